@@ -12,6 +12,7 @@ import os
 import time
 import asyncio
 import logging
+import threading
 from typing import Dict, Any, List
 from pathlib import Path
 
@@ -28,6 +29,34 @@ except ImportError as e:
     PERFORMANCE_MODULE_AVAILABLE = False
 
 
+class _HeadlessText:
+    """Minimal stand-in for tkinter.Text when no display is available
+
+    Keeps the text as a list of lines; like Tk, ``get`` builds the whole
+    text, so reading the widget back costs O(total text).
+    """
+
+    def __init__(self):
+        self.lines = [""]
+
+    def insert(self, index, *chunks):
+        text = "".join(chunks[0::2]).split("\n")
+        self.lines[-1] += text[0]
+        self.lines.extend(text[1:])
+
+    def delete(self, first, last):
+        if last == "end":
+            self.lines = [""]
+        else:
+            del self.lines[: int(float(last)) - 1]
+
+    def get(self, first, last):
+        return "\n".join(self.lines) + "\n"
+
+    def see(self, index):
+        pass
+
+
 class PerformanceBenchmark:
     """Benchmark performance improvements"""
 
@@ -191,6 +220,95 @@ class PerformanceBenchmark:
             self.logger.warning("psutil not available for memory benchmarking")
             return {}
 
+    def _log_widget(self):
+        """A hidden Tk text widget, or a headless stand-in without a display"""
+        try:
+            import tkinter as tk
+
+            root = tk.Tk()
+            root.withdraw()
+            return root, tk.Text(root), "tkinter"
+        except Exception:
+            return None, _HeadlessText(), "headless"
+
+    def benchmark_log_output(
+        self, lines: int = 100000, legacy_lines: int = 20000
+    ) -> Dict[str, Any]:
+        """Benchmark GUI log output: per-line inserts vs the batched log sink"""
+        self.logger.info("📝 Benchmarking GUI log output...")
+
+        from zoom_deep_clean.log_sink import (
+            DEFAULT_FLUSH_INTERVAL_MS,
+            LogSink,
+            TextLogView,
+        )
+
+        root, text, widget = self._log_widget()
+        results = {"widget": widget}
+        try:
+            # Legacy: two inserts, a full read-back and a see per line
+            worst = 0.0
+            start_time = time.perf_counter()
+            for n in range(legacy_lines):
+                line_start = time.perf_counter()
+                text.insert("end", "[00:00:00] ", "timestamp")
+                text.insert("end", f"Removing file {n}\n", "info")
+                text.see("end")
+                if text.get("1.0", "end").count("\n") > 1000:
+                    text.delete("1.0", "200.0")
+                worst = max(worst, time.perf_counter() - line_start)
+            legacy_time = time.perf_counter() - start_time
+            results["legacy"] = {
+                "lines": legacy_lines,
+                "time": legacy_time,
+                "lines_per_second": legacy_lines / legacy_time,
+                "max_stall_ms": worst * 1000,
+            }
+            text.delete("1.0", "end")
+
+            # Log sink: a worker thread logs as fast as it can while the GUI
+            # thread flushes every interval
+            sink = LogSink()
+            view = TextLogView(root, text, sink)
+            producer = threading.Thread(
+                target=lambda: [sink.append(f"Removing file {n}") for n in range(lines)]
+            )
+            flush_times = []
+            start_time = time.perf_counter()
+            producer.start()
+            while producer.is_alive() or len(sink):
+                time.sleep(DEFAULT_FLUSH_INTERVAL_MS / 1000)
+                flush_start = time.perf_counter()
+                view.flush()
+                if root is not None:
+                    root.update_idletasks()
+                flush_times.append(time.perf_counter() - flush_start)
+            sink_time = time.perf_counter() - start_time
+            producer.join()
+            results["log_sink"] = {
+                "lines": lines,
+                "time": sink_time,
+                "lines_per_second": lines / sink_time,
+                "flushes": len(flush_times),
+                "max_stall_ms": max(flush_times) * 1000,
+                "stalls": sum(
+                    1 for t in flush_times if t * 1000 > DEFAULT_FLUSH_INTERVAL_MS
+                ),
+                "dropped": sink.dropped,
+                "skipped": sink.skipped,
+                "displayed_lines": view.line_count,
+            }
+        finally:
+            if root is not None:
+                root.destroy()
+
+        self.logger.info(
+            f"Log sink: {results['log_sink']['lines_per_second']:.0f} lines/s, "
+            f"worst flush {results['log_sink']['max_stall_ms']:.1f}ms "
+            f"(legacy: {results['legacy']['lines_per_second']:.0f} lines/s)"
+        )
+        return results
+
     def run_full_benchmark(self) -> Dict[str, Any]:
         """Run complete performance benchmark"""
         self.logger.info("🚀 Starting comprehensive performance benchmark...")
@@ -201,6 +319,7 @@ class PerformanceBenchmark:
             "file_scanning": {},
             "process_management": {},
             "memory_usage": {},
+            "log_output": {},
         }
 
         # File scanning benchmark
@@ -223,6 +342,12 @@ class PerformanceBenchmark:
         except Exception as e:
             self.logger.error(f"Memory usage benchmark failed: {e}")
 
+        # GUI log output benchmark
+        try:
+            benchmark_results["log_output"] = self.benchmark_log_output()
+        except Exception as e:
+            self.logger.error(f"Log output benchmark failed: {e}")
+
         return benchmark_results
 
     def get_system_info(self) -> Dict[str, Any]:
@@ -312,6 +437,27 @@ class PerformanceBenchmark:
             if "memory_overhead_mb" in mem_results:
                 print(f"  Overhead: {mem_results['memory_overhead_mb']:.1f} MB")
 
+        # GUI log output results
+        if "log_output" in results and results["log_output"]:
+            print("\n📝 GUI Log Output:")
+            log_results = results["log_output"]
+            print(f"  Widget: {log_results['widget']}")
+
+            for name in ("legacy", "log_sink"):
+                if name in log_results:
+                    data = log_results[name]
+                    print(
+                        f"  {name}: {data['lines_per_second']:.0f} lines/s, "
+                        f"worst stall {data['max_stall_ms']:.1f}ms"
+                    )
+
+            if "log_sink" in log_results:
+                sink = log_results["log_sink"]
+                print(
+                    f"  Flushes: {sink['flushes']} ({sink['stalls']} over the "
+                    f"interval), {sink['dropped']} lines dropped"
+                )
+
         print("\n" + "=" * 60)
 
     def save_results(self, results: Dict[str, Any], filename: str = None):
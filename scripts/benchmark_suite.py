@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Scanner Benchmark Suite
+Reproducible scanner benchmarks against a synthetic macOS fixture tree
+
+Builds a deterministic fixture with zoom_deep_clean.synthetic_fixtures and
+times every registered scan engine against it. Results are written as JSON
+that scripts/performance_tracker.py can track for regressions:
+
+    python scripts/benchmark_suite.py --files 100000 --output bench.json
+    python scripts/performance_tracker.py --benchmark-results bench.json
+
+Cookie jar parsing is benchmarked on generated Safari jars:
+
+    python scripts/benchmark_suite.py --safari-cookies 100000 --engine binarycookies
+
+Created by: PHLthy215
+Version: 2.4.2 - Synthetic Benchmark Suite
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+
+# Add the package to path
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
+
+from zoom_deep_clean.synthetic_fixtures import (  # noqa: E402
+    FixtureManifest,
+    FixtureSpec,
+    generate_macos_fixture,
+)
+
+# Absolute thresholds (seconds) used by performance_tracker for each metric.
+# They are sized for the default 10k-file fixture; override with --threshold.
+DEFAULT_THRESHOLDS = {
+    "scan_async_file_scanner_time": 10,
+    "scan_comprehensive_file_search_time": 10,
+    "scan_remove_path_dry_run_time": 10,
+    "scan_binarycookies_time": 10,
+}
+
+# Relative slowdown against recent history that counts as a regression
+DEFAULT_REGRESSION_PERCENT = 25
+
+
+def engine_async_file_scanner(
+    manifest: FixtureManifest, logger: logging.Logger
+) -> List[str]:
+    """AsyncFileScanner.scan_directories_parallel over the fixture"""
+    from zoom_deep_clean.performance_optimizations import AsyncFileScanner
+
+    scanner = AsyncFileScanner(logger, max_workers=8)
+    results = asyncio.run(scanner.scan_directories_parallel(manifest.search_locations))
+    return [result.path for result in results]
+
+
+def engine_comprehensive_file_search(
+    manifest: FixtureManifest, logger: logging.Logger
+) -> List[str]:
+    """The find-based search used by comprehensive_file_search"""
+    from zoom_deep_clean.cleaner_enhanced import find_zoom_files
+
+    found = []
+    for location in manifest.search_locations:
+        files, _ = find_zoom_files(location)
+        found.extend(files)
+    return found
+
+
+def engine_remove_path_dry_run(
+    manifest: FixtureManifest, logger: logging.Logger
+) -> Tuple[List[str], Dict[str, Any]]:
+    """_remove_path over every fixture file in dry-run mode
+
+    Reports the filesystem syscall counters of the cleaner's stat cache.
+    """
+    from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
+    from zoom_deep_clean.command_backend import ReplayBackend
+
+    log_dir = tempfile.mkdtemp(prefix="zdce_bench_log_")
+    try:
+        cleaner = ZoomDeepCleanerEnhanced(
+            log_file=os.path.join(log_dir, "bench.log"),
+            dry_run=True,
+            enable_backup=False,
+            enable_advanced_features=False,
+            command_backend=ReplayBackend(interactions=[]),
+        )
+        cleaner.logger.setLevel(logging.ERROR)
+
+        removed = []
+        for directory, _, files in os.walk(manifest.root):
+            for name in files:
+                path = os.path.join(directory, name)
+                if cleaner._remove_path(path):
+                    removed.append(path)
+        return removed, {"syscalls": cleaner.stat_cache.stats()}
+    finally:
+        shutil.rmtree(log_dir, ignore_errors=True)
+
+
+def engine_binarycookies(
+    manifest: FixtureManifest, logger: logging.Logger
+) -> Tuple[List[str], Dict[str, Any]]:
+    """Scan every fixture cookie jar and rewrite it without Zoom cookies
+
+    The cleaned jars are written to a temporary directory, so the fixture
+    stays intact across repeats. Needs ``--safari-cookies``.
+    """
+    from zoom_deep_clean.binary_cookies import clean_cookie_jar
+
+    output_dir = tempfile.mkdtemp(prefix="zdce_bench_cookies_")
+    try:
+        found = []
+        cookies_scanned = zoom_cookies = 0
+        for index, jar in enumerate(manifest.cookie_jars):
+            result = clean_cookie_jar(
+                jar,
+                backup=False,
+                output_path=os.path.join(output_dir, f"{index}.binarycookies"),
+            )
+            if result.error:
+                raise RuntimeError(f"{jar}: {result.error}")
+            cookies_scanned += result.cookies_scanned
+            zoom_cookies += result.removed
+            if result.removed:
+                found.append(jar)
+        return found, {"cookies_scanned": cookies_scanned, "zoom_cookies": zoom_cookies}
+    finally:
+        shutil.rmtree(output_dir, ignore_errors=True)
+
+
+EngineResult = Union[List[str], Tuple[List[str], Dict[str, Any]]]
+
+# Registry of scan engines: name -> callable(manifest, logger) -> found paths,
+# optionally with extra result data. New engines register here to be compared
+# against the existing ones.
+ENGINES: Dict[str, Callable[[FixtureManifest, logging.Logger], EngineResult]] = {
+    "async_file_scanner": engine_async_file_scanner,
+    "comprehensive_file_search": engine_comprehensive_file_search,
+    "remove_path_dry_run": engine_remove_path_dry_run,
+    "binarycookies": engine_binarycookies,
+}
+
+
+class BenchmarkSuite:
+    """Run registered scan engines against a synthetic fixture"""
+
+    def __init__(
+        self,
+        spec: FixtureSpec,
+        root: Optional[str] = None,
+        repeat: int = 3,
+        engines: Optional[List[str]] = None,
+    ):
+        self.spec = spec
+        self.root = root
+        self.repeat = max(1, repeat)
+        self.engine_names = engines or list(ENGINES)
+        self.logger = logging.getLogger("benchmark_suite")
+
+        unknown = [name for name in self.engine_names if name not in ENGINES]
+        if unknown:
+            raise ValueError(f"Unknown engine(s): {', '.join(unknown)}")
+
+    def build_fixture(self, root: str) -> FixtureManifest:
+        """Generate the fixture tree and report how long it took"""
+        self.logger.info(
+            f"🏗️ Generating fixture: {self.spec.file_count} files, depth "
+            f"{self.spec.depth}, zoom density {self.spec.zoom_density}"
+        )
+        start_time = time.perf_counter()
+        manifest = generate_macos_fixture(root, self.spec)
+        self.logger.info(
+            f"✅ Fixture ready in {time.perf_counter() - start_time:.2f}s "
+            f"({manifest.files_created} files, {manifest.directories_created} dirs)"
+        )
+        return manifest
+
+    def run_engine(self, name: str, manifest: FixtureManifest) -> Dict[str, Any]:
+        """Time one engine ``repeat`` times"""
+        engine = ENGINES[name]
+        timings = []
+        found: List[str] = []
+        extra: Dict[str, Any] = {}
+
+        for _ in range(self.repeat):
+            start_time = time.perf_counter()
+            result = engine(manifest, self.logger)
+            timings.append(time.perf_counter() - start_time)
+            found, extra = result if isinstance(result, tuple) else (result, {})
+
+        best = min(timings)
+        found_set = set(found)
+        expected = set(manifest.zoom_paths)
+        return {
+            "times": timings,
+            "best": best,
+            "median": statistics.median(timings),
+            "files_found": len(found),
+            "expected_zoom_files_found": len(found_set & expected),
+            "files_per_second": (
+                manifest.files_created / best if best > 0 else float("inf")
+            ),
+            **extra,
+        }
+
+    def run(self) -> Dict[str, Any]:
+        """Build the fixture (unless reusing one), run all engines and report"""
+        temp_root = None
+        root = self.root
+        if root is None:
+            temp_root = tempfile.mkdtemp(prefix="zdce_fixture_")
+            root = temp_root
+
+        try:
+            manifest = self.build_fixture(root)
+            engines = {}
+            for name in self.engine_names:
+                self.logger.info(f"⚡ Benchmarking engine: {name}")
+                try:
+                    engines[name] = self.run_engine(name, manifest)
+                except Exception as e:
+                    self.logger.error(f"❌ Engine {name} failed: {e}")
+                    engines[name] = {"error": str(e)}
+
+            metrics = {
+                f"scan_{name}_time": data["best"]
+                for name, data in engines.items()
+                if "best" in data
+            }
+            return {
+                "timestamp": time.time(),
+                "system_info": {
+                    "platform": platform.system(),
+                    "platform_version": platform.release(),
+                    "architecture": platform.machine(),
+                    "python_version": platform.python_version(),
+                    "cpu_count": os.cpu_count(),
+                },
+                "fixture": manifest.to_dict(),
+                "repeat": self.repeat,
+                "engines": engines,
+                "metrics": metrics,
+            }
+        finally:
+            if temp_root:
+                shutil.rmtree(temp_root, ignore_errors=True)
+
+
+def print_results(results: Dict[str, Any]) -> None:
+    """Print benchmark results in a readable format"""
+    print("\n" + "=" * 60)
+    print("🚀 SCANNER BENCHMARK RESULTS")
+    print("=" * 60)
+
+    fixture = results["fixture"]
+    print(
+        f"\n📁 Fixture: {fixture['files_created']} files, "
+        f"{fixture['zoom_files_created']} Zoom files, "
+        f"{fixture['symlinks_created']} symlinks (seed {fixture['seed']})"
+    )
+
+    print("\n⚡ Engines:")
+    for name, data in results["engines"].items():
+        if "error" in data:
+            print(f"  {name}: ❌ {data['error']}")
+            continue
+        print(
+            f"  {name}: best {data['best']:.3f}s, median {data['median']:.3f}s, "
+            f"{data['files_found']} found, {data['files_per_second']:.0f} files/s"
+        )
+        if "cookies_scanned" in data:
+            print(
+                f"    cookies: {data['cookies_scanned']} scanned, "
+                f"{data['zoom_cookies']} Zoom cookies removed"
+            )
+        if "syscalls" in data:
+            syscalls = data["syscalls"]
+            print(
+                f"    filesystem syscalls: {syscalls['syscalls']} "
+                f"({syscalls.get('cache_hits', 0)} answered from the stat cache)"
+            )
+    print("\n" + "=" * 60)
+
+
+def parse_thresholds(values: List[str]) -> Dict[str, float]:
+    """Parse ``metric=seconds`` threshold overrides"""
+    thresholds = dict(DEFAULT_THRESHOLDS)
+    for value in values:
+        metric, _, seconds = value.partition("=")
+        if not metric or not seconds:
+            raise argparse.ArgumentTypeError(
+                f"Threshold must look like metric=seconds: {value}"
+            )
+        thresholds[metric] = float(seconds)
+    return thresholds
+
+
+def main() -> int:
+    """Main benchmark execution"""
+    parser = argparse.ArgumentParser(
+        description="Benchmark Zoom scanners against a synthetic macOS fixture"
+    )
+    parser.add_argument("--files", type=int, default=10000, help="Files to generate")
+    parser.add_argument("--depth", type=int, default=4, help="Maximum nesting depth")
+    parser.add_argument(
+        "--zoom-density",
+        type=float,
+        default=0.01,
+        help="Fraction of generated files that are Zoom artifacts",
+    )
+    parser.add_argument(
+        "--symlinks", type=float, default=0.0, help="Fraction of entries as symlinks"
+    )
+    parser.add_argument("--users", type=int, default=1, help="Number of fake users")
+    parser.add_argument(
+        "--safari-cookies",
+        type=int,
+        default=0,
+        help="Cookies in each user's Safari cookie jar (binarycookies engine)",
+    )
+    parser.add_argument("--seed", type=int, default=1132, help="Random seed")
+    parser.add_argument(
+        "--root", help="Generate the fixture here and keep it (default: temp dir)"
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="Runs per engine")
+    parser.add_argument(
+        "--engine",
+        action="append",
+        choices=sorted(ENGINES),
+        help="Engine to run (repeatable, default: all)",
+    )
+    parser.add_argument(
+        "--threshold",
+        action="append",
+        default=[],
+        help="Override a regression threshold, e.g. scan_async_file_scanner_time=5",
+    )
+    parser.add_argument(
+        "--regression-percent",
+        type=float,
+        default=DEFAULT_REGRESSION_PERCENT,
+        help="Slowdown against recent history reported as a regression",
+    )
+    parser.add_argument("--output", help="Write JSON results to this file")
+    parser.add_argument("--verbose", "-v", action="store_true")
+    args = parser.parse_args()
+
+    logging.basicConfig(
+        level=logging.DEBUG if args.verbose else logging.INFO,
+        format="%(asctime)s - %(levelname)s - %(message)s",
+    )
+
+    spec = FixtureSpec(
+        file_count=args.files,
+        depth=args.depth,
+        zoom_density=args.zoom_density,
+        symlink_ratio=args.symlinks,
+        users=tuple(f"user{n}" for n in range(max(1, args.users))),
+        seed=args.seed,
+        safari_cookies=args.safari_cookies,
+    )
+
+    suite = BenchmarkSuite(
+        spec, root=args.root, repeat=args.repeat, engines=args.engine
+    )
+    results = suite.run()
+    results["thresholds"] = parse_thresholds(args.threshold)
+    results["regression_percent"] = args.regression_percent
+
+    print_results(results)
+
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2, default=str)
+        print(f"📄 Benchmark results saved to {args.output}")
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
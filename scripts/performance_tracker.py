@@ -29,6 +29,9 @@ class PerformanceTracker:
             "total_time": 120,  # seconds
             "alert_threshold": 80,  # percentage of threshold
         }
+        # Benchmark metrics checked against their own recent history
+        self.regression_metrics = set()
+        self.regression_percent = 25
 
     def load_metrics(self) -> List[Dict]:
         """Load historical performance metrics"""
@@ -130,6 +133,29 @@ class PerformanceTracker:
 
         return results
 
+    def load_benchmark_results(self, results_file: str) -> Dict[str, float]:
+        """Load metrics emitted by scripts/benchmark_suite.py
+
+        Thresholds embedded in the results are merged into the tracker's
+        thresholds and the metrics are flagged for regression tracking.
+        """
+        with open(results_file, "r") as f:
+            results = json.load(f)
+
+        metrics = {
+            name: float(value)
+            for name, value in results.get("metrics", {}).items()
+            if isinstance(value, (int, float))
+        }
+        for name, threshold in results.get("thresholds", {}).items():
+            if name in metrics:
+                self.thresholds[name] = threshold
+        self.regression_metrics.update(metrics)
+        self.regression_percent = results.get(
+            "regression_percent", self.regression_percent
+        )
+        return metrics
+
     def _count_tests(self, pytest_output: str) -> int:
         """Extract test count from pytest output"""
         try:
@@ -190,6 +216,21 @@ class PerformanceTracker:
         if len(historical) >= 3:  # Need at least 3 data points
             analysis["trend_analysis"] = self._analyze_trends(historical, current)
 
+            # Benchmark metrics also fail when they regress against history
+            for metric, trend in analysis["trend_analysis"].items():
+                change = trend["change_from_previous_percent"]
+                if (
+                    metric in self.regression_metrics
+                    and change > self.regression_percent
+                ):
+                    analysis["alerts"].append(
+                        {
+                            "level": "ERROR",
+                            "metric": metric,
+                            "message": f"{metric} regressed {change:.1f}% against recent runs",
+                        }
+                    )
+
         return analysis
 
     def _get_status(self, percentage: float) -> str:
@@ -205,10 +246,17 @@ class PerformanceTracker:
         """Analyze performance trends over time"""
         trends = {}
 
-        # Get recent data (last 10 runs)
-        recent = historical[-10:] + [{"metrics": current}]
+        # Get recent data (last 10 runs); saved runs keep their numbers
+        # under "current_metrics"
+        recent = [
+            {"metrics": run.get("metrics", run.get("current_metrics", {}))}
+            for run in historical[-10:]
+        ] + [{"metrics": current}]
+
+        tracked = ["test_time", "lint_time", "security_time", "total_time"]
+        tracked.extend(sorted(self.regression_metrics))
 
-        for metric in ["test_time", "lint_time", "security_time", "total_time"]:
+        for metric in tracked:
             values = [
                 run.get("metrics", {}).get(metric, 0)
                 for run in recent
@@ -226,9 +274,18 @@ class PerformanceTracker:
                     ((avg_recent - avg_older) / avg_older * 100) if avg_older > 0 else 0
                 )
 
+                previous_average = statistics.mean(values[:-1])
                 trends[metric] = {
                     "current": current.get(metric, 0),
                     "recent_average": avg_recent,
+                    "previous_average": previous_average,
+                    "change_from_previous_percent": (
+                        (current.get(metric, 0) - previous_average)
+                        / previous_average
+                        * 100
+                        if previous_average > 0
+                        else 0
+                    ),
                     "trend_percent": trend_percent,
                     "trend_direction": (
                         "increasing"
@@ -300,12 +357,15 @@ class PerformanceTracker:
 
         return "\n".join(report)
 
-    def run_performance_check(self) -> bool:
+    def run_performance_check(self, benchmark_results: str = None) -> bool:
         """Run complete performance check and return success status"""
         print("🚀 Starting performance monitoring...")
 
         # Run measurements
-        current_metrics = self.run_timed_tests()
+        if benchmark_results:
+            current_metrics = self.load_benchmark_results(benchmark_results)
+        else:
+            current_metrics = self.run_timed_tests()
 
         # Analyze results
         analysis = self.analyze_performance(current_metrics)
@@ -339,6 +399,11 @@ def main():
         default="performance_metrics.json",
         help="File to store performance metrics",
     )
+    parser.add_argument(
+        "--benchmark-results",
+        help="Track metrics from a scripts/benchmark_suite.py JSON file "
+        "instead of timing the CI pipeline",
+    )
     parser.add_argument(
         "--fail-on-regression",
         action="store_true",
@@ -348,7 +413,7 @@ def main():
     args = parser.parse_args()
 
     tracker = PerformanceTracker(args.metrics_file)
-    success = tracker.run_performance_check()
+    success = tracker.run_performance_check(args.benchmark_results)
 
     if args.fail_on_regression and not success:
         print("\n❌ Performance regression detected!")
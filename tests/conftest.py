@@ -4,13 +4,23 @@ Test configuration for Zoom Deep Clean Enhanced
 Ensures proper module discovery and imports
 """
 
+import atexit
+import os
+import shutil
 import sys
+import tempfile
 from pathlib import Path
 
 # Add the project root to Python path
 project_root = Path(__file__).parent.parent
 sys.path.insert(0, str(project_root))
 
+# Run against a throwaway home so caches, step history and backups that
+# default to ~/Library never touch the real one
+test_home = tempfile.mkdtemp(prefix="zoom_deep_clean_home_")
+os.environ["HOME"] = test_home
+atexit.register(shutil.rmtree, test_home, ignore_errors=True)
+
 # Ensure we can import the main package
 try:
     import zoom_deep_clean
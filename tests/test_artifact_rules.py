@@ -0,0 +1,228 @@
+#!/usr/bin/env python3
+"""
+Tests for the artifact rule catalog
+Trie compilation, single-scan resolution and the on-disk cache
+"""
+
+import json
+import os
+import pickle
+import shutil
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import patch
+
+from zoom_deep_clean import artifact_rules
+from zoom_deep_clean.artifact_rules import (
+    ARTIFACT_CATALOG,
+    ARTIFACT_RULES,
+    ArtifactRule,
+    CompiledRuleSet,
+    catalog_paths,
+    category_scope,
+    load_compiled_rules,
+)
+
+
+def _touch(path, directory=False):
+    if directory:
+        os.makedirs(path, exist_ok=True)
+        return
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("zoom.us")
+
+
+class TestRuleResolution(unittest.TestCase):
+    """Test resolving the compiled catalog against a directory tree"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.home = os.path.join(self.temp_dir, "Users", "alice")
+        self.library = os.path.join(self.home, "Library")
+        self.compiled = CompiledRuleSet.compile()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_catalog_scopes_are_consistent(self):
+        """Every category holds either user or system rules, never both"""
+        for category, paths in ARTIFACT_CATALOG.items():
+            scopes = {ArtifactRule(path, category).scope for path in paths}
+            self.assertEqual(scopes, {category_scope(category)}, category)
+
+    def test_resolves_literal_and_glob_rules(self):
+        """Literal names, glob components and nested rules all match"""
+        _touch(os.path.join(self.library, "Preferences", "us.zoom.xos.plist"))
+        _touch(os.path.join(self.library, "Preferences", "com.apple.finder.plist"))
+        _touch(os.path.join(self.library, "Application Support", "zoom.us"), True)
+        team_db = os.path.join(
+            self.library,
+            "Group Containers",
+            "ABC.team",
+            "Zoom",
+            "data",
+            "zoomus.enc.db",
+        )
+        _touch(team_db)
+
+        matches = self.compiled.resolve("user", self.home)
+
+        self.assertEqual(
+            matches["preferences"],
+            [os.path.join(self.library, "Preferences", "us.zoom.xos.plist")],
+        )
+        self.assertEqual(
+            matches["application_data"],
+            [os.path.join(self.library, "Application Support", "zoom.us")],
+        )
+        self.assertEqual(matches["auth_databases"], [team_db])
+        self.assertNotIn("webkit_storage", matches)
+
+    def test_matching_is_case_insensitive(self):
+        """Names match regardless of case, like on APFS"""
+        _touch(os.path.join(self.library, "Preferences", "US.ZOOM.XOS.plist"))
+
+        matches = self.compiled.resolve("user", self.home, ["preferences"])
+
+        self.assertEqual(
+            matches["preferences"],
+            [os.path.join(self.library, "Preferences", "US.ZOOM.XOS.plist")],
+        )
+
+    def test_system_globs_and_overlapping_rules(self):
+        """A path matched by a literal and a glob rule is listed once"""
+        agents = os.path.join(self.temp_dir, "Library", "LaunchAgents")
+        _touch(os.path.join(agents, "us.zoom.updater.plist"))
+        _touch(os.path.join(agents, "us.zoom.custom.plist"))
+        _touch(os.path.join(agents, "com.example.agent.plist"))
+
+        matches = self.compiled.resolve("system", self.temp_dir, ["launch_agents"])
+
+        self.assertEqual(
+            matches["launch_agents"],
+            [
+                os.path.join(agents, "us.zoom.custom.plist"),
+                os.path.join(agents, "us.zoom.updater.plist"),
+            ],
+        )
+
+    def test_each_parent_scanned_once(self):
+        """One scandir per visited directory; missing subtrees are pruned"""
+        _touch(os.path.join(self.library, "Preferences", "us.zoom.xos.plist"))
+        _touch(os.path.join(self.library, "Caches", "us.zoom.xos"), True)
+
+        scanned = []
+        real_scandir = os.scandir
+
+        def counting_scandir(path):
+            scanned.append(path)
+            return real_scandir(path)
+
+        with patch("zoom_deep_clean.artifact_rules.os.scandir", counting_scandir):
+            self.compiled.resolve("user", self.home)
+
+        self.assertEqual(len(scanned), len(set(scanned)))
+        # home, Library, Preferences and Caches; no rule continues below the
+        # matched us.zoom.xos cache, so it is never scanned
+        self.assertEqual(len(scanned), 4)
+        self.assertEqual(self.compiled.directories_scanned, 4)
+
+    def test_missing_base_resolves_to_nothing(self):
+        """A base directory that does not exist matches nothing"""
+        matches = self.compiled.resolve("user", os.path.join(self.temp_dir, "nope"))
+
+        self.assertEqual(matches, {})
+        with self.assertRaises(ValueError):
+            self.compiled.resolve("everything", self.home)
+
+
+class TestRuleCache(unittest.TestCase):
+    """Test the on-disk compiled rule cache"""
+
+    def setUp(self):
+        self.cache_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir, ignore_errors=True)
+
+    def test_cache_written_and_reused(self):
+        """The second load reads the cache instead of compiling"""
+        first = load_compiled_rules(self.cache_dir)
+        cache_files = os.listdir(self.cache_dir)
+        self.assertEqual(len(cache_files), 1)
+
+        with patch.object(
+            CompiledRuleSet, "compile", side_effect=AssertionError("recompiled")
+        ), patch(
+            "zoom_deep_clean.artifact_rules.rules_digest",
+            side_effect=AssertionError("catalog hashed"),
+        ):
+            second = load_compiled_rules(self.cache_dir)
+
+        self.assertEqual(second.digest, first.digest)
+        self.assertEqual(second.tries, first.tries)
+        self.assertEqual(second.rules, ARTIFACT_RULES)
+
+    def test_corrupt_cache_is_recompiled(self):
+        """A damaged cache file is replaced"""
+        load_compiled_rules(self.cache_dir)
+        cache_file = os.path.join(self.cache_dir, os.listdir(self.cache_dir)[0])
+        with open(cache_file, "w") as f:
+            f.write("{not json")
+
+        compiled = load_compiled_rules(self.cache_dir)
+
+        with open(cache_file) as f:
+            self.assertEqual(json.load(f)["digest"], compiled.digest)
+
+    def test_modified_catalog_module_is_recompiled(self):
+        """Editing the catalog module invalidates its cache entry"""
+        load_compiled_rules(self.cache_dir)
+        real_stat = os.stat
+
+        def edited(path, *args, **kwargs):
+            st = real_stat(path, *args, **kwargs)
+            if path != artifact_rules.__file__:
+                return st
+            return SimpleNamespace(st_size=st.st_size, st_mtime_ns=st.st_mtime_ns + 1)
+
+        with patch("zoom_deep_clean.artifact_rules.os.stat", side_effect=edited):
+            load_compiled_rules(self.cache_dir)
+
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+
+    def test_catalog_change_uses_new_cache_entry(self):
+        """Different rule lists never share a cache file"""
+        load_compiled_rules(self.cache_dir)
+        extra = ARTIFACT_RULES + (ArtifactRule("~/Library/ZoomExtra", "extra"),)
+
+        compiled = load_compiled_rules(self.cache_dir, rules=extra)
+
+        self.assertEqual(len(os.listdir(self.cache_dir)), 2)
+        self.assertEqual(compiled.rules[-1].category, "extra")
+
+    def test_pickles_for_worker_processes(self):
+        """Compiled rules survive the trip to a process pool worker"""
+        compiled = CompiledRuleSet.compile()
+
+        clone = pickle.loads(pickle.dumps(compiled))
+
+        self.assertEqual(clone.tries, compiled.tries)
+        self.assertEqual(clone.digest, compiled.digest)
+
+    def test_platform_paths_come_from_catalog(self):
+        """PlatformDetector reports the catalog's macOS locations"""
+        import logging
+
+        from zoom_deep_clean.cross_platform_support import PlatformDetector
+
+        paths = PlatformDetector(logging.getLogger(__name__))._get_macos_paths()
+
+        self.assertEqual(paths["applications"], catalog_paths("applications"))
+        self.assertIn("/Library/LaunchAgents/us.zoom.*", paths["system_data"])
+
+
+if __name__ == "__main__":
+    unittest.main()
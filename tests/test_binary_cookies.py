@@ -0,0 +1,256 @@
+#!/usr/bin/env python3
+"""
+Tests for the Safari binarycookies scanner and rewriter
+Zoom cookie matching, selective rewrites, backups and cleaner integration
+"""
+
+import json
+import logging
+import os
+import shutil
+import struct
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean.binary_cookies import (
+    clean_cookie_jar,
+    cookie_jar_paths,
+    scan_cookie_jar,
+)
+from zoom_deep_clean.command_backend import ReplayBackend
+from zoom_deep_clean.synthetic_fixtures import generate_cookie_jar_fixture
+
+
+def _checksum_ok(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    (count,) = struct.unpack_from(">I", data, 4)
+    offset = 8 + 4 * count
+    checksum = 0
+    for size in struct.unpack_from(f">{count}I", data, 8):
+        checksum += sum(data[offset : offset + size : 4])
+        offset += size
+    return struct.unpack_from(">I", data, offset)[0] == checksum & 0xFFFFFFFF
+
+
+class TestCookieJar(unittest.TestCase):
+    """Test scanning and rewriting a single jar"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.jar = os.path.join(self.temp_dir, "Cookies.binarycookies")
+        self.fixture = generate_cookie_jar_fixture(
+            self.jar, cookie_count=2000, zoom_cookie_count=40
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _names(self, result):
+        return sorted((cookie.domain, cookie.name) for cookie in result.cookies)
+
+    def test_scan_finds_only_zoom_cookies(self):
+        """Zoom domains and subdomains match, look-alike domains do not"""
+        with open(self.jar, "rb") as f:
+            before = f.read()
+
+        result = scan_cookie_jar(self.jar)
+
+        self.assertIsNone(result.error)
+        self.assertEqual(result.cookies_scanned, 2000)
+        self.assertEqual(result.pages, self.fixture.pages)
+        self.assertEqual(self._names(result), sorted(self.fixture.zoom_cookies))
+        self.assertEqual(result.cookies[0].path, "/")
+        self.assertAlmostEqual(result.cookies[0].expires, 1893456000.0)
+        with open(self.jar, "rb") as f:
+            self.assertEqual(f.read(), before)
+
+    def test_rewrite_removes_zoom_cookies(self):
+        """The rewritten jar keeps every other cookie and a valid checksum"""
+        with open(self.jar, "rb") as f:
+            trailer = f.read()[-60:]
+
+        result = clean_cookie_jar(self.jar)
+
+        self.assertIsNone(result.error)
+        self.assertEqual(result.removed, 40)
+        rescan = scan_cookie_jar(self.jar)
+        self.assertEqual(rescan.cookies, [])
+        self.assertEqual(rescan.cookies_scanned, 1960)
+        self.assertTrue(_checksum_ok(self.jar))
+        with open(self.jar, "rb") as f:
+            self.assertEqual(f.read()[-60:], trailer)
+
+    def test_removed_cookies_are_backed_up(self):
+        """Only the removed cookie records are written to the backup"""
+        backup_dir = os.path.join(self.temp_dir, "backup")
+
+        result = clean_cookie_jar(self.jar, backup_dir=backup_dir)
+
+        self.assertEqual(os.path.dirname(result.backup_path), backup_dir)
+        self.assertEqual(os.stat(result.backup_path).st_mode & 0o777, 0o600)
+        with open(result.backup_path) as f:
+            backup = json.load(f)
+        self.assertEqual(
+            sorted((c["domain"], c["name"]) for c in backup["cookies"]),
+            sorted(self.fixture.zoom_cookies),
+        )
+        self.assertEqual(os.listdir(backup_dir), [os.path.basename(result.backup_path)])
+
+    def test_no_backup_without_a_backup_dir(self):
+        """Removed cookies are never written next to the jar"""
+        result = clean_cookie_jar(self.jar)
+
+        self.assertEqual(result.removed, 40)
+        self.assertIsNone(result.backup_path)
+        self.assertEqual(os.listdir(self.temp_dir), [os.path.basename(self.jar)])
+
+    def test_pages_emptied_are_dropped(self):
+        """A page holding only Zoom cookies disappears from the jar"""
+        jar = os.path.join(self.temp_dir, "zoom.binarycookies")
+        generate_cookie_jar_fixture(
+            jar, cookie_count=10, zoom_cookie_count=10, cookies_per_page=5
+        )
+
+        result = clean_cookie_jar(jar)
+
+        self.assertEqual(result.removed, 10)
+        rescan = scan_cookie_jar(jar)
+        self.assertEqual((rescan.pages, rescan.cookies_scanned), (0, 0))
+        self.assertIsNone(rescan.error)
+
+    def test_output_path_leaves_jar_untouched(self):
+        """Writing elsewhere keeps the original jar as it was"""
+        output = os.path.join(self.temp_dir, "clean.binarycookies")
+        with open(self.jar, "rb") as f:
+            before = f.read()
+
+        clean_cookie_jar(self.jar, output_path=output)
+
+        with open(self.jar, "rb") as f:
+            self.assertEqual(f.read(), before)
+        self.assertEqual(scan_cookie_jar(output).cookies, [])
+
+    def test_malformed_jar_is_reported(self):
+        """Files that are not cookie jars are never rewritten"""
+        bogus = os.path.join(self.temp_dir, "bogus.binarycookies")
+        with open(bogus, "wb") as f:
+            f.write(b"not a cookie jar")
+
+        result = clean_cookie_jar(bogus)
+
+        self.assertIn("Not a binarycookies file", result.error)
+        with open(bogus, "rb") as f:
+            self.assertEqual(f.read(), b"not a cookie jar")
+
+
+class TestCookieJarCleaners(unittest.TestCase):
+    """Test the cleaners and verifier using the cookie jar parser"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.home = os.path.join(self.temp_dir, "alice")
+        library = os.path.join(self.home, "Library")
+        self.safari_jar = os.path.join(
+            library,
+            "Containers/com.apple.Safari/Data/Library/Cookies/Cookies.binarycookies",
+        )
+        self.app_jar = os.path.join(
+            library, "HTTPStorages/com.example.App.binarycookies"
+        )
+        for index, jar in enumerate((self.safari_jar, self.app_jar)):
+            generate_cookie_jar_fixture(jar, cookie_count=300, seed=index)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_jars_are_found(self):
+        """Safari's containerised jar and app jars are discovered"""
+        self.assertEqual(
+            sorted(cookie_jar_paths(self.home)), sorted([self.safari_jar, self.app_jar])
+        )
+
+    def test_auth_cleaner_removes_zoom_cookies(self):
+        """AuthTokenCleaner cleans every jar instead of asking the user"""
+        from zoom_deep_clean.auth_token_cleaner import AuthTokenCleaner
+
+        cleaner = AuthTokenCleaner(
+            user_home=self.home, command_backend=ReplayBackend(interactions=[])
+        )
+        cleaner._clean_browser_auth_data()
+
+        for jar in (self.safari_jar, self.app_jar):
+            self.assertEqual(scan_cookie_jar(jar).cookies, [])
+            self.assertEqual(scan_cookie_jar(jar).cookies_scanned, 290)
+        self.assertEqual(
+            len([item for item in cleaner.cleaned_items if "Safari cookies" in item]),
+            2,
+        )
+
+    def test_webkit_storage_cleans_shared_jars(self):
+        """clean_webkit_storage removes Zoom cookies from other apps' jars"""
+        from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
+
+        cleaner = ZoomDeepCleanerEnhanced(
+            log_file=os.path.join(self.temp_dir, "clean.log"),
+            enable_backup=False,
+            enable_advanced_features=False,
+            command_backend=ReplayBackend(interactions=[]),
+        )
+        cleaner.user_home = self.home
+        cleaner.clean_webkit_storage()
+
+        self.assertEqual(cleaner.cleanup_stats["cookies_removed"], 20)
+        self.assertEqual(scan_cookie_jar(self.app_jar).cookies, [])
+
+    def test_user_data_parses_each_jar_once(self):
+        """Jars cleaned by the authentication cleanup are not parsed again"""
+        from zoom_deep_clean import cleaner_enhanced
+
+        cleaner = cleaner_enhanced.ZoomDeepCleanerEnhanced(
+            log_file=os.path.join(self.temp_dir, "clean.log"),
+            enable_backup=False,
+            enable_advanced_features=False,
+            command_backend=ReplayBackend(interactions=[]),
+            user_home=self.home,
+        )
+        cleaned = []
+        real_clean = cleaner_enhanced.clean_cookie_jar
+
+        def counting_clean(path, **kwargs):
+            cleaned.append(path)
+            return real_clean(path, **kwargs)
+
+        with patch.object(cleaner_enhanced, "clean_cookie_jar", counting_clean), patch(
+            "zoom_deep_clean.auth_token_cleaner.clean_cookie_jar", counting_clean
+        ):
+            cleaner.clean_user_data()
+
+        self.assertEqual(sorted(cleaned), sorted([self.safari_jar, self.app_jar]))
+        self.assertEqual(cleaner.cleanup_stats["cookies_removed"], 20)
+
+    def test_verifier_reports_zoom_cookies(self):
+        """Zoom cookies in generic jars count as remaining browser data"""
+        from zoom_deep_clean.device_fingerprint_verifier import (
+            DeviceFingerprintVerifier,
+        )
+
+        verifier = DeviceFingerprintVerifier(
+            user_home=self.home, command_backend=ReplayBackend(interactions=[])
+        )
+        verifier.logger.setLevel(logging.ERROR)
+        verifier._check_browser_data()
+
+        remaining = verifier.verification_results["remaining_items"]
+        self.assertIn(f"{self.app_jar} (10 Zoom cookies)", remaining)
+
+        clean_cookie_jar(self.app_jar)
+        clean_cookie_jar(self.safari_jar)
+        verifier.verification_results["remaining_items"] = []
+        verifier._check_browser_data()
+        self.assertEqual(verifier.verification_results["remaining_items"], [])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,374 @@
+#!/usr/bin/env python3
+"""
+Tests for cooperative cancellation
+Tokens, process group termination, cancellable backends and cancel latency
+"""
+
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean.cancellation import (
+    CancellationToken,
+    CleanupCancelled,
+    run_cancellable,
+)
+from zoom_deep_clean.command_backend import ReplayBackend, SubprocessBackend
+from zoom_deep_clean.progress_events import RUN_FINISHED, STEP_STARTED
+from zoom_deep_clean.synthetic_fixtures import generate_macos_fixture
+
+MAX_CANCEL_LATENCY = 0.25  # seconds from cancel() until the run gives up
+
+
+def _alive(pid):
+    """Whether ``pid`` is a live (non-zombie) process"""
+    try:
+        with open(f"/proc/{pid}/stat") as f:
+            return f.read().split(")")[-1].split()[0] != "Z"
+    except FileNotFoundError:
+        return False
+    except OSError:
+        pass
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    return True
+
+
+def _wait_for(predicate, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if predicate():
+            return True
+        time.sleep(0.01)
+    return predicate()
+
+
+def _cancel_later(token, delay=0.3):
+    timer = threading.Timer(delay, token.cancel)
+    timer.start()
+    return timer
+
+
+class TestCancellationToken(unittest.TestCase):
+    """Test the token itself"""
+
+    def test_callbacks_run_once(self):
+        token = CancellationToken()
+        calls = []
+        token.register(lambda: calls.append("a"))
+        removed = token.register(lambda: calls.append("b"))
+        token.unregister(removed)
+
+        token.cancel("stop")
+        token.cancel("again")
+
+        self.assertEqual(calls, ["a"])
+        self.assertEqual(token.reason, "stop")
+        with self.assertRaises(CleanupCancelled):
+            token.check()
+
+    def test_register_after_cancel_runs_at_once(self):
+        token = CancellationToken()
+        token.cancel()
+        calls = []
+
+        token.register(lambda: calls.append(1))
+
+        self.assertEqual(calls, [1])
+
+    def test_broken_callback_does_not_stop_others(self):
+        token = CancellationToken()
+        calls = []
+        token.register(lambda: 1 / 0)
+        token.register(lambda: calls.append(1))
+
+        token.cancel()
+
+        self.assertEqual(calls, [1])
+
+    def test_wait(self):
+        token = CancellationToken()
+        self.assertFalse(token.wait(0.01))
+        _cancel_later(token, 0.05)
+        self.assertTrue(token.wait(5))
+
+    def test_not_caught_by_except_exception(self):
+        token = CancellationToken()
+        token.cancel()
+        with self.assertRaises(CleanupCancelled):
+            try:
+                token.check()
+            except Exception:
+                self.fail("cancellation must escape except Exception")
+
+
+@unittest.skipUnless(hasattr(os, "killpg"), "process groups are POSIX only")
+class TestRunCancellable(unittest.TestCase):
+    """Test killing running commands"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_cancel_kills_the_whole_process_group(self):
+        """The grandchild dies with the child, within the latency budget"""
+        pid_file = os.path.join(self.temp_dir, "grandchild.pid")
+        script = (
+            "import subprocess, sys, time\n"
+            "child = subprocess.Popen(['sleep', '30'])\n"
+            f"open({pid_file!r}, 'w').write(str(child.pid))\n"
+            "time.sleep(30)\n"
+        )
+        token = CancellationToken()
+        timer = _cancel_later(token)
+
+        with self.assertRaises(CleanupCancelled):
+            run_cancellable([sys.executable, "-c", script], [token], timeout=30)
+        returned = time.monotonic()
+        timer.join()
+
+        self.assertLess(returned - token.cancelled_at, MAX_CANCEL_LATENCY)
+        with open(pid_file) as f:
+            grandchild = int(f.read())
+        self.assertTrue(_wait_for(lambda: not _alive(grandchild)))
+
+    def test_timeout_lets_sudo_relay_the_termination(self):
+        """Without a process group, a timed-out command gets SIGTERM first"""
+        pid_file = os.path.join(self.temp_dir, "grandchild.pid")
+        # Like sudo: forwards SIGTERM to its child, but dies on SIGKILL alone
+        script = (
+            "import signal, subprocess, sys, time\n"
+            "child = subprocess.Popen(['sleep', '30'])\n"
+            f"open({pid_file!r}, 'w').write(str(child.pid))\n"
+            "def relay(signum, frame):\n"
+            "    child.terminate()\n"
+            "    sys.exit(1)\n"
+            "signal.signal(signal.SIGTERM, relay)\n"
+            "time.sleep(30)\n"
+        )
+
+        started = time.monotonic()
+        with patch(
+            "zoom_deep_clean.cancellation._keeps_terminal", return_value=True
+        ), self.assertRaises(subprocess.TimeoutExpired):
+            run_cancellable(
+                [sys.executable, "-c", script], [CancellationToken()], timeout=1
+            )
+
+        # An orphaned grandchild would hold the output pipes for 30 seconds
+        self.assertLess(time.monotonic() - started, 5)
+
+        with open(pid_file) as f:
+            grandchild = int(f.read())
+        self.addCleanup(lambda: _alive(grandchild) and os.kill(grandchild, 9))
+        self.assertTrue(_wait_for(lambda: not _alive(grandchild)))
+
+    def test_completes_normally(self):
+        token = CancellationToken()
+        result = run_cancellable([sys.executable, "-c", "print('zoom.us')"], [token])
+
+        self.assertEqual((result.returncode, result.stdout), (0, "zoom.us\n"))
+
+    def test_already_cancelled_starts_nothing(self):
+        token = CancellationToken()
+        token.cancel()
+        marker = os.path.join(self.temp_dir, "ran")
+
+        with self.assertRaises(CleanupCancelled):
+            run_cancellable(["touch", marker], [token])
+
+        self.assertFalse(os.path.exists(marker))
+
+
+class TestCancellableBackends(unittest.TestCase):
+    """Test commands run inside ``backend.cancellation``"""
+
+    def _assert_cancelled_quickly(self, backend, cmd):
+        token = CancellationToken()
+        timer = _cancel_later(token)
+        with backend.cancellation(token):
+            with self.assertRaises(CleanupCancelled):
+                backend.run(cmd, timeout=30)
+        returned = time.monotonic()
+        timer.join()
+        self.assertLess(returned - token.cancelled_at, MAX_CANCEL_LATENCY)
+        self.assertEqual(backend.cancel_tokens, ())
+
+    @unittest.skipUnless(hasattr(os, "killpg"), "process groups are POSIX only")
+    def test_subprocess_backend(self):
+        self._assert_cancelled_quickly(SubprocessBackend(), ["sleep", "30"])
+
+    def test_replay_latency_is_interrupted(self):
+        backend = ReplayBackend(
+            interactions=[{"args": ["ioreg", "-l"], "returncode": 0}], latency=30
+        )
+        self._assert_cancelled_quickly(backend, ["ioreg", "-l"])
+
+    def test_outside_a_cancellation_block_nothing_changes(self):
+        backend = ReplayBackend(interactions=[])
+        token = CancellationToken()
+        with backend.cancellation(token):
+            pass
+        token.cancel()
+
+        self.assertEqual(backend.run(["true"]).returncode, 127)
+
+    def test_deep_system_cleaner_stops(self):
+        from zoom_deep_clean.deep_system_cleaner import DeepSystemCleaner
+
+        backend = ReplayBackend(interactions=[])
+        token = CancellationToken()
+        token.cancel()
+        cleaner = DeepSystemCleaner(
+            logging.getLogger("test"),
+            dry_run=True,
+            command_backend=backend,
+            cancel_token=token,
+        )
+
+        with self.assertRaises(CleanupCancelled):
+            cleaner.clean_deep_system_artifacts()
+        self.assertEqual(backend.calls, 0)
+
+
+# Runs inside a session whose controlling terminal is a pty
+TERMINAL_HELPER = """
+import json, os, sys
+from zoom_deep_clean.cancellation import CancellationToken
+from zoom_deep_clean.command_backend import SubprocessBackend
+
+os.close(os.open(os.ttyname(0), os.O_RDWR))  # acquire it as controlling tty
+probe = (
+    "import os; fd = os.open('/dev/tty', os.O_RDWR); "
+    "print(os.tcgetpgrp(fd) == os.getpgrp())"
+)
+backend = SubprocessBackend()
+results = {}
+with backend.cancellation(CancellationToken()):
+    for name, args in (("child", [sys.executable, "-c", probe]), ("sudo", [sys.argv[2]])):
+        result = backend.run(args, timeout=10)
+        results[name] = [result.returncode, result.stdout.strip(), result.stderr]
+with open(sys.argv[1], "w") as f:
+    json.dump(results, f)
+"""
+
+
+@unittest.skipUnless(
+    hasattr(os, "openpty") and hasattr(os, "killpg"), "needs POSIX terminals"
+)
+class TestControllingTerminal(unittest.TestCase):
+    """Test that cancellable commands keep the controlling terminal"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_children_can_open_the_terminal_and_sudo_can_prompt(self):
+        import json
+        import subprocess
+
+        # A stand-in for sudo reporting whether it could prompt on /dev/tty
+        sudo = os.path.join(self.temp_dir, "sudo")
+        with open(sudo, "w") as f:
+            f.write(f"#!{sys.executable}\n")
+            f.write(
+                "import os\nfd = os.open('/dev/tty', os.O_RDWR)\n"
+                "print(os.tcgetpgrp(fd) == os.getpgrp())\n"
+            )
+        os.chmod(sudo, 0o755)
+        output = os.path.join(self.temp_dir, "results.json")
+        master, slave = os.openpty()
+        self.addCleanup(os.close, master)
+        try:
+            helper = subprocess.Popen(
+                [sys.executable, "-c", TERMINAL_HELPER, output, sudo],
+                stdin=slave,
+                stdout=slave,
+                stderr=slave,
+                start_new_session=True,
+                cwd=os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+            )
+        finally:
+            os.close(slave)
+        self.assertEqual(helper.wait(30), 0)
+
+        with open(output) as f:
+            results = json.load(f)
+        # Both could open /dev/tty; only sudo is in the foreground group
+        self.assertEqual(results["child"][:2], [0, "False"])
+        self.assertEqual(results["sudo"][:2], [0, "True"])
+
+
+@unittest.skipUnless(hasattr(os, "killpg"), "process groups are POSIX only")
+class TestCleanerCancellation(unittest.TestCase):
+    """Test cancelling run_deep_clean from another thread"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "Lab01")
+        generate_macos_fixture(self.root, file_count=20, users=("alice",))
+        patcher = patch(
+            "zoom_deep_clean.cleaner_enhanced.report_path_for_root",
+            return_value=os.path.join(self.temp_dir, "report.json"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_cancel_stops_running_step_and_later_steps(self):
+        from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
+
+        cleaner = ZoomDeepCleanerEnhanced(
+            log_file=os.path.join(self.temp_dir, "clean.log"),
+            enable_backup=False,
+            dry_run=True,
+            target_root=self.root,
+            command_backend=SubprocessBackend(),
+            step_history_dir=None,
+        )
+        events = []
+        cleaner.progress.subscribe(events.append)
+        slow_step = lambda: cleaner.command_backend.run(["sleep", "30"])
+        results = []
+
+        def run():
+            results.append((cleaner.run_deep_clean(), time.monotonic()))
+
+        with patch.object(cleaner, "remove_zoom_applications", slow_step):
+            thread = threading.Thread(target=run)
+            thread.start()
+            time.sleep(0.3)
+            cleaner.cancel()
+            thread.join(5)
+
+        self.assertFalse(thread.is_alive())
+        success, returned = results[0]
+        self.assertFalse(success)
+        self.assertLess(
+            returned - cleaner.cancel_token.cancelled_at, MAX_CANCEL_LATENCY
+        )
+        self.assertTrue(cleaner.was_cancelled_by_user())
+        started = [e.step for e in events if e.kind == STEP_STARTED]
+        self.assertEqual(started, ["remove_applications"])
+        self.assertEqual(events[-1].kind, RUN_FINISHED)
+        self.assertEqual(events[-1].error, "cancelled")
+        self.assertEqual(cleaner.command_backend.cancel_tokens, ())
+
+
+if __name__ == "__main__":
+    unittest.main()
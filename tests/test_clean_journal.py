@@ -0,0 +1,194 @@
+#!/usr/bin/env python3
+"""
+Tests for the clean journal and delta verification
+Recording run paths and re-checking only them instead of searching the disk
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean.clean_journal import (
+    FOUND,
+    INDEXED,
+    PLACEHOLDER,
+    REMOVED,
+    TARGETED,
+    CleanJournal,
+)
+from zoom_deep_clean.command_backend import ReplayBackend
+from zoom_deep_clean.device_fingerprint_verifier import DeviceFingerprintVerifier
+from zoom_deep_clean.synthetic_fixtures import generate_macos_fixture
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("zoom")
+    return path
+
+
+class TestCleanJournal(unittest.TestCase):
+    """Test recording paths"""
+
+    def test_paths_and_directories(self):
+        journal = CleanJournal()
+        journal.index({"preferences": ["/a/us.zoom.xos.plist"], "caches": []})
+        journal.record(TARGETED, ["/b/zoom.us"])
+        journal.record(REMOVED, ["/b/zoom.us"])
+        journal.record(FOUND, ["/c/d/zoomus.enc.db"])
+        journal.record(PLACEHOLDER, ["/e/zoom.us.db"])
+
+        self.assertEqual(
+            journal.paths(),
+            ["/a/us.zoom.xos.plist", "/b/zoom.us", "/c/d/zoomus.enc.db"],
+        )
+        self.assertEqual(journal.directories(), ["/a", "/b", "/c/d"])
+        self.assertEqual(journal.paths(PLACEHOLDER), ["/e/zoom.us.db"])
+        self.assertEqual(journal.summary()[INDEXED], 1)
+
+        journal.clear()
+        self.assertEqual(len(journal), 0)
+
+    def test_unknown_event(self):
+        with self.assertRaises(ValueError):
+            CleanJournal().record("deleted", ["/a"])
+
+
+class TestDeltaVerification(unittest.TestCase):
+    """Test verifying from a journal"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "Lab01")
+        self.home = os.path.join(self.root, "Users", "alice")
+        self.prefs = os.path.join(self.home, "Library", "Preferences")
+        os.makedirs(self.prefs)
+        self.backend = ReplayBackend(interactions=[])
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _verifier(self):
+        verifier = DeviceFingerprintVerifier(
+            command_backend=self.backend,
+            target_root=self.root,
+            user_home=self.home,
+        )
+        verifier.logger.setLevel(logging.ERROR)
+        return verifier
+
+    def test_only_journal_paths_and_their_directories_are_checked(self):
+        removed = os.path.join(self.prefs, "us.zoom.xos.plist")
+        left = _touch(os.path.join(self.prefs, "us.zoom.Transcode.plist"))
+        reappeared = _touch(os.path.join(self.prefs, "us.zoom.updater.plist"))
+        placeholder = _touch(os.path.join(self.prefs, "zoom.us.db"))
+        _touch(os.path.join(self.prefs, "com.apple.finder.plist"))
+        journal = CleanJournal()
+        journal.record(REMOVED, [removed, placeholder])
+        journal.record(FOUND, [left])
+        journal.record(PLACEHOLDER, [placeholder])
+
+        with patch("builtins.open", side_effect=IOError):  # no report file
+            report = self._verifier().verify_complete_cleanup(journal=journal)
+
+        summary = report["verification_summary"]
+        self.assertEqual(summary["verification_mode"], "delta")
+        self.assertEqual(summary["paths_checked"], 2)
+        self.assertEqual(summary["directories_checked"], 1)
+        self.assertEqual(
+            sorted(report["cleanup_results"]["remaining_items"]), [left, reappeared]
+        )
+        self.assertFalse(summary["device_ready_for_zoom"])
+        # Nothing was searched; the only commands remove what was left
+        self.assertEqual(
+            sorted(args[-1] for args in self.backend.misses), [left, reappeared]
+        )
+        self.assertFalse([args for args in self.backend.misses if "find" in args])
+
+    def test_clean_journal_means_device_ready(self):
+        journal = CleanJournal()
+        journal.record(REMOVED, [os.path.join(self.prefs, "us.zoom.xos.plist")])
+
+        with patch("builtins.open", side_effect=IOError):
+            report = self._verifier().verify_complete_cleanup(journal=journal)
+
+        self.assertEqual(report["verification_summary"]["status"], "complete_cleanup")
+        self.assertTrue(report["verification_summary"]["device_ready_for_zoom"])
+
+
+class TestCleanerJournal(unittest.TestCase):
+    """Test the journal of a cleaner run and the verification mode it selects"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "Lab01")
+        generate_macos_fixture(self.root, file_count=20, users=("alice",))
+        patcher = patch(
+            "zoom_deep_clean.cleaner_enhanced.report_path_for_root",
+            return_value=os.path.join(self.temp_dir, "report.json"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run(self, **options):
+        from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
+
+        backend = ReplayBackend(interactions=[])
+        cleaner = ZoomDeepCleanerEnhanced(
+            log_file=os.path.join(self.temp_dir, "clean.log"),
+            enable_backup=False,
+            dry_run=True,
+            target_root=self.root,
+            command_backend=backend,
+            step_history_dir=None,
+            **options,
+        )
+        captured = {}
+        original = DeviceFingerprintVerifier._generate_verification_report
+
+        def capture(verifier):
+            with patch("builtins.open", side_effect=IOError):
+                captured["report"] = original(verifier)
+            return captured["report"]
+
+        with patch.object(
+            DeviceFingerprintVerifier, "_generate_verification_report", capture
+        ):
+            cleaner.run_deep_clean()
+        # Disk-wide searches run by the verifier (the deep system cleaner
+        # still searches the temp folders it cleans)
+        system_finds = [args for args in backend.misses if args[:2] == ["sudo", "find"]]
+        return cleaner, captured["report"], system_finds
+
+    def test_run_verifies_from_its_journal(self):
+        cleaner, report, system_finds = self._run()
+
+        summary = report["verification_summary"]
+        self.assertEqual(summary["verification_mode"], "delta")
+        self.assertGreater(cleaner.journal.summary()[TARGETED], 0)
+        self.assertEqual(summary["paths_checked"], len(cleaner.journal.paths()))
+        # A dry run leaves every targeted artifact in place
+        self.assertFalse(summary["device_ready_for_zoom"])
+        self.assertNotIn(
+            os.path.join(self.root, "Library"), [args[2] for args in system_finds]
+        )
+
+    def test_full_verification_flag_searches_the_disk(self):
+        _, report, system_finds = self._run(full_verification=True)
+
+        self.assertEqual(report["verification_summary"]["verification_mode"], "full")
+        self.assertNotIn("paths_checked", report["verification_summary"])
+        self.assertIn(
+            os.path.join(self.root, "Library"), [args[2] for args in system_finds]
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
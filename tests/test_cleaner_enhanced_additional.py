@@ -260,7 +260,10 @@ class TestZoomDeepCleanerEnhancedAdvancedFeatures(unittest.TestCase):
             log_file=self.temp_log, dry_run=True, enable_advanced_features=True
         )
 
-        # Verify AdvancedFeatures was instantiated
+        # AdvancedFeatures is instantiated on first use, once
+        mock_advanced_features.assert_not_called()
+        self.assertIs(cleaner.advanced_features, mock_advanced)
+        self.assertIs(cleaner.advanced_features, mock_advanced)
         mock_advanced_features.assert_called_once()
 
     def test_advanced_features_initialization_disabled(self):
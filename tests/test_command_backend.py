@@ -0,0 +1,236 @@
+#!/usr/bin/env python3
+"""
+Tests for the pluggable command backends
+Recording, replay, synthetic latency and injection into the cleaners
+"""
+
+import json
+import logging
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import time
+import unittest
+
+from zoom_deep_clean.command_backend import (
+    CASSETTE_VERSION,
+    CommandBackend,
+    CommandNotRecorded,
+    RecordingBackend,
+    ReplayBackend,
+    SubprocessBackend,
+    backend_from_spec,
+)
+
+PRINT_CMD = [sys.executable, "-c", "print('zoom.us')"]
+FAIL_CMD = [sys.executable, "-c", "import sys; sys.exit(3)"]
+
+
+def _interaction(args, stdout="", returncode=0, duration=0.0, **extra):
+    data = {
+        "args": args,
+        "returncode": returncode,
+        "stdout": stdout,
+        "stderr": "",
+        "duration": duration,
+    }
+    data.update(extra)
+    return data
+
+
+class TestRecordingBackend(unittest.TestCase):
+    """Test recording real executions to a cassette"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cassette = os.path.join(self.temp_dir, "cassettes", "run.json")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_subprocess_backend_runs_command(self):
+        """SubprocessBackend captures text output"""
+        result = SubprocessBackend().run(PRINT_CMD, timeout=30)
+
+        self.assertEqual(result.returncode, 0)
+        self.assertEqual(result.stdout.strip(), "zoom.us")
+
+    def test_record_then_replay_roundtrip(self):
+        """A recorded cassette replays the same results"""
+        with RecordingBackend(self.cassette) as recorder:
+            live_ok = recorder.run(PRINT_CMD, timeout=30)
+            live_fail = recorder.run(FAIL_CMD, timeout=30)
+
+        with open(self.cassette) as f:
+            data = json.load(f)
+        self.assertEqual(data["version"], CASSETTE_VERSION)
+        self.assertEqual(len(data["interactions"]), 2)
+
+        replay = ReplayBackend(self.cassette)
+        replay_ok = replay.run(PRINT_CMD)
+        replay_fail = replay.run(FAIL_CMD)
+
+        self.assertEqual(replay_ok.stdout, live_ok.stdout)
+        self.assertEqual(replay_fail.returncode, live_fail.returncode)
+        self.assertEqual(replay.misses, [])
+
+    def test_check_raises_after_recording(self):
+        """check=True still records the failing interaction"""
+        recorder = RecordingBackend(self.cassette)
+        with self.assertRaises(subprocess.CalledProcessError):
+            recorder.run(FAIL_CMD, timeout=30, check=True)
+
+        self.assertEqual(recorder.interactions[0]["returncode"], 3)
+
+    def test_missing_executable_is_recorded(self):
+        """OSErrors are recorded and re-raised on replay"""
+        recorder = RecordingBackend(self.cassette)
+        with self.assertRaises(FileNotFoundError):
+            recorder.run(["zdce-no-such-tool"])
+        recorder.save()
+
+        with self.assertRaises(FileNotFoundError):
+            ReplayBackend(self.cassette).run(["zdce-no-such-tool"])
+
+
+class TestReplayBackend(unittest.TestCase):
+    """Test deterministic replay"""
+
+    def test_repeated_commands_replay_in_order(self):
+        """Interactions for the same args replay FIFO, then repeat the last"""
+        replay = ReplayBackend(
+            interactions=[
+                _interaction(["ps"], stdout="zoom.us"),
+                _interaction(["ps"], stdout=""),
+            ]
+        )
+
+        outputs = [replay.run(["ps"]).stdout for _ in range(3)]
+
+        self.assertEqual(outputs, ["zoom.us", "", ""])
+        self.assertEqual(replay.calls, 3)
+
+    def test_unrecorded_command(self):
+        """Misses return 127, or raise in strict mode"""
+        replay = ReplayBackend(interactions=[])
+        result = replay.run(["ioreg", "-l"])
+
+        self.assertEqual(result.returncode, 127)
+        self.assertEqual(replay.misses, [["ioreg", "-l"]])
+
+        strict = ReplayBackend(interactions=[], strict=True)
+        with self.assertRaises(CommandNotRecorded):
+            strict.run(["ioreg", "-l"])
+
+    def test_bytes_output_when_text_disabled(self):
+        """text=False returns bytes like subprocess"""
+        replay = ReplayBackend(interactions=[_interaction(["ls"], stdout="a\n")])
+
+        self.assertEqual(replay.run(["ls"], text=False).stdout, b"a\n")
+
+    def test_recorded_latency_and_timeouts(self):
+        """Recorded durations are replayed and honour timeouts"""
+        replay = ReplayBackend(
+            interactions=[_interaction(["slow"], duration=0.2)],
+            latency="recorded",
+            latency_scale=0.5,
+        )
+        start_time = time.perf_counter()
+        replay.run(["slow"])
+        self.assertGreaterEqual(time.perf_counter() - start_time, 0.09)
+
+        with self.assertRaises(subprocess.TimeoutExpired):
+            replay.run(["slow"], timeout=0.01)
+
+    def test_recorded_timeout_replays_as_timeout(self):
+        """A command that timed out while recording times out on replay"""
+        replay = ReplayBackend(
+            interactions=[{"args": ["hang"], "timeout": True, "duration": 1.0}]
+        )
+
+        with self.assertRaises(subprocess.TimeoutExpired):
+            replay.run(["hang"], timeout=1)
+
+    def test_backend_from_spec(self):
+        """Specs select backends and latency modes"""
+        self.assertIsInstance(backend_from_spec(""), SubprocessBackend)
+        with tempfile.NamedTemporaryFile("w", suffix=".json", delete=False) as f:
+            json.dump({"version": CASSETTE_VERSION, "interactions": []}, f)
+        try:
+            self.assertEqual(
+                backend_from_spec(f"replay:{f.name}:recorded").latency, "recorded"
+            )
+            self.assertEqual(backend_from_spec(f"replay:{f.name}:0.05").latency, 0.05)
+        finally:
+            os.unlink(f.name)
+        with self.assertRaises(ValueError):
+            backend_from_spec("bogus")
+
+
+class TestBackendInjection(unittest.TestCase):
+    """Test that the cleaners run their commands through the backend"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_incomplete_backend_cannot_be_created(self):
+        """A backend without run fails when constructed, not on first use"""
+
+        class Incomplete(CommandBackend):
+            pass
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+    def test_deep_system_cleaner_uses_backend(self):
+        """DeepSystemCleaner queries ioreg through the injected backend"""
+        from zoom_deep_clean.deep_system_cleaner import DeepSystemCleaner
+
+        replay = ReplayBackend(
+            interactions=[
+                _interaction(
+                    ["ioreg", "-l"],
+                    stdout='  "IOUserClientCreator" = "pid 42, zoom.us"\n',
+                )
+            ]
+        )
+        cleaner = DeepSystemCleaner(
+            logging.getLogger("test_command_backend"),
+            dry_run=True,
+            command_backend=replay,
+        )
+
+        cleaner._clear_ioreg_zoom_entries()
+
+        self.assertEqual(replay.calls, 1)
+        self.assertEqual(replay.misses, [])
+
+    def test_replay_enables_cleaner_on_any_platform(self):
+        """A replay backend skips the macOS-only guard and answers dry runs"""
+        from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
+
+        replay = ReplayBackend(
+            interactions=[_interaction(["pgrep", "-f", "zoom"], stdout="4242\n")]
+        )
+        cleaner = ZoomDeepCleanerEnhanced(
+            log_file=os.path.join(self.temp_dir, "clean.log"),
+            dry_run=True,
+            enable_backup=False,
+            enable_advanced_features=False,
+            command_backend=replay,
+        )
+
+        success, output = cleaner._run_command(["pgrep", "-f", "zoom"], "Find Zoom")
+
+        self.assertTrue(success)
+        self.assertEqual(output, "4242\n")
+        self.assertIs(cleaner.deep_system_cleaner.command_backend, replay)
+
+
+if __name__ == "__main__":
+    unittest.main()
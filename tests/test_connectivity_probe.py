@@ -0,0 +1,174 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent connectivity prober
+Local listeners over IPv4 and IPv6, the global deadline and the result cache
+"""
+
+import logging
+import socket
+import time
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean.connectivity_probe import (
+    ConnectivityProber,
+    clear_probe_cache,
+)
+
+
+def _listener(family, address):
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.bind((address, 0))
+    sock.listen(16)
+    return sock
+
+
+def _closed_port(family, address):
+    sock = socket.socket(family, socket.SOCK_STREAM)
+    sock.bind((address, 0))
+    port = sock.getsockname()[1]
+    sock.close()
+    return port
+
+
+def _ipv6_available():
+    if not socket.has_ipv6:
+        return False
+    try:
+        _listener(socket.AF_INET6, "::1").close()
+        return True
+    except OSError:
+        return False
+
+
+class TestConnectivityProber(unittest.TestCase):
+    """Test probing local listener sockets"""
+
+    def setUp(self):
+        clear_probe_cache()
+        self.families = [(socket.AF_INET, "127.0.0.1")]
+        if _ipv6_available():
+            self.families.append((socket.AF_INET6, "::1"))
+        self.lookups = []
+        self.fake_hosts = set()
+
+        real_getaddrinfo = socket.getaddrinfo
+
+        def fake_getaddrinfo(host, port, family=0, type=0, *args):
+            self.lookups.append(host)
+            if host.startswith("slow"):
+                time.sleep(1.0)
+            if host.endswith(".test") or host in self.fake_hosts:
+                return [
+                    (fam, socket.SOCK_STREAM, 6, "", (address, 0))
+                    for fam, address in self.families
+                ]
+            return real_getaddrinfo(host, port, family, type, *args)
+
+        patcher = patch("socket.getaddrinfo", side_effect=fake_getaddrinfo)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        clear_probe_cache()
+
+    def test_open_and_closed_ports(self):
+        """Listeners are open and unused ports refused, on every family"""
+        listener = _listener(socket.AF_INET, "127.0.0.1")
+        self.addCleanup(listener.close)
+        open_port = listener.getsockname()[1]
+        if len(self.families) > 1:
+            # Listen on the same port over IPv6 so both families answer
+            try:
+                listener6 = socket.socket(socket.AF_INET6, socket.SOCK_STREAM)
+                self.addCleanup(listener6.close)
+                listener6.bind(("::1", open_port))
+                listener6.listen(16)
+            except OSError:
+                self.families = self.families[:1]
+        closed_port = _closed_port(socket.AF_INET, "127.0.0.1")
+
+        report = ConnectivityProber(deadline=5).run(
+            ["zoom.test"], [open_port, closed_port]
+        )
+
+        self.assertTrue(report.resolutions["zoom.test"].resolved)
+        self.assertEqual(len(report.probes), 2 * len(self.families))
+        self.assertTrue(report.port_open("zoom.test", open_port))
+        self.assertFalse(report.port_open("zoom.test", closed_port))
+        for probe in report.probes_for("zoom.test", open_port):
+            self.assertTrue(probe.open)
+            self.assertGreaterEqual(probe.latency, 0)
+        for probe in report.probes_for("zoom.test", closed_port):
+            self.assertFalse(probe.timed_out)
+            self.assertIsNotNone(probe.error)
+        self.assertEqual(
+            {probe.family for probe in report.probes},
+            {"ipv4", "ipv6"} if len(self.families) > 1 else {"ipv4"},
+        )
+        self.assertFalse(report.deadline_hit)
+
+    def test_hosts_are_resolved_concurrently(self):
+        """Several slow lookups finish in the time of one"""
+        hosts = [f"slow{n}.test" for n in range(5)]
+
+        report = ConnectivityProber(deadline=4).run(hosts)
+
+        self.assertLess(report.elapsed, 3.0)
+        self.assertTrue(all(report.resolutions[host].resolved for host in hosts))
+
+    def test_deadline_marks_unfinished_lookups(self):
+        """Work still pending at the deadline is timed out, not waited for"""
+        report = ConnectivityProber(deadline=0.2).run(["slow.test", "fast.test"])
+
+        self.assertLess(report.elapsed, 0.9)
+        self.assertTrue(report.deadline_hit)
+        self.assertTrue(report.resolutions["slow.test"].timed_out)
+        self.assertTrue(report.resolutions["fast.test"].resolved)
+
+        # Results cut off by the deadline are not cached
+        ConnectivityProber(deadline=0.2).run(["slow.test"])
+        self.assertEqual(self.lookups.count("slow.test"), 2)
+
+    def test_results_are_cached(self):
+        """Repeat runs within the TTL reuse lookups and probes"""
+        listener = _listener(socket.AF_INET, "127.0.0.1")
+        self.addCleanup(listener.close)
+        port = listener.getsockname()[1]
+        prober = ConnectivityProber(families=("ipv4",))
+
+        first = prober.run(["zoom.test"], [port])
+        second = prober.run(["zoom.test"], [port])
+
+        self.assertEqual(first.cached, 0)
+        self.assertEqual(second.cached, 2)
+        self.assertTrue(second.port_open("zoom.test", port))
+        self.assertEqual(self.lookups, ["zoom.test"])
+
+        clear_probe_cache()
+        prober.run(["zoom.test"], [port])
+        ConnectivityProber(cache_ttl=0).run(["other.test"])
+        ConnectivityProber(cache_ttl=0).run(["other.test"])
+        self.assertEqual(self.lookups.count("zoom.test"), 2)
+        self.assertEqual(self.lookups.count("other.test"), 2)
+
+    def test_error_1132_checks_share_lookups(self):
+        """The connectivity and port checks resolve each domain once"""
+        from zoom_deep_clean.error_1132_handler import Error1132Handler
+
+        handler = Error1132Handler(logging.getLogger("test"))
+        handler.prober = ConnectivityProber(deadline=5, connect_timeout=1)
+        self.fake_hosts = set(handler.zoom_domains)
+
+        connectivity = handler._check_zoom_connectivity()
+        ports = handler._check_port_connectivity()
+
+        self.assertTrue(connectivity["all_passed"])
+        self.assertEqual(connectivity["addresses"]["zoom.us"]["ipv4"], ["127.0.0.1"])
+        self.assertEqual(len(ports["ports_tested"]), 6)
+        self.assertEqual(len(ports["ports_open"]) + len(ports["ports_blocked"]), 6)
+        self.assertEqual(sorted(self.lookups), sorted(handler.zoom_domains))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,155 @@
+#!/usr/bin/env python3
+"""
+Tests for concurrent device fingerprint verification checks
+Wall time, deterministic merging, per-check deadlines and timings
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean.command_backend import ReplayBackend
+from zoom_deep_clean.device_fingerprint_verifier import DeviceFingerprintVerifier
+
+TARGET_ROOT_CHECKS = {
+    "user_library": "_check_user_library_files",
+    "system_level": "_check_system_level_files",
+    "launch_agents": "_check_launch_agents",
+    "device_containers": "_check_device_containers",
+    "metadata_indexes": "_check_metadata_indexes",
+    "browser_data": "_check_browser_data",
+    "log_files": "_check_log_files",
+}
+
+
+class TestConcurrentChecks(unittest.TestCase):
+    """Test running the verification checks on a pool"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "Lab01")
+        self.home = os.path.join(self.root, "Users", "alice")
+        os.makedirs(os.path.join(self.home, "Library"))
+        self.verifier = DeviceFingerprintVerifier(
+            command_backend=ReplayBackend(interactions=[]),
+            dry_run=True,
+            target_root=self.root,
+            user_home=self.home,
+        )
+        self.verifier.logger.setLevel(logging.ERROR)
+        self.release = threading.Event()
+        self.addCleanup(self.release.set)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _replace_checks(self, make_check):
+        for index, (name, method) in enumerate(TARGET_ROOT_CHECKS.items()):
+            setattr(self.verifier, method, make_check(index, name))
+
+    def _verify(self):
+        with patch("builtins.open", side_effect=IOError):  # no report file
+            return self.verifier.verify_complete_cleanup()
+
+    def test_wall_time_follows_the_slowest_check(self):
+        def make_check(index, name):
+            delay = 0.4 if name == "system_level" else 0.2
+            return lambda results: time.sleep(delay)
+
+        self._replace_checks(make_check)
+
+        started = time.monotonic()
+        report = self._verify()
+        elapsed = time.monotonic() - started
+
+        # Sequentially the checks take 1.6 s
+        self.assertLess(elapsed, 0.9)
+        timings = report["check_timings"]
+        self.assertEqual(set(timings), set(TARGET_ROOT_CHECKS) | {"total"})
+        self.assertGreaterEqual(timings["system_level"], 0.4)
+        self.assertLess(timings["total"], 0.9)
+
+    def test_results_merge_in_check_order(self):
+        """Later checks finish first, yet items keep the order checks are listed"""
+
+        def make_check(index, name):
+            def check(results):
+                time.sleep(0.05 * (len(TARGET_ROOT_CHECKS) - index))
+                results["remaining_items"].append(name)
+                results["findings"].append(f"{name} finding")
+
+            return check
+
+        self._replace_checks(make_check)
+
+        report = self._verify()
+
+        results = report["cleanup_results"]
+        self.assertEqual(results["remaining_items"], list(TARGET_ROOT_CHECKS))
+        self.assertEqual(
+            results["informational_findings"],
+            [f"{name} finding" for name in TARGET_ROOT_CHECKS],
+        )
+        self.assertEqual(report["verification_summary"]["incomplete_checks"], [])
+
+    def test_check_past_its_deadline_leaves_verification_incomplete(self):
+        def make_check(index, name):
+            if name == "metadata_indexes":
+                return lambda results: self.release.wait(5)
+            return lambda results: results["remaining_items"].append(name)
+
+        self._replace_checks(make_check)
+        self.verifier.check_deadlines["metadata_indexes"] = 0.1
+
+        started = time.monotonic()
+        report = self._verify()
+
+        self.assertLess(time.monotonic() - started, 2)
+        summary = report["verification_summary"]
+        self.assertEqual(summary["incomplete_checks"], ["metadata_indexes"])
+        self.assertEqual(summary["status"], "verification_incomplete")
+        self.assertFalse(summary["device_ready_for_zoom"])
+        self.assertIn(
+            "Verification check metadata_indexes did not complete: Timed out after 0.1s",
+            report["cleanup_results"]["informational_findings"],
+        )
+        # The other checks' items are still reported
+        self.assertEqual(summary["remaining_items_count"], len(TARGET_ROOT_CHECKS) - 1)
+
+    def test_failing_check_does_not_stop_the_others(self):
+        def make_check(index, name):
+            if name == "browser_data":
+                return lambda results: 1 / 0
+            return lambda results: None
+
+        self._replace_checks(make_check)
+
+        report = self._verify()
+
+        summary = report["verification_summary"]
+        self.assertEqual(summary["incomplete_checks"], ["browser_data"])
+        self.assertFalse(summary["device_ready_for_zoom"])
+        self.assertIn("check_timings", report)
+
+    def test_check_called_alone_records_into_the_results(self):
+        agents = os.path.join(self.root, "Library", "LaunchAgents")
+        os.makedirs(agents)
+        agent = os.path.join(agents, "us.zoom.updater.plist")
+        args = ["find", agents, "-name", "*zoom*", "-o", "-name", "*Zoom*"]
+        args += ["-o", "-name", "*us.zoom*"]
+        self.verifier.command_backend = ReplayBackend(
+            interactions=[{"args": args, "stdout": agent + "\n", "returncode": 0}]
+        )
+
+        self.verifier._check_launch_agents()
+
+        self.assertEqual(self.verifier.verification_results["remaining_items"], [agent])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,222 @@
+#!/usr/bin/env python3
+"""
+Tests for the concurrent diagnostic runner
+Deadlines, streamed outcomes, timings and the Error 1132 diagnostic
+"""
+
+import logging
+import subprocess
+import threading
+import time
+import unittest
+from unittest.mock import Mock, patch
+
+from zoom_deep_clean.diagnostic_runner import (
+    STATUS_ERROR,
+    STATUS_OK,
+    STATUS_TIMEOUT,
+    DiagnosticRunner,
+    validate_sudo,
+)
+
+
+def _sleeper(seconds, value=None):
+    def check():
+        time.sleep(seconds)
+        return value
+
+    return check
+
+
+class TestDiagnosticRunner(unittest.TestCase):
+    """Test running checks concurrently"""
+
+    def test_checks_run_concurrently(self):
+        """Total wall time is that of the slowest check, not the sum"""
+        runner = DiagnosticRunner(
+            [(f"check{n}", _sleeper(0.3, n)) for n in range(5)], default_deadline=5
+        )
+
+        run = runner.run()
+
+        self.assertLess(run.elapsed, 1.0)
+        self.assertEqual(list(run.outcomes), [f"check{n}" for n in range(5)])
+        for n in range(5):
+            outcome = run.outcomes[f"check{n}"]
+            self.assertEqual((outcome.status, outcome.result), (STATUS_OK, n))
+            self.assertGreaterEqual(outcome.elapsed, 0.25)
+
+    def test_outcomes_stream_as_they_finish(self):
+        """Fast checks reach the caller before slow ones finish"""
+        release = threading.Event()
+        runner = DiagnosticRunner(
+            [("slow", lambda: release.wait(5)), ("fast", lambda: "done")]
+        )
+        seen = []
+
+        for outcome in runner.iter_outcomes():
+            seen.append(outcome.name)
+            release.set()
+
+        self.assertEqual(seen, ["fast", "slow"])
+
+    def test_deadline_marks_check_timed_out(self):
+        """A check past its deadline is reported without waiting for it"""
+        runner = DiagnosticRunner(
+            [("hung", _sleeper(2.0, "late")), ("quick", _sleeper(0.05, "ok"))],
+            deadlines={"hung": 0.2},
+            default_deadline=5,
+        )
+
+        started = time.monotonic()
+        run = runner.run()
+
+        self.assertLess(time.monotonic() - started, 1.0)
+        hung = run.outcomes["hung"]
+        self.assertEqual(hung.status, STATUS_TIMEOUT)
+        self.assertTrue(hung.timed_out)
+        self.assertIsNone(hung.result)
+        self.assertIn("0.2s", hung.error)
+        self.assertEqual(run.outcomes["quick"].status, STATUS_OK)
+        self.assertEqual(run.timed_out, ["hung"])
+
+    def test_abandoned_check_does_not_block_exit(self):
+        """Checks run on daemon threads, which are not joined at exit"""
+        release = threading.Event()
+        self.addCleanup(release.set)
+        threads = []
+
+        def hung():
+            threads.append(threading.current_thread())
+            release.wait(5)
+
+        run = DiagnosticRunner([("hung", hung)], default_deadline=0.1).run()
+
+        self.assertEqual(run.timed_out, ["hung"])
+        self.assertTrue(threads[0].daemon)
+        self.assertTrue(threads[0].is_alive())
+
+    def test_failing_check(self):
+        """Exceptions are reported as errors, other checks carry on"""
+
+        def broken():
+            raise RuntimeError("pfctl exploded")
+
+        run = DiagnosticRunner([("broken", broken), ("fine", lambda: 1)]).run()
+
+        self.assertEqual(run.outcomes["broken"].status, STATUS_ERROR)
+        self.assertEqual(run.outcomes["broken"].error, "pfctl exploded")
+        self.assertEqual(run.outcomes["fine"].result, 1)
+
+    def test_timings(self):
+        """Wall time is reported per check and overall"""
+        run = DiagnosticRunner([("a", _sleeper(0.1)), ("b", lambda: None)]).run()
+
+        timings = run.timings()
+
+        self.assertEqual(set(timings), {"a", "b", "total"})
+        self.assertGreaterEqual(timings["a"], 0.09)
+        self.assertGreaterEqual(timings["total"], timings["a"])
+
+
+class TestValidateSudo(unittest.TestCase):
+    """Test validating sudo once before checks fan out"""
+
+    def _validate(self, returncodes, tty):
+        run = Mock(side_effect=[Mock(returncode=code) for code in returncodes])
+        with patch("subprocess.run", run), patch("sys.stdin") as stdin:
+            stdin.isatty.return_value = tty
+            return validate_sudo(), [call.args[0] for call in run.call_args_list]
+
+    def test_cached_credentials_do_not_prompt(self):
+        self.assertEqual(self._validate([0], tty=True), (True, [["sudo", "-n", "-v"]]))
+
+    def test_prompts_once_on_a_terminal(self):
+        self.assertEqual(
+            self._validate([1, 0], tty=True),
+            (True, [["sudo", "-n", "-v"], ["sudo", "-v"]]),
+        )
+
+    def test_never_prompts_without_a_terminal(self):
+        self.assertEqual(
+            self._validate([1], tty=False), (False, [["sudo", "-n", "-v"]])
+        )
+
+    def test_missing_sudo(self):
+        with patch("subprocess.run", side_effect=FileNotFoundError("sudo")):
+            self.assertFalse(validate_sudo())
+
+    def test_prompt_timeout(self):
+        with patch(
+            "subprocess.run", side_effect=subprocess.TimeoutExpired(["sudo"], 1)
+        ):
+            self.assertFalse(validate_sudo())
+
+
+class TestError1132Diagnostic(unittest.TestCase):
+    """Test Error1132Handler running its checks through the runner"""
+
+    def setUp(self):
+        from zoom_deep_clean.error_1132_handler import Error1132Handler
+
+        self.handler = Error1132Handler(logging.getLogger("test"))
+        checks = {
+            "_check_zoom_connectivity": {"all_passed": True},
+            "_check_firewall_rules": {"zoom_rules_found": False},
+            "_check_proxy_settings": {"has_proxies": False},
+            "_check_zoom_logs": {"error_1132_found": False},
+            "_check_network_configuration": {},
+            "_check_port_connectivity": {"all_passed": True},
+            "_check_advanced_network_diagnostics": {"ping_results": {}},
+        }
+        for method, result in checks.items():
+            patcher = patch.object(
+                type(self.handler), method, side_effect=_sleeper(0.2, result)
+            )
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        patcher = patch(
+            "zoom_deep_clean.error_1132_handler.validate_sudo", return_value=True
+        )
+        self.validate_sudo = patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def test_checks_run_concurrently(self):
+        """Seven checks of 0.2s finish in well under their summed time"""
+        streamed = []
+
+        results = self.handler.diagnose_error_1132(on_result=streamed.append)
+
+        self.assertLess(results["check_timings"]["total"], 1.0)
+        self.assertEqual(len(streamed), 7)
+        self.assertEqual(results["timed_out_checks"], [])
+        self.assertEqual(results["firewall"], {"zoom_rules_found": False})
+
+    def test_sudo_is_validated_once_before_the_checks(self):
+        order = []
+        self.validate_sudo.side_effect = lambda: order.append("sudo") or True
+        type(self.handler)._check_firewall_rules.side_effect = (
+            lambda: order.append("firewall") or {}
+        )
+
+        self.handler.diagnose_error_1132()
+
+        self.assertEqual(order, ["sudo", "firewall"])
+
+    def test_timed_out_check_in_report(self):
+        """Timed-out checks are marked in the results and the report"""
+        self.handler.check_deadlines["proxy"] = 0.05
+
+        results = self.handler.diagnose_error_1132()
+        report = self.handler.generate_error_1132_report(results)
+
+        self.assertEqual(results["timed_out_checks"], ["proxy"])
+        self.assertTrue(results["proxy"]["timed_out"])
+        self.assertIn("⏰ Check did not finish in time", report)
+        self.assertIn("proxy: ", report)
+        self.assertIn("(timed out)", report)
+        self.assertIn("Overall:", report)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,212 @@
+#!/usr/bin/env python3
+"""
+Tests for the resumable range download engine
+Parallel ranges, resuming .part files, streaming hashes and the installer
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from zoom_deep_clean import download_engine
+from zoom_deep_clean.download_engine import (
+    PART_SUFFIX,
+    STATE_SUFFIX,
+    DownloadEngine,
+    download_file,
+)
+
+
+class _RangeHandler(BaseHTTPRequestHandler):
+    """Serves ``server.payload`` with optional Range support and drops"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        server = self.server
+        payload = server.payload
+        etag = f'"{hashlib.md5(payload).hexdigest()}"'
+        server.requests.append(self.headers.get("Range"))
+
+        start, end, status = 0, len(payload) - 1, 200
+        range_header = self.headers.get("Range")
+        if_range = self.headers.get("If-Range")
+        if server.ranges and range_header and if_range in (None, etag):
+            first, _, last = range_header[len("bytes=") :].partition("-")
+            start, end, status = int(first), int(last or end), 206
+
+        self.send_response(status)
+        self.send_header("Content-Length", str(end - start + 1))
+        self.send_header("ETag", etag)
+        if status == 206:
+            self.send_header("Content-Range", f"bytes {start}-{end}/{len(payload)}")
+        self.end_headers()
+
+        body = payload[start : end + 1]
+        if server.drop_after is not None and len(body) > 1:
+            body = body[: server.drop_after]
+        with server.lock:
+            server.bytes_sent += len(body)
+        self.wfile.write(body)
+
+
+class TestDownloadEngine(unittest.TestCase):
+    """Test downloads from a local HTTP server"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.dest = os.path.join(self.temp_dir, "ZoomInstaller.pkg")
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _RangeHandler)
+        self.server.daemon_threads = True
+        self.server.payload = os.urandom(1024 * 1024 + 123)
+        self.server.ranges = True
+        self.server.drop_after = None
+        self.server.requests = []
+        self.server.bytes_sent = 0
+        self.server.lock = threading.Lock()
+        thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+        thread.start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/zoom.pkg"
+
+        # Small segments so a 1 MiB payload is split across connections
+        patcher = patch.object(download_engine, "MIN_SEGMENT_SIZE", 64 * 1024)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _engine(self, **options):
+        options.setdefault("chunk_size", 64 * 1024)
+        options.setdefault("timeout", 5)
+        return DownloadEngine(**options)
+
+    def _read(self, path):
+        with open(path, "rb") as f:
+            return f.read()
+
+    def test_parallel_ranges(self):
+        """Segments are fetched over several connections and reassembled"""
+        result = self._engine(connections=4).download(self.url, self.dest)
+
+        self.assertIsNone(result.error)
+        self.assertEqual(self._read(self.dest), self.server.payload)
+        self.assertEqual(result.sha256, hashlib.sha256(self.server.payload).hexdigest())
+        self.assertEqual(result.connections, 4)
+        self.assertEqual(result.size, len(self.server.payload))
+        self.assertEqual(result.bytes_transferred, len(self.server.payload))
+        self.assertGreater(result.throughput, 0)
+        # one probe plus one request per segment
+        self.assertEqual(len(self.server.requests), 5)
+        self.assertFalse(os.path.exists(self.dest + PART_SUFFIX))
+        self.assertFalse(os.path.exists(self.dest + STATE_SUFFIX))
+
+    def test_resume_after_dropped_connections(self):
+        """An interrupted download continues from its .part file"""
+        self.server.drop_after = 100 * 1024
+
+        failed = self._engine(connections=4, retries=0).download(self.url, self.dest)
+
+        self.assertIsNotNone(failed.error)
+        self.assertTrue(os.path.exists(self.dest + PART_SUFFIX))
+        self.assertTrue(os.path.exists(self.dest + STATE_SUFFIX))
+        self.assertFalse(os.path.exists(self.dest))
+
+        self.server.drop_after = None
+        sent_before = self.server.bytes_sent
+        result = self._engine(connections=4).download(self.url, self.dest)
+
+        self.assertIsNone(result.error)
+        self.assertEqual(self._read(self.dest), self.server.payload)
+        self.assertEqual(result.sha256, hashlib.sha256(self.server.payload).hexdigest())
+        self.assertGreater(result.resumed_bytes, 0)
+        self.assertEqual(
+            result.resumed_bytes + result.bytes_transferred, len(self.server.payload)
+        )
+        # only the missing bytes (plus the probe byte) were sent again
+        self.assertEqual(
+            self.server.bytes_sent - sent_before, result.bytes_transferred + 1
+        )
+
+    def test_retries_resume_within_one_call(self):
+        """Dropped segments are retried from where they stopped"""
+        self.server.drop_after = 200 * 1024
+
+        result = self._engine(connections=2, retries=10).download(self.url, self.dest)
+
+        self.assertIsNone(result.error)
+        self.assertEqual(self._read(self.dest), self.server.payload)
+
+    def test_changed_file_restarts(self):
+        """Progress recorded for an older version of the file is discarded"""
+        self.server.drop_after = 100 * 1024
+        self._engine(connections=4, retries=0).download(self.url, self.dest)
+
+        self.server.drop_after = None
+        self.server.payload = os.urandom(len(self.server.payload))
+        result = self._engine(connections=4).download(self.url, self.dest)
+
+        self.assertIsNone(result.error)
+        self.assertEqual(result.resumed_bytes, 0)
+        self.assertEqual(self._read(self.dest), self.server.payload)
+
+    def test_server_without_ranges(self):
+        """A single streamed connection is used when ranges are unsupported"""
+        self.server.ranges = False
+
+        result = download_file(self.url, self.dest, chunk_size=64 * 1024)
+
+        self.assertIsNone(result.error)
+        self.assertEqual(result.connections, 1)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertEqual(result.sha256, hashlib.sha256(self.server.payload).hexdigest())
+
+    def test_hash_mismatch(self):
+        """A download whose hash does not match is discarded"""
+        result = self._engine().download(self.url, self.dest, expected_sha256="0" * 64)
+
+        self.assertIn("SHA-256 mismatch", result.error)
+        self.assertFalse(os.path.exists(self.dest))
+        self.assertFalse(os.path.exists(self.dest + PART_SUFFIX))
+
+    def test_hash_is_not_read_back_for_a_single_segment(self):
+        """Data arriving in order is hashed from memory only"""
+        with patch.object(os, "pread", side_effect=AssertionError) as pread:
+            result = self._engine(connections=1).download(self.url, self.dest)
+
+        self.assertIsNone(result.error)
+        pread.assert_not_called()
+
+    def test_installer_uses_engine(self):
+        """ZoomInstaller downloads through the engine and logs throughput"""
+        from zoom_deep_clean.zoom_installer_builtin import ZoomInstaller
+
+        installer = ZoomInstaller(
+            logging.getLogger("test"), temp_dir=self.temp_dir, cache_dir=None
+        )
+        with patch.dict(ZoomInstaller.ZOOM_URLS, {"client": self.url}), patch.object(
+            ZoomInstaller, "_verify_download", return_value=True
+        ), self.assertLogs("test", level="INFO") as logs:
+            path = installer.download_zoom()
+
+        self.assertEqual(path, os.path.join(self.temp_dir, "zoom.pkg"))
+        self.assertEqual(self._read(path), self.server.payload)
+        self.assertEqual(
+            installer.download_sha256, hashlib.sha256(self.server.payload).hexdigest()
+        )
+        self.assertTrue(any("MB/s" in line for line in logs.output))
+        progress = [line for line in logs.output if "Download progress" in line]
+        self.assertTrue(1 <= len(progress) <= 10)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -18,6 +18,7 @@ from pathlib import Path
 # Add parent directory to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
+from zoom_deep_clean.connectivity_probe import clear_probe_cache
 from zoom_deep_clean.error_1132_handler import Error1132Handler
 
 
@@ -52,12 +53,18 @@ class TestError1132Diagnostics(unittest.TestCase):
     def setUp(self):
         self.logger = logging.getLogger("test")
         self.handler = Error1132Handler(self.logger)
+        clear_probe_cache()
 
-    @patch("socket.gethostbyname")
-    def test_check_zoom_connectivity_success(self, mock_gethostbyname):
+    def tearDown(self):
+        clear_probe_cache()
+
+    @patch("socket.getaddrinfo")
+    def test_check_zoom_connectivity_success(self, mock_getaddrinfo):
         """Test successful Zoom connectivity check"""
         # Mock successful DNS resolution
-        mock_gethostbyname.return_value = "1.2.3.4"
+        mock_getaddrinfo.return_value = [
+            (socket.AF_INET, socket.SOCK_STREAM, 6, "", ("1.2.3.4", 0))
+        ]
 
         results = self.handler._check_zoom_connectivity()
 
@@ -72,11 +79,11 @@ class TestError1132Diagnostics(unittest.TestCase):
         )
         self.assertEqual(len(results["domains_failed"]), 0)
 
-    @patch("socket.gethostbyname")
-    def test_check_zoom_connectivity_failure(self, mock_gethostbyname):
+    @patch("socket.getaddrinfo")
+    def test_check_zoom_connectivity_failure(self, mock_getaddrinfo):
         """Test failed Zoom connectivity check"""
         # Mock failed DNS resolution
-        mock_gethostbyname.side_effect = socket.gaierror("DNS resolution failed")
+        mock_getaddrinfo.side_effect = socket.gaierror("DNS resolution failed")
 
         results = self.handler._check_zoom_connectivity()
 
@@ -257,6 +264,7 @@ class TestError1132Integration(unittest.TestCase):
         self.logger = logging.getLogger("test")
         self.handler = Error1132Handler(self.logger)
 
+    @patch("zoom_deep_clean.error_1132_handler.validate_sudo", return_value=True)
     @patch.object(Error1132Handler, "_check_zoom_connectivity")
     @patch.object(Error1132Handler, "_check_firewall_rules")
     @patch.object(Error1132Handler, "_check_proxy_settings")
@@ -273,6 +281,7 @@ class TestError1132Integration(unittest.TestCase):
         mock_proxy,
         mock_firewall,
         mock_connectivity,
+        mock_validate_sudo,
     ):
         """Test complete Error 1132 diagnostic"""
         # Mock all diagnostic functions
@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Tests for the content-addressed installer cache
+Conditional revalidation, offline use, pruning and memoised verification
+"""
+
+import hashlib
+import logging
+import os
+import shutil
+import tempfile
+import threading
+import unittest
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from unittest.mock import patch
+
+from zoom_deep_clean import installer_cache
+from zoom_deep_clean.download_engine import DownloadEngine, DownloadResult
+from zoom_deep_clean.installer_cache import (
+    MODIFIED,
+    NOT_MODIFIED,
+    OFFLINE,
+    InstallerCache,
+)
+
+
+class _ConditionalHandler(BaseHTTPRequestHandler):
+    """Serves ``server.payload`` with an ETag and answers revalidation"""
+
+    def log_message(self, *args):
+        pass
+
+    def do_GET(self):
+        payload = self.server.payload
+        etag = f'"{hashlib.md5(payload).hexdigest()}"'
+        self.server.requests.append(dict(self.headers))
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Length", str(len(payload)))
+        self.send_header("ETag", etag)
+        self.end_headers()
+        self.wfile.write(payload)
+
+
+class TestInstallerCache(unittest.TestCase):
+    """Test fetching installers through the cache"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.cache_dir = os.path.join(self.temp_dir, "cache")
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), _ConditionalHandler)
+        self.server.daemon_threads = True
+        self.server.payload = os.urandom(256 * 1024)
+        self.server.requests = []
+        threading.Thread(target=self.server.serve_forever, daemon=True).start()
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/Zoom.pkg"
+        self.engine = DownloadEngine(timeout=5)
+
+    def tearDown(self):
+        self._stop_server()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _stop_server(self):
+        if self.server is not None:
+            self.server.shutdown()
+            self.server.server_close()
+            self.server = None
+
+    def _sha(self, data):
+        return hashlib.sha256(data).hexdigest()
+
+    def test_blobs_are_content_addressed(self):
+        """A download is stored under its SHA-256 and indexed by URL"""
+        cached = InstallerCache(self.cache_dir).fetch(self.url, self.engine)
+
+        self.assertIsNone(cached.error)
+        self.assertFalse(cached.from_cache)
+        self.assertEqual(cached.sha256, self._sha(self.server.payload))
+        self.assertEqual(
+            cached.path,
+            os.path.join(self.cache_dir, "blobs", f"{cached.sha256}.pkg"),
+        )
+        with open(cached.path, "rb") as f:
+            self.assertEqual(f.read(), self.server.payload)
+        self.assertEqual(os.listdir(os.path.join(self.cache_dir, "downloads")), [])
+
+    def test_unchanged_installer_is_not_downloaded_again(self):
+        """A 304 answer to the conditional GET serves the cached blob"""
+        first = InstallerCache(self.cache_dir).fetch(self.url, self.engine)
+        self.server.requests.clear()
+
+        second = InstallerCache(self.cache_dir).fetch(self.url, self.engine)
+
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.revalidation, NOT_MODIFIED)
+        self.assertEqual(second.path, first.path)
+        self.assertIsNone(second.download)
+        self.assertEqual(len(self.server.requests), 1)
+        self.assertIn("If-None-Match", self.server.requests[0])
+
+    def test_changed_installer_replaces_blob(self):
+        """A new version is downloaded and the old blob pruned"""
+        cache = InstallerCache(self.cache_dir)
+        first = cache.fetch(self.url, self.engine)
+        self.server.payload = os.urandom(256 * 1024)
+
+        second = cache.fetch(self.url, self.engine)
+
+        self.assertEqual(second.revalidation, MODIFIED)
+        self.assertFalse(second.from_cache)
+        self.assertEqual(second.sha256, self._sha(self.server.payload))
+        self.assertFalse(os.path.exists(first.path))
+        self.assertEqual(cache.lookup(self.url)["sha256"], second.sha256)
+
+    def test_offline_uses_cached_installer(self):
+        """Without a network, the last known installer is still served"""
+        cache = InstallerCache(self.cache_dir)
+        first = cache.fetch(self.url, self.engine)
+        self._stop_server()
+
+        second = cache.fetch(self.url, self.engine)
+
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.revalidation, OFFLINE)
+        self.assertEqual(second.path, first.path)
+
+    def test_expected_hash_mismatch_downloads_again(self):
+        """A cached blob with a different hash than expected is not used"""
+        cache = InstallerCache(self.cache_dir)
+        cache.fetch(self.url, self.engine)
+
+        cached = cache.fetch(self.url, self.engine, expected_sha256="0" * 64)
+
+        self.assertIn("SHA-256 mismatch", cached.error)
+        self.assertIsNone(cached.revalidation)
+
+    def test_modified_blob_is_downloaded_again(self):
+        """A blob rewritten in the cache is not served under its old hash"""
+        cache = InstallerCache(self.cache_dir)
+        first = cache.fetch(self.url, self.engine)
+        with open(first.path, "r+b") as f:
+            f.write(b"tampered")
+
+        second = cache.fetch(self.url, self.engine)
+
+        self.assertFalse(second.from_cache)
+        self.assertIsNone(second.revalidation)
+        self.assertEqual(second.path, first.path)
+        with open(second.path, "rb") as f:
+            self.assertEqual(f.read(), self.server.payload)
+
+    def test_touched_blob_is_rehashed_once(self):
+        """A blob with new metadata but the same content is still served"""
+        cache = InstallerCache(self.cache_dir)
+        first = cache.fetch(self.url, self.engine)
+        os.utime(first.path, (1, 1))
+
+        with patch(
+            "zoom_deep_clean.installer_cache._sha256_file",
+            wraps=installer_cache._sha256_file,
+        ) as rehash:
+            second = cache.fetch(self.url, self.engine)
+            third = cache.fetch(self.url, self.engine)
+
+        self.assertTrue(second.from_cache and third.from_cache)
+        self.assertEqual(rehash.call_count, 1)
+
+    def test_concurrent_prune_never_sees_a_stored_blob_unindexed(self):
+        """A blob is moved into the cache and indexed under one lock"""
+        payload = b"installer"
+        download = os.path.join(self.temp_dir, "Zoom.pkg.part")
+        with open(download, "wb") as f:
+            f.write(payload)
+        result = DownloadResult(
+            url=self.url, path=download, size=len(payload), sha256=self._sha(payload)
+        )
+        other = InstallerCache(self.cache_dir)
+        pruned, threads = [], []
+        real_replace = os.replace
+
+        def replace_then_prune(source, destination):
+            real_replace(source, destination)
+            if destination.endswith(".pkg"):
+                # Another process prunes right after the blob lands
+                thread = threading.Thread(target=lambda: pruned.append(other.prune()))
+                thread.start()
+                thread.join(0.2)
+                threads.append(thread)
+
+        with patch(
+            "zoom_deep_clean.installer_cache.os.replace", side_effect=replace_then_prune
+        ):
+            blob = InstallerCache(self.cache_dir).store(self.url, result)
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(pruned, [0])
+        self.assertTrue(os.path.isfile(blob))
+
+    def test_cache_works_without_file_locking(self):
+        """Without fcntl the index is still read and written"""
+        with patch.object(installer_cache, "fcntl", None):
+            cache = InstallerCache(self.cache_dir)
+            first = cache.fetch(self.url, self.engine)
+            second = cache.fetch(self.url, self.engine)
+
+        self.assertIsNone(first.error)
+        self.assertTrue(second.from_cache)
+        self.assertEqual(second.path, first.path)
+        self.assertEqual(cache.lookup(self.url)["sha256"], first.sha256)
+
+    def test_verdicts(self):
+        """Verdicts are stored per hash and survive new cache instances"""
+        InstallerCache(self.cache_dir).record_verdict("ab" * 32, True, "valid")
+
+        verdict = InstallerCache(self.cache_dir).verdict("ab" * 32)
+
+        self.assertEqual((verdict["verified"], verdict["detail"]), (True, "valid"))
+        self.assertIsNone(InstallerCache(self.cache_dir).verdict("cd" * 32))
+
+    def test_installer_reuses_cache_and_verdicts(self):
+        """Repeated installs neither download nor verify the package again"""
+        from zoom_deep_clean.zoom_installer_builtin import ZoomInstaller
+
+        def installer():
+            return ZoomInstaller(
+                logging.getLogger("test"),
+                temp_dir=self.temp_dir,
+                cache_dir=self.cache_dir,
+            )
+
+        with patch.dict(ZoomInstaller.ZOOM_URLS, {"client": self.url}), patch.object(
+            ZoomInstaller,
+            "_check_package",
+            return_value=(True, "valid Zoom package"),
+        ) as check:
+            first = installer()
+            path = first.download_zoom()
+            first.cleanup_downloads()
+            self.server.requests.clear()
+            second_path = installer().download_zoom()
+
+        self.assertEqual(path, second_path)
+        self.assertTrue(os.path.exists(path))
+        self.assertEqual(check.call_count, 1)
+        self.assertEqual(len(self.server.requests), 1)
+
+    def test_verdict_is_not_trusted_for_a_replaced_blob(self):
+        """A package swapped into the cache is verified before it is used"""
+        from zoom_deep_clean.zoom_installer_builtin import ZoomInstaller
+
+        with patch.dict(ZoomInstaller.ZOOM_URLS, {"client": self.url}), patch.object(
+            ZoomInstaller,
+            "_check_package",
+            return_value=(True, "valid Zoom package"),
+        ) as check:
+            first = ZoomInstaller(
+                logging.getLogger("test"),
+                temp_dir=self.temp_dir,
+                cache_dir=self.cache_dir,
+            )
+            path = first.download_zoom()
+            first.cleanup_downloads()
+            replacement = path + ".new"
+            with open(replacement, "wb") as f:
+                f.write(b"not the verified package")
+            os.replace(replacement, path)
+
+            second = ZoomInstaller(
+                logging.getLogger("test"),
+                temp_dir=self.temp_dir,
+                cache_dir=self.cache_dir,
+            )
+            self.assertEqual(second.download_zoom(), path)
+
+        with open(path, "rb") as f:
+            self.assertEqual(f.read(), self.server.payload)
+        self.assertEqual(check.call_count, 1)  # same content: verdict reused
+
+    def test_failed_checks_are_not_memoised(self):
+        """A verification that could not run is retried next time"""
+        from zoom_deep_clean.zoom_installer_builtin import ZoomInstaller
+
+        installer = ZoomInstaller(
+            logging.getLogger("test"), temp_dir=self.temp_dir, cache_dir=self.cache_dir
+        )
+        with patch.dict(ZoomInstaller.ZOOM_URLS, {"client": self.url}), patch.object(
+            ZoomInstaller, "_check_package", return_value=(False, None)
+        ):
+            self.assertIsNone(installer.download_zoom())
+
+        self.assertIsNone(
+            installer.installer_cache.verdict(self._sha(self.server.payload))
+        )
+        self.assertIsNone(installer.installer_cache.lookup(self.url))
+
+
+if __name__ == "__main__":
+    unittest.main()
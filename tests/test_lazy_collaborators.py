@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy collaborators of ZoomDeepCleanerEnhanced
+Advanced features, deep system cleaner, backup dir and compatibility probe
+"""
+
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean import cleaner_enhanced
+from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
+from zoom_deep_clean.command_backend import ReplayBackend
+
+
+class TestLazyCollaborators(unittest.TestCase):
+    """Test that the cleaner only builds what callers touch"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.backup_dir = os.path.join(self.temp_dir, "backup")
+        self.backup_patch = patch.object(
+            cleaner_enhanced, "BACKUP_DIR", self.backup_dir
+        )
+        self.backup_patch.start()
+
+    def tearDown(self):
+        self.backup_patch.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _cleaner(self, **kwargs):
+        return ZoomDeepCleanerEnhanced(
+            log_file=os.path.join(self.temp_dir, "clean.log"),
+            command_backend=ReplayBackend(interactions=[]),
+            **kwargs,
+        )
+
+    def test_report_only_use_builds_nothing(self):
+        """generate_report needs no collaborator and no backup dir"""
+        with patch.object(
+            cleaner_enhanced, "AdvancedFeatures"
+        ) as advanced, patch.object(cleaner_enhanced, "DeepSystemCleaner") as deep:
+            cleaner = self._cleaner(dry_run=True)
+            report = cleaner.generate_report()
+
+        advanced.assert_not_called()
+        deep.assert_not_called()
+        self.assertEqual(report["backup_location"], self.backup_dir)
+        self.assertFalse(os.path.exists(self.backup_dir))
+
+    def test_collaborators_built_once_on_first_use(self):
+        """Both collaborators are cached and share the cleaner's settings"""
+        cleaner = self._cleaner(dry_run=True, enable_backup=False)
+
+        deep = cleaner.deep_system_cleaner
+        advanced = cleaner.advanced_features
+
+        self.assertIs(cleaner.deep_system_cleaner, deep)
+        self.assertIs(cleaner.advanced_features, advanced)
+        self.assertIs(deep.command_backend, cleaner.command_backend)
+        self.assertIs(advanced.logger, cleaner.logger)
+        self.assertTrue(advanced.dry_run)
+
+    def test_disabled_advanced_features(self):
+        """Disabled advanced features are never constructed"""
+        with patch.object(cleaner_enhanced, "AdvancedFeatures") as advanced:
+            cleaner = self._cleaner(dry_run=True, enable_advanced_features=False)
+
+            self.assertIsNone(cleaner.advanced_features)
+            self.assertEqual(cleaner.run_advanced_features(), {"enabled": False})
+        advanced.assert_not_called()
+
+    def test_backup_dir_created_on_first_backup(self):
+        """The backup directory appears with the first backed-up path"""
+        zoom_file = os.path.join(self.temp_dir, "zoom.us", "us.zoom.xos.plist")
+        os.makedirs(os.path.dirname(zoom_file))
+        with open(zoom_file, "w") as f:
+            f.write("us.zoom.xos")
+        cleaner = self._cleaner(enable_advanced_features=False)
+        self.assertFalse(os.path.exists(self.backup_dir))
+
+        self.assertTrue(cleaner._backup_path(zoom_file))
+
+        self.assertEqual(os.stat(self.backup_dir).st_mode & 0o777, 0o700)
+        self.assertEqual(cleaner.cleanup_stats["files_backed_up"], 1)
+
+    def test_compatibility_probed_once_per_process(self):
+        """Later cleaners reuse the first compatibility probe"""
+        from zoom_deep_clean.macos_compatibility import compatibility_manager
+
+        with patch.object(
+            cleaner_enhanced, "_compatibility_probed", False
+        ), patch.object(
+            compatibility_manager, "log_compatibility_info"
+        ) as log_info, patch.object(
+            compatibility_manager, "is_supported_version", return_value=True
+        ):
+            self._cleaner(dry_run=True)
+            self._cleaner(dry_run=True)
+
+            probe = cleaner_enhanced.probe_macos_compatibility()
+
+        log_info.assert_called_once()
+        self.assertTrue(probe["supported_version"])
+
+
+if __name__ == "__main__":
+    unittest.main()
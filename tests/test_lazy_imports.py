@@ -0,0 +1,94 @@
+#!/usr/bin/env python3
+"""
+Tests for lazy subsystem loading
+Import-time budget for package import and CLI --help/--version
+"""
+
+import os
+import subprocess
+import sys
+import unittest
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Modules that must only be loaded once a cleaning subsystem is used
+HEAVY_MODULES = (
+    "zoom_deep_clean.cleaner_enhanced",
+    "zoom_deep_clean.advanced_features",
+    "zoom_deep_clean.deep_system_cleaner",
+    "zoom_deep_clean.device_fingerprint_verifier",
+    "zoom_deep_clean.auth_token_cleaner",
+    "zoom_deep_clean.comprehensive_cli",
+    "zoom_deep_clean.error_1132_handler",
+    "zoom_deep_clean.zoom_installer_builtin",
+    "ssl",
+    "urllib.request",
+)
+
+# Generous so slow CI machines pass; the real figure is a few tens of ms
+IMPORT_BUDGET_US = 150_000
+
+
+def _import_times(code):
+    """Run ``code`` under ``-X importtime``: module -> cumulative microseconds"""
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", code],
+        cwd=PROJECT_ROOT,
+        capture_output=True,
+        text=True,
+        timeout=60,
+    )
+    times = {}
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        _, cumulative, module = line[len("import time:") :].split("|")
+        times[module.strip()] = int(cumulative)
+    return result, times
+
+
+class TestLazyImports(unittest.TestCase):
+    """Test that startup paths do not load the cleaning subsystems"""
+
+    def _assert_light(self, times, module):
+        loaded = [name for name in HEAVY_MODULES if name in times]
+        self.assertEqual(loaded, [])
+        self.assertLess(times[module], IMPORT_BUDGET_US)
+
+    def test_package_import(self):
+        """import zoom_deep_clean loads no subsystem"""
+        result, times = _import_times("import zoom_deep_clean")
+
+        self.assertEqual(result.returncode, 0, result.stderr)
+        self._assert_light(times, "zoom_deep_clean")
+
+    def test_cli_help_and_version(self):
+        """zdce --help and --version stay within the import budget"""
+        for flag in ("--help", "--version"):
+            code = (
+                "import sys; sys.argv = ['zdce', '%s']\n"
+                "from zoom_deep_clean.cli_enhanced import main\n"
+                "main()" % flag
+            )
+            result, times = _import_times(code)
+
+            # argparse exits with code 2 due to the CLI's exception handling
+            self.assertEqual(result.returncode, 2, result.stderr)
+            self.assertIn("zdce", result.stdout)
+            self._assert_light(times, "zoom_deep_clean.cli_enhanced")
+
+    def test_lazy_attributes_resolve(self):
+        """Public names are still importable from the package and the CLI"""
+        import zoom_deep_clean
+        from zoom_deep_clean import cli_enhanced
+        from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
+
+        self.assertIs(zoom_deep_clean.ZoomDeepCleanerEnhanced, ZoomDeepCleanerEnhanced)
+        self.assertIs(cli_enhanced.ZoomDeepCleanerEnhanced, ZoomDeepCleanerEnhanced)
+        self.assertIn("DeepSystemCleaner", dir(zoom_deep_clean))
+        with self.assertRaises(AttributeError):
+            zoom_deep_clean.NoSuchCleaner
+
+
+if __name__ == "__main__":
+    unittest.main()
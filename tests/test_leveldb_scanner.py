@@ -0,0 +1,258 @@
+#!/usr/bin/env python3
+"""
+Tests for the Chromium LevelDB origin scanner
+Fixture databases, block skipping, Session Storage maps and tombstoning
+"""
+
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+import tracemalloc
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean import leveldb_scanner
+from zoom_deep_clean.command_backend import ReplayBackend
+from zoom_deep_clean.leveldb_scanner import (
+    is_zoom_origin,
+    scan_leveldb,
+    snappy_decompress,
+)
+from zoom_deep_clean.synthetic_fixtures import (
+    _snappy_compress,
+    generate_leveldb_fixture,
+)
+
+
+class TestFormatHelpers(unittest.TestCase):
+    """Test the low-level decoders"""
+
+    def test_snappy_round_trip(self):
+        """Literals, copies and overlapping copies decode"""
+        data = b"zoom.us " * 200 + bytes(range(256)) * 3
+        self.assertEqual(snappy_decompress(_snappy_compress(data)), data)
+        # literal "ab", then a copy of 8 bytes at offset 2 (overlapping)
+        self.assertEqual(snappy_decompress(b"\x0a\x04ab\x11\x02"), b"ababababab")
+
+    def test_zoom_origins(self):
+        """Only zoom.us and zoom.com hosts and their subdomains match"""
+        self.assertTrue(is_zoom_origin(b"https://zoom.us"))
+        self.assertTrue(is_zoom_origin(b"https://us02web.ZOOM.us:443/"))
+        self.assertTrue(is_zoom_origin(b"https://app.zoom.com"))
+        self.assertFalse(is_zoom_origin(b"https://notzoom.us"))
+        self.assertFalse(is_zoom_origin(b"https://zoom.us.example.net"))
+
+
+class TestLevelDBScanner(unittest.TestCase):
+    """Test scanning generated storage databases"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.path = os.path.join(self.temp_dir, "leveldb")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _keys(self, result):
+        return [entry.key for entry in result.entries]
+
+    def test_local_storage_keys(self):
+        """Live Zoom keys are found in tables and the log, decoys are not"""
+        fixture = generate_leveldb_fixture(self.path)
+
+        result = scan_leveldb(self.path)
+
+        self.assertIsNone(result.error)
+        self.assertEqual(self._keys(result), fixture.zoom_keys)
+        self.assertIn(b"_https://zoom.us\x00\x01added", self._keys(result))
+        self.assertNotIn(b"_https://zoom.us\x00\x01stale", self._keys(result))
+        self.assertEqual(
+            result.origins,
+            ["https://app.zoom.com", "https://us02web.zoom.us", "https://zoom.us"],
+        )
+        self.assertEqual(result.tables_scanned, 1)
+        self.assertEqual(result.last_sequence, fixture.last_sequence)
+
+    def test_uncompressed_tables(self):
+        """Tables without snappy compression are read the same way"""
+        fixture = generate_leveldb_fixture(self.path, compress=False)
+
+        self.assertEqual(self._keys(scan_leveldb(self.path)), fixture.zoom_keys)
+
+    def test_blocks_of_other_origins_are_skipped(self):
+        """Blocks holding only other origins are never read or decompressed"""
+        fixture = generate_leveldb_fixture(self.path, keys_per_origin=300)
+        decompressed = []
+        real_decompress = leveldb_scanner.snappy_decompress
+
+        def counting_decompress(data):
+            decompressed.append(len(data))
+            return real_decompress(data)
+
+        with patch.object(leveldb_scanner, "snappy_decompress", counting_decompress):
+            result = scan_leveldb(self.path)
+
+        self.assertEqual(self._keys(result), fixture.zoom_keys)
+        self.assertEqual(
+            result.blocks_read + result.blocks_skipped, fixture.table_blocks
+        )
+        self.assertGreater(result.blocks_skipped, 4 * result.blocks_read)
+        # data blocks read, plus at most the index block
+        self.assertLessEqual(len(decompressed), result.blocks_read + 1)
+
+    def test_memory_independent_of_other_origins(self):
+        """Tables are mapped, so other origins' data never reaches the heap"""
+        peaks = []
+        for other_origin_count in (20, 150):
+            path = os.path.join(self.temp_dir, f"leveldb-{other_origin_count}")
+            generate_leveldb_fixture(
+                path, other_origin_count=other_origin_count, keys_per_origin=100
+            )
+            scan_leveldb(path)
+
+            tracemalloc.start()
+            try:
+                scan_leveldb(path)
+                peaks.append(tracemalloc.get_traced_memory()[1])
+            finally:
+                tracemalloc.stop()
+
+        self.assertLess(peaks[1], peaks[0] * 1.5)
+
+    def test_session_storage_maps(self):
+        """Map entries of Zoom namespaces are found in a second pass"""
+        fixture = generate_leveldb_fixture(self.path, session_storage=True)
+
+        result = scan_leveldb(self.path)
+
+        self.assertEqual(self._keys(result), fixture.zoom_keys)
+        self.assertTrue(any(key.startswith(b"map-") for key in self._keys(result)))
+        self.assertIn("https://zoom.us/", result.origins)
+
+    def test_tombstone_removes_keys(self):
+        """Deletions appended to the log hide every matched key"""
+        fixture = generate_leveldb_fixture(self.path)
+
+        result = scan_leveldb(self.path, tombstone=True)
+
+        self.assertIsNone(result.error)
+        self.assertEqual(result.tombstoned, len(fixture.zoom_keys))
+        rescan = scan_leveldb(self.path)
+        self.assertEqual(rescan.entries, [])
+        self.assertEqual(
+            rescan.last_sequence, fixture.last_sequence + len(fixture.zoom_keys)
+        )
+
+    def test_tombstone_refused_while_locked(self):
+        """A database locked by a running browser is left untouched"""
+        generate_leveldb_fixture(self.path)
+        log_path = os.path.join(self.path, "000005.log")
+        log_size = os.path.getsize(log_path)
+        holder = subprocess.Popen(
+            [
+                sys.executable,
+                "-c",
+                "import fcntl, sys, time\n"
+                "f = open(sys.argv[1], 'a')\n"
+                "fcntl.lockf(f, fcntl.LOCK_EX)\n"
+                "print('locked', flush=True)\n"
+                "time.sleep(60)",
+                os.path.join(self.path, "LOCK"),
+            ],
+            stdout=subprocess.PIPE,
+            text=True,
+        )
+        try:
+            self.assertEqual(holder.stdout.readline().strip(), "locked")
+
+            result = scan_leveldb(self.path, tombstone=True)
+        finally:
+            holder.kill()
+            holder.wait()
+            holder.stdout.close()
+
+        self.assertIn("in use", result.error)
+        self.assertEqual(os.path.getsize(log_path), log_size)
+
+    def test_tombstone_refused_without_file_locking(self):
+        """Without fcntl the database is scanned but never written"""
+        fixture = generate_leveldb_fixture(self.path)
+        log_path = os.path.join(self.path, "000005.log")
+        log_size = os.path.getsize(log_path)
+
+        with patch.object(leveldb_scanner, "fcntl", None):
+            result = scan_leveldb(self.path, tombstone=True)
+
+        self.assertIn("Cannot lock", result.error)
+        self.assertEqual(self._keys(result), fixture.zoom_keys)
+        self.assertEqual(result.tombstoned, 0)
+        self.assertEqual(os.path.getsize(log_path), log_size)
+
+    def test_importable_without_fcntl(self):
+        """Modules that use the scanner still import where fcntl is missing"""
+        probe = subprocess.run(
+            [
+                sys.executable,
+                "-c",
+                "import sys\n"
+                "sys.modules['fcntl'] = None\n"
+                "import zoom_deep_clean.auth_token_cleaner\n",
+            ],
+            capture_output=True,
+            text=True,
+        )
+        self.assertEqual(probe.returncode, 0, probe.stderr)
+
+
+class TestBrowserStorageCleaning(unittest.TestCase):
+    """Test AuthTokenCleaner's browser storage cleanup"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.home = os.path.join(self.temp_dir, "alice")
+        self.storage = os.path.join(
+            self.home,
+            "Library/Application Support/Google/Chrome/Profile 1/Local Storage/leveldb",
+        )
+        self.fixture = generate_leveldb_fixture(self.storage)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _cleaner(self, dry_run):
+        from zoom_deep_clean.auth_token_cleaner import AuthTokenCleaner
+
+        return AuthTokenCleaner(
+            dry_run=dry_run,
+            user_home=self.home,
+            command_backend=ReplayBackend(interactions=[]),
+        )
+
+    def test_dry_run_only_reports(self):
+        """Dry runs never write to the storage database"""
+        log_path = os.path.join(self.storage, "000005.log")
+        log_size = os.path.getsize(log_path)
+
+        self._cleaner(True)._clean_browser_auth_data()
+
+        self.assertEqual(os.path.getsize(log_path), log_size)
+        self.assertEqual(
+            len(scan_leveldb(self.storage).entries), len(self.fixture.zoom_keys)
+        )
+
+    def test_storage_keys_removed(self):
+        """Zoom origins are removed from every Chromium profile"""
+        cleaner = self._cleaner(False)
+
+        cleaner._clean_browser_auth_data()
+
+        self.assertEqual(scan_leveldb(self.storage).entries, [])
+        self.assertTrue(
+            any(item.startswith("Chrome storage:") for item in cleaner.cleaned_items)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,243 @@
+#!/usr/bin/env python3
+"""
+Tests for the GUI log sink
+Bounded buffering, batched flushes, the line cap and logging integration
+"""
+
+import logging
+import threading
+import unittest
+
+from zoom_deep_clean.log_sink import (
+    LogSink,
+    TextLogView,
+    format_record,
+    level_for_record,
+)
+
+
+class _FakeText:
+    """Records calls the way a tkinter Text widget would receive them"""
+
+    def __init__(self):
+        self.lines = [""]
+        self.calls = []
+
+    def insert(self, index, *chunks):
+        self.calls.append(("insert", index, chunks))
+        text = "".join(chunks[0::2]).split("\n")
+        self.lines[-1] += text[0]
+        self.lines.extend(text[1:])
+
+    def delete(self, first, last):
+        self.calls.append(("delete", first, last))
+        if last == "end":
+            self.lines = [""]
+        else:
+            del self.lines[: int(float(last)) - 1]
+
+    def see(self, index):
+        self.calls.append(("see", index))
+
+    def get(self, first, last):
+        raise AssertionError("the view must not read the widget back")
+
+
+class _FakeRoot:
+    def __init__(self):
+        self.scheduled = []
+
+    def after(self, delay, callback):
+        self.scheduled.append((delay, callback))
+        return len(self.scheduled)
+
+    def after_cancel(self, after_id):
+        self.scheduled[after_id - 1] = None
+
+
+class TestLogSink(unittest.TestCase):
+    """Test queueing and draining lines"""
+
+    def test_drain_returns_lines_in_order(self):
+        sink = LogSink()
+        sink.append("one")
+        sink.append("two", "error")
+
+        records = sink.drain()
+
+        self.assertEqual(
+            [(m, l) for _, m, l in records], [("one", "info"), ("two", "error")]
+        )
+        self.assertEqual(sink.drain(), [])
+        self.assertRegex(format_record(records[0]), r"^\[\d\d:\d\d:\d\d\] one$")
+
+    def test_overflow_is_reported_not_silent(self):
+        """Lines beyond the buffer are counted and announced"""
+        sink = LogSink(max_pending=10)
+        for n in range(25):
+            sink.append(f"line {n}")
+
+        records = sink.drain()
+
+        self.assertEqual(sink.dropped, 15)
+        self.assertIn("15 log lines dropped", records[0][1])
+        self.assertEqual(records[0][2], "warning")
+        self.assertEqual(
+            [m for _, m, _ in records[1:]], [f"line {n}" for n in range(15, 25)]
+        )
+
+        sink.append("after")
+        self.assertEqual([m for _, m, _ in sink.drain()], ["after"])
+
+    def test_drain_keeps_only_what_fits(self):
+        """A backlog larger than the widget is cut to its newest lines"""
+        sink = LogSink()
+        for n in range(50):
+            sink.append(f"line {n}")
+
+        records = sink.drain(max_lines=10)
+
+        self.assertEqual(
+            [m for _, m, _ in records], [f"line {n}" for n in range(40, 50)]
+        )
+        self.assertEqual(sink.skipped, 40)
+
+    def test_concurrent_producers(self):
+        sink = LogSink(max_pending=100000)
+        threads = [
+            threading.Thread(target=lambda: [sink.append("x") for _ in range(1000)])
+            for _ in range(8)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(len(sink.drain()), 8000)
+        self.assertEqual(sink.lines_in, 8000)
+
+    def test_handler_levels(self):
+        """The logging handler tags records like the old GUI handler did"""
+        sink = LogSink()
+        logger = logging.getLogger("test_log_sink")
+        logger.propagate = False
+        logger.setLevel(logging.INFO)
+        handler = sink.handler()
+        logger.addHandler(handler)
+        try:
+            logger.info("plain")
+            logger.info("✅ removed")
+            logger.warning("careful")
+            logger.error("broken")
+        finally:
+            logger.removeHandler(handler)
+
+        levels = [(m, l) for _, m, l in sink.drain()]
+        self.assertEqual(
+            levels,
+            [
+                ("plain", "info"),
+                ("✅ removed", "success"),
+                ("careful", "warning"),
+                ("broken", "error"),
+            ],
+        )
+
+    def test_level_for_record(self):
+        record = logging.makeLogRecord({"levelno": logging.INFO})
+        self.assertEqual(level_for_record(record, "Cleanup SUCCESS"), "success")
+
+
+class TestTextLogView(unittest.TestCase):
+    """Test flushing the sink into a text widget"""
+
+    def setUp(self):
+        self.root = _FakeRoot()
+        self.text = _FakeText()
+        self.sink = LogSink()
+
+    def test_batch_is_one_insert(self):
+        view = TextLogView(self.root, self.text, self.sink)
+        for n in range(100):
+            self.sink.append(f"line {n}", "success" if n % 2 else "info")
+
+        self.assertEqual(view.flush(), 100)
+
+        inserts = [c for c in self.text.calls if c[0] == "insert"]
+        self.assertEqual(len(inserts), 1)
+        chunks = inserts[0][2]
+        self.assertEqual(
+            chunks[1::2][:4], ("timestamp", "info", "timestamp", "success")
+        )
+        self.assertEqual(self.text.calls[-1], ("see", "end"))
+        self.assertEqual(view.flush(), 0)
+
+    def test_line_cap_without_reading_widget(self):
+        """Old lines are deleted from a running count, never by reading back"""
+        view = TextLogView(self.root, self.text, self.sink, max_lines=100)
+        for batch in range(30):
+            for n in range(10):
+                self.sink.append(f"batch {batch} line {n}")
+            view.flush()
+
+        self.assertEqual(view.line_count, 100)
+        self.assertEqual(len(self.text.lines) - 1, 100)
+        self.assertEqual(self.text.lines[-2].split("] ")[1], "batch 29 line 9")
+
+    def test_multiline_messages_count_every_line(self):
+        view = TextLogView(self.root, self.text, self.sink, max_lines=5)
+        self.sink.append("traceback\n  line 1\n  line 2")
+        self.sink.append("next\n  more")
+        self.sink.append("last")
+
+        view.flush()
+
+        self.assertEqual(view.line_count, 5)
+        self.assertEqual(len(self.text.lines) - 1, 5)
+        self.assertTrue(self.text.lines[0].endswith("line 1"))
+
+    def test_follow(self):
+        following = [False]
+        view = TextLogView(self.root, self.text, self.sink, follow=lambda: following[0])
+        self.sink.append("quiet")
+        view.flush()
+        self.assertNotIn(("see", "end"), self.text.calls)
+
+        following[0] = True
+        self.sink.append("loud")
+        view.flush()
+        self.assertIn(("see", "end"), self.text.calls)
+
+    def test_timer(self):
+        """The view reschedules itself every interval until stopped"""
+        view = TextLogView(self.root, self.text, self.sink, interval_ms=50)
+        view.start()
+        view.start()
+        self.assertEqual(len(self.root.scheduled), 1)
+
+        self.sink.append("tick")
+        delay, callback = self.root.scheduled[0]
+        callback()
+
+        self.assertEqual(delay, 50)
+        self.assertEqual(len(self.root.scheduled), 2)
+        self.assertEqual(view.flushes, 1)
+
+        view.stop()
+        self.assertIsNone(self.root.scheduled[-1])
+
+    def test_clear(self):
+        view = TextLogView(self.root, self.text, self.sink)
+        self.sink.append("shown")
+        view.flush()
+        self.sink.append("pending")
+
+        view.clear()
+
+        self.assertEqual(view.line_count, 0)
+        self.assertEqual(self.text.lines, [""])
+        self.assertEqual(view.flush(), 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
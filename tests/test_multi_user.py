@@ -0,0 +1,229 @@
+#!/usr/bin/env python3
+"""
+Tests for multi-user cleaning
+Account discovery, per-user cleanup against fixture homes and aggregation
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean.clean_journal import REMOVED
+from zoom_deep_clean.command_backend import (
+    BACKEND_ENV_VAR,
+    CASSETTE_VERSION,
+    ReplayBackend,
+    set_default_backend,
+)
+from zoom_deep_clean.multi_user import (
+    MultiUserCleaner,
+    clean_user_home,
+    discover_user_homes,
+)
+from zoom_deep_clean.synthetic_fixtures import generate_macos_fixture
+
+
+class TestMultiUserCleaning(unittest.TestCase):
+    """Test cleaning several fixture accounts"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "fixture")
+        self.manifest = generate_macos_fixture(
+            self.root, file_count=50, users=("alice", "bob")
+        )
+        self.users_root = os.path.join(self.root, "Users")
+
+        # Replay an empty cassette so no external command is ever executed,
+        # in this process or in the pool workers
+        self.cassette = cassette = os.path.join(self.temp_dir, "empty.json")
+        with open(cassette, "w") as f:
+            json.dump({"version": CASSETTE_VERSION, "interactions": []}, f)
+        self.env_patch = patch.dict(os.environ, {BACKEND_ENV_VAR: f"replay:{cassette}"})
+        self.env_patch.start()
+        set_default_backend(None)
+
+        self.options = {
+            "log_file": os.path.join(self.temp_dir, "clean.log"),
+            "enable_backup": False,
+        }
+
+    def tearDown(self):
+        self.env_patch.stop()
+        set_default_backend(None)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _app_support(self, user):
+        return os.path.join(
+            self.users_root, user, "Library", "Application Support", "zoom.us"
+        )
+
+    def test_discover_user_homes_skips_non_accounts(self):
+        """Shared, hidden and Library-less entries are not accounts"""
+        os.makedirs(os.path.join(self.users_root, "Shared", "Library"))
+        os.makedirs(os.path.join(self.users_root, ".localized"))
+        os.makedirs(os.path.join(self.users_root, "nolibrary"))
+
+        homes = discover_user_homes(self.users_root)
+
+        self.assertEqual(
+            homes,
+            [
+                os.path.join(self.users_root, "alice"),
+                os.path.join(self.users_root, "bob"),
+            ],
+        )
+
+    def test_clean_user_home_removes_user_artifacts(self):
+        """A worker removes Zoom data from its own home only"""
+        result = clean_user_home(
+            os.path.join(self.users_root, "alice"), dict(self.options)
+        )
+
+        self.assertNotIn("error", result)
+        self.assertGreater(result["statistics"]["directories_removed"], 0)
+        self.assertFalse(os.path.exists(self._app_support("alice")))
+        self.assertTrue(os.path.exists(self._app_support("bob")))
+
+    def test_dry_run_leaves_user_data(self):
+        """Dry run does not remove anything"""
+        clean_user_home(
+            os.path.join(self.users_root, "alice"), dict(self.options, dry_run=True)
+        )
+
+        self.assertTrue(os.path.exists(self._app_support("alice")))
+
+    def test_run_cleans_all_users_and_aggregates(self):
+        """System steps run once and every account is cleaned in the pool"""
+        report_file = os.path.join(self.temp_dir, "report.json")
+        cleaner = MultiUserCleaner(
+            users_root=self.users_root,
+            max_workers=2,
+            report_file=report_file,
+            **self.options,
+        )
+
+        with patch.object(
+            MultiUserCleaner, "run_system_steps", return_value=True
+        ) as system_steps:
+            cleaner.run()
+
+        system_steps.assert_called_once()
+        for user in ("alice", "bob"):
+            self.assertFalse(os.path.exists(self._app_support(user)))
+
+        with open(report_file) as f:
+            report = json.load(f)
+        self.assertEqual(report["mode"], "multi-user")
+        self.assertEqual(len(report["users"]), 2)
+        self.assertEqual(
+            report["user_totals"]["directories_removed"],
+            sum(u["statistics"]["directories_removed"] for u in report["users"]),
+        )
+
+    def test_verification_runs_once_after_every_account(self):
+        """The final search and verification see all homes already cleaned"""
+        from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
+
+        report_file = os.path.join(self.temp_dir, "report.json")
+        cleaner = MultiUserCleaner(
+            users_root=self.users_root,
+            max_workers=2,
+            report_file=report_file,
+            **self.options,
+        )
+        system_cleaner = ZoomDeepCleanerEnhanced(
+            include_user_steps=False, include_verification=False, **self.options
+        )
+        self.assertNotIn(
+            "fingerprint_verification",
+            [name for name, _ in system_cleaner._progress_steps()],
+        )
+
+        def system_steps():
+            cleaner.system_cleaner = system_cleaner
+            return True
+
+        def verify():
+            # Both homes are clean and their paths reached the journal
+            for user in ("alice", "bob"):
+                self.assertFalse(os.path.exists(self._app_support(user)))
+                self.assertIn(
+                    self._app_support(user), system_cleaner.journal.paths(REMOVED)
+                )
+            return {"verified": True}
+
+        with patch.object(
+            MultiUserCleaner, "run_system_steps", side_effect=system_steps
+        ), patch.object(
+            system_cleaner, "comprehensive_file_search", return_value=[]
+        ) as search, patch.object(
+            system_cleaner, "verify_device_fingerprint", side_effect=verify
+        ) as verification:
+            cleaner.run()
+
+        search.assert_called_once()
+        verification.assert_called_once()
+        with open(report_file) as f:
+            report = json.load(f)
+        self.assertEqual(report["device_fingerprint_verification"], {"verified": True})
+        self.assertNotIn("journal", report["users"][0])
+
+    def test_command_backend_forwarded_by_spec(self):
+        """Workers rebuild a replay backend from its cassette"""
+        cleaner = MultiUserCleaner(
+            user_homes=[], command_backend=ReplayBackend(self.cassette)
+        )
+        self.assertEqual(
+            cleaner._worker_options()["command_backend_spec"],
+            f"replay:{self.cassette}",
+        )
+
+        in_memory = MultiUserCleaner(
+            user_homes=[], command_backend=ReplayBackend(interactions=[])
+        )
+        with self.assertLogs("zoom_deep_clean.multi_user", "WARNING"):
+            options = in_memory._worker_options()
+        self.assertNotIn("command_backend_spec", options)
+
+    def test_machine_wide_options_not_forwarded(self):
+        """Reboot and hostname options stay with the system pass"""
+        cleaner = MultiUserCleaner(
+            user_homes=[],
+            system_reboot=True,
+            reset_hostname=True,
+            dry_run=True,
+        )
+
+        options = cleaner._worker_options()
+        self.assertEqual(set(options), {"dry_run", "artifact_rules"})
+        self.assertTrue(options["dry_run"])
+
+    def test_auth_cleaner_targets_other_users_keychain(self):
+        """Another account's login keychain is passed to security(1)"""
+        from zoom_deep_clean.auth_token_cleaner import (
+            AuthTokenCleaner,
+            keychain_args_for_home,
+        )
+
+        home = os.path.join(self.users_root, "alice")
+        cleaner = AuthTokenCleaner(dry_run=True, user_home=home)
+
+        self.assertEqual(keychain_args_for_home(os.path.expanduser("~")), [])
+        self.assertEqual(
+            cleaner._keychain_args(),
+            [os.path.join(home, "Library", "Keychains", "login.keychain-db")],
+        )
+        self.assertEqual(
+            cleaner._expand_path("~/Library/Cookies"),
+            os.path.join(home, "Library", "Cookies"),
+        )
+        with self.assertRaises(ValueError):
+            cleaner.clean_all_auth_tokens(scope="everything")
+
+
+if __name__ == "__main__":
+    unittest.main()
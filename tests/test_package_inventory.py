@@ -0,0 +1,303 @@
+#!/usr/bin/env python3
+"""
+Tests for the package inventory
+Exact-name queries of dpkg, rpm, pacman, snap and flatpak, and how the Linux
+cleaner uses them
+"""
+
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean.command_backend import ReplayBackend
+from zoom_deep_clean.cross_platform_support import LinuxZoomCleaner
+from zoom_deep_clean.package_inventory import (
+    DpkgSource,
+    FlatpakSource,
+    PackageInventory,
+    PackageSource,
+    PacmanSource,
+    RpmSource,
+    SnapSource,
+    parse_dpkg_status,
+)
+
+DPKG_STATUS = """\
+Package: zoomer
+Status: install ok installed
+Version: 1.0
+
+Package: zoom
+Status: install ok installed
+Priority: optional
+Version: 6.1.1.443
+Description: Zoom Cloud Meetings
+ zoom, zoom.us and more
+
+Package: zoom-old
+Status: deinstall ok config-files
+Version: 5.0
+"""
+
+RPM_QUERY = [
+    "rpm",
+    "-q",
+    "--whatprovides",
+    "zoom",
+    "--queryformat",
+    "%{NAME}\t%{VERSION}-%{RELEASE}\n",
+]
+
+
+class TestDpkgSource(unittest.TestCase):
+    """Test reading the dpkg database files"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.status = os.path.join(self.temp_dir, "status")
+        self.info = os.path.join(self.temp_dir, "info")
+        os.makedirs(self.info)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_status_parsing_matches_exact_installed_names(self):
+        lines = DPKG_STATUS.splitlines(keepends=True)
+
+        self.assertEqual(
+            list(parse_dpkg_status(lines, ("zoom", "zoom-old"))),
+            [("zoom", "6.1.1.443")],
+        )
+
+    def test_installed_package_and_its_files(self):
+        with open(self.status, "w") as f:
+            f.write(DPKG_STATUS)
+        with open(os.path.join(self.info, "zoom:amd64.list"), "w") as f:
+            f.write("/.\n/opt\n/opt/zoom\n/usr/bin/zoom\n")
+        replay = ReplayBackend(interactions=[])
+        source = DpkgSource(replay, status_file=self.status, info_dir=self.info)
+
+        (package,) = source.installed()
+
+        self.assertEqual((package.name, package.version), ("zoom", "6.1.1.443"))
+        self.assertEqual(package.files, ("/opt", "/opt/zoom", "/usr/bin/zoom"))
+        self.assertEqual(
+            source.remove_command(package),
+            ["apt-get", "remove", "--purge", "-y", "zoom"],
+        )
+        self.assertEqual(replay.calls, 0)
+
+    def test_unreadable_status_asks_dpkg_query(self):
+        os.makedirs(self.status)  # exists, but cannot be read as a file
+        fmt = "-f=${Package}\t${Version}\t${db:Status-Status}\n"
+        replay = ReplayBackend(
+            interactions=[
+                {
+                    "args": ["dpkg-query", "-W", fmt, "zoom"],
+                    "stdout": "zoom\t6.1.1\tinstalled\n",
+                },
+                {"args": ["dpkg-query", "-L", "zoom"], "stdout": "/.\n/opt/zoom\n"},
+            ]
+        )
+        source = DpkgSource(replay, status_file=self.status, info_dir=self.info)
+
+        (package,) = source.installed()
+
+        self.assertEqual(package.files, ("/opt/zoom",))
+        self.assertEqual(replay.misses, [])
+
+
+class TestCommandSources(unittest.TestCase):
+    """Test the package managers queried through commands"""
+
+    def test_rpm_whatprovides(self):
+        replay = ReplayBackend(
+            interactions=[
+                {"args": RPM_QUERY, "stdout": "zoom\t6.1.1-443\n"},
+                {
+                    "args": ["rpm", "-ql", "zoom"],
+                    "stdout": "/opt/zoom\n/usr/bin/zoom\n",
+                },
+            ]
+        )
+
+        (package,) = RpmSource(replay).installed()
+
+        self.assertEqual((package.name, package.version), ("zoom", "6.1.1-443"))
+        self.assertTrue(package.owns("/usr/bin/zoom"))
+        self.assertFalse(package.owns("/usr/bin"))
+
+    def test_rpm_nothing_provides_zoom(self):
+        replay = ReplayBackend(
+            interactions=[
+                {
+                    "args": RPM_QUERY,
+                    "stdout": "no package provides zoom\n",
+                    "returncode": 1,
+                }
+            ]
+        )
+
+        self.assertEqual(RpmSource(replay).installed(), [])
+
+    def test_pacman_exact_names(self):
+        replay = ReplayBackend(
+            interactions=[
+                {"args": ["pacman", "-Q", "zoom"], "stdout": "zoom 6.1.1-1\n"},
+                {"args": ["pacman", "-Qlq", "zoom"], "stdout": "/opt/zoom/\n"},
+            ]
+        )
+
+        packages = PacmanSource(replay).installed()
+
+        # zoom-system-qt is not recorded: the replay answers "not found"
+        self.assertEqual([package.name for package in packages], ["zoom"])
+
+    def test_snap_owns_its_directories(self):
+        replay = ReplayBackend(
+            interactions=[
+                {
+                    "args": ["snap", "list", "zoom-client"],
+                    "stdout": "Name  Version  Rev  Tracking  Publisher  Notes\n"
+                    "zoom-client  6.1.1  225  latest/stable  zoom-client  -\n",
+                }
+            ]
+        )
+
+        (package,) = SnapSource(replay).installed()
+
+        self.assertEqual(package.version, "6.1.1")
+        self.assertTrue(package.owns("/snap/zoom-client/225/zoom"))
+        self.assertTrue(package.owns(os.path.expanduser("~/snap/zoom-client")))
+
+    def test_flatpak_location(self):
+        location = "/var/lib/flatpak/app/us.zoom.Zoom/x86_64/stable/abc"
+        replay = ReplayBackend(
+            interactions=[
+                {
+                    "args": ["flatpak", "info", "us.zoom.Zoom"],
+                    "stdout": f"Zoom - Video Conferencing\n\n"
+                    f"          ID: us.zoom.Zoom\n     Version: 6.1.1\n"
+                    f"    Location: {location}\n",
+                }
+            ]
+        )
+
+        (package,) = FlatpakSource(replay).installed()
+
+        self.assertEqual(package.version, "6.1.1")
+        self.assertTrue(package.owns(os.path.join(location, "files/zoom")))
+
+    def test_incomplete_source_cannot_be_created(self):
+        class Incomplete(PackageSource):
+            def installed(self):
+                return []
+
+        with self.assertRaises(TypeError):
+            Incomplete(ReplayBackend(interactions=[]))
+
+    def test_failing_source_does_not_hide_the_others(self):
+        replay = ReplayBackend(
+            interactions=[
+                {"args": ["pacman", "-Q", "zoom"], "stdout": "zoom 6.1.1-1\n"},
+                {"args": ["pacman", "-Qlq", "zoom"], "stdout": ""},
+                {"args": ["pacman", "-Q", "zoom-system-qt"], "returncode": 1},
+            ],
+            strict=True,
+        )
+        inventory = PackageInventory([RpmSource(replay), PacmanSource(replay)])
+
+        self.assertEqual([p.name for p in inventory.packages()], ["zoom"])
+        self.assertEqual(len(inventory.errors), 1)
+        self.assertTrue(inventory.errors[0].startswith("rpm:"))
+
+
+class TestLinuxCleanerPackages(unittest.TestCase):
+    """Test the Linux cleaner's use of the inventory"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        for patcher in (
+            patch.dict(os.environ, {"HOME": self.temp_dir}),
+            patch("platform.system", return_value="Linux"),
+        ):
+            patcher.start()
+            self.addCleanup(patcher.stop)
+        self.snap_data = os.path.join(self.temp_dir, "snap", "zoom-client")
+        self.flatpak_data = os.path.join(self.temp_dir, ".var", "app", "us.zoom.Zoom")
+        os.makedirs(self.snap_data)
+        os.makedirs(self.flatpak_data)
+        self.logger = logging.getLogger("test_package_inventory")
+        self.logger.setLevel(logging.ERROR)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _cleaner(self, dry_run, removal_returncode=0):
+        self.replay = ReplayBackend(
+            interactions=[
+                {
+                    "args": ["snap", "list", "zoom-client"],
+                    "stdout": "Name Version Rev Tracking Publisher Notes\n"
+                    "zoom-client 6.1.1 225 latest/stable zoom-client -\n",
+                },
+                {
+                    "args": ["snap", "remove", "--purge", "zoom-client"],
+                    "returncode": removal_returncode,
+                },
+            ]
+        )
+        inventory = PackageInventory([SnapSource(self.replay)])
+        return LinuxZoomCleaner(self.logger, dry_run=dry_run, packages=inventory)
+
+    def test_files_owned_by_a_package_are_left_to_it(self):
+        cleaner = self._cleaner(dry_run=False)
+
+        removed = cleaner._remove_zoom_files()
+
+        self.assertEqual(removed, 1)
+        self.assertFalse(os.path.exists(self.flatpak_data))
+        self.assertTrue(os.path.exists(self.snap_data))
+
+    def test_packages_are_removed_by_exact_name(self):
+        cleaner = self._cleaner(dry_run=False)
+
+        self.assertEqual(cleaner._remove_zoom_packages(), 1)
+        self.assertEqual(self.replay.misses, [])
+
+    def test_failed_removal_is_not_counted(self):
+        cleaner = self._cleaner(dry_run=False, removal_returncode=1)
+
+        self.assertEqual(cleaner._remove_zoom_packages(), 0)
+
+    def test_files_of_a_package_that_failed_to_uninstall_are_removed(self):
+        cleaner = self._cleaner(dry_run=False, removal_returncode=1)
+
+        self.assertEqual(cleaner._remove_zoom_packages(), 0)
+        removed = cleaner._remove_zoom_files()
+
+        # snap still lists the package, but its files go the old way
+        self.assertEqual(removed, 2)
+        self.assertFalse(os.path.exists(self.snap_data))
+        self.assertEqual(self.replay.calls, 3)  # query, remove, re-query
+
+    def test_package_still_installed_after_removal_keeps_its_files(self):
+        cleaner = self._cleaner(dry_run=False)
+
+        cleaner._remove_zoom_packages()
+        cleaner._remove_zoom_files()
+
+        self.assertTrue(os.path.exists(self.snap_data))
+
+    def test_dry_run_removes_nothing(self):
+        cleaner = self._cleaner(dry_run=True)
+
+        self.assertEqual(cleaner._remove_zoom_packages(), 1)
+        self.assertEqual(self.replay.calls, 1)  # only the query
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,201 @@
+#!/usr/bin/env python3
+"""
+Tests for the lazy plist scanner
+Binary and XML verdicts, container sizes, the result cache and callers
+"""
+
+import logging
+import os
+import plistlib
+import shutil
+import tempfile
+import unittest
+from pathlib import Path
+from unittest.mock import patch
+
+from zoom_deep_clean import plist_scanner
+from zoom_deep_clean.command_backend import ReplayBackend
+from zoom_deep_clean.plist_scanner import (
+    PlistScanError,
+    clear_plist_cache,
+    plist_mentions_zoom,
+    scan_plist,
+)
+
+DOCK = {
+    "persistent-apps": [
+        {"tile-data": {"bundle-identifier": "com.apple.Safari"}},
+        {"tile-data": {"bundle-identifier": "us.zoom.xos"}},
+    ],
+    "persistent-others": [],
+    "recent-apps": [{"tile-data": {"bundle-identifier": "com.apple.mail"}}],
+    "tilesize": 48,
+}
+
+
+class TestPlistScanner(unittest.TestCase):
+    """Test verdicts for binary and XML plists"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        clear_plist_cache()
+
+    def tearDown(self):
+        clear_plist_cache()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, value, name="test.plist", fmt=plistlib.FMT_BINARY):
+        path = os.path.join(self.temp_dir, name)
+        with open(path, "wb") as f:
+            plistlib.dump(value, f, fmt=fmt)
+        return path
+
+    def test_markers_in_every_kind_of_text(self):
+        """Keys, ASCII and Unicode strings and data objects are searched"""
+        cases = {
+            "key": {"ZoomAutoStart": True},
+            "ascii": {"handler": "us.zoom.xos"},
+            "unicode": {"title": "Réunion ZOOM"},
+            "data": {"bookmark": b"\x00\x01file:///Applications/zoom.us.app"},
+            "nested": {"a": [{"b": [1, 2.5, {"c": "zoommtg"}]}]},
+        }
+        for fmt in (plistlib.FMT_BINARY, plistlib.FMT_XML):
+            for name, value in cases.items():
+                with self.subTest(fmt=fmt, case=name):
+                    path = self._write(value, f"{name}-{fmt}.plist", fmt)
+                    self.assertTrue(plist_mentions_zoom(path))
+
+    def test_clean_plists(self):
+        """Plists without Zoom markers are clean in both formats"""
+        value = {"handlers": [f"com.vendor{n}.app" for n in range(500)], "n": 7}
+        for fmt in (plistlib.FMT_BINARY, plistlib.FMT_XML):
+            path = self._write(value, f"clean-{fmt}.plist", fmt)
+            summary = scan_plist(path)
+            self.assertFalse(summary.mentions_zoom)
+            self.assertEqual(summary.binary, fmt == plistlib.FMT_BINARY)
+
+    def test_binary_plists_are_not_decoded(self):
+        """The binary reader never hands the file to plistlib"""
+        path = self._write(DOCK)
+
+        with patch.object(plistlib, "loads", side_effect=AssertionError), patch.object(
+            plistlib, "load", side_effect=AssertionError
+        ):
+            summary = scan_plist(
+                path,
+                count_keys=("persistent-apps", "recent-apps", "missing"),
+                zoom_keys=("persistent-apps", "recent-apps"),
+            )
+
+        self.assertEqual(
+            summary.counts, {"persistent-apps": 2, "recent-apps": 1, "missing": 0}
+        )
+        self.assertEqual(
+            summary.zoom_in, {"persistent-apps": True, "recent-apps": False}
+        )
+
+    def test_xml_counts_match_binary(self):
+        """The plistlib fallback reports the same summary"""
+        binary = scan_plist(self._write(DOCK), ("persistent-apps",), ("recent-apps",))
+        xml = scan_plist(
+            self._write(DOCK, "dock.xml.plist", plistlib.FMT_XML),
+            ("persistent-apps",),
+            ("recent-apps",),
+        )
+
+        self.assertEqual(
+            (binary.counts, binary.zoom_in, binary.mentions_zoom),
+            (xml.counts, xml.zoom_in, xml.mentions_zoom),
+        )
+
+    def test_unchanged_plists_are_cached(self):
+        """Repeat scans are free until the file's mtime or size changes"""
+        path = self._write({"handler": "com.apple.Safari"})
+
+        with patch.object(
+            plist_scanner, "BinaryPlist", wraps=plist_scanner.BinaryPlist
+        ) as reader:
+            scan_plist(path, count_keys=("handler",))
+            scan_plist(path, count_keys=("handler",))
+            self.assertEqual(reader.call_count, 1)
+
+            self._write({"handler": "us.zoom.xos"})
+            os.utime(path, ns=(1, 1))
+            self.assertTrue(scan_plist(path, count_keys=("handler",)).mentions_zoom)
+            self.assertEqual(reader.call_count, 2)
+
+    def test_malformed_plists(self):
+        """Corrupt files raise PlistScanError and are not cached"""
+        path = os.path.join(self.temp_dir, "corrupt.plist")
+        with open(path, "wb") as f:
+            f.write(b"bplist00" + b"\xff" * 40)
+
+        with self.assertRaises(PlistScanError):
+            scan_plist(path, count_keys=("a",))
+        with open(path, "wb") as f:
+            f.write(b"not a plist at all")
+        with self.assertRaises(PlistScanError):
+            plist_mentions_zoom(path)
+
+
+class TestPlistScannerCallers(unittest.TestCase):
+    """Test the cleaners and analyzers reading plists through the scanner"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.home = os.path.join(self.temp_dir, "alice")
+        os.makedirs(os.path.join(self.home, "Library", "Preferences"))
+        clear_plist_cache()
+
+    def tearDown(self):
+        clear_plist_cache()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _write(self, rel_path, value):
+        path = os.path.join(self.home, rel_path)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with open(path, "wb") as f:
+            plistlib.dump(value, f, fmt=plistlib.FMT_BINARY)
+
+    def test_network_auth_data(self):
+        """Zoom network configurations are reported from the binary plist"""
+        from zoom_deep_clean.auth_token_cleaner import AuthTokenCleaner
+
+        self._write(
+            "Library/Preferences/com.apple.networkConnect.plist",
+            {"VPN": {"ServerAddress": "vpn.zoom.us"}},
+        )
+        cleaner = AuthTokenCleaner(
+            user_home=self.home, command_backend=ReplayBackend(interactions=[])
+        )
+
+        with self.assertLogs(cleaner.logger, level="INFO") as logs:
+            cleaner._clean_network_auth_data()
+
+        self.assertTrue(
+            any("Found Zoom network config" in line for line in logs.output)
+        )
+
+    def test_app_usage_patterns(self):
+        """Dock and LaunchServices summaries come from container headers"""
+        from zoom_deep_clean.advanced_detection import SystemFingerprintAnalyzer
+
+        self._write("Library/Preferences/com.apple.dock.plist", DOCK)
+        self._write(
+            "Library/Application Support/com.apple.LaunchServices/"
+            "com.apple.launchservices.secure.plist",
+            {"LSHandlers": [{"LSHandlerURLScheme": f"s{n}"} for n in range(300)]},
+        )
+        analyzer = SystemFingerprintAnalyzer(logging.getLogger(__name__))
+
+        with patch.object(Path, "home", return_value=Path(self.home)):
+            patterns = analyzer._analyze_app_usage_patterns()
+
+        self.assertEqual(
+            patterns,
+            {"launchservices_entries": 300, "dock_apps_count": 2, "zoom_in_dock": True},
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
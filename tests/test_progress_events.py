@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+Tests for progress events
+Step weights from history, ETA, item counts and the cleaner's event stream
+"""
+
+import json
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean.command_backend import ReplayBackend
+from zoom_deep_clean.progress_events import (
+    HISTORY_FILE,
+    HISTORY_SAMPLES,
+    RUN_FINISHED,
+    RUN_STARTED,
+    STEP_FINISHED,
+    STEP_ITEMS,
+    STEP_STARTED,
+    ProgressTracker,
+    StepHistory,
+)
+from zoom_deep_clean.synthetic_fixtures import generate_macos_fixture
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+STEPS = [("scan", "Scanning"), ("remove", "Removing"), ("report", "Reporting")]
+
+
+class TestProgressTracker(unittest.TestCase):
+    """Test the event stream of a run"""
+
+    def setUp(self):
+        self.clock = _Clock()
+        self.history = StepHistory(cache_dir=None)
+        self.events = []
+
+    def _tracker(self):
+        tracker = ProgressTracker(self.history, clock=self.clock)
+        tracker.subscribe(self.events.append)
+        return tracker
+
+    def _run(self, tracker, durations):
+        tracker.start_run(STEPS)
+        for (name, _), duration in zip(STEPS, durations):
+            with tracker.step(name):
+                self.clock.now += duration
+        tracker.finish_run(True)
+
+    def test_event_sequence(self):
+        self._run(self._tracker(), [1, 1, 1])
+
+        kinds = [(e.kind, e.step) for e in self.events]
+        self.assertEqual(kinds[0], (RUN_STARTED, None))
+        self.assertEqual(kinds[1], (STEP_STARTED, "scan"))
+        self.assertEqual(kinds[2], (STEP_FINISHED, "scan"))
+        self.assertEqual(kinds[-1], (RUN_FINISHED, None))
+        self.assertEqual(self.events[1].label, "Scanning")
+        self.assertEqual((self.events[3].step_index, self.events[3].step_count), (2, 3))
+        self.assertEqual(self.events[-1].fraction, 1.0)
+        self.assertEqual(self.events[-1].elapsed, 3)
+
+    def test_weights_come_from_history(self):
+        """A step that took 8 of 10 seconds last time counts for 80%"""
+        self.history.record({"scan": 8.0, "remove": 1.0, "report": 1.0})
+        tracker = self._tracker()
+
+        tracker.start_run(STEPS)
+        with tracker.step("scan"):
+            self.clock.now += 8
+        started_remove = None
+        with tracker.step("remove"):
+            started_remove = self.events[-1]
+
+        self.assertAlmostEqual(started_remove.fraction, 0.8)
+        # every step has history, so the ETA is the expected time left
+        self.assertAlmostEqual(started_remove.eta, 2.0)
+
+    def test_failed_and_cancelled_runs_are_not_remembered(self):
+        for success, error in ((False, None), (False, "cancelled")):
+            tracker = self._tracker()
+            tracker.start_run(STEPS)
+            with tracker.step("scan"):
+                self.clock.now += 1
+            tracker.finish_run(success, error=error)
+
+        self.assertIsNone(self.history.expected("scan"))
+
+    def test_eta_without_history_extrapolates(self):
+        tracker = self._tracker()
+        tracker.start_run(STEPS)
+        with tracker.step("scan"):
+            self.clock.now += 4
+        with tracker.step("remove"):
+            event = self.events[-1]
+
+        self.assertAlmostEqual(event.fraction, 1 / 3)
+        self.assertAlmostEqual(event.eta, 8.0)
+
+    def test_items_advance_within_a_step(self):
+        tracker = self._tracker()
+        tracker.start_run(STEPS)
+        with tracker.step("remove"):
+            for item in tracker.iter_items(["a", "b", "c", "d"]):
+                self.clock.now += 1
+
+        items = [e for e in self.events if e.kind == STEP_ITEMS]
+        self.assertEqual([e.items_done for e in items], [0, 1, 2, 3, 4])
+        self.assertEqual(items[-1].items_total, 4)
+        self.assertAlmostEqual(items[2].fraction, 0.5 / 3)
+        self.assertIn("(2/4)", items[2].describe())
+
+    def test_item_events_are_rate_limited(self):
+        tracker = self._tracker()
+        tracker.start_run(STEPS)
+        with tracker.step("scan"):
+            for done in range(1000):
+                tracker.items(done, 1000)
+            tracker.items(1000, 1000)
+
+        items = [e for e in self.events if e.kind == STEP_ITEMS]
+        self.assertEqual(len(items), 2)
+        self.assertEqual(items[-1].items_done, 1000)
+
+    def test_failed_step_is_reported(self):
+        tracker = self._tracker()
+        tracker.start_run(STEPS)
+        with self.assertRaises(RuntimeError):
+            with tracker.step("scan"):
+                raise RuntimeError("disk gone")
+
+        finished = self.events[-1]
+        self.assertEqual(finished.kind, STEP_FINISHED)
+        self.assertFalse(finished.success)
+        self.assertEqual(finished.error, "disk gone")
+
+    def test_broken_observer_does_not_break_run(self):
+        tracker = self._tracker()
+        tracker.subscribe(lambda event: 1 / 0)
+
+        self._run(tracker, [1, 1, 1])
+
+        self.assertEqual(self.events[-1].kind, RUN_FINISHED)
+
+    def test_unsubscribe(self):
+        tracker = self._tracker()
+        tracker.unsubscribe(self.events.append)
+
+        self._run(tracker, [1, 1, 1])
+
+        self.assertEqual(self.events, [])
+
+
+class TestStepHistory(unittest.TestCase):
+    """Test persisting step durations"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_history_persists_per_profile(self):
+        StepHistory(self.temp_dir, "live").record({"scan": 3.0})
+        StepHistory(self.temp_dir, "dry_run").record({"scan": 0.5})
+
+        self.assertEqual(StepHistory(self.temp_dir, "live").expected("scan"), 3.0)
+        self.assertEqual(StepHistory(self.temp_dir, "dry_run").expected("scan"), 0.5)
+        self.assertIsNone(StepHistory(self.temp_dir, "live").expected("other"))
+
+    def test_median_of_recent_runs(self):
+        history = StepHistory(self.temp_dir)
+        for duration in [100.0] + [2.0] * HISTORY_SAMPLES:
+            history.record({"scan": duration})
+
+        self.assertEqual(StepHistory(self.temp_dir).expected("scan"), 2.0)
+        with open(os.path.join(self.temp_dir, HISTORY_FILE)) as f:
+            samples = json.load(f)["profiles"]["live"]["scan"]
+        self.assertEqual(len(samples), HISTORY_SAMPLES)
+
+    def test_corrupt_history_is_ignored(self):
+        with open(os.path.join(self.temp_dir, HISTORY_FILE), "w") as f:
+            f.write("{not json")
+
+        history = StepHistory(self.temp_dir)
+        history.record({"scan": 1.0})
+
+        self.assertEqual(StepHistory(self.temp_dir).expected("scan"), 1.0)
+
+
+class TestCleanerProgress(unittest.TestCase):
+    """Test the events published by run_deep_clean"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "Lab01")
+        generate_macos_fixture(self.root, file_count=50, users=("alice", "bob"))
+        patcher = patch(
+            "zoom_deep_clean.cleaner_enhanced.report_path_for_root",
+            return_value=os.path.join(self.temp_dir, "report.json"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_run_publishes_every_step_and_learns_durations(self):
+        from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
+
+        def cleaner():
+            return ZoomDeepCleanerEnhanced(
+                log_file=os.path.join(self.temp_dir, "clean.log"),
+                enable_backup=False,
+                dry_run=True,
+                target_root=self.root,
+                command_backend=ReplayBackend(interactions=[]),
+                step_history_dir=self.temp_dir,
+            )
+
+        first = cleaner()
+        events = []
+        first.progress.subscribe(events.append)
+        first.run_deep_clean()
+
+        started = [e.step for e in events if e.kind == STEP_STARTED]
+        self.assertEqual(started, [name for name, _ in first._progress_steps()])
+        fractions = [e.fraction for e in events]
+        self.assertEqual(fractions, sorted(fractions))
+        self.assertEqual(events[-1].kind, RUN_FINISHED)
+        user_items = [
+            e for e in events if e.kind == STEP_ITEMS and e.step == "user_data"
+        ]
+        self.assertEqual(user_items[-1].items_total, 2)
+
+        second = cleaner()
+        self.assertIsNotNone(second.progress.history.expected("user_data"))
+        self.assertEqual(second.progress.history.profile, "target_root")
+
+    def test_performance_monitor_records_steps(self):
+        from zoom_deep_clean.performance_monitoring import PerformanceMonitor
+
+        monitor = PerformanceMonitor(logging.getLogger("test"), False)
+        tracker = ProgressTracker(StepHistory(cache_dir=None))
+        tracker.subscribe(monitor.record_progress_event)
+
+        tracker.start_run(STEPS)
+        with tracker.step("scan"):
+            pass
+        tracker.finish_run()
+
+        self.assertEqual([m.operation_name for m in monitor.metrics], ["Scanning"])
+        self.assertTrue(monitor.metrics[0].success)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,331 @@
+#!/usr/bin/env python3
+"""
+Tests for the search index backends
+Spotlight and locate lookups, stale and excluded trees, and walk fallback
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from zoom_deep_clean.command_backend import ReplayBackend
+from zoom_deep_clean.performance_optimizations import AsyncFileScanner
+from zoom_deep_clean.search_backends import (
+    INDEX_MAX_AGE,
+    IndexedSearch,
+    LocateBackend,
+    SearchBackend,
+    SpotlightBackend,
+    build_find_command,
+)
+from zoom_deep_clean.synthetic_fixtures import generate_macos_fixture
+
+LOCATE_QUERY = ["plocate", "-i", "-b", "zoom"]
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("zoom")
+    return path
+
+
+def _stdout(paths):
+    return "".join(path + "\n" for path in paths)
+
+
+class _Clock:
+    def __init__(self, now):
+        self.now = now
+
+    def __call__(self):
+        return self.now
+
+
+class TestLocateSearch(unittest.TestCase):
+    """Test answering searches from the locate database"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.location = os.path.join(self.temp_dir, "home")
+        self.pruned = os.path.join(self.location, "scratch")
+        os.makedirs(self.pruned)
+        self.database = _touch(os.path.join(self.temp_dir, "plocate.db"))
+        self.conf = os.path.join(self.temp_dir, "updatedb.conf")
+        with open(self.conf, "w") as f:
+            f.write(f'PRUNE_BIND_MOUNTS="yes"\nPRUNEPATHS="/media {self.pruned}"\n')
+        self.clock = _Clock(os.path.getmtime(self.database) + 60)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _search(self, indexed):
+        self.replay = ReplayBackend(
+            interactions=[{"args": LOCATE_QUERY, "stdout": _stdout(indexed)}]
+        )
+        backend = LocateBackend(
+            self.replay,
+            databases=[self.database],
+            updatedb_conf=self.conf,
+            clock=self.clock,
+        )
+        return IndexedSearch([backend])
+
+    def test_fresh_index_answers_and_pruned_trees_are_walked(self):
+        config = _touch(os.path.join(self.location, ".config", "zoomus.conf"))
+        gone = os.path.join(self.location, ".cache", "zoom", "old.log")
+        in_pruned = _touch(os.path.join(self.pruned, "zoom.tmp"))
+        elsewhere = _touch(os.path.join(self.temp_dir, "other", "zoom.us"))
+        search = self._search([config, gone, in_pruned, elsewhere])
+
+        candidates, walk = search.lookup(self.location)
+
+        self.assertEqual(candidates, [config])
+        self.assertEqual(walk, [self.pruned])
+        stats = search.stats()
+        self.assertEqual(stats["backend"], "locate")
+        self.assertTrue(stats["index_fresh"])
+        self.assertEqual(stats["index_age_seconds"], 60.0)
+        self.assertEqual(stats["stale_entries"], 1)
+        self.assertEqual(stats["subtrees_walked"], 1)
+        self.assertEqual(stats["index_hit_rate"], 1.0)
+
+    def test_entries_created_after_updatedb_are_found(self):
+        indexed = _touch(os.path.join(self.location, ".config", "zoomus.conf"))
+        old = self.clock.now - 3600
+        for directory in (self.location, self.pruned, os.path.dirname(indexed)):
+            os.utime(directory, (old, old))
+        os.utime(self.database, (old + 60, old + 60))
+        # Installed since the database was built, below changed directories
+        _touch(os.path.join(self.location, ".zoom", "logs", "zoom.log"))
+        in_pruned = _touch(os.path.join(self.pruned, "zoom.tmp"))
+        search = self._search([indexed])
+
+        candidates, walk = search.lookup(self.location)
+
+        self.assertEqual(candidates, [indexed, os.path.join(self.location, ".zoom")])
+        self.assertEqual(walk, [self.pruned])
+        self.assertNotIn(in_pruned, candidates)
+        self.assertEqual(search.stats()["unindexed_entries"], 1)
+
+    def test_one_query_serves_every_location(self):
+        search = self._search([])
+
+        search.lookup(self.location)
+        search.lookup(os.path.join(self.temp_dir, "other"))
+
+        self.assertEqual(self.replay.calls, 1)
+
+    def test_stale_index_is_not_trusted(self):
+        self.clock.now += INDEX_MAX_AGE
+        search = self._search([])
+
+        self.assertEqual(search.lookup(self.location), (None, [self.location]))
+        self.assertEqual(self.replay.calls, 0)
+        stats = search.stats()
+        self.assertFalse(stats["index_fresh"])
+        self.assertEqual(stats["index_hit_rate"], 0.0)
+        self.assertEqual(
+            stats["walk_reasons"], {self.location: "locate index is stale"}
+        )
+
+    def test_pruned_location_is_walked(self):
+        search = self._search([])
+
+        self.assertEqual(search.lookup(self.pruned), (None, [self.pruned]))
+
+    def test_missing_database_means_walking(self):
+        search = IndexedSearch(
+            [LocateBackend(ReplayBackend(interactions=[]), databases=[])]
+        )
+
+        self.assertEqual(search.lookup(self.location), (None, [self.location]))
+        self.assertIsNone(search.stats()["backend"])
+
+
+class TestSpotlightSearch(unittest.TestCase):
+    """Test answering searches from Spotlight"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _backend(self, status="Indexing enabled.", found=()):
+        return SpotlightBackend(
+            ReplayBackend(
+                interactions=[
+                    {"args": ["mdutil", "-s", "/"], "stdout": f"/:\n\t{status}\n"},
+                    {
+                        "args": ["mdfind", "-onlyin", self.temp_dir, "-name", "zoom"],
+                        "stdout": _stdout(found),
+                    },
+                ]
+            )
+        )
+
+    def test_hidden_directories_are_walked(self):
+        app = _touch(os.path.join(self.temp_dir, "Applications", "zoom.us.app"))
+        os.makedirs(os.path.join(self.temp_dir, ".zoom"))
+        search = IndexedSearch([self._backend(found=[app])])
+
+        candidates, walk = search.lookup(self.temp_dir)
+
+        self.assertEqual(candidates, [app])
+        self.assertEqual(walk, [os.path.join(self.temp_dir, ".zoom")])
+
+    def test_unindexed_system_trees(self):
+        backend = self._backend()
+
+        self.assertEqual(backend.excluded_subtrees("/Library"), ["/Library"])
+        self.assertEqual(
+            backend.excluded_subtrees("/Users/alice/Library/Preferences"),
+            ["/Users/alice/Library/Preferences"],
+        )
+
+    def test_disabled_index_means_walking(self):
+        search = IndexedSearch([self._backend(status="Indexing disabled.")])
+
+        self.assertEqual(search.lookup(self.temp_dir), (None, [self.temp_dir]))
+        self.assertEqual(
+            search.stats()["walk_reasons"][self.temp_dir], "no search index available"
+        )
+
+    def test_incomplete_backend_cannot_be_created(self):
+        class Incomplete(SearchBackend):
+            def _probe(self):
+                return True
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+class TestCleanerIndexedSearch(unittest.TestCase):
+    """Test comprehensive_file_search on a live (replayed) system"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.location = os.path.join(self.temp_dir, "Applications")
+        self.zoom_file = _touch(os.path.join(self.location, "zoom.us.plist"))
+        self.bundle = os.path.join(self.location, "zoom.us.app")
+        _touch(os.path.join(self.bundle, "Contents", "Info.plist"))
+        # Spotlight lists the bundle but not the files inside it
+        self.binary = _touch(os.path.join(self.bundle, "Contents", "MacOS", "zoom.us"))
+        self.hidden = os.path.join(self.location, ".zoom")
+        os.makedirs(self.hidden)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _cleaner(self, **options):
+        from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
+
+        mdfind = ["mdfind", "-onlyin", self.location, "-name", "zoom"]
+        indexed = [self.zoom_file, self.bundle]
+        self.replay = ReplayBackend(
+            interactions=[
+                {"args": ["mdutil", "-s", "/"], "stdout": "/:\n\tIndexing enabled.\n"},
+                {"args": mdfind, "stdout": _stdout(indexed)},
+                {
+                    "args": build_find_command(self.bundle),
+                    "stdout": _stdout([self.binary]),
+                },
+            ]
+        )
+        cleaner = ZoomDeepCleanerEnhanced(
+            log_file=os.path.join(self.temp_dir, "clean.log"),
+            enable_backup=False,
+            dry_run=True,
+            command_backend=self.replay,
+            step_history_dir=None,
+            **options,
+        )
+        cleaner.logger.setLevel(logging.ERROR)
+        return cleaner
+
+    def _walked(self):
+        return [args[1] for args in self.replay.misses if args[0] == "find"]
+
+    def test_index_answers_and_only_excluded_subtrees_are_walked(self):
+        cleaner = self._cleaner()
+
+        found = cleaner.comprehensive_file_search([self.location])
+
+        # Zoom directories from the index are walked for their contents
+        self.assertEqual(found, [self.zoom_file, self.binary])
+        self.assertEqual(self._walked(), [self.hidden])
+        stats = cleaner.generate_report()["file_search"]
+        self.assertEqual(stats["backend"], "spotlight")
+        self.assertEqual(stats["locations_indexed"], 1)
+        self.assertEqual(stats["index_hit_rate"], 1.0)
+
+    def test_search_index_can_be_disabled(self):
+        cleaner = self._cleaner(use_search_index=False)
+
+        cleaner.comprehensive_file_search([self.location])
+
+        self.assertEqual(self._walked(), [self.location])
+        self.assertIsNone(cleaner.generate_report()["file_search"]["backend"])
+
+
+class TestAsyncScannerIndexedSearch(unittest.TestCase):
+    """Test that AsyncFileScanner finds the same files from an index"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.logger = logging.getLogger("test_search_backends")
+        self.logger.setLevel(logging.ERROR)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _scan(self, scanner, locations):
+        results = asyncio.run(scanner.scan_directories_parallel(locations))
+        return {result.path for result in results}
+
+    def test_index_results_match_a_full_walk(self):
+        root = os.path.join(self.temp_dir, "fixture")
+        manifest = generate_macos_fixture(
+            root, file_count=400, zoom_density=0.05, symlink_ratio=0.0
+        )
+        # What updatedb would have indexed: every name containing "zoom"
+        indexed = [
+            os.path.join(dirpath, name)
+            for dirpath, dirnames, filenames in os.walk(root)
+            for name in dirnames + filenames
+            if "zoom" in name.lower()
+        ]
+        database = _touch(os.path.join(self.temp_dir, "plocate.db"))
+        conf = os.path.join(self.temp_dir, "updatedb.conf")
+        with open(conf, "w") as f:
+            f.write('PRUNEPATHS="/media"\n')
+        backend = LocateBackend(
+            ReplayBackend(
+                interactions=[{"args": LOCATE_QUERY, "stdout": _stdout(indexed)}]
+            ),
+            databases=[database],
+            updatedb_conf=conf,
+        )
+        search = IndexedSearch([backend])
+
+        walked = self._scan(
+            AsyncFileScanner(self.logger, max_workers=2), manifest.search_locations
+        )
+        from_index = self._scan(
+            AsyncFileScanner(self.logger, max_workers=2, search=search),
+            manifest.search_locations,
+        )
+
+        self.assertGreater(len(walked), 0)
+        self.assertEqual(from_index, walked)
+        self.assertEqual(
+            search.stats()["locations_indexed"], len(manifest.search_locations)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+Tests for the shared SQLite cleanup engine
+Single-pass deletes, row backups, read-only dry runs and browser profiles
+"""
+
+import json
+import logging
+import os
+import shutil
+import sqlite3
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean import sqlite_cleaner
+from zoom_deep_clean.command_backend import ReplayBackend
+from zoom_deep_clean.sqlite_cleaner import (
+    SQLiteTarget,
+    browser_cookie_targets,
+    clean_database,
+    clean_databases,
+    tcc_target,
+)
+
+TCC_ROWS = [
+    ("kTCCServiceCamera", "us.zoom.xos", 2, b"\xfa\xde\x0c"),
+    ("kTCCServiceMicrophone", "US.ZOOM.XOS", 2, None),
+    ("kTCCServiceScreenCapture", "us.Zoom.ZoomClips", 0, None),
+    ("kTCCServiceCamera", "com.apple.FaceTime", 2, None),
+]
+
+
+def _create_tcc(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute(
+        "CREATE TABLE access (service TEXT, client TEXT, auth_value INTEGER, csreq BLOB)"
+    )
+    conn.executemany("INSERT INTO access VALUES (?, ?, ?, ?)", TCC_ROWS)
+    conn.commit()
+    conn.close()
+
+
+def _create_cookies(path, table, host_column):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    conn = sqlite3.connect(path)
+    conn.execute(f"CREATE TABLE {table} (name TEXT, {host_column} TEXT, value BLOB)")
+    conn.executemany(
+        f"INSERT INTO {table} VALUES (?, ?, ?)",
+        [
+            ("_zm_ssid", ".zoom.us", b"secret"),
+            ("_zm_lang", "ZOOM.US", b""),
+            ("sid", ".example.com", b"keep"),
+        ],
+    )
+    conn.commit()
+    conn.close()
+
+
+def _rows(path, table="access"):
+    conn = sqlite3.connect(path)
+    try:
+        return conn.execute(f"SELECT * FROM {table} ORDER BY rowid").fetchall()
+    finally:
+        conn.close()
+
+
+class TestCleanDatabase(unittest.TestCase):
+    """Test cleaning a single database"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.tcc = os.path.join(self.temp_dir, "TCC.db")
+        _create_tcc(self.tcc)
+        self.statements = []
+
+        real_connect = sqlite_cleaner.connect
+
+        def tracing_connect(*args, **kwargs):
+            conn = real_connect(*args, **kwargs)
+            conn.set_trace_callback(self.statements.append)
+            return conn
+
+        self.connect_patch = patch.object(sqlite_cleaner, "connect", tracing_connect)
+        self.connect_patch.start()
+
+    def tearDown(self):
+        self.connect_patch.stop()
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _table_statements(self):
+        return [sql for sql in self.statements if '"access"' in sql]
+
+    def test_single_pass_delete(self):
+        """Rows are matched case-insensitively and deleted in one statement"""
+        result = clean_database(tcc_target(self.tcc))
+
+        self.assertIsNone(result.error)
+        self.assertTrue(result.deleted)
+        self.assertEqual(
+            [row["client"] for row in result.rows],
+            ["us.zoom.xos", "US.ZOOM.XOS", "us.Zoom.ZoomClips"],
+        )
+        self.assertEqual(_rows(self.tcc), [TCC_ROWS[3]])
+
+        statements = self._table_statements()
+        self.assertEqual(len(statements), 1)
+        self.assertTrue(statements[0].startswith('DELETE FROM "access"'))
+
+    def test_only_deleted_rows_are_backed_up(self):
+        """The backup holds every column of the deleted rows, nothing else"""
+        backup_dir = os.path.join(self.temp_dir, "backup")
+
+        result = clean_database(tcc_target(self.tcc), backup_dir=backup_dir)
+
+        self.assertEqual(os.path.dirname(result.backup_path), backup_dir)
+        self.assertEqual(os.stat(result.backup_path).st_mode & 0o777, 0o600)
+        self.assertEqual(os.stat(backup_dir).st_mode & 0o777, 0o700)
+        with open(result.backup_path) as f:
+            backup = json.load(f)
+        self.assertEqual(
+            backup["columns"], ["service", "client", "auth_value", "csreq"]
+        )
+        self.assertEqual(len(backup["rows"]), 3)
+        self.assertEqual(backup["rows"][0][3], {"base64": "+t4M"})
+        self.assertEqual(os.listdir(backup_dir), [os.path.basename(result.backup_path)])
+
+    def test_no_backup_without_a_backup_dir(self):
+        """Deleted rows are never written next to the database"""
+        result = clean_database(tcc_target(self.tcc))
+
+        self.assertTrue(result.deleted)
+        self.assertIsNone(result.backup_path)
+        self.assertEqual(os.listdir(self.temp_dir), ["TCC.db"])
+
+    def test_without_returning_support(self):
+        """Older SQLite libraries get the same result in one transaction"""
+        with patch.object(sqlite_cleaner, "SUPPORTS_RETURNING", False):
+            result = clean_database(tcc_target(self.tcc))
+
+        self.assertEqual(result.matched, 3)
+        self.assertEqual(_rows(self.tcc), [TCC_ROWS[3]])
+
+    def test_dry_run_is_read_only(self):
+        """Dry runs report matches without writing or locking the database"""
+        with open(self.tcc, "rb") as f:
+            before = f.read()
+
+        for immutable in (False, True):
+            result = clean_database(
+                tcc_target(self.tcc), dry_run=True, immutable=immutable
+            )
+
+            self.assertEqual(result.matched, 3)
+            self.assertFalse(result.deleted)
+            self.assertIsNone(result.backup_path)
+
+        with open(self.tcc, "rb") as f:
+            self.assertEqual(f.read(), before)
+        self.assertFalse(any("DELETE" in sql for sql in self.statements))
+        self.assertEqual(os.listdir(self.temp_dir), ["TCC.db"])
+
+    def test_errors_are_reported(self):
+        """A database without the expected table is left untouched"""
+        target = SQLiteTarget(
+            path=self.tcc,
+            table="cookies",
+            match_column="host_key",
+            report_columns=("name",),
+        )
+
+        result = clean_database(target)
+
+        self.assertIn("no such table", result.error)
+        self.assertEqual(len(_rows(self.tcc)), 4)
+
+
+class TestBrowserCookies(unittest.TestCase):
+    """Test browser profile discovery and concurrent cleaning"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.home = os.path.join(self.temp_dir, "alice")
+        support = os.path.join(self.home, "Library", "Application Support")
+        self.chromium = [
+            os.path.join(support, "Google/Chrome/Default/Network/Cookies"),
+            os.path.join(support, "Google/Chrome/Profile 2/Cookies"),
+            os.path.join(support, "BraveSoftware/Brave-Browser/Default/Cookies"),
+            os.path.join(support, "Opera Software/com.operasoftware.Opera/Cookies"),
+        ]
+        for path in self.chromium:
+            _create_cookies(path, "cookies", "host_key")
+        self.firefox = os.path.join(
+            support, "Firefox", "Profiles", "abcd.default-release", "cookies.sqlite"
+        )
+        _create_cookies(self.firefox, "moz_cookies", "host")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_every_profile_is_found(self):
+        """Chromium-family profiles and Firefox profiles are enumerated"""
+        targets = browser_cookie_targets(self.home)
+
+        self.assertEqual(
+            sorted(target.path for target in targets),
+            sorted(self.chromium + [self.firefox]),
+        )
+        labels = {target.label for target in targets}
+        self.assertEqual(
+            labels, {"Chrome", "Brave-Browser", "com.operasoftware.Opera", "Firefox"}
+        )
+
+    def test_all_profiles_cleaned(self):
+        """Zoom cookies are removed from every profile"""
+        results = clean_databases(browser_cookie_targets(self.home), max_workers=3)
+
+        self.assertEqual([result.matched for result in results], [2] * 5)
+        for path in self.chromium:
+            self.assertEqual(_rows(path, "cookies"), [("sid", ".example.com", b"keep")])
+        self.assertEqual(
+            _rows(self.firefox, "moz_cookies"), [("sid", ".example.com", b"keep")]
+        )
+
+    def test_lookalike_domains_survive(self):
+        """Only Zoom domains and their subdomains match, not substrings"""
+        conn = sqlite3.connect(self.firefox)
+        conn.executemany(
+            "INSERT INTO moz_cookies VALUES (?, ?, ?)",
+            [
+                ("_zi", ".zoominfo.com", b"keep"),
+                ("earth", "zoom.earth", b"keep"),
+                ("car", "www.zoomcar.com", b"keep"),
+                ("sub", "us02web.Zoom.US", b"secret"),
+                ("com", ".zoom.com", b"secret"),
+            ],
+        )
+        conn.commit()
+        conn.close()
+
+        (result,) = clean_databases(
+            [t for t in browser_cookie_targets(self.home) if t.label == "Firefox"]
+        )
+
+        self.assertEqual(result.matched, 4)
+        self.assertEqual(
+            [row[1] for row in _rows(self.firefox, "moz_cookies")],
+            [".example.com", ".zoominfo.com", "zoom.earth", "www.zoomcar.com"],
+        )
+
+    def test_auth_cleaner_uses_all_profiles(self):
+        """AuthTokenCleaner cleans cookies beyond Chrome's Default profile"""
+        from zoom_deep_clean.auth_token_cleaner import AuthTokenCleaner
+
+        cleaner = AuthTokenCleaner(
+            user_home=self.home, command_backend=ReplayBackend(interactions=[])
+        )
+        cleaner._clean_browser_auth_data()
+
+        self.assertEqual(
+            len([item for item in cleaner.cleaned_items if "cookies" in item]), 5
+        )
+        self.assertEqual(len(_rows(self.firefox, "moz_cookies")), 1)
+
+
+class TestTCCCleanup(unittest.TestCase):
+    """Test DeepSystemCleaner's TCC cleanup through the shared engine"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "Lab01")
+        self.tcc_paths = [
+            os.path.join(self.root, "Library/Application Support/com.apple.TCC/TCC.db"),
+            os.path.join(
+                self.root,
+                "Users/alice/Library/Application Support/com.apple.TCC/TCC.db",
+            ),
+        ]
+        for path in self.tcc_paths:
+            _create_tcc(path)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _cleaner(self, dry_run, replay, backup_dir=None):
+        from zoom_deep_clean.deep_system_cleaner import DeepSystemCleaner
+
+        return DeepSystemCleaner(
+            logger=logging.getLogger(__name__),
+            dry_run=dry_run,
+            command_backend=replay,
+            target_root=self.root,
+            backup_dir=backup_dir,
+        )
+
+    def test_offline_tcc_cleanup(self):
+        """System and user TCC databases are cleaned without tccutil"""
+        replay = ReplayBackend(interactions=[])
+
+        cleared = self._cleaner(False, replay)._clear_tcc_zoom_entries()
+
+        self.assertEqual(cleared, 6)
+        for path in self.tcc_paths:
+            self.assertEqual(_rows(path), [TCC_ROWS[3]])
+        self.assertEqual(replay.misses, [])
+
+    def test_removed_rows_go_to_the_backup_dir(self):
+        """With backups enabled the rows land in the private backup directory"""
+        backup_dir = os.path.join(self.temp_dir, "backup")
+
+        self._cleaner(
+            False, ReplayBackend(interactions=[]), backup_dir
+        )._clear_tcc_zoom_entries()
+
+        self.assertEqual(len(os.listdir(backup_dir)), 2)
+        for path in self.tcc_paths:
+            self.assertEqual(os.listdir(os.path.dirname(path)), ["TCC.db"])
+
+    def test_offline_dry_run(self):
+        """Dry runs count entries and leave the databases alone"""
+        cleaner = self._cleaner(True, ReplayBackend(interactions=[]))
+
+        cleared = cleaner._clear_tcc_zoom_entries()
+
+        self.assertEqual(cleared, 6)
+        for path in self.tcc_paths:
+            self.assertEqual(len(_rows(path)), 4)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,171 @@
+#!/usr/bin/env python3
+"""
+Tests for the per-run stat cache
+Caching, invalidation and the syscalls issued by _remove_path
+"""
+
+import os
+import shutil
+import tempfile
+import time
+import unittest
+
+from zoom_deep_clean.command_backend import ReplayBackend
+from zoom_deep_clean.stat_cache import StatCache
+
+
+class TestStatCache(unittest.TestCase):
+    """Test the lstat cache itself"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.file = os.path.join(self.temp_dir, "zoom.us", "data", "zoomus.enc.db")
+        os.makedirs(os.path.dirname(self.file))
+        with open(self.file, "wb") as f:
+            f.write(b"zoom.us")
+        self.cache = StatCache()
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_one_lstat_per_path(self):
+        """Repeated queries are answered from the cache"""
+        self.assertTrue(self.cache.exists(self.file))
+        self.assertTrue(self.cache.is_file(self.file))
+        self.assertFalse(self.cache.is_dir(self.file))
+        self.assertEqual(self.cache.size(self.file), 7)
+
+        stats = self.cache.stats()
+        self.assertEqual(stats["lstat"], 1)
+        self.assertEqual(stats["cache_hits"], 3)
+        self.assertEqual(stats["syscalls"], 1)
+
+    def test_missing_paths_are_cached(self):
+        """A missing path is looked up once"""
+        missing = os.path.join(self.temp_dir, "missing")
+
+        self.assertFalse(self.cache.exists(missing))
+        self.assertEqual(self.cache.size(missing), 0)
+        self.assertEqual(self.cache.stats()["lstat"], 1)
+
+    def test_invalidate_drops_descendants(self):
+        """Invalidating a directory forgets everything below it"""
+        directory = os.path.join(self.temp_dir, "zoom.us")
+        self.cache.exists(directory)
+        self.cache.exists(self.file)
+        sibling = os.path.join(self.temp_dir, "zoom.us.other")
+        self.cache.exists(sibling)
+
+        shutil.rmtree(directory)
+        self.cache.invalidate(directory)
+
+        self.assertFalse(self.cache.exists(directory))
+        self.assertFalse(self.cache.exists(self.file))
+        self.assertFalse(self.cache.exists(sibling))
+        # the sibling sharing the name prefix stayed cached
+        self.assertEqual(self.cache.stats()["lstat"], 5)
+
+    def test_invalidate_visits_only_the_subtree(self):
+        """Invalidations stay cheap however many paths are cached"""
+        paths = [
+            os.path.join(self.temp_dir, f"dir{index % 100}", f"entry{index}")
+            for index in range(20000)
+        ]
+        for path in paths:
+            self.cache.exists(path)
+
+        started = time.monotonic()
+        for path in paths[::2]:
+            self.cache.invalidate(path)
+        self.cache.invalidate(os.path.join(self.temp_dir, "dir1"))
+        elapsed = time.monotonic() - started
+
+        # A scan of every cached key per call takes tens of seconds here
+        self.assertLess(elapsed, 2.0)
+        self.assertEqual(len(self.cache._entries), 9800)
+        self.assertNotIn(paths[1], self.cache._entries)
+        self.assertIn(paths[3], self.cache._entries)
+
+    def test_dangling_symlink_exists(self):
+        """lstat sees links whose target is gone"""
+        link = os.path.join(self.temp_dir, "zoom.link")
+        os.symlink(os.path.join(self.temp_dir, "nowhere"), link)
+
+        self.assertTrue(self.cache.exists(link))
+        self.assertTrue(self.cache.is_symlink(link))
+        self.assertFalse(self.cache.is_file(link))
+
+
+class TestRemovePathSyscalls(unittest.TestCase):
+    """Test that the cleaner's removal pipeline shares one lstat per path"""
+
+    def setUp(self):
+        from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
+
+        self.temp_dir = tempfile.mkdtemp()
+        self.zoom_dir = os.path.join(self.temp_dir, "Application Support", "zoom.us")
+        os.makedirs(self.zoom_dir)
+        self.zoom_file = os.path.join(self.zoom_dir, "us.zoom.xos.plist")
+        with open(self.zoom_file, "wb") as f:
+            f.write(b"us.zoom.xos")
+
+        self.replay = ReplayBackend(interactions=[])
+        self.cleaner = ZoomDeepCleanerEnhanced(
+            log_file=os.path.join(self.temp_dir, "clean.log"),
+            enable_backup=False,
+            enable_advanced_features=False,
+            command_backend=self.replay,
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_file_removal_uses_one_lstat(self):
+        """Existence, verification and removal share one lstat"""
+        self.assertTrue(self.cleaner._remove_path(self.zoom_file))
+
+        stats = self.cleaner.stat_cache.stats()
+        self.assertFalse(os.path.exists(self.zoom_file))
+        self.assertEqual(stats["lstat"], 1)
+        self.assertEqual(stats["open"], 1)
+        self.assertEqual(stats["unlink"], 1)
+        self.assertFalse(self.cleaner.stat_cache.exists(self.zoom_file))
+
+    def test_backup_and_directory_removal(self):
+        """Backups reuse the cached lstat and removal invalidates the subtree"""
+        self.cleaner.enable_backup = True
+        self.cleaner.backup_dir = os.path.join(self.temp_dir, "backup")
+        self.cleaner.stat_cache.exists(self.zoom_file)
+
+        self.assertTrue(self.cleaner._remove_path(self.zoom_dir))
+
+        stats = self.cleaner.stat_cache.stats()
+        self.assertEqual(stats["copytree"], 1)
+        self.assertEqual(stats["rmtree"], 1)
+        self.assertEqual(stats["lstat"], 2)
+        self.assertFalse(self.cleaner.stat_cache.exists(self.zoom_file))
+        self.assertEqual(self.cleaner.cleanup_stats["files_backed_up"], 1)
+
+    def test_symlink_removed_not_target(self):
+        """A symlinked Zoom directory is unlinked, its target is kept"""
+        link = os.path.join(self.temp_dir, "zoom.us.link")
+        os.symlink(self.zoom_dir, link)
+
+        self.assertTrue(self.cleaner._remove_path(link))
+
+        self.assertFalse(os.path.lexists(link))
+        self.assertTrue(os.path.isfile(self.zoom_file))
+
+    def test_commands_invalidate_their_paths(self):
+        """Paths passed to external commands are re-checked afterwards"""
+        self.cleaner.stat_cache.exists(self.zoom_file)
+
+        self.cleaner._run_command(["rm", "-f", self.zoom_file], "Removing file")
+
+        self.assertEqual(self.replay.misses, [["rm", "-f", self.zoom_file]])
+        self.cleaner.stat_cache.exists(self.zoom_file)
+        self.assertEqual(self.cleaner.stat_cache.stats()["lstat"], 2)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,170 @@
+#!/usr/bin/env python3
+"""
+Tests for the synthetic macOS fixture generator
+Determinism, layout and scanner compatibility of generated trees
+"""
+
+import asyncio
+import logging
+import os
+import shutil
+import tempfile
+import unittest
+
+from zoom_deep_clean.synthetic_fixtures import (
+    CANONICAL_SYSTEM_ARTIFACTS,
+    CANONICAL_USER_ARTIFACTS,
+    FixtureSpec,
+    generate_macos_fixture,
+)
+from zoom_deep_clean.performance_optimizations import AsyncFileScanner
+
+
+def _relative_tree(root):
+    """Sorted list of all entries below root, relative to it"""
+    entries = []
+    for dirpath, dirnames, filenames in os.walk(root):
+        for name in dirnames + filenames:
+            entries.append(os.path.relpath(os.path.join(dirpath, name), root))
+    return sorted(entries)
+
+
+class TestFixtureGenerator(unittest.TestCase):
+    """Test fixture tree generation"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.logger = logging.getLogger("test_synthetic_fixtures")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _root(self, name):
+        return os.path.join(self.temp_dir, name)
+
+    def test_generation_is_deterministic(self):
+        """Same seed and spec produce identical trees"""
+        spec = FixtureSpec(file_count=500, depth=3, zoom_density=0.05, seed=7)
+        generate_macos_fixture(self._root("a"), spec)
+        generate_macos_fixture(self._root("b"), spec)
+
+        self.assertEqual(
+            _relative_tree(self._root("a")), _relative_tree(self._root("b"))
+        )
+
+    def test_different_seeds_differ(self):
+        """Different seeds produce different trees"""
+        generate_macos_fixture(self._root("a"), file_count=300, seed=1)
+        generate_macos_fixture(self._root("b"), file_count=300, seed=2)
+
+        self.assertNotEqual(
+            _relative_tree(self._root("a")), _relative_tree(self._root("b"))
+        )
+
+    def test_macos_layout_and_canonical_artifacts(self):
+        """Skeleton directories and well-known artifacts are created"""
+        root = self._root("layout")
+        manifest = generate_macos_fixture(root, file_count=100, users=("alice", "bob"))
+
+        for rel in ["private/var/folders", "private/var/db/receipts"]:
+            self.assertTrue(os.path.isdir(os.path.join(root, rel)))
+        for user in ("alice", "bob"):
+            for rel in ["Library/Containers", "Library/Group Containers"]:
+                self.assertTrue(os.path.isdir(os.path.join(root, "Users", user, rel)))
+
+        for rel in CANONICAL_SYSTEM_ARTIFACTS:
+            self.assertTrue(os.path.isfile(os.path.join(root, rel)))
+        for rel in CANONICAL_USER_ARTIFACTS:
+            path = os.path.join(root, rel.format(user="bob"))
+            self.assertTrue(os.path.isfile(path))
+            self.assertIn(path, manifest.zoom_paths)
+
+    def test_counts_and_zoom_density(self):
+        """Manifest counts match the requested spec"""
+        manifest = generate_macos_fixture(
+            self._root("counts"), file_count=1000, zoom_density=0.1
+        )
+        canonical = len(CANONICAL_SYSTEM_ARTIFACTS) + len(CANONICAL_USER_ARTIFACTS)
+
+        self.assertEqual(manifest.files_created, 1000 + canonical)
+        self.assertEqual(manifest.zoom_files_created, 100 + canonical)
+        self.assertEqual(len(manifest.zoom_paths), manifest.zoom_files_created)
+        for path in manifest.zoom_paths:
+            self.assertTrue(os.path.exists(path))
+
+    def test_depth_is_respected(self):
+        """Generated directories never exceed the requested depth"""
+        root = self._root("depth")
+        generate_macos_fixture(root, file_count=2000, depth=2, files_per_directory=4)
+        base = os.path.join(root, "private", "var", "db", "receipts")
+
+        for dirpath, _, _ in os.walk(base):
+            self.assertLessEqual(os.path.relpath(dirpath, base).count(os.sep), 1)
+
+    def test_symlinks_do_not_create_cycles(self):
+        """Following every symlink terminates"""
+        root = self._root("links")
+        manifest = generate_macos_fixture(root, file_count=400, symlink_ratio=0.2)
+
+        self.assertGreater(manifest.symlinks_created, 0)
+        walked = sum(len(files) for _, _, files in os.walk(root, followlinks=True))
+        self.assertGreater(walked, 0)
+
+    def test_invalid_spec_rejected(self):
+        """Out-of-range options raise errors"""
+        with self.assertRaises(ValueError):
+            generate_macos_fixture(self._root("bad"), zoom_density=1.5)
+        for depth in (0, -1):
+            with self.assertRaises(ValueError):
+                generate_macos_fixture(self._root("bad"), file_count=500, depth=depth)
+        with self.assertRaises(TypeError):
+            generate_macos_fixture(self._root("bad"), not_an_option=1)
+
+    def test_async_file_scanner_finds_fixture_artifacts(self):
+        """AsyncFileScanner discovers the generated Zoom files"""
+        manifest = generate_macos_fixture(
+            self._root("scan"), file_count=500, zoom_density=0.05
+        )
+        scanner = AsyncFileScanner(self.logger, max_workers=2)
+
+        results = asyncio.run(
+            scanner.scan_directories_parallel(manifest.search_locations)
+        )
+        found = {result.path for result in results}
+
+        self.assertTrue(
+            os.path.join(
+                manifest.root, "Library", "LaunchAgents", "us.zoom.updater.plist"
+            )
+            in found
+        )
+        self.assertGreater(len(found & set(manifest.zoom_paths)), 0)
+
+    @unittest.skipUnless(shutil.which("find"), "find not available")
+    def test_find_search_matches_fixture(self):
+        """The find-based comprehensive search sees fixture artifacts"""
+        from zoom_deep_clean.cleaner_enhanced import find_zoom_files
+
+        manifest = generate_macos_fixture(self._root("find"), file_count=200)
+        found = []
+        for location in manifest.search_locations:
+            files, _ = find_zoom_files(location)
+            found.extend(files)
+
+        self.assertIn(
+            os.path.join(
+                manifest.root,
+                "Users",
+                "fixtureuser",
+                "Library",
+                "Application Support",
+                "zoom.us",
+                "data",
+                "zoomus.enc.db",
+            ),
+            found,
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,183 @@
+#!/usr/bin/env python3
+"""
+Tests for target-root mode
+Path re-basing and offline cleaning of fixture volumes
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean.command_backend import (
+    BACKEND_ENV_VAR,
+    CASSETTE_VERSION,
+    ReplayBackend,
+    set_default_backend,
+)
+from zoom_deep_clean.synthetic_fixtures import generate_macos_fixture
+from zoom_deep_clean.target_root import (
+    TargetRootBatch,
+    clean_target_root,
+    rebase_path,
+    report_path_for_root,
+    virtual_path,
+)
+
+
+class TestPathRebasing(unittest.TestCase):
+    """Test mapping live-system paths onto a target root"""
+
+    def test_rebase_path(self):
+        """Absolute paths move under the root, everything else is unchanged"""
+        self.assertEqual(
+            rebase_path("/Library/LaunchAgents", "/Volumes/Lab01"),
+            "/Volumes/Lab01/Library/LaunchAgents",
+        )
+        self.assertEqual(
+            rebase_path("/Volumes/Lab01/Users", "/Volumes/Lab01"),
+            "/Volumes/Lab01/Users",
+        )
+        self.assertEqual(
+            rebase_path("relative/path", "/Volumes/Lab01"), "relative/path"
+        )
+        self.assertEqual(rebase_path("/Library", None), "/Library")
+
+    def test_virtual_path(self):
+        """Target-root paths map back to the live path they stand for"""
+        self.assertEqual(
+            virtual_path("/Volumes/Lab01/System/Library", "/Volumes/Lab01"),
+            "/System/Library",
+        )
+        self.assertEqual(virtual_path("/Volumes/Lab01", "/Volumes/Lab01"), "/")
+        self.assertEqual(
+            virtual_path("/Volumes/Lab010", "/Volumes/Lab01"), "/Volumes/Lab010"
+        )
+
+    def test_report_paths_are_unique_per_root(self):
+        """Roots with the same name never share a report file"""
+        self.assertNotEqual(
+            report_path_for_root("/Volumes/a/Macintosh HD"),
+            report_path_for_root("/Volumes/b/Macintosh HD"),
+        )
+
+
+class TestTargetRootCleaning(unittest.TestCase):
+    """Test cleaning fixture volumes offline"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "Lab01")
+        generate_macos_fixture(self.root, file_count=50, users=("alice", "bob"))
+
+        # Replay an empty cassette so no external command is ever executed,
+        # in this process or in the pool workers
+        cassette = os.path.join(self.temp_dir, "empty.json")
+        with open(cassette, "w") as f:
+            json.dump({"version": CASSETTE_VERSION, "interactions": []}, f)
+        self.env_patch = patch.dict(os.environ, {BACKEND_ENV_VAR: f"replay:{cassette}"})
+        self.env_patch.start()
+        set_default_backend(None)
+
+        # Keep per-root reports out of the real ~/Documents
+        self.report_patch = patch(
+            "zoom_deep_clean.cleaner_enhanced.report_path_for_root",
+            side_effect=lambda root: os.path.join(
+                self.temp_dir, os.path.basename(root) + "_report.json"
+            ),
+        )
+        self.report_patch.start()
+
+        self.options = {
+            "log_file": os.path.join(self.temp_dir, "clean.log"),
+            "enable_backup": False,
+        }
+
+    def tearDown(self):
+        self.report_patch.stop()
+        self.env_patch.stop()
+        set_default_backend(None)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _artifacts(self, root):
+        return [
+            os.path.join(root, "Library", "LaunchAgents", "us.zoom.updater.plist"),
+            os.path.join(
+                root, "Users", "alice", "Library", "Application Support", "zoom.us"
+            ),
+            os.path.join(
+                root, "Users", "bob", "Library", "Application Support", "zoom.us"
+            ),
+        ]
+
+    def test_clean_target_root_removes_artifacts(self):
+        """User data is removed and system commands target the root"""
+        replay = ReplayBackend(interactions=[])
+        result = clean_target_root(
+            self.root, dict(self.options, command_backend=replay)
+        )
+
+        self.assertNotIn("error", result)
+        self.assertGreater(result["statistics"]["directories_removed"], 0)
+        for path in self._artifacts(self.root)[1:]:
+            self.assertFalse(os.path.exists(path), path)
+        self.assertEqual(os.path.dirname(result["report_file"]), self.temp_dir)
+
+        # Nothing outside the root is touched and nothing is unloaded
+        commands = [" ".join(args) for args in replay.misses]
+        self.assertIn(f"sudo rm -f {self._artifacts(self.root)[0]}", commands)
+        self.assertFalse(any(cmd.startswith("sudo launchctl") for cmd in commands))
+        self.assertFalse(any(cmd.startswith("security") for cmd in commands))
+
+    def test_dry_run_leaves_artifacts(self):
+        """Dry run does not remove anything inside the root"""
+        clean_target_root(self.root, dict(self.options, dry_run=True))
+
+        for path in self._artifacts(self.root):
+            self.assertTrue(os.path.exists(path), path)
+
+    def test_dangerous_paths_inside_root_rejected(self):
+        """System paths inside the image are protected like live ones"""
+        from zoom_deep_clean.cleaner_enhanced import (
+            SecurityError,
+            ZoomDeepCleanerEnhanced,
+        )
+
+        cleaner = ZoomDeepCleanerEnhanced(target_root=self.root, **self.options)
+
+        with self.assertRaises(SecurityError):
+            cleaner._validate_path(os.path.join(self.root, "System", "Library"))
+        self.assertFalse(cleaner.live_system)
+
+    def test_batch_cleans_several_roots(self):
+        """Every root is processed and missing roots are reported"""
+        second = os.path.join(self.temp_dir, "Lab02")
+        generate_macos_fixture(second, file_count=20, users=("carol",))
+        missing = os.path.join(self.temp_dir, "missing")
+
+        batch = TargetRootBatch(
+            [self.root, second, missing], max_workers=2, **self.options
+        )
+        batch.run()
+
+        report = batch.generate_report()
+        self.assertEqual(report["roots_cleaned"], 2)
+        self.assertEqual(report["roots_failed"], [missing])
+        self.assertFalse(
+            os.path.exists(
+                os.path.join(
+                    second,
+                    "Users",
+                    "carol",
+                    "Library",
+                    "Application Support",
+                    "zoom.us",
+                )
+            )
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
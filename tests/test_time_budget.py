@@ -0,0 +1,210 @@
+#!/usr/bin/env python3
+"""
+Tests for the run-wide time budget
+Priority order, per-step shares, skipped steps and the cleaner's report
+"""
+
+import json
+import os
+import shutil
+import tempfile
+import time
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean.command_backend import ReplayBackend
+from zoom_deep_clean.progress_events import STEP_STARTED
+from zoom_deep_clean.synthetic_fixtures import generate_macos_fixture
+from zoom_deep_clean.time_budget import MIN_COMMAND_TIMEOUT, TimeBudget, prioritise
+
+
+class _Clock:
+    def __init__(self):
+        self.now = 100.0
+
+    def __call__(self):
+        return self.now
+
+
+class TestPrioritise(unittest.TestCase):
+    """Test the order steps run in under a budget"""
+
+    def test_high_value_artifacts_first_broad_scans_last(self):
+        names = [
+            "stop_processes",
+            "remove_applications",
+            "auth_tokens",
+            "launch_agents",
+            "user_data",
+            "fingerprint_stores",
+            "deep_system",
+            "file_search",
+            "fingerprint_verification",
+            "report",
+            "reboot",
+        ]
+
+        order = prioritise(names)
+
+        # Keychain entries and zoomus.enc.db are user data, but go first
+        self.assertEqual(
+            order[:5],
+            [
+                "stop_processes",
+                "fingerprint_stores",
+                "auth_tokens",
+                "deep_system",
+                "launch_agents",
+            ],
+        )
+        self.assertEqual(order[-3:], ["file_search", "report", "reboot"])
+        self.assertLess(order.index("user_data"), order.index("remove_applications"))
+
+
+class TestTimeBudget(unittest.TestCase):
+    """Test handing out the deadline step by step"""
+
+    def setUp(self):
+        self.clock = _Clock()
+        self.budget = TimeBudget(100, clock=self.clock)
+        self.budget.start()
+
+    def test_share_follows_expected_durations(self):
+        """A step expected to take 3 of 4 pending seconds gets 75% of the time"""
+        self.assertTrue(self.budget.begin_step("scan", 3.0, 4.0))
+
+        self.assertAlmostEqual(
+            self.budget.timeout(1000), 0.75 * (100 - self.budget.reserve)
+        )
+        self.assertEqual(self.budget.timeout(30), 30)
+
+    def test_unused_time_rolls_over(self):
+        self.budget.begin_step("quick", 1.0, 2.0)
+        self.clock.now += 1
+        self.budget.end_step()
+
+        self.budget.begin_step("slow", 1.0, 1.0)
+
+        self.assertAlmostEqual(self.budget.timeout(1000), 99 - self.budget.reserve)
+        self.assertEqual(self.budget.completed[0]["elapsed"], 1.0)
+        self.assertFalse(self.budget.completed[0]["overran"])
+
+    def test_exhausted_budget_skips_steps(self):
+        self.budget.begin_step("scan", 1.0, 2.0)
+        self.clock.now += 99
+        self.assertTrue(self.budget.step_expired())
+        self.assertEqual(self.budget.timeout(30), MIN_COMMAND_TIMEOUT)
+        self.budget.end_step()
+
+        self.assertFalse(self.budget.begin_step("file_search", 1.0, 1.0, "Searching"))
+
+        report = self.budget.report()
+        self.assertTrue(report["exhausted"])
+        self.assertEqual(report["skipped"][0]["step"], "file_search")
+        self.assertEqual(report["skipped"][0]["label"], "Searching")
+        self.assertTrue(report["steps"][0]["overran"])
+
+    def test_start_resets(self):
+        self.budget.begin_step("scan", 1.0, 1.0)
+        self.budget.cut("stopped early")
+        self.budget.end_step()
+
+        self.budget.start()
+
+        self.assertEqual(self.budget.report()["steps"], [])
+        self.assertEqual(self.budget.report()["cut_short"], [])
+
+    def test_positive_budget_required(self):
+        with self.assertRaises(ValueError):
+            TimeBudget(0)
+
+
+class TestCleanerTimeBudget(unittest.TestCase):
+    """Test a budgeted target-root run"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "Lab01")
+        generate_macos_fixture(self.root, file_count=20, users=("alice",))
+        self.report_file = os.path.join(self.temp_dir, "report.json")
+        patcher = patch(
+            "zoom_deep_clean.cleaner_enhanced.report_path_for_root",
+            return_value=self.report_file,
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _cleaner(self, time_budget):
+        from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
+
+        return ZoomDeepCleanerEnhanced(
+            log_file=os.path.join(self.temp_dir, "clean.log"),
+            enable_backup=False,
+            dry_run=True,
+            target_root=self.root,
+            command_backend=ReplayBackend(interactions=[]),
+            step_history_dir=None,
+            time_budget=time_budget,
+        )
+
+    def _report(self):
+        with open(self.report_file) as f:
+            return json.load(f)
+
+    def test_steps_run_in_priority_order(self):
+        cleaner = self._cleaner(600)
+        events = []
+        cleaner.progress.subscribe(events.append)
+
+        cleaner.run_deep_clean()
+
+        started = [e.step for e in events if e.kind == STEP_STARTED]
+        self.assertEqual(started, [name for name, _ in cleaner._progress_steps()])
+        self.assertEqual(started[:2], ["fingerprint_stores", "deep_system"])
+        self.assertEqual(started[-2:], ["file_search", "report"])
+        budget = self._report()["time_budget"]
+        self.assertEqual(budget["skipped"], [])
+        self.assertEqual(len(budget["steps"]), len(started) - 1)
+
+    def test_exhausted_budget_skips_low_value_steps(self):
+        cleaner = self._cleaner(0.5)
+        slow_step = lambda: time.sleep(0.6) or {}
+
+        with patch.object(
+            cleaner.deep_system_cleaner, "clean_deep_system_artifacts", slow_step
+        ), patch.object(cleaner, "comprehensive_file_search") as search:
+            cleaner.run_deep_clean()
+
+        search.assert_not_called()
+        budget = self._report()["time_budget"]
+        self.assertTrue(budget["exhausted"])
+        skipped = [entry["step"] for entry in budget["skipped"]]
+        self.assertEqual(skipped[-1], "file_search")
+        self.assertIn("launch_agents", skipped)
+        self.assertEqual(
+            [entry["step"] for entry in budget["steps"]],
+            ["fingerprint_stores", "deep_system"],
+        )
+
+    def test_file_search_is_cut_off(self):
+        clock = _Clock()
+        cleaner = self._cleaner(None)
+        cleaner.time_budget = TimeBudget(10, clock=clock)
+        cleaner.time_budget.start()
+        cleaner.time_budget.begin_step("file_search", 1.0, 1.0)
+        clock.now += 20
+
+        found = cleaner.comprehensive_file_search([self.root, self.temp_dir])
+
+        self.assertEqual(found, [])
+        self.assertEqual(
+            cleaner.time_budget.cut_short,
+            [{"step": "file_search", "detail": "2 of 2 search locations not searched"}],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
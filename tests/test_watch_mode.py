@@ -0,0 +1,376 @@
+#!/usr/bin/env python3
+"""
+Tests for watch mode
+Rule matching of single paths, event sources, debouncing and removal of
+artifacts that reappear while watching
+"""
+
+import logging
+import os
+import shutil
+import sys
+import tempfile
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+from zoom_deep_clean.artifact_rules import CompiledRuleSet
+from zoom_deep_clean.cancellation import CancellationToken
+from zoom_deep_clean.command_backend import ReplayBackend
+from zoom_deep_clean.synthetic_fixtures import generate_macos_fixture
+from zoom_deep_clean.watch_mode import (
+    ArtifactWatcher,
+    EventSource,
+    InotifySource,
+    PollingSource,
+)
+
+
+def _touch(path):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w") as f:
+        f.write("zoom")
+    return path
+
+
+def _until(condition, timeout=5.0):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        if condition():
+            return True
+        time.sleep(0.02)
+    return condition()
+
+
+class TestRuleMatch(unittest.TestCase):
+    """Test matching single paths against the compiled rules"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.rules = CompiledRuleSet.compile()
+        self.home = os.path.join(self.temp_dir, "Users", "alice")
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _match(self, relative):
+        return self.rules.match("user", self.home, os.path.join(self.home, relative))
+
+    def test_paths(self):
+        self.assertEqual(
+            self._match("Library/Preferences/us.zoom.xos.plist"),
+            (["preferences"], False),
+        )
+        # Case-insensitive like resolve, globs included
+        self.assertEqual(
+            self._match("Library/Group Containers/ABC.us.zoom/Zoom/data/zoomus.enc.db")[
+                0
+            ],
+            ["auth_databases"],
+        )
+        self.assertEqual(
+            self._match("library/caches/US.ZOOM.XOS")[0], ["application_data"]
+        )
+        self.assertEqual(self._match("Library/Application Support"), ([], True))
+        self.assertEqual(
+            self._match("Library/Preferences/com.apple.finder.plist"), ([], False)
+        )
+        self.assertEqual(
+            self.rules.match("user", self.home, os.path.join(self.temp_dir, "zoom.us")),
+            ([], False),
+        )
+
+    def test_agrees_with_resolve(self):
+        root = os.path.join(self.temp_dir, "fixture")
+        generate_macos_fixture(root, file_count=50, users=("alice",))
+        home = os.path.join(root, "Users", "alice")
+
+        resolved = self.rules.resolve("user", home)
+
+        self.assertTrue(resolved)
+        for category, paths in resolved.items():
+            for path in paths:
+                self.assertIn(category, self.rules.match("user", home, path)[0])
+
+
+class _SourceTests:
+    """Behaviour shared by the event sources"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.source = self.make_source()
+        self.addCleanup(self.source.close)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _wait_for(self, path, timeout=3.0):
+        deadline = time.monotonic() + timeout
+        changed = []
+        while path not in changed and time.monotonic() < deadline:
+            changed += self.source.wait(deadline - time.monotonic())
+        return changed
+
+    def test_reports_created_entries(self):
+        self.assertTrue(self.source.add(self.temp_dir))
+        self.assertFalse(self.source.add(self.temp_dir))
+
+        created = _touch(os.path.join(self.temp_dir, "zoom.us.plist"))
+
+        self.assertIn(created, self._wait_for(created))
+
+    def test_wake_interrupts_a_blocked_wait(self):
+        self.source.add(self.temp_dir)
+        threading.Timer(0.1, self.source.wake).start()
+
+        started = time.monotonic()
+        self.assertEqual(self.source.wait(None), [])
+        self.assertLess(time.monotonic() - started, 2)
+
+    def test_removed_directory_is_no_longer_watched(self):
+        directory = os.path.join(self.temp_dir, "Preferences")
+        os.makedirs(directory)
+        self.source.add(directory)
+
+        os.rmdir(directory)
+        self.source.wait(0.3)
+
+        self.assertNotIn(directory, self.source.directories)
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+class TestInotifySource(_SourceTests, unittest.TestCase):
+    def make_source(self):
+        return InotifySource()
+
+
+class TestPollingSource(_SourceTests, unittest.TestCase):
+    def make_source(self):
+        return PollingSource(interval=0.05)
+
+
+class _ScriptedSource(EventSource):
+    """Returns scripted changes, then cancels the watch once idle"""
+
+    name = "scripted"
+
+    def __init__(self, script, token):
+        super().__init__()
+        self.script = list(script)
+        self.token = token
+
+    def _add(self, directory):
+        return True
+
+    def wait(self, timeout):
+        if self.script:
+            return self.script.pop(0)
+        if timeout is None:
+            self.token.cancel()
+        return []
+
+
+class _RecordingTarget:
+    def __init__(self):
+        self.removed = []
+
+    def scan(self):
+        return [], []
+
+    def classify(self, path):
+        return "preferences", False
+
+    def remove(self, path, category):
+        self.removed.append(path)
+        return True
+
+
+class TestEventSource(unittest.TestCase):
+    """Test the event source base class"""
+
+    def test_incomplete_source_cannot_be_created(self):
+        class Incomplete(EventSource):
+            def _add(self, directory):
+                return True
+
+        with self.assertRaises(TypeError):
+            Incomplete()
+
+
+class TestDebounce(unittest.TestCase):
+    """Test batching bursts of events"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.a, self.b, self.c = (
+            _touch(os.path.join(self.temp_dir, name)) for name in ("a", "b", "c")
+        )
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _run(self, **options):
+        token = CancellationToken()
+        script = [[self.a], [self.b, self.a], [self.c]]
+        self.target = _RecordingTarget()
+        watcher = ArtifactWatcher(
+            self.target,
+            source=_ScriptedSource(script, token),
+            cancel_token=token,
+            **options,
+        )
+        watcher.logger.setLevel(logging.ERROR)
+        return watcher.run()
+
+    def test_burst_is_one_batch(self):
+        counters = self._run()
+
+        self.assertEqual(counters["events"], 4)
+        self.assertEqual(counters["batches"], 1)
+        self.assertEqual(counters["paths_evaluated"], 3)
+        self.assertEqual(self.target.removed, [self.a, self.b, self.c])
+
+    def test_batch_delay_caps_a_burst(self):
+        counters = self._run(max_batch_delay=0)
+
+        self.assertEqual(counters["batches"], 3)
+        self.assertEqual(counters["paths_evaluated"], 4)
+
+
+class TestCleanerWatch(unittest.TestCase):
+    """Test a cleaner watching an offline root for reappearing artifacts"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        self.root = os.path.join(self.temp_dir, "Lab01")
+        generate_macos_fixture(self.root, file_count=20, users=("alice",))
+        self.home = os.path.join(self.root, "Users", "alice")
+        patcher = patch(
+            "zoom_deep_clean.cleaner_enhanced.report_path_for_root",
+            return_value=os.path.join(self.temp_dir, "report.json"),
+        )
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+        from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
+
+        self.cleaner = ZoomDeepCleanerEnhanced(
+            log_file=os.path.join(self.temp_dir, "clean.log"),
+            enable_backup=False,
+            target_root=self.root,
+            command_backend=ReplayBackend(interactions=[]),
+            step_history_dir=None,
+        )
+        self.cleaner.logger.setLevel(logging.ERROR)
+        self.counters = None
+        self.thread = threading.Thread(target=self._watch, daemon=True)
+
+    def tearDown(self):
+        self.cleaner.cancel()
+        self.thread.join(5)
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def _watch(self):
+        self.counters = self.cleaner.watch(
+            source=PollingSource(interval=0.05), debounce=0.05
+        )
+
+    def _start(self):
+        self.thread.start()
+        self.assertTrue(_until(lambda: self.cleaner.watcher is not None))
+        # Removals of the initial scan are over once the watcher is ready
+        self.assertTrue(self.cleaner.watcher.ready.wait(10))
+        self.assertGreater(self.cleaner.watcher.counters()["watched_directories"], 0)
+
+    def test_reappearing_artifact_is_removed(self):
+        self._start()
+        initial = self.cleaner.watcher.counters()["removed"]
+
+        plist = _touch(os.path.join(self.home, "Library/Preferences/us.zoom.xos.plist"))
+        keep = _touch(
+            os.path.join(self.home, "Library/Preferences/com.apple.dock.plist")
+        )
+
+        self.assertTrue(_until(lambda: not os.path.exists(plist)))
+        self.assertTrue(os.path.exists(keep))
+        self.cleaner.cancel()
+        self.thread.join(5)
+        self.assertFalse(self.thread.is_alive())
+        self.assertEqual(self.counters["removed"], initial + 1)
+        self.assertGreaterEqual(self.counters["events"], 2)
+        self.assertEqual(self.counters["failed"], 0)
+
+    def test_new_directory_is_rescanned_and_placeholders_are_kept(self):
+        self._start()
+        initial = self.cleaner.watcher.counters()["removed"]
+        data = os.path.join(self.home, "Library/Application Support/Zoom/data")
+        os.makedirs(data)
+        database = _touch(os.path.join(data, "zoomus.enc.db"))
+
+        # The database is shredded and replaced by a restricted placeholder
+        self.assertTrue(_until(lambda: self.cleaner.watcher.counters()["rescans"] > 1))
+        self.assertTrue(
+            _until(lambda: self.cleaner.watcher.counters()["removed"] > initial)
+        )
+        self.assertTrue(os.path.exists(database))
+        self.assertEqual(os.path.getsize(database), 0)
+        removed = self.cleaner.watcher.counters()["removed"]
+        time.sleep(0.3)
+        self.assertEqual(self.cleaner.watcher.counters()["removed"], removed)
+        self.assertTrue(os.path.exists(database))
+
+    def test_cancel_stops_an_idle_watch(self):
+        self._start()
+
+        self.cleaner.cancel()
+        self.thread.join(2)
+
+        self.assertFalse(self.thread.is_alive())
+        self.assertEqual(self.counters["events"], 0)
+
+
+@unittest.skipUnless(sys.platform.startswith("linux"), "inotify is Linux-only")
+class TestLinuxWatch(unittest.TestCase):
+    """Test watching the known Linux Zoom locations"""
+
+    def setUp(self):
+        self.temp_dir = tempfile.mkdtemp()
+        patcher = patch.dict(os.environ, {"HOME": self.temp_dir})
+        patcher.start()
+        self.addCleanup(patcher.stop)
+
+    def tearDown(self):
+        shutil.rmtree(self.temp_dir, ignore_errors=True)
+
+    def test_reappearing_config_is_removed(self):
+        from zoom_deep_clean.cross_platform_support import LinuxZoomCleaner
+
+        logger = logging.getLogger("test_watch_mode")
+        logger.setLevel(logging.ERROR)
+        cleaner = LinuxZoomCleaner(logger)
+        os.makedirs(os.path.join(self.temp_dir, ".config"))
+        token = CancellationToken()
+        source = InotifySource()
+        result = {}
+        thread = threading.Thread(
+            target=lambda: result.update(cleaner.watch(token, source, debounce=0.05)),
+            daemon=True,
+        )
+        thread.start()
+        self.assertTrue(_until(lambda: source.directories))
+
+        config = _touch(os.path.join(self.temp_dir, ".config", "zoomus.conf"))
+        _touch(os.path.join(self.temp_dir, ".config", "other.conf"))
+
+        self.assertTrue(_until(lambda: not os.path.exists(config)))
+        token.cancel()
+        thread.join(5)
+        self.assertEqual(result["removed"], 1)
+        self.assertTrue(
+            os.path.exists(os.path.join(self.temp_dir, ".config", "other.conf"))
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -11,10 +11,7 @@ This package provides comprehensive Zoom removal capabilities including:
 Version: 2.4.2
 """
 
-from .cleaner_enhanced import ZoomDeepCleanerEnhanced, SecurityError
-from .deep_system_cleaner import DeepSystemCleaner
-from .zoom_installer_builtin import ZoomInstaller, download_and_install_zoom
-from .comprehensive_cli import ComprehensiveZoomCLI
+import importlib
 
 __version__ = "2.4.2"
 __author__ = "PHLthy215"
@@ -36,6 +33,30 @@ __all__ = [
     "__description__",
 ]
 
+# Public classes are imported on first access (PEP 562) so that importing the
+# package, or running the CLI with --help/--version, stays fast
+_LAZY_ATTRIBUTES = {
+    "ZoomDeepCleanerEnhanced": ".cleaner_enhanced",
+    "SecurityError": ".cleaner_enhanced",
+    "DeepSystemCleaner": ".deep_system_cleaner",
+    "ZoomInstaller": ".zoom_installer_builtin",
+    "download_and_install_zoom": ".zoom_installer_builtin",
+    "ComprehensiveZoomCLI": ".comprehensive_cli",
+}
+
+
+def __getattr__(name):
+    module_name = _LAZY_ATTRIBUTES.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(module_name, __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(_LAZY_ATTRIBUTES))
+
 
 # CLI main function available via lazy import to avoid warnings
 def main():
@@ -10,11 +10,12 @@ Version: 2.3.0 - Advanced Detection
 import os
 import re
 import subprocess
-import plistlib
 from typing import List, Dict, Any
 from pathlib import Path
 import logging
 
+from .plist_scanner import PlistScanError, scan_plist
+
 
 class SystemFingerprintAnalyzer:
     """Advanced system fingerprint detection and analysis"""
@@ -262,30 +263,30 @@ class SystemFingerprintAnalyzer:
 
             if ls_db_path.exists():
                 try:
-                    with open(ls_db_path, "rb") as f:
-                        plist_data = plistlib.load(f)
-                        # Analyze without exposing sensitive data
-                        usage_patterns["launchservices_entries"] = len(
-                            plist_data.get("LSHandlers", [])
-                        )
-                except Exception:
+                    # Analyze without exposing sensitive data
+                    summary = scan_plist(str(ls_db_path), count_keys=("LSHandlers",))
+                    usage_patterns["launchservices_entries"] = summary.counts[
+                        "LSHandlers"
+                    ]
+                except (OSError, PlistScanError):
                     pass
 
             # Dock preferences
             dock_plist = Path.home() / "Library/Preferences/com.apple.dock.plist"
             if dock_plist.exists():
                 try:
-                    with open(dock_plist, "rb") as f:
-                        dock_data = plistlib.load(f)
-                        persistent_apps = dock_data.get("persistent-apps", [])
-                        usage_patterns["dock_apps_count"] = len(persistent_apps)
-
-                        # Check for Zoom in dock (privacy-safe)
-                        zoom_in_dock = any(
-                            "zoom" in str(app).lower() for app in persistent_apps
-                        )
-                        usage_patterns["zoom_in_dock"] = zoom_in_dock
-                except Exception:
+                    summary = scan_plist(
+                        str(dock_plist),
+                        count_keys=("persistent-apps",),
+                        zoom_keys=("persistent-apps",),
+                    )
+                    usage_patterns["dock_apps_count"] = summary.counts[
+                        "persistent-apps"
+                    ]
+
+                    # Check for Zoom in dock (privacy-safe)
+                    usage_patterns["zoom_in_dock"] = summary.zoom_in["persistent-apps"]
+                except (OSError, PlistScanError):
                     pass
 
         except Exception as e:
@@ -333,13 +334,11 @@ class SystemFingerprintAnalyzer:
             )
             if wifi_plist.exists():
                 try:
-                    with open(wifi_plist, "rb") as f:
-                        wifi_data = plistlib.load(f)
-                        known_networks = wifi_data.get("KnownNetworks", {})
-                        network_patterns["known_wifi_networks_count"] = len(
-                            known_networks
-                        )
-                except Exception:
+                    summary = scan_plist(str(wifi_plist), count_keys=("KnownNetworks",))
+                    network_patterns["known_wifi_networks_count"] = summary.counts[
+                        "KnownNetworks"
+                    ]
+                except (OSError, PlistScanError):
                     pass
 
         except Exception as e:
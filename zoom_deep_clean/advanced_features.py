@@ -18,6 +18,8 @@ import random
 from typing import List, Dict, Tuple, Optional, Union, Any
 from datetime import datetime
 
+from .command_backend import CommandBackend, get_default_backend
+
 
 class AdvancedFeaturesError(Exception):
     """Raised when advanced features encounter errors"""
@@ -33,10 +35,12 @@ class AdvancedFeatures:
         logger: logging.Logger,
         dry_run: bool = False,
         enable_mac_spoofing: bool = False,
+        command_backend: Optional[CommandBackend] = None,
     ):
         self.logger = logger
         self.dry_run = dry_run
         self.enable_mac_spoofing = enable_mac_spoofing
+        self.command_backend = command_backend or get_default_backend()
 
         self.advanced_stats = {
             "keychain_entries_scanned": 0,
@@ -74,9 +78,7 @@ class AdvancedFeatures:
         try:
             self.logger.debug(f"Executing advanced command: {' '.join(cmd_args)}")
 
-            result = subprocess.run(
-                cmd_args, capture_output=True, text=True, timeout=timeout, shell=False
-            )
+            result = self.command_backend.run(cmd_args, text=True, timeout=timeout)
 
             if result.returncode == 0:
                 self.logger.debug(f"Advanced command succeeded: {' '.join(cmd_args)}")
@@ -0,0 +1,391 @@
+#!/usr/bin/env python3
+"""
+Artifact Rule Catalog Module
+Declarative catalog of known Zoom artifact locations
+
+Every known artifact path is a rule in ARTIFACT_CATALOG, grouped by category.
+Rules starting with ``~/`` are resolved against a user home, all others
+against the system root (``/`` or a target root). Any path component may be
+a glob pattern.
+
+The catalog is compiled into one trie per scope keyed by directory
+component, so resolving it needs exactly one ``scandir`` per visited parent
+directory instead of one ``os.path.exists`` per rule, and directories that
+do not exist prune every rule below them. Matching is case-insensitive like
+the default APFS volume format. On macOS the compiled form is cached on
+disk as JSON.
+
+Created by: PHLthy215
+Version: 2.4.2 - Artifact Rule Catalog
+"""
+
+import fnmatch
+import hashlib
+import json
+import logging
+import os
+import sys
+import threading
+from dataclasses import asdict, dataclass
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Tuple
+
+RULES_CACHE_VERSION = 1
+
+# Only macOS has a cache directory for the catalog; elsewhere it is compiled
+DEFAULT_RULE_CACHE_DIR = (
+    os.path.expanduser("~/Library/Caches/zoom_deep_clean")
+    if sys.platform == "darwin"
+    else None
+)
+
+RULE_SCOPES = ("user", "system")
+
+ARTIFACT_CATALOG: Dict[str, Tuple[str, ...]] = {
+    "applications": (
+        "/Applications/zoom.us.app",
+        "/Applications/Zoom.app",
+        "/Applications/ZoomPhone.app",
+        "/Applications/ZoomClips.app",
+        "/Applications/ZoomChat.app",
+        "/Applications/ZoomPresence.app",
+        "/Applications/ZoomUpdater.app",
+        "/Applications/ZoomInstaller.app",
+    ),
+    "launch_agents": (
+        "/Library/LaunchAgents/us.zoom.updater.login.check.plist",
+        "/Library/LaunchAgents/us.zoom.updater.plist",
+        "/Library/LaunchAgents/us.zoom.ZoomDaemon.plist",
+        "/Library/LaunchAgents/us.zoom.ZoomAutoUpdater.plist",
+        "/Library/LaunchAgents/us.zoom.*",
+    ),
+    "system_daemons": (
+        "/Library/LaunchDaemons/us.zoom.ZoomDaemon.plist",
+        "/Library/PrivilegedHelperTools/us.zoom.ZoomDaemon",
+        "/Library/LaunchDaemons/us.zoom.updater.plist",
+        "/Library/LaunchDaemons/us.zoom.*",
+    ),
+    "audio_drivers": (
+        "/Library/Audio/Plug-Ins/HAL/ZoomAudioDevice.driver",
+        "/System/Library/Extensions/ZoomAudioDevice.kext",
+        "/Library/Extensions/ZoomAudioDevice.kext",
+    ),
+    "system_application_data": ("/Library/Application Support/zoom.us",),
+    "webkit_storage": (
+        "~/Library/WebKit/us.zoom.xos",
+        "~/Library/HTTPStorages/us.zoom.xos",
+        "~/Library/HTTPStorages/us.zoom.xos.binarycookies",
+        "~/Library/Cookies/us.zoom.xos.binarycookies",
+        "~/Library/WebKit/NetworkProcess",
+        "~/Library/WebKit/WebProcess",
+    ),
+    "group_containers": (
+        "~/Library/Group Containers/BJ4HAAB9B3.ZoomClient3rd",
+        "~/Library/Group Containers/us.zoom.xos",
+        "~/Library/Group Containers/zoom.us",
+    ),
+    "application_data": (
+        "~/Library/Application Support/zoom.us",
+        "~/Library/Application Support/ZoomUpdater",
+        "~/Library/Application Support/ZoomPhone",
+        "~/Library/Application Support/ZoomClips",
+        "~/Library/Application Support/ZoomChat",
+        "~/Library/Application Support/ZoomPresence",
+        "~/Library/Caches/us.zoom.xos",
+        "~/Library/Caches/ZoomPhone",
+        "~/Library/Caches/ZoomChat",
+        "~/Library/Logs/zoom.us",
+        "~/Library/Logs/ZoomPhone",
+        "~/Library/Logs/ZoomChat",
+        "~/Library/Saved Application State/us.zoom.xos.savedState",
+    ),
+    "preferences": (
+        "~/Library/Preferences/us.zoom.xos.plist",
+        "~/Library/Preferences/us.zoom.updater.plist",
+        "~/Library/Preferences/us.zoom.updater.config.plist",
+        "~/Library/Preferences/us.zoom.ZoomAutoUpdater.plist",
+        "~/Library/Preferences/us.zoom.ZoomClips.plist",
+        "~/Library/Preferences/ZoomChat.plist",
+        "~/Library/Preferences/ZoomPhone.plist",
+        "~/Library/Preferences/ZoomPresence.plist",
+    ),
+    "auth_databases": (
+        "~/Library/Application Support/Zoom/data/zoomus.enc.db",
+        "~/Library/Application Support/Zoom/data/zoomus.tmp.enc.db",
+        "~/Library/Application Support/Zoom/data/auth.db",
+        "~/Library/Application Support/Zoom/data/token.db",
+        "~/Library/Application Support/Zoom/data/identity.db",
+        "~/Library/Application Support/us.zoom.xos/data/zoomus.enc.db",
+        "~/Library/Application Support/us.zoom.xos/data/auth.db",
+        "~/Library/Containers/us.zoom.xos/Data/Library/Application Support/Zoom/data/zoomus.enc.db",
+        "~/Library/Group Containers/*/Zoom/data/zoomus.enc.db",
+    ),
+}
+
+_GLOB_CHARS = set("*?[")
+
+
+@dataclass(frozen=True)
+class ArtifactRule:
+    """One known artifact location"""
+
+    path: str
+    category: str
+
+    @property
+    def scope(self) -> str:
+        """``user`` for home-relative rules, ``system`` otherwise"""
+        return "user" if self.path.startswith("~/") else "system"
+
+    @property
+    def components(self) -> List[str]:
+        """Path components below the home directory or root"""
+        relative = self.path[2:] if self.scope == "user" else self.path.lstrip("/")
+        return [part for part in relative.split("/") if part]
+
+
+ARTIFACT_RULES: Tuple[ArtifactRule, ...] = tuple(
+    ArtifactRule(path, category)
+    for category, paths in ARTIFACT_CATALOG.items()
+    for path in paths
+)
+
+
+def catalog_paths(*categories: str) -> List[str]:
+    """The rule paths of the given categories, in catalog order"""
+    return [path for category in categories for path in ARTIFACT_CATALOG[category]]
+
+
+def category_scope(category: str) -> str:
+    """Scope shared by all rules of a category"""
+    return ArtifactRule(ARTIFACT_CATALOG[category][0], category).scope
+
+
+def _new_node() -> Dict[str, Any]:
+    # r: ids of rules ending here, l: literal children, g: glob children
+    return {"r": [], "l": {}, "g": {}}
+
+
+def rules_digest(rules: Sequence[ArtifactRule]) -> str:
+    """Stable digest of a rule list, used to key the on-disk cache"""
+    payload = json.dumps(
+        [RULES_CACHE_VERSION, [asdict(rule) for rule in rules]], sort_keys=True
+    )
+    return hashlib.sha1(payload.encode("utf-8")).hexdigest()
+
+
+class CompiledRuleSet:
+    """Rule catalog compiled into per-scope tries keyed by directory component"""
+
+    def __init__(
+        self,
+        rules: Sequence[ArtifactRule],
+        tries: Dict[str, Dict[str, Any]],
+        digest: str,
+    ):
+        self.rules = tuple(rules)
+        self.tries = tries
+        self.digest = digest
+        self.directories_scanned = 0
+        self._lock = threading.Lock()
+
+    @classmethod
+    def compile(cls, rules: Sequence[ArtifactRule] = ARTIFACT_RULES):
+        """Build the tries from a rule list"""
+        tries = {scope: _new_node() for scope in RULE_SCOPES}
+        for rule_id, rule in enumerate(rules):
+            node = tries[rule.scope]
+            for component in rule.components:
+                kind = "g" if _GLOB_CHARS & set(component) else "l"
+                node = node[kind].setdefault(component.casefold(), _new_node())
+            node["r"].append(rule_id)
+        return cls(rules, tries, rules_digest(rules))
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "version": RULES_CACHE_VERSION,
+            "digest": self.digest,
+            "rules": [asdict(rule) for rule in self.rules],
+            "tries": self.tries,
+        }
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]):
+        if data.get("version") != RULES_CACHE_VERSION:
+            raise ValueError(f"Unsupported rule cache version: {data.get('version')}")
+        rules = [ArtifactRule(**rule) for rule in data["rules"]]
+        return cls(rules, data["tries"], data["digest"])
+
+    def __getstate__(self) -> Dict[str, Any]:
+        # Shipped to process pool workers; the lock is recreated there
+        return self.to_dict()
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        rules = [ArtifactRule(**rule) for rule in state["rules"]]
+        self.__init__(rules, state["tries"], state["digest"])
+
+    def resolve(
+        self,
+        scope: str,
+        base: str,
+        categories: Optional[Iterable[str]] = None,
+        visited: Optional[List[str]] = None,
+    ) -> Dict[str, List[str]]:
+        """Existing paths below ``base`` matched by the rules of ``scope``
+
+        Returns a mapping of category to matched paths. A path matched by
+        several rules of the same category is listed once. The directories
+        scanned on the way, where matches can (re)appear, are appended to
+        ``visited``.
+        """
+        if scope not in RULE_SCOPES:
+            raise ValueError(f"Invalid rule scope: {scope}")
+        wanted = set(categories) if categories is not None else None
+
+        matches: Dict[str, List[str]] = {}
+        seen = set()
+        scanned = 0
+        stack = [(self.tries[scope], base)]
+        while stack:
+            node, directory = stack.pop()
+            try:
+                with os.scandir(directory) as iterator:
+                    entries = {
+                        entry.name: entry.is_dir(follow_symlinks=False)
+                        for entry in iterator
+                    }
+            except OSError:
+                continue
+            scanned += 1
+            if visited is not None:
+                visited.append(directory)
+
+            children = []
+            for name, is_dir in entries.items():
+                folded = name.casefold()
+                child = node["l"].get(folded)
+                if child is not None:
+                    children.append((child, name, is_dir))
+                for pattern, child in node["g"].items():
+                    if fnmatch.fnmatchcase(folded, pattern):
+                        children.append((child, name, is_dir))
+
+            for child, name, is_dir in children:
+                path = os.path.join(directory, name)
+                for rule_id in child["r"]:
+                    category = self.rules[rule_id].category
+                    if wanted is not None and category not in wanted:
+                        continue
+                    if (category, path) not in seen:
+                        seen.add((category, path))
+                        matches.setdefault(category, []).append(path)
+                if is_dir and (child["l"] or child["g"]):
+                    stack.append((child, path))
+
+        with self._lock:
+            self.directories_scanned += scanned
+        for paths in matches.values():
+            paths.sort()
+        return matches
+
+    def match(self, scope: str, base: str, path: str) -> Tuple[List[str], bool]:
+        """Categories whose ``scope`` rules match ``path`` below ``base``
+
+        Only the path's components are compared, nothing is read from disk.
+        The second value tells whether rules continue below ``path``, i.e.
+        whether matches may appear inside it.
+        """
+        if scope not in RULE_SCOPES:
+            raise ValueError(f"Invalid rule scope: {scope}")
+        relative = os.path.relpath(path, base)
+        if relative == os.curdir:
+            return [], True
+        if relative.startswith(os.pardir):
+            return [], False
+
+        nodes = [self.tries[scope]]
+        for component in relative.split(os.sep):
+            folded = component.casefold()
+            children = []
+            for node in nodes:
+                child = node["l"].get(folded)
+                if child is not None:
+                    children.append(child)
+                for pattern, child in node["g"].items():
+                    if fnmatch.fnmatchcase(folded, pattern):
+                        children.append(child)
+            nodes = children
+            if not nodes:
+                return [], False
+
+        categories: List[str] = []
+        for rule_id in sorted(rule_id for node in nodes for rule_id in node["r"]):
+            category = self.rules[rule_id].category
+            if category not in categories:
+                categories.append(category)
+        return categories, any(node["l"] or node["g"] for node in nodes)
+
+
+def _cache_key(rules: Sequence[ArtifactRule]) -> str:
+    """Key of a rule list in the disk cache
+
+    The built-in catalog is keyed by the size and mtime of this module, which
+    is a single ``stat`` instead of hashing every rule; other rule lists fall
+    back to their digest.
+    """
+    if rules is ARTIFACT_RULES:
+        try:
+            st = os.stat(__file__)
+            return f"catalog-{RULES_CACHE_VERSION}-{st.st_size}-{st.st_mtime_ns}"
+        except OSError:
+            pass
+    return rules_digest(rules)
+
+
+def load_compiled_rules(
+    cache_dir: Optional[str] = DEFAULT_RULE_CACHE_DIR,
+    rules: Sequence[ArtifactRule] = ARTIFACT_RULES,
+) -> CompiledRuleSet:
+    """Load the compiled catalog from the disk cache, compiling on a miss
+
+    The cache file is keyed by the catalog module's size and mtime (or the
+    digest of a custom rule list), so catalog changes never pick up a stale
+    compiled form. ``cache_dir=None`` disables the cache.
+    """
+    logger = logging.getLogger(__name__)
+    if cache_dir is None:
+        return CompiledRuleSet.compile(rules)
+
+    key = _cache_key(rules)
+    name = hashlib.sha1(key.encode("utf-8")).hexdigest()[:16]
+    cache_file = os.path.join(cache_dir, f"artifact_rules-{name}.json")
+    try:
+        with open(cache_file, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        if data.get("key") == key:
+            return CompiledRuleSet.from_dict(data)
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+
+    compiled = CompiledRuleSet.compile(rules)
+    try:
+        os.makedirs(cache_dir, exist_ok=True)
+        temp_file = f"{cache_file}.{os.getpid()}.tmp"
+        with open(temp_file, "w", encoding="utf-8") as f:
+            json.dump(dict(compiled.to_dict(), key=key), f)
+        os.replace(temp_file, cache_file)
+    except OSError as e:
+        logger.debug(f"Could not write rule cache {cache_file}: {e}")
+    return compiled
+
+
+_compiled_rules: Optional[CompiledRuleSet] = None
+_compiled_lock = threading.Lock()
+
+
+def get_compiled_rules() -> CompiledRuleSet:
+    """Process-wide compiled catalog, loaded once"""
+    global _compiled_rules
+    with _compiled_lock:
+        if _compiled_rules is None:
+            _compiled_rules = load_compiled_rules()
+        return _compiled_rules
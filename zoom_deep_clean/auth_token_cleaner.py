@@ -8,22 +8,68 @@ import os
 import subprocess
 import json
 import logging
-import sqlite3
-import plistlib
-from typing import Dict
+from typing import Dict, List, Optional
 import shutil
 from datetime import datetime
 
+from .command_backend import CommandBackend, get_default_backend
+from .artifact_rules import CompiledRuleSet, get_compiled_rules
+from .binary_cookies import clean_cookie_jar, cookie_jar_paths
+from .leveldb_scanner import scan_leveldb
+from .plist_scanner import PlistScanError, plist_mentions_zoom
+from .sqlite_cleaner import (
+    browser_cookie_targets,
+    chromium_profile_dirs,
+    clean_databases,
+)
+from .target_root import rebase_path
+
+# Scopes accepted by AuthTokenCleaner.clean_all_auth_tokens
+AUTH_CLEANUP_SCOPES = ("all", "user", "system")
+
+# LevelDB storage databases inside a Chromium profile
+CHROMIUM_STORAGE_DIRS = ("Local Storage/leveldb", "Session Storage")
+
+
+def keychain_args_for_home(user_home: str) -> List[str]:
+    """Keychain argument for security(1) when acting on another user's home
+
+    The invoking user's default keychain search list is used as-is; any other
+    account is addressed through its login keychain file.
+    """
+    if os.path.realpath(user_home) == os.path.realpath(os.path.expanduser("~")):
+        return []
+    return [os.path.join(user_home, "Library", "Keychains", "login.keychain-db")]
+
 
 class AuthTokenCleaner:
     """Comprehensive authentication token and identity cleaner"""
 
-    def __init__(self, verbose: bool = False, dry_run: bool = False):
+    def __init__(
+        self,
+        verbose: bool = False,
+        dry_run: bool = False,
+        command_backend: Optional[CommandBackend] = None,
+        user_home: Optional[str] = None,
+        target_root: Optional[str] = None,
+        artifact_rules: Optional[CompiledRuleSet] = None,
+        backup_dir: Optional[str] = None,
+    ):
         self.verbose = verbose
         self.dry_run = dry_run
+        self.command_backend = command_backend or get_default_backend()
+        self.user_home = user_home or os.path.expanduser("~")
+        self.target_root = target_root
+        # Keychain and service steps need the running system
+        self.live_system = target_root is None
+        self.artifact_rules = artifact_rules or get_compiled_rules()
+        # Private directory for removed cookies; None disables backups
+        self.backup_dir = backup_dir
         self.logger = self._setup_logging()
         self.cleaned_items = []
         self.errors = []
+        # Cookie jars processed by this cleaner -> Zoom cookies removed
+        self.cookie_jars_cleaned: Dict[str, int] = {}
 
     def _setup_logging(self) -> logging.Logger:
         """Setup logging configuration"""
@@ -39,11 +85,32 @@ class AuthTokenCleaner:
         logger.setLevel(logging.DEBUG if self.verbose else logging.INFO)
         return logger
 
-    def clean_all_auth_tokens(self) -> Dict:
+    def _expand_path(self, path: str) -> str:
+        """Expand a leading ~ against the target user's home directory
+
+        Absolute paths are re-based onto the target root, if any.
+        """
+        if path == "~" or path.startswith("~/"):
+            return self.user_home + path[1:]
+        return rebase_path(path, self.target_root)
+
+    def _keychain_args(self) -> List[str]:
+        """Keychain argument for security(1) matching the target user"""
+        return keychain_args_for_home(self.user_home)
+
+    def clean_all_auth_tokens(self, scope: str = "all") -> Dict:
         """
         Comprehensive authentication token cleanup
         Returns detailed report of cleanup operations
+
+        ``scope`` selects "user" (this home only), "system" (machine-wide
+        caches and services) or "all" steps.
         """
+        if scope not in AUTH_CLEANUP_SCOPES:
+            raise ValueError(f"Invalid auth cleanup scope: {scope}")
+        include_user = scope in ("all", "user")
+        include_system = scope in ("all", "system")
+
         self.logger.info("🔐 Starting comprehensive authentication token cleanup...")
 
         results = {
@@ -55,38 +122,45 @@ class AuthTokenCleaner:
         }
 
         try:
-            # Clean keychain entries (most critical)
-            self._clean_keychain_tokens()
+            if include_user and self.live_system:
+                # Clean keychain entries (most critical)
+                self._clean_keychain_tokens()
 
-            # Clean authentication databases
-            self._clean_auth_databases()
+            if include_user:
+                # Clean authentication databases
+                self._clean_auth_databases()
 
-            # Clean certificate stores
-            self._clean_certificate_stores()
+            if include_user and self.live_system:
+                # Clean certificate stores
+                self._clean_certificate_stores()
 
-            # Clean OAuth tokens and refresh tokens
-            self._clean_oauth_tokens()
+            if include_user:
+                # Clean OAuth tokens and refresh tokens
+                self._clean_oauth_tokens()
 
-            # Clean SSO and SAML data
-            self._clean_sso_data()
+                # Clean SSO and SAML data
+                self._clean_sso_data()
 
-            # Clean browser authentication data
-            self._clean_browser_auth_data()
+                # Clean browser authentication data
+                self._clean_browser_auth_data()
 
-            # Clean system authentication caches
-            self._clean_system_auth_caches()
+            if include_system and self.live_system:
+                # Clean system authentication caches
+                self._clean_system_auth_caches()
 
-            # Clean network authentication data
-            self._clean_network_auth_data()
+            if include_user:
+                # Clean network authentication data
+                self._clean_network_auth_data()
 
-            # Clean identity provider data
-            self._clean_identity_provider_data()
+                # Clean identity provider data
+                self._clean_identity_provider_data()
 
-            # Clean biometric authentication data
-            self._clean_biometric_auth_data()
+                # Clean biometric authentication data
+                self._clean_biometric_auth_data()
 
-            # Reset authentication services
-            self._reset_auth_services()
+            if include_system and self.live_system:
+                # Reset authentication services
+                self._reset_auth_services()
 
             results["cleaned_items"] = self.cleaned_items
             results["errors"] = self.errors
@@ -128,18 +202,18 @@ class AuthTokenCleaner:
         for service in zoom_services:
             try:
                 # Find all keychain items for this service
-                result = subprocess.run(
-                    ["security", "find-generic-password", "-s", service],
-                    capture_output=True,
+                result = self.command_backend.run(
+                    ["security", "find-generic-password", "-s", service]
+                    + self._keychain_args(),
                     text=True,
                 )
 
                 if result.returncode == 0:
                     # Delete the keychain item
                     if not self.dry_run:
-                        delete_result = subprocess.run(
-                            ["security", "delete-generic-password", "-s", service],
-                            capture_output=True,
+                        delete_result = self.command_backend.run(
+                            ["security", "delete-generic-password", "-s", service]
+                            + self._keychain_args(),
                             text=True,
                         )
 
@@ -160,17 +234,18 @@ class AuthTokenCleaner:
 
         # Also check for internet passwords (web authentication)
         try:
-            result = subprocess.run(
-                ["security", "find-internet-password", "-s", "zoom.us"],
-                capture_output=True,
+            result = self.command_backend.run(
+                ["security", "find-internet-password", "-s", "zoom.us"]
+                + self._keychain_args(),
                 text=True,
             )
 
             if result.returncode == 0:
                 if not self.dry_run:
-                    subprocess.run(
-                        ["security", "delete-internet-password", "-s", "zoom.us"],
-                        capture_output=True,
+                    self.command_backend.run(
+                        ["security", "delete-internet-password", "-s", "zoom.us"]
+                        + self._keychain_args(),
+                        text=False,
                     )
                 self.cleaned_items.append("Internet password: zoom.us")
                 self.logger.info("   ✅ Removed internet password for zoom.us")
@@ -182,34 +257,12 @@ class AuthTokenCleaner:
         """Clean authentication databases and SQLite stores"""
         self.logger.info("🗄️ Cleaning authentication databases...")
 
-        # Common authentication database locations
-        auth_db_paths = [
-            "~/Library/Application Support/Zoom/data/zoomus.enc.db",
-            "~/Library/Application Support/Zoom/data/zoomus.tmp.enc.db",
-            "~/Library/Application Support/Zoom/data/auth.db",
-            "~/Library/Application Support/Zoom/data/token.db",
-            "~/Library/Application Support/Zoom/data/identity.db",
-            "~/Library/Application Support/us.zoom.xos/data/zoomus.enc.db",
-            "~/Library/Application Support/us.zoom.xos/data/auth.db",
-            "~/Library/Containers/us.zoom.xos/Data/Library/Application Support/Zoom/data/zoomus.enc.db",
-            "~/Library/Group Containers/*/Zoom/data/zoomus.enc.db",
-        ]
-
-        for db_path in auth_db_paths:
-            expanded_path = os.path.expanduser(db_path)
-
-            # Handle wildcard paths
-            if "*" in expanded_path:
-                try:
-                    import glob
-
-                    matching_paths = glob.glob(expanded_path)
-                    for match_path in matching_paths:
-                        self._remove_auth_file(match_path)
-                except Exception as e:
-                    self.logger.warning(f"   ⚠️ Error with wildcard path {db_path}: {e}")
-            else:
-                self._remove_auth_file(expanded_path)
+        # Known authentication database locations from the artifact catalog
+        matches = self.artifact_rules.resolve(
+            "user", self.user_home, ["auth_databases"]
+        )
+        for db_path in matches.get("auth_databases", []):
+            self._remove_auth_file(db_path)
 
     def _remove_auth_file(self, file_path: str):
         """Remove an authentication file safely"""
@@ -235,7 +288,7 @@ class AuthTokenCleaner:
 
         # Check system keychain for Zoom certificates
         try:
-            result = subprocess.run(
+            result = self.command_backend.run(
                 [
                     "security",
                     "find-certificate",
@@ -243,7 +296,6 @@ class AuthTokenCleaner:
                     "Zoom",
                     "/System/Library/Keychains/SystemRootCertificates.keychain",
                 ],
-                capture_output=True,
                 text=True,
             )
 
@@ -256,17 +308,17 @@ class AuthTokenCleaner:
 
         # Check user keychain for Zoom certificates
         try:
-            result = subprocess.run(
-                ["security", "find-certificate", "-c", "Zoom"],
-                capture_output=True,
+            result = self.command_backend.run(
+                ["security", "find-certificate", "-c", "Zoom"] + self._keychain_args(),
                 text=True,
             )
 
             if result.returncode == 0:
                 if not self.dry_run:
-                    subprocess.run(
-                        ["security", "delete-certificate", "-c", "Zoom"],
-                        capture_output=True,
+                    self.command_backend.run(
+                        ["security", "delete-certificate", "-c", "Zoom"]
+                        + self._keychain_args(),
+                        text=False,
                     )
                 self.cleaned_items.append("Certificate: Zoom")
                 self.logger.info("   ✅ Removed Zoom certificate")
@@ -289,7 +341,7 @@ class AuthTokenCleaner:
         ]
 
         for oauth_path in oauth_paths:
-            expanded_path = os.path.expanduser(oauth_path)
+            expanded_path = self._expand_path(oauth_path)
             self._remove_auth_file(expanded_path)
 
         # Clean OAuth data from HTTP storages
@@ -299,7 +351,7 @@ class AuthTokenCleaner:
         ]
 
         for storage_path in http_storage_paths:
-            expanded_path = os.path.expanduser(storage_path)
+            expanded_path = self._expand_path(storage_path)
             if os.path.exists(expanded_path):
                 # Look for OAuth-related files
                 try:
@@ -330,7 +382,7 @@ class AuthTokenCleaner:
         ]
 
         for sso_path in sso_paths:
-            expanded_path = os.path.expanduser(sso_path)
+            expanded_path = self._expand_path(sso_path)
             self._remove_auth_file(expanded_path)
 
     def _clean_browser_auth_data(self):
@@ -343,91 +395,102 @@ class AuthTokenCleaner:
             "~/Library/Safari/LocalStorage/https_zoom.us_0.localstorage-shm",
             "~/Library/Safari/LocalStorage/https_zoom.us_0.localstorage-wal",
             "~/Library/Safari/Databases/https_zoom.us_0",
-            "~/Library/Cookies/Cookies.binarycookies",
         ]
 
         for safari_path in safari_paths:
-            expanded_path = os.path.expanduser(safari_path)
-            if "Cookies.binarycookies" in safari_path:
-                # For cookies, we need to be more selective
-                self._clean_cookies_file(expanded_path)
-            else:
-                self._remove_auth_file(expanded_path)
-
-        # Chrome/Chromium data (if present)
-        chrome_paths = [
-            "~/Library/Application Support/Google/Chrome/Default/Local Storage/leveldb",
-            "~/Library/Application Support/Google/Chrome/Default/Session Storage",
-            "~/Library/Application Support/Google/Chrome/Default/Cookies",
-        ]
+            self._remove_auth_file(self._expand_path(safari_path))
 
-        for chrome_path in chrome_paths:
-            expanded_path = os.path.expanduser(chrome_path)
-            if os.path.exists(expanded_path):
-                if "Cookies" in chrome_path:
-                    self._clean_chrome_cookies(expanded_path)
-                elif "Storage" in chrome_path:
-                    self._clean_browser_storage(expanded_path)
+        # Cookie jars are shared with other sites: only Zoom cookies go
+        for cookies_path in cookie_jar_paths(self.user_home):
+            self._clean_cookies_file(cookies_path)
+
+        # Local/Session Storage of every Chromium-family profile
+        for browser, profile_dir in chromium_profile_dirs(self.user_home):
+            for storage in CHROMIUM_STORAGE_DIRS:
+                storage_path = os.path.join(profile_dir, storage)
+                if os.path.isdir(storage_path):
+                    self._clean_browser_storage(storage_path, browser)
+
+        # Cookies of every Chromium-family and Firefox profile
+        self._clean_browser_cookies()
 
     def _clean_cookies_file(self, cookies_path: str):
         """Clean Zoom-related cookies from Safari cookies file"""
         if not os.path.exists(cookies_path):
             return
 
-        try:
-            # Note: Safari cookies are in binary format and complex to parse
-            # For now, we'll note the file for manual review
-            self.logger.info(f"   📄 Safari cookies file found: {cookies_path}")
-            self.logger.info(
-                "   ℹ️ Consider clearing Safari cookies manually for zoom.us"
-            )
-        except Exception as e:
-            self.logger.warning(f"   ⚠️ Error processing cookies file: {e}")
-
-    def _clean_chrome_cookies(self, cookies_path: str):
-        """Clean Zoom-related cookies from Chrome cookies database"""
-        if not os.path.exists(cookies_path):
+        result = clean_cookie_jar(
+            cookies_path, dry_run=self.dry_run, backup_dir=self.backup_dir
+        )
+        jar = os.path.basename(cookies_path)
+        if result.error:
+            self.logger.warning(f"   ⚠️ Error processing cookies file: {result.error}")
             return
 
-        try:
-            # Chrome cookies are stored in SQLite database
-            conn = sqlite3.connect(cookies_path)
-            cursor = conn.cursor()
-
-            # Find Zoom-related cookies
-            cursor.execute(
-                "SELECT name, host_key FROM cookies WHERE host_key LIKE '%zoom%'"
+        self.cookie_jars_cleaned[cookies_path] = result.removed
+        if result.removed:
+            self.cleaned_items.append(
+                f"Safari cookies: {result.removed} Zoom cookies from {jar}"
+            )
+            self.logger.info(
+                f"   ✅ Removed {result.removed} Zoom cookies from {cookies_path}"
+            )
+        elif result.cookies:
+            self.logger.info(
+                f"   [DRY RUN] Would remove {result.matched} Zoom cookies "
+                f"from {cookies_path}"
             )
-            zoom_cookies = cursor.fetchall()
 
-            if zoom_cookies and not self.dry_run:
-                cursor.execute("DELETE FROM cookies WHERE host_key LIKE '%zoom%'")
-                conn.commit()
+    def _clean_browser_cookies(self):
+        """Clean Zoom-related cookies from all browser cookie databases"""
+        results = clean_databases(
+            browser_cookie_targets(self.user_home),
+            dry_run=self.dry_run,
+            immutable=not self.live_system,
+            backup_dir=self.backup_dir,
+        )
+
+        for result in results:
+            browser = result.target.label
+            if result.error:
+                self.logger.warning(
+                    f"   ⚠️ Error cleaning {browser} cookies "
+                    f"{result.target.path}: {result.error}"
+                )
+            elif result.deleted:
                 self.cleaned_items.append(
-                    f"Chrome cookies: {len(zoom_cookies)} Zoom cookies"
+                    f"{browser} cookies: {result.matched} Zoom cookies"
                 )
                 self.logger.info(
-                    f"   ✅ Removed {len(zoom_cookies)} Zoom cookies from Chrome"
+                    f"   ✅ Removed {result.matched} Zoom cookies from {browser}"
+                )
+            elif result.rows:
+                self.logger.info(
+                    f"   [DRY RUN] Would remove {result.matched} Zoom cookies "
+                    f"from {browser}"
                 )
 
-            conn.close()
-
-        except Exception as e:
-            self.logger.warning(f"   ⚠️ Error cleaning Chrome cookies: {e}")
-
-    def _clean_browser_storage(self, storage_path: str):
-        """Clean browser local/session storage"""
-        if not os.path.exists(storage_path):
-            return
+    def _clean_browser_storage(self, storage_path: str, browser: str = "Chrome"):
+        """Remove Zoom origins from a browser's LevelDB local/session storage"""
+        result = scan_leveldb(storage_path, tombstone=not self.dry_run)
 
-        try:
-            for root, dirs, files in os.walk(storage_path):
-                for file in files:
-                    if "zoom" in file.lower():
-                        file_path = os.path.join(root, file)
-                        self._remove_auth_file(file_path)
-        except Exception as e:
-            self.logger.warning(f"   ⚠️ Error cleaning browser storage: {e}")
+        if result.error:
+            self.logger.warning(
+                f"   ⚠️ Error cleaning {browser} storage {storage_path}: {result.error}"
+            )
+        elif result.tombstoned:
+            self.cleaned_items.append(
+                f"{browser} storage: {result.tombstoned} keys of "
+                f"{', '.join(result.origins)}"
+            )
+            self.logger.info(
+                f"   ✅ Removed {result.tombstoned} Zoom storage keys from {browser}"
+            )
+        elif result.entries:
+            self.logger.info(
+                f"   [DRY RUN] Would remove {len(result.entries)} Zoom storage keys "
+                f"from {browser}"
+            )
 
     def _clean_system_auth_caches(self):
         """Clean system-level authentication caches"""
@@ -439,9 +502,9 @@ class AuthTokenCleaner:
             try:
                 # We can't directly modify this, but we can reset authorization cache
                 if not self.dry_run:
-                    subprocess.run(
+                    self.command_backend.run(
                         ["sudo", "dscacheutil", "-flushcache"],
-                        capture_output=True,
+                        text=False,
                         timeout=10,
                     )
                 self.cleaned_items.append("System authorization cache")
@@ -452,9 +515,9 @@ class AuthTokenCleaner:
         # Directory Services cache
         try:
             if not self.dry_run:
-                subprocess.run(
+                self.command_backend.run(
                     ["sudo", "killall", "-HUP", "DirectoryService"],
-                    capture_output=True,
+                    text=False,
                     timeout=10,
                 )
             self.cleaned_items.append("Directory Services cache")
@@ -473,42 +536,19 @@ class AuthTokenCleaner:
         ]
 
         for pref_path in network_prefs:
-            expanded_path = os.path.expanduser(pref_path)
+            expanded_path = self._expand_path(pref_path)
             if os.path.exists(expanded_path):
                 try:
-                    # Read and check for Zoom-related network auth
-                    with open(expanded_path, "rb") as f:
-                        plist_data = plistlib.load(f)
-
                     # Look for Zoom-related network configurations
-                    zoom_found = self._search_plist_for_zoom(plist_data)
-                    if zoom_found:
+                    if plist_mentions_zoom(expanded_path):
                         self.logger.info(
                             f"   🔍 Found Zoom network config in {pref_path}"
                         )
                         # Note: We typically don't modify system network preferences
 
-                except Exception as e:
+                except (OSError, PlistScanError) as e:
                     self.logger.warning(f"   ⚠️ Error checking network prefs: {e}")
 
-    def _search_plist_for_zoom(self, data, path="") -> bool:
-        """Recursively search plist data for Zoom-related entries"""
-        if isinstance(data, dict):
-            for key, value in data.items():
-                if any(term in str(key).lower() for term in ["zoom", "us.zoom"]):
-                    return True
-                if self._search_plist_for_zoom(value, f"{path}.{key}"):
-                    return True
-        elif isinstance(data, list):
-            for i, item in enumerate(data):
-                if self._search_plist_for_zoom(item, f"{path}[{i}]"):
-                    return True
-        elif isinstance(data, str):
-            if any(term in data.lower() for term in ["zoom", "us.zoom"]):
-                return True
-
-        return False
-
     def _clean_identity_provider_data(self):
         """Clean identity provider and federation data"""
         self.logger.info("🆔 Cleaning identity provider data...")
@@ -522,7 +562,7 @@ class AuthTokenCleaner:
         ]
 
         for idp_path in idp_paths:
-            expanded_path = os.path.expanduser(idp_path)
+            expanded_path = self._expand_path(idp_path)
             self._remove_auth_file(expanded_path)
 
     def _clean_biometric_auth_data(self):
@@ -537,22 +577,26 @@ class AuthTokenCleaner:
         ]
 
         for bio_path in biometric_paths:
-            expanded_path = os.path.expanduser(bio_path)
+            expanded_path = self._expand_path(bio_path)
             self._remove_auth_file(expanded_path)
 
         # Check for biometric keychain entries
+        if not self.live_system:
+            return
+
         try:
-            result = subprocess.run(
-                ["security", "find-generic-password", "-s", "zoom-biometric"],
-                capture_output=True,
+            result = self.command_backend.run(
+                ["security", "find-generic-password", "-s", "zoom-biometric"]
+                + self._keychain_args(),
                 text=True,
             )
 
             if result.returncode == 0:
                 if not self.dry_run:
-                    subprocess.run(
-                        ["security", "delete-generic-password", "-s", "zoom-biometric"],
-                        capture_output=True,
+                    self.command_backend.run(
+                        ["security", "delete-generic-password", "-s", "zoom-biometric"]
+                        + self._keychain_args(),
+                        text=False,
                     )
                 self.cleaned_items.append("Biometric keychain entry")
                 self.logger.info("   ✅ Removed biometric keychain entry")
@@ -574,9 +618,9 @@ class AuthTokenCleaner:
             try:
                 if not self.dry_run:
                     # Send HUP signal to reload service configuration
-                    subprocess.run(
+                    self.command_backend.run(
                         ["sudo", "killall", "-HUP", service],
-                        capture_output=True,
+                        text=False,
                         timeout=5,
                     )
                 self.cleaned_items.append(f"Reset service: {service}")
@@ -0,0 +1,301 @@
+#!/usr/bin/env python3
+"""
+Binary Cookies Module
+Zero-copy Safari/WebKit ``.binarycookies`` scanner and selective rewriter
+
+Safari and every WebKit app keep their cookie jar in Apple's binarycookies
+format: a big-endian header listing page sizes, pages of little-endian
+cookie records, a checksum and a trailing property list. Jars of heavy
+browser users hold 100k+ cookies, so this module never decodes them all:
+
+- the jar is memory-mapped and walked by offset; only each cookie's domain
+  is read, and only Zoom cookies are decoded into ``BinaryCookie`` objects
+- removing cookies rewrites the jar in one streaming pass: untouched pages
+  are copied verbatim from a ``memoryview`` of the map, only pages holding
+  Zoom cookies are rebuilt, and the file checksum is adjusted by the
+  difference of the rebuilt pages
+- the new jar replaces the old one atomically; when a backup directory is
+  given, the removed cookie records are first backed up there as JSON,
+  readable by the owner alone
+
+Created by: PHLthy215
+Version: 2.4.2 - Binary Cookies
+"""
+
+import base64
+import glob
+import mmap
+import os
+import shutil
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Set, Tuple
+
+from .leveldb_scanner import is_zoom_host
+from .sqlite_cleaner import write_private_backup
+
+BINARYCOOKIES_MAGIC = b"cook"
+PAGE_MAGIC = b"\x00\x00\x01\x00"
+PAGE_TERMINATOR = b"\x00\x00\x00\x00"
+COOKIE_HEADER_SIZE = 56
+
+# Cookie dates count seconds from 2001-01-01 (Mac absolute time)
+MAC_EPOCH_OFFSET = 978307200
+
+# Cookie jars below a home directory, relative to ~/Library
+COOKIE_JAR_GLOBS = (
+    "Cookies/*.binarycookies",
+    "HTTPStorages/*.binarycookies",
+    "Containers/com.apple.Safari/Data/Library/Cookies/*.binarycookies",
+)
+
+_COOKIE_OFFSETS = struct.Struct("<4I")  # domain, name, path, value
+_COOKIE_DATES = struct.Struct("<2d")  # expires, created
+
+
+class BinaryCookiesError(Exception):
+    """Malformed binarycookies file"""
+
+
+@dataclass
+class BinaryCookie:
+    """A Zoom cookie found in a jar"""
+
+    page: int
+    offset: int
+    size: int
+    domain: str
+    name: str
+    path: str
+    expires: float
+    flags: int = 0
+
+
+@dataclass
+class BinaryCookiesResult:
+    """Outcome of scanning (and optionally cleaning) one cookie jar"""
+
+    path: str
+    pages: int = 0
+    cookies_scanned: int = 0
+    cookies: List[BinaryCookie] = field(default_factory=list)
+    removed: int = 0
+    backup_path: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def matched(self) -> int:
+        return len(self.cookies)
+
+
+def cookie_jar_paths(user_home: str) -> List[str]:
+    """Every binarycookies jar of Safari and WebKit apps in a home"""
+    library = glob.escape(os.path.join(user_home, "Library"))
+    paths = []
+    for pattern in COOKIE_JAR_GLOBS:
+        paths.extend(sorted(glob.glob(os.path.join(library, pattern))))
+    return [path for path in paths if os.path.isfile(path)]
+
+
+def _page_layout(data) -> List[Tuple[int, int]]:
+    """(offset, size) of every page"""
+    if len(data) < 8 or data[:4] != BINARYCOOKIES_MAGIC:
+        raise BinaryCookiesError("Not a binarycookies file")
+    (page_count,) = struct.unpack_from(">I", data, 4)
+    sizes = struct.unpack_from(f">{page_count}I", data, 8)
+    offset = 8 + 4 * page_count
+    pages = []
+    for size in sizes:
+        pages.append((offset, size))
+        offset += size
+    if offset + 4 > len(data):
+        raise BinaryCookiesError("Truncated binarycookies file")
+    return pages
+
+
+def _page_cookies(data, page_offset: int, page_size: int) -> Iterator[Tuple[int, int]]:
+    """(absolute offset, size) of every cookie record in a page"""
+    if data[page_offset : page_offset + 4] != PAGE_MAGIC:
+        raise BinaryCookiesError(f"Bad page header at offset {page_offset}")
+    (count,) = struct.unpack_from("<I", data, page_offset + 4)
+    offsets = struct.unpack_from(f"<{count}I", data, page_offset + 8)
+    for relative in offsets:
+        (size,) = struct.unpack_from("<I", data, page_offset + relative)
+        if size < COOKIE_HEADER_SIZE or relative + size > page_size:
+            raise BinaryCookiesError(f"Bad cookie record at offset {page_offset}")
+        yield page_offset + relative, size
+
+
+def _cookie_string(data, start: int, size: int, field_offset: int) -> bytes:
+    """A NUL-terminated string field of the cookie record at ``start``"""
+    begin = start + field_offset
+    end = data.find(b"\x00", begin, start + size)
+    return bytes(data[begin : end if end >= 0 else start + size])
+
+
+def _decode_cookie(data, page: int, start: int, size: int) -> BinaryCookie:
+    (flags,) = struct.unpack_from("<I", data, start + 8)
+    domain, name, path, _ = _COOKIE_OFFSETS.unpack_from(data, start + 16)
+    expires, _ = _COOKIE_DATES.unpack_from(data, start + 40)
+    return BinaryCookie(
+        page=page,
+        offset=start,
+        size=size,
+        domain=_cookie_string(data, start, size, domain).decode("utf-8", "replace"),
+        name=_cookie_string(data, start, size, name).decode("utf-8", "replace"),
+        path=_cookie_string(data, start, size, path).decode("utf-8", "replace"),
+        expires=expires + MAC_EPOCH_OFFSET,
+        flags=flags,
+    )
+
+
+def _scan_data(data, result: BinaryCookiesResult) -> None:
+    pages = _page_layout(data)
+    result.pages = len(pages)
+    for page, (page_offset, page_size) in enumerate(pages):
+        for start, size in _page_cookies(data, page_offset, page_size):
+            result.cookies_scanned += 1
+            (domain_offset,) = struct.unpack_from("<I", data, start + 16)
+            domain = _cookie_string(data, start, size, domain_offset)
+            if is_zoom_host(domain.decode("ascii", "replace").lower()):
+                result.cookies.append(_decode_cookie(data, page, start, size))
+
+
+def _page_checksum(page) -> int:
+    """Sum of every fourth byte, as used by the file checksum"""
+    return sum(page[::4])
+
+
+def _rebuild_page(view, kept: List[Tuple[int, int]]) -> bytes:
+    """A page holding only the ``kept`` (offset, size) cookie records"""
+    header_size = 8 + 4 * len(kept) + 4
+    offsets = []
+    position = header_size
+    for _, size in kept:
+        offsets.append(position)
+        position += size
+    page = bytearray(PAGE_MAGIC)
+    page += struct.pack(f"<I{len(kept)}I", len(kept), *offsets)
+    page += PAGE_TERMINATOR
+    for start, size in kept:
+        page += view[start : start + size]
+    return bytes(page)
+
+
+def _backup_cookies(
+    backup_dir: str, path: str, view, cookies: List[BinaryCookie]
+) -> str:
+    payload = {
+        "jar": path,
+        "cookies": [
+            {
+                "domain": cookie.domain,
+                "name": cookie.name,
+                "path": cookie.path,
+                "expires": cookie.expires,
+                "record": base64.b64encode(
+                    view[cookie.offset : cookie.offset + cookie.size]
+                ).decode("ascii"),
+            }
+            for cookie in cookies
+        ],
+    }
+    return write_private_backup(backup_dir, "cookie-jar", path, payload)
+
+
+def _rewrite(data, output_path: str, result: BinaryCookiesResult) -> None:
+    """Stream the jar to ``output_path`` without the matched cookies"""
+    view = memoryview(data)
+    removed: Dict[int, Set[int]] = {}
+    for cookie in result.cookies:
+        removed.setdefault(cookie.page, set()).add(cookie.offset)
+
+    pages = _page_layout(data)
+    trailer = pages[-1][0] + pages[-1][1] if pages else 8
+    (checksum,) = struct.unpack_from(">I", data, trailer)
+
+    # Rebuilt pages are small; everything else is copied from the map
+    rebuilt: Dict[int, bytes] = {}
+    for page, offsets in removed.items():
+        page_offset, page_size = pages[page]
+        kept = [
+            cookie
+            for cookie in _page_cookies(data, page_offset, page_size)
+            if cookie[0] not in offsets
+        ]
+        new_page = _rebuild_page(view, kept) if kept else b""
+        checksum -= _page_checksum(view[page_offset : page_offset + page_size])
+        checksum += _page_checksum(new_page)
+        rebuilt[page] = new_page
+
+    sizes = [
+        len(rebuilt[page]) if page in rebuilt else size
+        for page, (_, size) in enumerate(pages)
+    ]
+    sizes = [size for size in sizes if size]
+
+    temp_path = f"{output_path}.{os.getpid()}.tmp"
+    try:
+        with open(temp_path, "wb") as f:
+            f.write(BINARYCOOKIES_MAGIC)
+            f.write(struct.pack(f">I{len(sizes)}I", len(sizes), *sizes))
+            for page, (page_offset, page_size) in enumerate(pages):
+                if page in rebuilt:
+                    f.write(rebuilt[page])
+                else:
+                    f.write(view[page_offset : page_offset + page_size])
+            f.write(struct.pack(">I", checksum & 0xFFFFFFFF))
+            f.write(view[trailer + 4 :])
+            f.flush()
+            os.fsync(f.fileno())
+        if os.path.exists(output_path):
+            shutil.copymode(output_path, temp_path)
+        os.replace(temp_path, output_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+
+
+def clean_cookie_jar(
+    path: str,
+    dry_run: bool = False,
+    backup_dir: Optional[str] = None,
+    output_path: Optional[str] = None,
+) -> BinaryCookiesResult:
+    """Find the Zoom cookies of a jar and, unless dry-running, remove them
+
+    The cleaned jar replaces ``path`` (or is written to ``output_path``).
+    Nothing is rewritten when the jar holds no Zoom cookies, and removed
+    cookies are backed up only when ``backup_dir`` is given.
+    """
+    result = BinaryCookiesResult(path)
+    try:
+        with open(path, "rb") as f:
+            if os.fstat(f.fileno()).st_size == 0:
+                return result
+            data = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            _scan_data(data, result)
+            if result.cookies and not dry_run:
+                if backup_dir:
+                    with memoryview(data) as view:
+                        result.backup_path = _backup_cookies(
+                            backup_dir, path, view, result.cookies
+                        )
+                _rewrite(data, output_path or path, result)
+                result.removed = len(result.cookies)
+        finally:
+            try:
+                data.close()
+            except BufferError:
+                # A view is still referenced (e.g. by a traceback); GC unmaps it
+                pass
+    except (BinaryCookiesError, OSError, struct.error, ValueError) as e:
+        result.error = str(e)
+    return result
+
+
+def scan_cookie_jar(path: str) -> BinaryCookiesResult:
+    """The Zoom cookies of a jar, without modifying it"""
+    return clean_cookie_jar(path, dry_run=True)
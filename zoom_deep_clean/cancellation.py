@@ -0,0 +1,233 @@
+#!/usr/bin/env python3
+"""
+Cancellation Module
+Cooperative cancellation that reaches running child processes
+
+Cancelling a cleanup used to set ``user_cancelled`` on the cleaner and
+nothing else: the run went on until its last step and a long ``find`` or
+``security`` call kept running in the background. A ``CancellationToken``
+is now shared by the cleaner, its collaborators and the command backend.
+The cleaner checks it between steps and items, and every command started
+while a token is active runs in its own process group, which is terminated
+as soon as the token is cancelled. Commands stay in the caller's session,
+so they keep the controlling terminal; ``sudo`` on a terminal even stays in
+the foreground group so it can prompt for a password, and is signalled
+directly instead (it relays the signal to its command).
+
+Cancellation is raised as ``CleanupCancelled``, a ``BaseException`` like
+``KeyboardInterrupt``, so the many ``except Exception`` blocks around
+individual steps do not swallow it.
+
+Created by: PHLthy215
+Version: 2.4.2 - Cancellation
+"""
+
+import os
+import signal
+import subprocess
+import sys
+import threading
+import time
+from typing import Callable, List, Optional, Sequence
+
+DEFAULT_CANCEL_REASON = "Cancelled by user"
+KILL_GRACE_PERIOD = 1.0  # seconds between SIGTERM and SIGKILL of a process group
+
+
+class CleanupCancelled(BaseException):
+    """Raised inside a run once its cancellation token has been cancelled"""
+
+    pass
+
+
+class CancellationToken:
+    """Thread-safe cancellation flag with callbacks
+
+    ``cancel`` may be called from any thread (typically the GUI thread). It
+    returns immediately; registered callbacks such as process group kills
+    run synchronously but never block on the cancelled work.
+    """
+
+    def __init__(self):
+        self._event = threading.Event()
+        self._lock = threading.Lock()
+        self._callbacks: List[Callable[[], None]] = []
+        self.reason: Optional[str] = None
+        self.cancelled_at: Optional[float] = None
+
+    @property
+    def cancelled(self) -> bool:
+        return self._event.is_set()
+
+    def cancel(self, reason: str = DEFAULT_CANCEL_REASON) -> None:
+        """Cancel the token and run its callbacks (only the first call counts)"""
+        with self._lock:
+            if self._event.is_set():
+                return
+            self.reason = reason
+            self.cancelled_at = time.monotonic()
+            self._event.set()
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            try:
+                callback()
+            except Exception:
+                pass  # one failed kill must not stop the others
+
+    def check(self) -> None:
+        """Raise ``CleanupCancelled`` if the token was cancelled"""
+        if self._event.is_set():
+            raise CleanupCancelled(self.reason or DEFAULT_CANCEL_REASON)
+
+    def wait(self, timeout: Optional[float] = None) -> bool:
+        """Sleep up to ``timeout`` seconds; True if cancelled meanwhile"""
+        return self._event.wait(timeout)
+
+    def register(self, callback: Callable[[], None]) -> Callable[[], None]:
+        """Call ``callback`` on cancel (at once if already cancelled)"""
+        with self._lock:
+            if not self._event.is_set():
+                self._callbacks.append(callback)
+                return callback
+        callback()
+        return callback
+
+    def unregister(self, callback: Callable[[], None]) -> None:
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+
+def check_all(tokens: Sequence[CancellationToken]) -> None:
+    """Raise ``CleanupCancelled`` if any of ``tokens`` was cancelled"""
+    for token in tokens:
+        token.check()
+
+
+def wait_any(tokens: Sequence[CancellationToken], timeout: float) -> bool:
+    """Sleep up to ``timeout`` seconds; True as soon as any token is cancelled"""
+    if not tokens:
+        time.sleep(timeout)
+        return False
+    if len(tokens) == 1:
+        return tokens[0].wait(timeout)
+    woken = threading.Event()
+    for token in tokens:
+        token.register(woken.set)
+    try:
+        return woken.wait(timeout)
+    finally:
+        for token in tokens:
+            token.unregister(woken.set)
+
+
+def _keeps_terminal(args: Sequence[str]) -> bool:
+    """Whether ``args`` may prompt on the terminal (sudo asking for a password)
+
+    Such a command must stay in the terminal's foreground process group: in
+    a group of its own, reading the terminal would stop it with SIGTTIN.
+    """
+    if not args or os.path.basename(args[0]) != "sudo":
+        return False
+    try:
+        return sys.stdin is not None and sys.stdin.isatty()
+    except (ValueError, OSError):  # closed or detached stdin
+        return False
+
+
+def _process_group_options() -> dict:
+    """Popen options starting the child in a new process group, same session"""
+    if sys.version_info >= (3, 11):
+        return {"process_group": 0}
+    return {"preexec_fn": os.setpgrp}
+
+
+def terminate_process_group(
+    process: subprocess.Popen,
+    grace_period: float = KILL_GRACE_PERIOD,
+    group: bool = True,
+) -> None:
+    """Send SIGTERM to the process group of ``process``, SIGKILL if it lingers
+
+    With ``group=False`` only ``process`` itself is signalled. The SIGKILL
+    follows on a timer thread, so the caller never waits.
+    """
+
+    def send(sig) -> None:
+        if process.poll() is not None and sig != signal.SIGTERM:
+            return
+        try:
+            if group and hasattr(os, "killpg"):
+                os.killpg(process.pid, sig)
+            elif sig == signal.SIGTERM:
+                process.terminate()
+            else:
+                process.kill()
+        except (ProcessLookupError, PermissionError):
+            pass
+
+    send(signal.SIGTERM)
+    if grace_period <= 0:
+        send(getattr(signal, "SIGKILL", signal.SIGTERM))
+        return
+    timer = threading.Timer(
+        grace_period, send, args=(getattr(signal, "SIGKILL", signal.SIGTERM),)
+    )
+    timer.daemon = True
+    timer.start()
+
+
+def run_cancellable(
+    cmd_args: Sequence[str],
+    cancel_tokens: Sequence[CancellationToken],
+    timeout: Optional[float] = None,
+    check: bool = False,
+    text: bool = True,
+    errors: Optional[str] = None,
+) -> subprocess.CompletedProcess:
+    """``subprocess.run`` whose process group dies when a token is cancelled
+
+    The command is started in a process group of its own, so everything it
+    spawns is terminated with it, on cancellation and on timeout alike:
+    SIGTERM first, SIGKILL after ``KILL_GRACE_PERIOD``.
+    ``sudo`` on a terminal is the exception (see ``_keeps_terminal``). Raises
+    ``CleanupCancelled`` if cancelled.
+    """
+    args = list(cmd_args)
+    check_all(cancel_tokens)
+    group = hasattr(os, "killpg") and not _keeps_terminal(args)
+    process = subprocess.Popen(
+        args,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        text=text,
+        errors=errors,
+        shell=False,  # Critical: Never use shell=True
+        **(_process_group_options() if group else {}),
+    )
+
+    def kill() -> None:
+        terminate_process_group(process, group=group)
+
+    for token in cancel_tokens:
+        token.register(kill)
+    try:
+        try:
+            stdout, stderr = process.communicate(timeout=timeout)
+        except subprocess.TimeoutExpired:
+            # SIGTERM first: sudo relays it to its child, SIGKILL would orphan it
+            terminate_process_group(process, group=group)
+            process.communicate()
+            raise
+        except BaseException:
+            terminate_process_group(process, group=group)
+            process.wait()
+            raise
+    finally:
+        for token in cancel_tokens:
+            token.unregister(kill)
+
+    check_all(cancel_tokens)
+    if check and process.returncode != 0:
+        raise subprocess.CalledProcessError(process.returncode, args, stdout, stderr)
+    return subprocess.CompletedProcess(args, process.returncode, stdout, stderr)
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+Clean Journal Module
+Paths a cleanup run indexed, targeted, removed or found
+
+Device fingerprint verification used to search the whole disk again after
+a clean (dozens of ``find`` runs, including ``sudo find /System/Library``),
+although usually only the paths the cleaner touched can have changed. The
+cleaner now records those paths in a ``CleanJournal``: the pre-clean
+artifact index resolved from the rule catalog, every path it targeted or
+removed, and the files its final search still found. The verifier re-stats
+just these paths and the directories containing them, so verification cost
+follows what changed rather than disk size.
+
+Created by: PHLthy215
+Version: 2.4.2 - Clean Journal
+"""
+
+import os
+import threading
+from typing import Dict, Iterable, List, Set
+
+# Journal events
+INDEXED = "indexed"  # matched by the artifact rules before cleaning
+TARGETED = "targeted"  # existed when the cleaner went to remove it
+REMOVED = "removed"  # removed (or, in a dry run, would have been)
+FOUND = "found"  # still found by the comprehensive file search
+PLACEHOLDER = "placeholder"  # restricted dummy file left in place on purpose
+
+EVENTS = (INDEXED, TARGETED, REMOVED, FOUND, PLACEHOLDER)
+
+
+class CleanJournal:
+    """Thread-safe record of the paths of one cleanup run"""
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._paths: Dict[str, Set[str]] = {event: set() for event in EVENTS}
+
+    def __len__(self) -> int:
+        return len(self.paths())
+
+    def record(self, event: str, paths: Iterable[str]) -> None:
+        if event not in self._paths:
+            raise ValueError(f"Unknown journal event: {event}")
+        with self._lock:
+            self._paths[event].update(paths)
+
+    def index(self, matches: Dict[str, List[str]]) -> None:
+        """Add artifact rule matches (category -> paths) as the pre-clean index"""
+        for paths in matches.values():
+            self.record(INDEXED, paths)
+
+    def paths(self, *events: str) -> List[str]:
+        """Sorted paths recorded for ``events`` (default: all but placeholders)"""
+        events = events or (INDEXED, TARGETED, REMOVED, FOUND)
+        with self._lock:
+            selected = set().union(*(self._paths[event] for event in events))
+        return sorted(selected)
+
+    def directories(self) -> List[str]:
+        """Sorted parent directories of the recorded paths"""
+        return sorted({os.path.dirname(path) for path in self.paths()} - {""})
+
+    def to_dict(self) -> Dict[str, List[str]]:
+        """Sorted paths per event, e.g. to ship a worker's journal back"""
+        with self._lock:
+            return {event: sorted(paths) for event, paths in self._paths.items()}
+
+    def merge(self, data: Dict[str, Iterable[str]]) -> None:
+        """Add the paths of another journal's ``to_dict``"""
+        for event, paths in data.items():
+            self.record(event, paths)
+
+    def summary(self) -> Dict[str, int]:
+        with self._lock:
+            return {event: len(paths) for event, paths in self._paths.items()}
+
+    def clear(self) -> None:
+        with self._lock:
+            for paths in self._paths.values():
+                paths.clear()
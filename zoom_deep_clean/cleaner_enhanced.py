@@ -15,15 +15,52 @@ import logging
 import json
 import re
 import time
+import threading
 from datetime import datetime
-from typing import List, Dict, Tuple, Optional, Union, Any
+from functools import cached_property
+from typing import List, Dict, Set, Tuple, Optional, Union, Any
 from .advanced_features import AdvancedFeatures, AdvancedFeaturesError
 from .deep_system_cleaner import DeepSystemCleaner
 from .device_fingerprint_verifier import DeviceFingerprintVerifier
-from .auth_token_cleaner import AuthTokenCleaner
+from .auth_token_cleaner import AuthTokenCleaner, keychain_args_for_home
+from .command_backend import CommandBackend, get_default_backend
+from .artifact_rules import (
+    CompiledRuleSet,
+    catalog_paths,
+    category_scope,
+    get_compiled_rules,
+)
+from .binary_cookies import clean_cookie_jar, cookie_jar_paths
+from .stat_cache import StatCache
+from .progress_events import (
+    DEFAULT_HISTORY_DIR,
+    DEFAULT_STEP_WEIGHT,
+    ProgressTracker,
+    StepHistory,
+)
+from .cancellation import CancellationToken, CleanupCancelled
+from .time_budget import TimeBudget, prioritise
+from .clean_journal import FOUND, PLACEHOLDER, REMOVED, TARGETED, CleanJournal
+from .watch_mode import ArtifactWatcher, EventSource, RuleWatchTarget
+from .search_backends import (
+    INDEX_QUERY_TIMEOUT,
+    IndexedSearch,
+    SpotlightBackend,
+    build_find_command,
+    split_candidates,
+)
+from .target_root import (
+    discover_user_homes,
+    rebase_path,
+    report_path_for_root,
+    virtual_path,
+)
 
 # Configuration
 DEFAULT_LOG_FILE = os.path.expanduser("~/Documents/zoom_deep_clean_enhanced.log")
+DEFAULT_REPORT_FILE = os.path.expanduser(
+    "~/Documents/zoom_cleanup_enhanced_report.json"
+)
 BACKUP_DIR = os.path.expanduser("~/Documents/zoom_deep_clean_backup")
 
 # Security Configuration
@@ -38,6 +75,99 @@ class SecurityError(Exception):
     pass
 
 
+def find_zoom_files(
+    location: str, timeout: int = 180, backend: Optional[CommandBackend] = None
+) -> Tuple[List[str], str]:
+    """Search one location for Zoom files with ``find``
+
+    Returns the matching paths and find's stderr. Raises
+    subprocess.TimeoutExpired when the search exceeds ``timeout`` seconds.
+    """
+    backend = backend or get_default_backend()
+    result = backend.run(build_find_command(location), timeout=timeout)
+    found_files = [f.strip() for f in result.stdout.split("\n") if f.strip()]
+    return found_files, result.stderr
+
+
+# Per-user stores Zoom fingerprints a device by; a full run handles them in
+# their own high-priority step, ahead of the rest of the user data
+FINGERPRINT_STORE_STEPS = (
+    "remove_keychain_entries",
+    "clean_zoom_encrypted_database",
+)
+
+# Cleanup steps that only touch the target user's home directory. Everything
+# else in run_deep_clean is machine-wide and runs once per invocation.
+USER_CLEANUP_STEPS = FINGERPRINT_STORE_STEPS + (
+    "clean_webkit_storage",
+    "remove_group_containers",
+    "clean_application_data",
+    "remove_preferences",
+)
+
+# Steps that act on the running system rather than on files; they are
+# skipped in target-root (offline) mode
+LIVE_SYSTEM_STEPS = {"remove_keychain_entries"}
+
+# Progress step names and labels published by run_deep_clean
+PROGRESS_STEP_LABELS = {
+    "stop_processes": "Stopping Zoom processes",
+    "remove_applications": "Removing Zoom applications",
+    "auth_tokens": "Clearing authentication tokens",
+    "fingerprint_stores": "Removing keychain entries and encrypted database",
+    "launch_agents": "Removing launch agents",
+    "system_daemon": "Removing system daemon",
+    "audio_driver": "Removing audio driver",
+    "user_data": "Cleaning user data",
+    "system_caches": "Cleaning system caches",
+    "network_caches": "Flushing network caches",
+    "deep_system": "Cleaning deep system artifacts",
+    "advanced_features": "Running advanced features",
+    "verify_deep_cleanup": "Verifying deep system cleanup",
+    "file_search": "Searching for remaining files",
+    "fingerprint_verification": "Verifying device fingerprint",
+    "report": "Saving report",
+    "reboot": "Rebooting",
+}
+
+
+CRITICAL_FEATURES = ("keychain_access", "system_commands", "file_operations")
+
+_compatibility_probe: Optional[Dict[str, Any]] = None
+_compatibility_probed = False
+_compatibility_lock = threading.Lock()
+
+
+def probe_macos_compatibility() -> Optional[Dict[str, Any]]:
+    """macOS version support and critical feature compatibility
+
+    The probe runs once per process and logs the system compatibility
+    information at that time; every later cleaner reuses the result.
+    Returns None when compatibility checking is not available.
+    """
+    global _compatibility_probe, _compatibility_probed
+    with _compatibility_lock:
+        if not _compatibility_probed:
+            try:
+                from .macos_compatibility import compatibility_manager
+
+                compatibility_manager.log_compatibility_info()
+                _compatibility_probe = {
+                    "supported_version": compatibility_manager.is_supported_version(),
+                    "incompatible_features": [
+                        feature
+                        for feature in CRITICAL_FEATURES
+                        if not compatibility_manager.check_feature_compatibility(
+                            feature
+                        )
+                    ],
+                }
+            except ImportError:
+                _compatibility_probe = None
+            _compatibility_probed = True
+        return _compatibility_probe
+
+
 class ZoomDeepCleanerEnhanced:
     """Enhanced VM-aware Zoom deep cleaner with comprehensive system-wide cleanup"""
 
@@ -53,6 +183,17 @@ class ZoomDeepCleanerEnhanced:
         enable_mac_spoofing: bool = False,
         reset_hostname: bool = False,
         new_hostname: Optional[str] = None,
+        command_backend: Optional[CommandBackend] = None,
+        user_home: Optional[str] = None,
+        include_user_steps: bool = True,
+        include_verification: bool = True,
+        target_root: Optional[str] = None,
+        artifact_rules: Optional[CompiledRuleSet] = None,
+        step_history_dir: Optional[str] = DEFAULT_HISTORY_DIR,
+        cancel_token: Optional[CancellationToken] = None,
+        time_budget: Optional[float] = None,
+        full_verification: bool = False,
+        use_search_index: bool = True,
     ):
         # Input validation
         self.log_file = self._validate_path(log_file)
@@ -65,9 +206,35 @@ class ZoomDeepCleanerEnhanced:
         self.enable_mac_spoofing = bool(enable_mac_spoofing)
         self.reset_hostname = bool(reset_hostname)
         self.new_hostname = new_hostname
-        self.user_home = os.path.expanduser("~")
+        self.user_home = (
+            os.path.abspath(user_home) if user_home else os.path.expanduser("~")
+        )
+        self.include_user_steps = bool(include_user_steps)
+        # Multi-user mode searches and verifies once, after every account
+        self.include_verification = bool(include_verification)
+        self.target_root = os.path.abspath(target_root) if target_root else None
+        self.live_system = self.target_root is None
+        self.report_file = (
+            report_path_for_root(self.target_root)
+            if self.target_root
+            else DEFAULT_REPORT_FILE
+        )
         self.backup_dir = BACKUP_DIR if enable_backup else None
         self.user_cancelled = False  # Track user cancellation separately from errors
+        self.cancel_token = cancel_token or CancellationToken()
+        self.time_budget = TimeBudget(time_budget) if time_budget else None
+        self.command_backend = command_backend or get_default_backend()
+        self.artifact_rules = artifact_rules or get_compiled_rules()
+        self._artifact_matches: Dict[Tuple[str, str], Dict[str, List[str]]] = {}
+        # Cookie jars already cleaned this run, so each jar is parsed once
+        self._cookie_jars_cleaned: Set[str] = set()
+        self.stat_cache = StatCache()
+        # Paths of the current run, re-checked by delta verification
+        self.journal = CleanJournal()
+        self.full_verification = bool(full_verification)
+        self.use_search_index = bool(use_search_index)
+        self.step_history_dir = step_history_dir
+        self.watcher: Optional[ArtifactWatcher] = None
 
         self.cleanup_stats = {
             "files_removed": 0,
@@ -91,18 +258,13 @@ class ZoomDeepCleanerEnhanced:
             "fingerprint_files_shredded": 0,
             "network_interfaces_reset": 0,
             "wifi_cycles_completed": 0,
+            "cookies_removed": 0,
         }
 
-        # Initialize advanced features if enabled
-        if self.enable_advanced_features:
-            self.advanced_features = AdvancedFeatures(
-                logger=None,  # Will be set after logging setup
-                dry_run=self.dry_run,
-                enable_mac_spoofing=self.enable_mac_spoofing,
-            )
-
-        # Initialize deep system cleaner
-        self.deep_system_cleaner = None  # Will be initialized after logging setup
+        # Advanced features, the deep system cleaner and the backup directory
+        # are created on first use, so report-only and single-step callers
+        # never pay for them
+        self._backup_dir_ready = False
 
         # Setup logging
         self._setup_logging()
@@ -110,9 +272,116 @@ class ZoomDeepCleanerEnhanced:
         # Validate environment
         self._validate_environment()
 
-        # Setup backup directory
-        if self.enable_backup:
-            self._setup_backup_dir()
+    @cached_property
+    def advanced_features(self) -> Optional[AdvancedFeatures]:
+        """Advanced fingerprint features, None when disabled"""
+        if not self.enable_advanced_features:
+            return None
+        return AdvancedFeatures(
+            logger=self.logger,
+            dry_run=self.dry_run,
+            enable_mac_spoofing=self.enable_mac_spoofing,
+            command_backend=self.command_backend,
+        )
+
+    @cached_property
+    def progress(self) -> ProgressTracker:
+        """Progress events of run_deep_clean; subscribe before the run"""
+        if not self.live_system:
+            profile = "target_root"
+        else:
+            profile = "dry_run" if self.dry_run else "live"
+        return ProgressTracker(
+            StepHistory(self.step_history_dir, profile), logger=self.logger
+        )
+
+    def _progress_steps(self) -> List[Tuple[str, str]]:
+        """The ``(name, label)`` progress steps of this run"""
+        if self.live_system:
+            names = ["stop_processes", "remove_applications", "auth_tokens"]
+        else:
+            names = ["remove_applications"]
+        user_steps = self.include_user_steps or not self.live_system
+        if user_steps:
+            names.append("fingerprint_stores")
+        names += ["launch_agents", "system_daemon", "audio_driver"]
+        if user_steps:
+            names.append("user_data")
+        names.append("system_caches")
+        if self.live_system:
+            names += [
+                "network_caches",
+                "deep_system",
+                "advanced_features",
+                "verify_deep_cleanup",
+            ]
+        else:
+            names.append("deep_system")
+        if self.include_verification:
+            names += ["file_search", "fingerprint_verification"]
+        names.append("report")
+        if self.live_system and self.system_reboot:
+            names.append("reboot")
+        if self.time_budget is not None:
+            names = prioritise(names)
+        return [(name, PROGRESS_STEP_LABELS[name]) for name in names]
+
+    def _run_step(self, name: str, action, *args, **kwargs):
+        """Run one cleanup step inside its progress events"""
+        self.cancel_token.check()
+        with self.progress.step(name):
+            return action(*args, **kwargs)
+
+    def _run_steps(self, steps: List[Tuple[str, Any]]) -> None:
+        """Run ``(name, action)`` steps, by priority within the time budget"""
+        budget = self.time_budget
+        if budget is None:
+            for name, action in steps:
+                self._run_step(name, action)
+            return
+
+        actions = dict(steps)
+        order = prioritise(list(actions))
+        # Expected durations from earlier runs decide each step's share
+        weights = {
+            name: self.progress.history.expected(name) or DEFAULT_STEP_WEIGHT
+            for name in order
+        }
+        for index, name in enumerate(order):
+            pending = sum(weights[later] for later in order[index:])
+            label = PROGRESS_STEP_LABELS.get(name, name)
+            if not budget.begin_step(name, weights[name], pending, label):
+                self.logger.warning(f"⏱️ Time budget exhausted - skipped: {label}")
+                continue
+            try:
+                self._run_step(name, actions[name])
+            finally:
+                budget.end_step()
+
+    def _command_timeout(self, default: float) -> float:
+        """``default`` seconds, capped by the time budget of the current step"""
+        if self.time_budget is None:
+            return default
+        return self.time_budget.timeout(default)
+
+    @cached_property
+    def file_search(self) -> IndexedSearch:
+        """Spotlight, consulted before search locations are walked"""
+        # The index describes the running system, not a mounted target root
+        if not (self.use_search_index and self.live_system):
+            return IndexedSearch()
+        return IndexedSearch([SpotlightBackend(self.command_backend)])
+
+    @cached_property
+    def deep_system_cleaner(self) -> DeepSystemCleaner:
+        return DeepSystemCleaner(
+            logger=self.logger,
+            dry_run=self.dry_run,
+            command_backend=self.command_backend,
+            target_root=self.target_root,
+            cancel_token=self.cancel_token,
+            backup_dir=self.backup_dir if self.enable_backup else None,
+        )
 
     def _validate_path(self, path: str) -> str:
         """Enhanced path validation with security integration"""
@@ -143,14 +412,36 @@ class ZoomDeepCleanerEnhanced:
             "/Applications/Utilities/",
         ]
 
+        # In target-root mode the same protections apply inside the image
+        target_root = getattr(self, "target_root", None)
+        checked_paths = {resolved, virtual_path(resolved, target_root)}
         for dangerous in dangerous_paths:
-            if resolved.startswith(dangerous):
+            if any(checked.startswith(dangerous) for checked in checked_paths):
                 raise SecurityError(
                     f"Access to critical system path denied: {resolved}"
                 )
 
         return resolved
 
+    def _rebase(self, path: str) -> str:
+        """Map a live-system path onto the target root (identity when live)"""
+        return rebase_path(path, self.target_root)
+
+    def _artifact_paths(self, category: str) -> List[str]:
+        """Existing paths matched by the artifact rule catalog for a category
+
+        The whole catalog of a scope is resolved in one pass the first time
+        any of its categories is needed for the current home or root.
+        """
+        scope = category_scope(category)
+        base = self.user_home if scope == "user" else self.target_root or "/"
+        matches = self._artifact_matches.get((scope, base))
+        if matches is None:
+            matches = self.artifact_rules.resolve(scope, base)
+            self._artifact_matches[(scope, base)] = matches
+            self.journal.index(matches)
+        return matches.get(category, [])
+
     def _setup_backup_dir(self) -> None:
         """Setup secure backup directory"""
         if not self.backup_dir:
@@ -158,6 +449,7 @@ class ZoomDeepCleanerEnhanced:
 
         try:
             os.makedirs(self.backup_dir, mode=0o700, exist_ok=True)
+            self._backup_dir_ready = True
             self.logger.info(f"Backup directory: {self.backup_dir}")
         except Exception as e:
             self.logger.error(f"Failed to create backup directory: {e}")
@@ -172,7 +464,9 @@ class ZoomDeepCleanerEnhanced:
         # Get or create logger
         self.logger = logging.getLogger(__name__)
 
-        # Clear any existing handlers to avoid duplicates
+        # Close and clear any existing handlers to avoid duplicates
+        for handler in self.logger.handlers:
+            handler.close()
         self.logger.handlers.clear()
 
         # Set logging level
@@ -183,8 +477,12 @@ class ZoomDeepCleanerEnhanced:
             "%(asctime)s - %(levelname)s - %(funcName)s:%(lineno)d - %(message)s"
         )
 
-        # Create file handler
-        file_handler = logging.FileHandler(self.log_file, mode="a")
+        # Create file handler; opening it also checks the log is writable
+        try:
+            file_handler = logging.FileHandler(self.log_file, mode="a")
+        except PermissionError:
+            print(f"Error: Cannot write to log file {self.log_file}")
+            sys.exit(1)
         file_handler.setFormatter(formatter)
         self.logger.addHandler(file_handler)
 
@@ -208,18 +506,12 @@ class ZoomDeepCleanerEnhanced:
             self.logger.info(f"MAC spoofing: {self.enable_mac_spoofing}")
             self.logger.info(f"Hostname reset: {self.reset_hostname}")
 
-        # Set logger for advanced features
-        if self.enable_advanced_features:
-            self.advanced_features.logger = self.logger
-
-        # Initialize deep system cleaner
-        self.deep_system_cleaner = DeepSystemCleaner(
-            logger=self.logger, dry_run=self.dry_run
-        )
-
     def _validate_environment(self) -> None:
         """Validate that we're running on macOS with proper permissions"""
-        if sys.platform != "darwin":
+        # A replay backend never touches the live system, so recorded macOS
+        # runs can be replayed and profiled on any platform. Offline images
+        # can likewise be cleaned from any host.
+        if sys.platform != "darwin" and self.command_backend.live and self.live_system:
             self.logger.error("This script is designed for macOS only")
             sys.exit(1)
 
@@ -232,40 +524,19 @@ class ZoomDeepCleanerEnhanced:
         if not os.path.isdir(self.user_home):
             raise SecurityError(f"Invalid user home directory: {self.user_home}")
 
-        # Check if we can write to log file
-        try:
-            with open(self.log_file, "a") as f:
-                f.write("")
-        except PermissionError:
-            print(f"Error: Cannot write to log file {self.log_file}")
-            sys.exit(1)
-
-        # Import and check macOS compatibility
-        try:
-            from .macos_compatibility import compatibility_manager
-
-            # Log system compatibility information
-            compatibility_manager.log_compatibility_info()
-
-            # Check if current macOS version is supported
-            if not compatibility_manager.is_supported_version():
+        # macOS compatibility is probed once per process
+        compatibility = probe_macos_compatibility()
+        if compatibility is None:
+            self.logger.warning("macOS compatibility checking not available")
+        else:
+            if not compatibility["supported_version"]:
                 self.logger.warning(
                     "Running on unsupported macOS version - proceed with caution"
                 )
-
-            # Check feature compatibility
-            critical_features = [
-                "keychain_access",
-                "system_commands",
-                "file_operations",
-            ]
-            for feature in critical_features:
-                if not compatibility_manager.check_feature_compatibility(feature):
-                    self.logger.error(
-                        f"Critical feature '{feature}' not compatible with current macOS version"
-                    )
-        except ImportError:
-            self.logger.warning("macOS compatibility checking not available")
+            for feature in compatibility["incompatible_features"]:
+                self.logger.error(
+                    f"Critical feature '{feature}' not compatible with current macOS version"
+                )
 
         # Log security settings
         self.logger.info(f"Security: Path validation enabled")
@@ -393,6 +664,22 @@ class ZoomDeepCleanerEnhanced:
         # Default: return empty success for unhandled operations
         return True, ""
 
+    def _replay_dry_run_output(
+        self, cmd_args: List[str], timeout: int
+    ) -> Tuple[bool, str]:
+        """Answer a dry-run command from a non-live (replay) backend"""
+        try:
+            result = self.command_backend.run(cmd_args, timeout=timeout)
+        except subprocess.TimeoutExpired:
+            return False, f"Command timed out after {timeout} seconds"
+        except Exception as e:
+            return False, str(e)
+        if result.returncode == 0:
+            return True, result.stdout
+        return False, result.stderr.strip() or (
+            f"Command failed with code {result.returncode}"
+        )
+
     def _run_command(
         self,
         cmd_args: Union[str, List[str]],
@@ -424,6 +711,7 @@ class ZoomDeepCleanerEnhanced:
                 description = args_or_description
                 # cmd_args is already set correctly
 
+        self.cancel_token.check()
         if description:
             self.logger.info(f"Executing: {description}")
 
@@ -465,6 +753,11 @@ class ZoomDeepCleanerEnhanced:
                     "timestamp": time.time(),
                 }
             )
+            # A replay backend answers with recorded output instead of the
+            # hand-written simulation (nothing is executed either way)
+            if not self.command_backend.live:
+                return self._replay_dry_run_output(cmd_args, timeout)
+
             # Return contextually appropriate simulation data
             return self._simulate_dry_run_output(cmd_args, description)
 
@@ -472,17 +765,16 @@ class ZoomDeepCleanerEnhanced:
         if require_sudo and cmd_args[0] != "sudo":
             cmd_args = ["sudo"] + cmd_args
 
+        # The command may change any path it is given
+        for arg in cmd_args:
+            if arg.startswith("/"):
+                self.stat_cache.invalidate(arg)
+
+        timeout = self._command_timeout(timeout)
         try:
             self.logger.debug(f"Executing command: {' '.join(cmd_args)}")
 
-            result = subprocess.run(
-                cmd_args,
-                stdout=subprocess.PIPE,
-                stderr=subprocess.PIPE,
-                text=True,
-                timeout=timeout,
-                shell=False,  # Critical: Never use shell=True
-            )
+            result = self.command_backend.run(cmd_args, timeout=timeout)
 
             if result.returncode == 0:
                 self.logger.debug(f"Command succeeded: {' '.join(cmd_args)}")
@@ -668,7 +960,10 @@ class ZoomDeepCleanerEnhanced:
         self._verify_process_cleanup()
 
     def _verify_zoom_file(self, path: str) -> bool:
-        """Verify that a file/directory is actually related to Zoom"""
+        """Verify that a file/directory is actually related to Zoom
+
+        File type and size come from the stat cache.
+        """
         try:
             # Check if path contains zoom-related keywords
             path_lower = path.lower()
@@ -686,8 +981,9 @@ class ZoomDeepCleanerEnhanced:
                 return False
 
             # For files, check content signatures
-            if os.path.isfile(path) and os.path.getsize(path) > 0:
+            if self.stat_cache.is_file(path) and self.stat_cache.size(path) > 0:
                 try:
+                    self.stat_cache.count("open")
                     with open(path, "rb") as f:
                         header = f.read(1024)  # Read first 1KB
 
@@ -711,9 +1007,14 @@ class ZoomDeepCleanerEnhanced:
 
     def _backup_path(self, path: str) -> bool:
         """Create backup of file/directory before removal"""
-        if not self.enable_backup or not os.path.exists(path):
+        if not self.enable_backup or not self.stat_cache.exists(path):
             return True
 
+        if not self._backup_dir_ready:
+            self._setup_backup_dir()
+            if not self.enable_backup:
+                return True
+
         try:
             # Create relative backup path
             rel_path = os.path.relpath(path, "/")
@@ -723,10 +1024,12 @@ class ZoomDeepCleanerEnhanced:
             # Create backup directory structure
             os.makedirs(backup_dir, mode=0o700, exist_ok=True)
 
-            if os.path.isdir(path):
+            if self.stat_cache.is_dir(path):
+                self.stat_cache.count("copytree")
                 shutil.copytree(path, backup_path, dirs_exist_ok=True)
             else:
-                shutil.copy2(path, backup_path)
+                self.stat_cache.count("copy")
+                shutil.copy2(path, backup_path, follow_symlinks=False)
 
             self.cleanup_stats["files_backed_up"] += 1
             self.logger.debug(f"Backed up: {path} -> {backup_path}")
@@ -764,6 +1067,8 @@ class ZoomDeepCleanerEnhanced:
 
         # Fallback to regular removal
         try:
+            self.stat_cache.invalidate(file_path)
+            self.stat_cache.count("unlink")
             os.remove(file_path)
             self.logger.info(f"✅ Removed (standard): {description or file_path}")
             return True
@@ -779,6 +1084,8 @@ class ZoomDeepCleanerEnhanced:
 
         try:
             # Create empty file
+            self.stat_cache.invalidate(file_path)
+            self.stat_cache.count("open")
             with open(file_path, "w") as f:
                 pass
 
@@ -797,7 +1104,12 @@ class ZoomDeepCleanerEnhanced:
         force: bool = False,
         secure_shred: bool = False,
     ) -> bool:
-        """Safely remove file or directory with security validation and backup"""
+        """Safely remove file or directory with security validation and backup
+
+        Existence, verification, backup and removal share one cached lstat.
+        Symlinks are removed themselves, never their targets.
+        """
+        self.cancel_token.check()
         try:
             # Validate path
             validated_path = self._validate_path(path)
@@ -806,7 +1118,7 @@ class ZoomDeepCleanerEnhanced:
             self.cleanup_stats["security_violations"] += 1
             return False
 
-        if not os.path.exists(validated_path):
+        if not self.stat_cache.exists(validated_path):
             self.logger.debug(f"Path does not exist: {validated_path}")
             return False
 
@@ -815,12 +1127,14 @@ class ZoomDeepCleanerEnhanced:
             self.logger.warning(f"Skipping non-Zoom file: {validated_path}")
             return False
 
+        self.journal.record(TARGETED, [validated_path])
         if self.dry_run:
-            if os.path.isdir(validated_path):
+            if self.stat_cache.is_dir(validated_path):
                 self.logger.info(f"DRY RUN: Would remove directory: {validated_path}")
             else:
                 action = "securely shred" if secure_shred else "remove"
                 self.logger.info(f"DRY RUN: Would {action} file: {validated_path}")
+            self.journal.record(REMOVED, [validated_path])
             return True
 
         # Create backup before removal
@@ -829,24 +1143,33 @@ class ZoomDeepCleanerEnhanced:
                 f"Backup failed for {validated_path}, proceeding with removal"
             )
 
+        is_dir = self.stat_cache.is_dir(validated_path)
+        is_file = self.stat_cache.is_file(validated_path)
+        is_symlink = self.stat_cache.is_symlink(validated_path)
+
         try:
-            if os.path.isdir(validated_path):
+            if is_dir:
+                self.stat_cache.invalidate(validated_path)
+                self.stat_cache.count("rmtree")
                 shutil.rmtree(validated_path)
                 self.cleanup_stats["directories_removed"] += 1
                 self.logger.info(
                     f"✅ Removed directory: {description or validated_path}"
                 )
-            elif os.path.isfile(validated_path):
-                if secure_shred:
+            elif is_file or is_symlink:
+                if secure_shred and is_file:
                     # Use secure shredding for sensitive files
                     if self._secure_shred_file(validated_path, description):
                         self.cleanup_stats["files_removed"] += 1
                         # Create restricted dummy file (ZoomFixer technique)
-                        self._create_restricted_dummy_file(validated_path)
+                        if self._create_restricted_dummy_file(validated_path):
+                            self.journal.record(PLACEHOLDER, [validated_path])
                     else:
                         return False
                 else:
                     # Standard removal
+                    self.stat_cache.invalidate(validated_path)
+                    self.stat_cache.count("unlink")
                     os.remove(validated_path)
                     self.cleanup_stats["files_removed"] += 1
                     self.logger.info(
@@ -858,6 +1181,7 @@ class ZoomDeepCleanerEnhanced:
                 )
                 return False
 
+            self.journal.record(REMOVED, [validated_path])
             return True
 
         except PermissionError:
@@ -900,7 +1224,8 @@ class ZoomDeepCleanerEnhanced:
             for cmd_type in ["delete-generic-password", "delete-internet-password"]:
                 try:
                     success, _ = self._run_command(
-                        ["security", cmd_type, "-s", entry],
+                        ["security", cmd_type, "-s", entry]
+                        + keychain_args_for_home(self.user_home),
                         f"Removing keychain {cmd_type.split('-')[1]}: {entry}",
                     )
                     if success:
@@ -912,101 +1237,93 @@ class ZoomDeepCleanerEnhanced:
         """Remove system-level launch agents"""
         self.logger.info("🚫 Removing system-level launch agents...")
 
-        launch_agents = [
-            "/Library/LaunchAgents/us.zoom.updater.login.check.plist",
-            "/Library/LaunchAgents/us.zoom.updater.plist",
-            "/Library/LaunchAgents/us.zoom.ZoomDaemon.plist",
-            "/Library/LaunchAgents/us.zoom.ZoomAutoUpdater.plist",
-        ]
-
-        for agent in launch_agents:
-            if os.path.exists(agent):
-                # Unload first
+        for agent in self.progress.iter_items(self._artifact_paths("launch_agents")):
+            # Unload first (only loaded on the running system)
+            if self.live_system:
                 self._run_command(
                     ["launchctl", "unload", agent],
                     f"Unloading {os.path.basename(agent)}",
                     require_sudo=True,
                 )
-                # Then remove
-                self._run_command(
-                    ["rm", "-f", agent],
-                    f"Removing {os.path.basename(agent)}",
-                    require_sudo=True,
-                )
-                self.cleanup_stats["system_locations_cleaned"] += 1
+            # Then remove
+            self._run_command(
+                ["rm", "-f", agent],
+                f"Removing {os.path.basename(agent)}",
+                require_sudo=True,
+            )
+            self.cleanup_stats["system_locations_cleaned"] += 1
 
     def remove_system_daemon(self) -> None:
         """Remove system daemon and privileged helper tools"""
         self.logger.info("🔧 Removing system daemon...")
 
-        daemon_files = [
-            "/Library/LaunchDaemons/us.zoom.ZoomDaemon.plist",
-            "/Library/PrivilegedHelperTools/us.zoom.ZoomDaemon",
-            "/Library/LaunchDaemons/us.zoom.updater.plist",
-        ]
-
-        for daemon_file in daemon_files:
-            if os.path.exists(daemon_file):
-                if daemon_file.endswith(".plist"):
-                    self._run_command(
-                        ["launchctl", "unload", daemon_file],
-                        f"Unloading {os.path.basename(daemon_file)}",
-                        require_sudo=True,
-                    )
-
+        for daemon_file in self.progress.iter_items(
+            self._artifact_paths("system_daemons")
+        ):
+            if daemon_file.endswith(".plist") and self.live_system:
                 self._run_command(
-                    ["rm", "-f", daemon_file],
-                    f"Removing {os.path.basename(daemon_file)}",
+                    ["launchctl", "unload", daemon_file],
+                    f"Unloading {os.path.basename(daemon_file)}",
                     require_sudo=True,
                 )
-                self.cleanup_stats["system_locations_cleaned"] += 1
+
+            self._run_command(
+                ["rm", "-f", daemon_file],
+                f"Removing {os.path.basename(daemon_file)}",
+                require_sudo=True,
+            )
+            self.cleanup_stats["system_locations_cleaned"] += 1
 
     def remove_audio_driver(self) -> None:
         """Remove Zoom audio driver"""
         self.logger.info("🔊 Removing audio driver...")
 
-        audio_drivers = [
-            "/Library/Audio/Plug-Ins/HAL/ZoomAudioDevice.driver",
-            "/System/Library/Extensions/ZoomAudioDevice.kext",
-            "/Library/Extensions/ZoomAudioDevice.kext",
-        ]
-
-        for driver in audio_drivers:
-            if os.path.exists(driver):
-                self._run_command(
-                    ["rm", "-rf", driver],
-                    f"Removing {os.path.basename(driver)}",
-                    require_sudo=True,
-                )
-                self.cleanup_stats["system_locations_cleaned"] += 1
+        for driver in self._artifact_paths("audio_drivers"):
+            self._run_command(
+                ["rm", "-rf", driver],
+                f"Removing {os.path.basename(driver)}",
+                require_sudo=True,
+            )
+            self.cleanup_stats["system_locations_cleaned"] += 1
 
     def clean_webkit_storage(self) -> None:
         """Deep clean WebKit and HTTP storage"""
         self.logger.info("🌐 Deep cleaning WebKit storage...")
 
-        webkit_paths = [
-            f"{self.user_home}/Library/WebKit/us.zoom.xos",
-            f"{self.user_home}/Library/HTTPStorages/us.zoom.xos",
-            f"{self.user_home}/Library/HTTPStorages/us.zoom.xos.binarycookies",
-            f"{self.user_home}/Library/Cookies/us.zoom.xos.binarycookies",
-            f"{self.user_home}/Library/WebKit/NetworkProcess",
-            f"{self.user_home}/Library/WebKit/WebProcess",
-        ]
-
+        webkit_paths = self._artifact_paths("webkit_storage")
         for path in webkit_paths:
             self._remove_path(path, f"WebKit storage: {os.path.basename(path)}")
 
+        # Zoom cookies in the cookie jars of Safari and other WebKit apps that
+        # the authentication cleanup has not already handled
+        for jar in cookie_jar_paths(self.user_home):
+            if jar not in webkit_paths and jar not in self._cookie_jars_cleaned:
+                self._clean_cookie_jar(jar)
+
+    def _clean_cookie_jar(self, jar: str) -> None:
+        """Remove the Zoom cookies of a binarycookies jar, keeping the rest"""
+        result = clean_cookie_jar(
+            jar,
+            dry_run=self.dry_run,
+            backup_dir=self.backup_dir if self.enable_backup else None,
+        )
+        self._cookie_jars_cleaned.add(jar)
+        if result.error:
+            self.logger.warning(f"Could not clean cookie jar {jar}: {result.error}")
+            self.cleanup_stats["warnings"] += 1
+        elif result.matched and self.dry_run:
+            self.logger.info(
+                f"DRY RUN: Would remove {result.matched} Zoom cookies from: {jar}"
+            )
+        elif result.removed:
+            self.cleanup_stats["cookies_removed"] += result.removed
+            self.logger.info(f"🍪 Removed {result.removed} Zoom cookies from: {jar}")
+
     def remove_group_containers(self) -> None:
         """Remove Group Containers"""
         self.logger.info("📦 Removing Group Containers...")
 
-        group_containers = [
-            f"{self.user_home}/Library/Group Containers/BJ4HAAB9B3.ZoomClient3rd",
-            f"{self.user_home}/Library/Group Containers/us.zoom.xos",
-            f"{self.user_home}/Library/Group Containers/zoom.us",
-        ]
-
-        for container in group_containers:
+        for container in self._artifact_paths("group_containers"):
             self._remove_path(
                 container, f"Group container: {os.path.basename(container)}"
             )
@@ -1017,19 +1334,13 @@ class ZoomDeepCleanerEnhanced:
 
         # Common Zoom application paths
         zoom_app_paths = [
-            "/Applications/zoom.us.app",
-            "/Applications/Zoom.app",
-            "/Applications/ZoomPhone.app",
-            "/Applications/ZoomClips.app",
-            "/Applications/ZoomChat.app",
-            "/Applications/ZoomPresence.app",
-            "/Applications/ZoomUpdater.app",
-            "/Applications/ZoomInstaller.app",
+            self._rebase(app_path) for app_path in catalog_paths("applications")
         ]
+        applications_dir = self._rebase("/Applications")
 
         apps_found = 0
         for app_path in zoom_app_paths:
-            if os.path.exists(app_path):
+            if self.stat_cache.exists(app_path):
                 self.logger.info(f"🎯 Found Zoom application: {app_path}")
                 self._remove_path(
                     app_path, f"Zoom application: {os.path.basename(app_path)}"
@@ -1041,8 +1352,8 @@ class ZoomDeepCleanerEnhanced:
         # Also check for any other Zoom-related apps in /Applications
         # but exclude our own cleanup tool
         try:
-            if os.path.exists("/Applications"):
-                for item in os.listdir("/Applications"):
+            if os.path.exists(applications_dir):
+                for item in os.listdir(applications_dir):
                     if (
                         item.lower().startswith("zoom")
                         and item.endswith(".app")
@@ -1050,7 +1361,7 @@ class ZoomDeepCleanerEnhanced:
                         and "cleaner" not in item.lower()
                     ):
 
-                        app_path = f"/Applications/{item}"
+                        app_path = os.path.join(applications_dir, item)
                         # Skip if already processed above
                         if app_path not in zoom_app_paths:
                             self.logger.info(
@@ -1133,53 +1444,68 @@ class ZoomDeepCleanerEnhanced:
         """Deep clean application data"""
         self.logger.info("🗄️ Deep cleaning application data...")
 
-        # First, surgically target the encrypted database (ZoomFixer method)
-        self.clean_zoom_encrypted_database()
-
-        app_data_paths = [
-            f"{self.user_home}/Library/Application Support/zoom.us",
-            f"{self.user_home}/Library/Application Support/ZoomUpdater",
-            f"{self.user_home}/Library/Application Support/ZoomPhone",
-            f"{self.user_home}/Library/Application Support/ZoomClips",
-            f"{self.user_home}/Library/Application Support/ZoomChat",
-            f"{self.user_home}/Library/Application Support/ZoomPresence",
-            f"{self.user_home}/Library/Caches/us.zoom.xos",
-            f"{self.user_home}/Library/Caches/ZoomPhone",
-            f"{self.user_home}/Library/Caches/ZoomChat",
-            f"{self.user_home}/Library/Logs/zoom.us",
-            f"{self.user_home}/Library/Logs/ZoomPhone",
-            f"{self.user_home}/Library/Logs/ZoomChat",
-            f"{self.user_home}/Library/Saved Application State/us.zoom.xos.savedState",
-        ]
-
-        for path in app_data_paths:
+        for path in self._artifact_paths("application_data"):
             self._remove_path(path, f"App data: {os.path.basename(path)}")
 
     def remove_preferences(self) -> None:
         """Remove preference files"""
         self.logger.info("⚙️ Removing preference files...")
 
-        pref_files = [
-            f"{self.user_home}/Library/Preferences/us.zoom.xos.plist",
-            f"{self.user_home}/Library/Preferences/us.zoom.updater.plist",
-            f"{self.user_home}/Library/Preferences/us.zoom.updater.config.plist",
-            f"{self.user_home}/Library/Preferences/us.zoom.ZoomAutoUpdater.plist",
-            f"{self.user_home}/Library/Preferences/us.zoom.ZoomClips.plist",
-            f"{self.user_home}/Library/Preferences/ZoomChat.plist",
-            f"{self.user_home}/Library/Preferences/ZoomPhone.plist",
-            f"{self.user_home}/Library/Preferences/ZoomPresence.plist",
-        ]
-
-        for pref in pref_files:
+        for pref in self._artifact_paths("preferences"):
             self._remove_path(pref, f"Preference: {os.path.basename(pref)}")
 
+    def clean_fingerprint_stores(self) -> None:
+        """Remove the keychain entries and encrypted database of ``self.user_home``"""
+        for step in FINGERPRINT_STORE_STEPS:
+            if not self.live_system and step in LIVE_SYSTEM_STEPS:
+                continue
+            getattr(self, step)()
+
+    def clean_user_data(self, fingerprint_stores: bool = True) -> Dict[str, Any]:
+        """Run every per-user cleanup step against ``self.user_home``
+
+        ``fingerprint_stores=False`` skips the steps ``clean_fingerprint_stores``
+        already ran. Returns the authentication cleanup results for this
+        account.
+        """
+        self.logger.info(f"👤 Cleaning user data in {self.user_home}")
+        self._artifact_matches.pop(("user", self.user_home), None)
+        auth_cleaner = AuthTokenCleaner(
+            verbose=self.verbose,
+            dry_run=self.dry_run,
+            command_backend=self.command_backend,
+            user_home=self.user_home,
+            target_root=self.target_root,
+            artifact_rules=self.artifact_rules,
+            backup_dir=self.backup_dir if self.enable_backup else None,
+        )
+        auth_cleanup_results = auth_cleaner.clean_all_auth_tokens(scope="user")
+        for jar, removed in auth_cleaner.cookie_jars_cleaned.items():
+            self._cookie_jars_cleaned.add(jar)
+            self.cleanup_stats["cookies_removed"] += removed
+
+        for step in USER_CLEANUP_STEPS:
+            if not self.live_system and step in LIVE_SYSTEM_STEPS:
+                continue
+            if not fingerprint_stores and step in FINGERPRINT_STORE_STEPS:
+                continue
+            getattr(self, step)()
+
+        return auth_cleanup_results
+
     def clean_system_caches(self) -> None:
         """Clean system caches and receipts with security validation"""
         self.logger.info("🧹 Cleaning system caches...")
 
         # Clean receipts using secure command execution
         self._run_command(
-            ["find", "/private/var/db/receipts", "-name", "*zoom*", "-delete"],
+            [
+                "find",
+                self._rebase("/private/var/db/receipts"),
+                "-name",
+                "*zoom*",
+                "-delete",
+            ],
             "Removing Zoom receipts",
             require_sudo=True,
             timeout=60,
@@ -1188,7 +1514,7 @@ class ZoomDeepCleanerEnhanced:
         # Clean temporary files more securely
         temp_dirs = ["/tmp", "/var/tmp", "/private/tmp", "/var/folders"]
 
-        for temp_dir in temp_dirs:
+        for temp_dir in map(self._rebase, temp_dirs):
             if os.path.exists(temp_dir):
                 # Find zoom files in temp directory
                 self._run_command(
@@ -1350,92 +1676,113 @@ class ZoomDeepCleanerEnhanced:
         self.randomize_hostname()
         self.spoof_mac_address()
 
-    def comprehensive_file_search(self) -> List[str]:
-        """Perform comprehensive search for remaining Zoom files"""
-        self.logger.info(
-            "🔍 Performing comprehensive search for remaining Zoom files..."
-        )
-
-        remaining_files = []
+    def _default_search_locations(self) -> List[str]:
+        """Locations scanned by comprehensive_file_search"""
         search_locations = [
             "/Library",
             "/System/Library",
             "/private/var",
             "/Applications",
         ]
+        search_locations = [self._rebase(location) for location in search_locations]
 
         # Add user directories to search locations
+        users_dir = self._rebase("/Users")
         try:
             user_dirs = [
                 d
-                for d in os.listdir("/Users")
-                if os.path.isdir(os.path.join("/Users", d))
+                for d in os.listdir(users_dir)
+                if os.path.isdir(os.path.join(users_dir, d))
             ]
             for user in user_dirs:
-                search_locations.append(f"/Users/{user}")
+                search_locations.append(os.path.join(users_dir, user))
         except OSError as e:
             self.logger.warning(f"Could not list user directories: {e}")
 
-        excluded_dirs = [
-            "*/.Trash/*",
-            "*/Library/Caches/*",
-            "*/Application Support/MobileSync/*",
-            "*/Time Machine Backups/*",
-        ]
+        return search_locations
+
+    def comprehensive_file_search(
+        self, search_locations: Optional[List[str]] = None
+    ) -> List[str]:
+        """Perform comprehensive search for remaining Zoom files"""
+        self.logger.info(
+            "🔍 Performing comprehensive search for remaining Zoom files..."
+        )
+
+        remaining_files = []
+        if search_locations is None:
+            search_locations = self._default_search_locations()
 
-        for location in search_locations:
+        for index, location in enumerate(search_locations):
+            self.cancel_token.check()
+            if self.time_budget is not None and self.time_budget.step_expired():
+                skipped = len(search_locations) - index
+                self.logger.warning(
+                    f"⏱️ Time budget exhausted - {skipped} search location(s) not searched"
+                )
+                self.time_budget.cut(
+                    f"{skipped} of {len(search_locations)} search locations not searched"
+                )
+                break
             if not os.path.exists(location):
                 continue
 
             self.logger.info(f"🔎 Searching in {location}...")
 
-            # Use a more robust find command that handles permission errors
-            find_command = ["find", location, "-iname", "*zoom*"]
-
-            # Add exclusions
-            for excluded in excluded_dirs:
-                find_command.extend(["-not", "-path", excluded])
-
-            find_command.extend(["-type", "f", "2>/dev/null"])
-
-            # Run without requiring sudo for better permission handling
-            try:
-                result = subprocess.run(
-                    find_command,
-                    capture_output=True,
-                    text=True,
-                    timeout=180,
-                    shell=False,
+            # The index answers what it covers; the rest is walked with find
+            candidates, walk = self.file_search.lookup(
+                location, timeout=self._command_timeout(INDEX_QUERY_TIMEOUT)
+            )
+            found_files: List[str] = []
+            if candidates is not None:
+                # Zoom directories are walked: the index may not list their contents
+                found_files, directories = split_candidates(candidates)
+                self.logger.info(
+                    f"⚡ {len(found_files)} Zoom files from the search index, "
+                    f"{len(walk)} excluded subtree(s) and {len(directories)} "
+                    f"Zoom folder(s) to walk"
                 )
+                walk = walk + directories
+            for subtree in walk:
+                self.cancel_token.check()
+                found_files.extend(self._walk_search_location(subtree))
 
-                # Log the command for dry run mode
-                if self.dry_run:
-                    cmd_str = " ".join(find_command)
-                    self.logger.info(
-                        f"DRY RUN: Searching for Zoom files in {location} | Command: {cmd_str}"
-                    )
+            if found_files:
+                remaining_files.extend(found_files)
+                self.journal.record(FOUND, found_files)
+                self.cleanup_stats["remaining_files_found"] += len(found_files)
 
-                if result.stdout.strip():
-                    found_files = [
-                        f.strip()
-                        for f in result.stdout.strip().split("\n")
-                        if f.strip()
-                    ]
-                    remaining_files.extend(found_files)
-                    self.cleanup_stats["remaining_files_found"] += len(found_files)
+        return remaining_files
 
-                # Log permission errors as debug info, not warnings
-                if result.stderr and "Operation not permitted" in result.stderr:
-                    self.logger.debug(
-                        f"Some directories in {location} require elevated permissions"
-                    )
+    def _walk_search_location(self, location: str) -> List[str]:
+        """Search one location for Zoom files with find"""
+        # Log the command for dry run mode
+        if self.dry_run:
+            cmd_str = " ".join(build_find_command(location))
+            self.logger.info(
+                f"DRY RUN: Searching for Zoom files in {location} | Command: {cmd_str}"
+            )
 
-            except subprocess.TimeoutExpired:
-                self.logger.warning(f"Search in {location} timed out")
-            except Exception as e:
-                self.logger.debug(f"Search error in {location}: {e}")
+        # Run without requiring sudo for better permission handling
+        try:
+            found_files, stderr = find_zoom_files(
+                location,
+                timeout=self._command_timeout(180),
+                backend=self.command_backend,
+            )
 
-        return remaining_files
+            # Log permission errors as debug info, not warnings
+            if stderr and "Operation not permitted" in stderr:
+                self.logger.debug(
+                    f"Some directories in {location} require elevated permissions"
+                )
+            return found_files
+
+        except subprocess.TimeoutExpired:
+            self.logger.warning(f"Search in {location} timed out")
+        except Exception as e:
+            self.logger.debug(f"Search error in {location}: {e}")
+        return []
 
     def run_advanced_features(self) -> Dict[str, Any]:
         """Execute advanced fingerprint detection and modification features"""
@@ -1548,7 +1895,7 @@ class ZoomDeepCleanerEnhanced:
         self.logger.info("System will reboot in 10 seconds. Press Ctrl+C to cancel.")
 
         try:
-            time.sleep(10)
+            self.cancel_token.wait(10)  # a cancel skips the countdown
             self._run_command(
                 ["shutdown", "-r", "now"], "Rebooting system", require_sudo=True
             )
@@ -1566,6 +1913,7 @@ class ZoomDeepCleanerEnhanced:
             "system_reboot": self.system_reboot,
             "backup_location": self.backup_dir if self.enable_backup else None,
             "statistics": self.cleanup_stats,
+            "filesystem_syscalls": self.stat_cache.stats(),
             "log_file": self.log_file,
             "security_features": {
                 "path_validation": True,
@@ -1576,6 +1924,9 @@ class ZoomDeepCleanerEnhanced:
                 "comprehensive_search": True,
             },
         }
+        if self.time_budget is not None:
+            report["time_budget"] = self.time_budget.report()
+        report["file_search"] = self.file_search.stats()
 
         return report
 
@@ -1656,9 +2007,7 @@ class ZoomDeepCleanerEnhanced:
     def save_report(self, report: Dict[str, Any]) -> None:
         """Save cleanup report to JSON file with security validation"""
         try:
-            report_file = self._validate_path(
-                os.path.expanduser("~/Documents/zoom_cleanup_enhanced_report.json")
-            )
+            report_file = self._validate_path(self.report_file)
 
             # Create directory if it doesn't exist
             os.makedirs(os.path.dirname(report_file), mode=0o755, exist_ok=True)
@@ -1680,8 +2029,181 @@ class ZoomDeepCleanerEnhanced:
         """Check if the operation was cancelled by user (Ctrl+C)"""
         return self.user_cancelled
 
+    def cancel(self, reason: str = "Cancelled by user") -> None:
+        """Stop a running cleanup from any thread
+
+        The run stops at its next step or item, and commands still running
+        are terminated with their process groups.
+        """
+        self.user_cancelled = True
+        self.cancel_token.cancel(reason)
+
+    def watch(self, source: Optional[EventSource] = None, **options) -> Dict[str, int]:
+        """Remove artifacts that reappear after the clean, until cancelled
+
+        Blocks until ``cancel`` is called or Ctrl+C is pressed and returns
+        the watch counters; ``self.watcher`` exposes them while it runs.
+        """
+        self.watcher = ArtifactWatcher(
+            RuleWatchTarget(self),
+            source=source,
+            logger=self.logger,
+            cancel_token=self.cancel_token,
+            **options,
+        )
+        return self.watcher.run()
+
+    def verify_device_fingerprint(self) -> Dict[str, Any]:
+        """Verify that no device fingerprint survived the clean
+
+        Only the paths in ``self.journal`` are re-checked unless
+        ``full_verification`` is set.
+        """
+        self.logger.info("🔍 Starting comprehensive device fingerprint verification...")
+        fingerprint_verifier = DeviceFingerprintVerifier(
+            verbose=self.verbose,
+            command_backend=self.command_backend,
+            target_root=self.target_root,
+            dry_run=self.dry_run,
+        )
+        return fingerprint_verifier.verify_complete_cleanup(
+            journal=None if self.full_verification else self.journal
+        )
+
+    def run_target_root_clean(self) -> bool:
+        """Clean an offline target root (mounted volume, image or directory)
+
+        Path rules are re-based onto ``self.target_root``, every account found
+        under its /Users is cleaned, and live-system-only steps are skipped.
+        """
+        try:
+            self.logger.info(f"💿 Target-root clean of {self.target_root}")
+
+            results: Dict[str, Any] = {"users": {}, "deep": {}, "verification": {}}
+
+            def for_each_user(action):
+                # Per-user steps for every account inside the target root
+                original_home = self.user_home
+                try:
+                    user_homes = discover_user_homes(self._rebase("/Users"))
+                    for user_home in self.progress.iter_items(user_homes):
+                        self.cancel_token.check()
+                        self.user_home = user_home
+                        action(user_home)
+                finally:
+                    self.user_home = original_home
+
+            def fingerprint_stores():
+                for_each_user(lambda user_home: self.clean_fingerprint_stores())
+
+            def clean_user(user_home):
+                results["users"][user_home] = self.clean_user_data(
+                    fingerprint_stores=False
+                )
+
+            def user_data():
+                for_each_user(clean_user)
+
+            def deep_system():
+                results["deep"] = self.deep_system_cleaner.clean_deep_system_artifacts()
+                for key, value in results["deep"].items():
+                    self.cleanup_stats[key] = self.cleanup_stats.get(key, 0) + value
+
+            def file_search():
+                remaining_files = self.comprehensive_file_search()
+                if remaining_files:
+                    self.logger.warning(
+                        f"⚠️ Found {len(remaining_files)} remaining Zoom files"
+                    )
+
+            def fingerprint_verification():
+                results["verification"] = self.verify_device_fingerprint()
+
+            steps = [
+                ("remove_applications", self.remove_zoom_applications),
+                ("fingerprint_stores", fingerprint_stores),
+                ("launch_agents", self.remove_launch_agents),
+                ("system_daemon", self.remove_system_daemon),
+                ("audio_driver", self.remove_audio_driver),
+                ("user_data", user_data),
+                ("system_caches", self.clean_system_caches),
+                ("deep_system", deep_system),
+            ]
+            if self.include_verification:
+                steps += [
+                    ("file_search", file_search),
+                    ("fingerprint_verification", fingerprint_verification),
+                ]
+            self._run_steps(steps)
+            user_results = results["users"]
+            deep_cleanup_results = results["deep"]
+            verification_report = results["verification"]
+
+            with self.progress.step("report"):
+                report = self.generate_report()
+                report["target_root"] = self.target_root
+                report["users"] = user_results
+                report["deep_system_cleanup"] = {"results": deep_cleanup_results}
+                report["device_fingerprint_verification"] = verification_report
+                self.save_report(report)
+
+            self.logger.info("=" * 80)
+            self.logger.info(f"🎉 TARGET-ROOT CLEAN COMPLETE: {self.target_root}")
+            self.logger.info(f"   • User accounts cleaned: {len(user_results)}")
+            self.logger.info(
+                f"   • Files removed: {self.cleanup_stats['files_removed']}"
+            )
+            self.logger.info(
+                f"   • Directories removed: {self.cleanup_stats['directories_removed']}"
+            )
+            self.logger.info(
+                f"   • Remaining files found: {self.cleanup_stats['remaining_files_found']}"
+            )
+
+            return (
+                self.cleanup_stats["errors"] == 0
+                and self.cleanup_stats["security_violations"] == 0
+            )
+
+        except (KeyboardInterrupt, CleanupCancelled):
+            self.logger.warning("Operation cancelled by user")
+            self.user_cancelled = True
+            return False
+        except Exception as e:
+            self.logger.error(f"Unexpected error during target-root cleanup: {e}")
+            return False
+
     def run_deep_clean(self) -> bool:
-        """Execute the complete enhanced deep clean process"""
+        """Execute the complete enhanced deep clean process
+
+        Progress is published to the observers of ``self.progress``; the run
+        stops early once ``cancel`` is called.
+        """
+        # Artifacts and file states are resolved afresh for every run
+        self._artifact_matches.clear()
+        self._cookie_jars_cleaned.clear()
+        self.stat_cache.clear()
+        self.journal.clear()
+        self.file_search.reset()
+
+        if self.time_budget is not None:
+            self.time_budget.start()
+        self.progress.start_run(self._progress_steps())
+        success = False
+        try:
+            with self.command_backend.cancellation(self.cancel_token):
+                if self.live_system:
+                    success = self._run_live_clean()
+                else:
+                    success = self.run_target_root_clean()
+        finally:
+            self.progress.finish_run(
+                success, error="cancelled" if self.user_cancelled else None
+            )
+        return success
+
+    def _run_live_clean(self) -> bool:
+        """Run every cleanup step against the running system"""
         try:
             self.logger.info(
                 "🔥 ZOOM DEEP CLEAN ENHANCED - VM-Aware & System-Wide v2.2.0 by PHLthy215"
@@ -1695,87 +2217,132 @@ class ZoomDeepCleanerEnhanced:
                 )
 
             # Execute enhanced cleanup steps
-            self.stop_zoom_processes()
-            self.remove_zoom_applications()  # NEW: Remove main Zoom apps from /Applications
+            results: Dict[str, Any] = {
+                "auth": {"success": False, "cleaned_items": [], "errors": []},
+                "deep": {},
+                "deep_verified": False,
+                "advanced": {},
+                "verification": {},
+            }
 
-            # Comprehensive authentication token cleanup (CRITICAL for login issues)
-            self.logger.info(
-                "🔐 Starting comprehensive authentication token cleanup..."
-            )
-            auth_cleaner = AuthTokenCleaner(verbose=self.verbose, dry_run=self.dry_run)
-            auth_cleanup_results = auth_cleaner.clean_all_auth_tokens()
-
-            self.remove_keychain_entries()
-            self.remove_launch_agents()
-            self.remove_system_daemon()
-            self.remove_audio_driver()
-            self.clean_webkit_storage()
-            self.remove_group_containers()
-            self.clean_application_data()
-            self.remove_preferences()
-            self.clean_system_caches()
-            self.flush_network_caches()
-
-            # Execute deep system cleanup (addresses "login works but can't join meetings" issue)
-            self.logger.info("🔍 Starting deep system artifact cleanup...")
-            deep_cleanup_results = (
-                self.deep_system_cleaner.clean_deep_system_artifacts()
-            )
-
-            # Update cleanup stats with deep cleanup results
-            for key, value in deep_cleanup_results.items():
-                if key in self.cleanup_stats:
-                    self.cleanup_stats[key] += value
-                else:
-                    self.cleanup_stats[key] = value
+            def auth_tokens():
+                # Comprehensive authentication token cleanup (CRITICAL for login issues)
+                self.logger.info(
+                    "🔐 Starting comprehensive authentication token cleanup..."
+                )
+                auth_cleaner = AuthTokenCleaner(
+                    verbose=self.verbose,
+                    dry_run=self.dry_run,
+                    command_backend=self.command_backend,
+                    backup_dir=self.backup_dir if self.enable_backup else None,
+                )
+                results["auth"] = auth_cleaner.clean_all_auth_tokens(scope="system")
+
+            def user_data():
+                user_auth_results = self.clean_user_data(fingerprint_stores=False)
+                auth_cleanup_results = results["auth"]
+                for key in ("cleaned_items", "errors"):
+                    auth_cleanup_results[key] = (
+                        auth_cleanup_results[key] + user_auth_results[key]
+                    )
+                auth_cleanup_results["success"] = (
+                    auth_cleanup_results["success"] and user_auth_results["success"]
+                )
 
-            # Run advanced fingerprint features
-            advanced_results = self.run_advanced_features()
+            def deep_system():
+                # Execute deep system cleanup (addresses "login works but can't join meetings" issue)
+                self.logger.info("🔍 Starting deep system artifact cleanup...")
+                results["deep"] = self.deep_system_cleaner.clean_deep_system_artifacts()
 
-            # Verify deep system cleanup was successful
-            deep_cleanup_verified = self.deep_system_cleaner.verify_deep_cleanup()
-            if not deep_cleanup_verified:
-                self.logger.warning(
-                    "⚠️ Deep system cleanup verification failed - some artifacts may remain"
-                )
-            else:
-                self.logger.info("✅ Deep system cleanup verification passed")
+                # Update cleanup stats with deep cleanup results
+                for key, value in results["deep"].items():
+                    if key in self.cleanup_stats:
+                        self.cleanup_stats[key] += value
+                    else:
+                        self.cleanup_stats[key] = value
 
-            # Perform comprehensive search for remaining files
-            remaining_files = self.comprehensive_file_search()
-            if remaining_files:
-                self.logger.warning(
-                    f"⚠️ Found {len(remaining_files)} remaining Zoom files:"
+            def advanced_features():
+                # Run advanced fingerprint features
+                results["advanced"] = self.run_advanced_features()
+
+            def verify_deep_cleanup():
+                # Verify deep system cleanup was successful
+                results["deep_verified"] = (
+                    self.deep_system_cleaner.verify_deep_cleanup()
                 )
-                for file_path in remaining_files[:10]:  # Show first 10
-                    self.logger.warning(f"   📄 {file_path}")
-                if len(remaining_files) > 10:
+                if not results["deep_verified"]:
                     self.logger.warning(
-                        f"   ... and {len(remaining_files) - 10} more files"
+                        "⚠️ Deep system cleanup verification failed - some artifacts may remain"
                     )
+                else:
+                    self.logger.info("✅ Deep system cleanup verification passed")
+
+            def file_search():
+                # Perform comprehensive search for remaining files
+                remaining_files = self.comprehensive_file_search()
+                if remaining_files:
+                    self.logger.warning(
+                        f"⚠️ Found {len(remaining_files)} remaining Zoom files:"
+                    )
+                    for file_path in remaining_files[:10]:  # Show first 10
+                        self.logger.warning(f"   📄 {file_path}")
+                    if len(remaining_files) > 10:
+                        self.logger.warning(
+                            f"   ... and {len(remaining_files) - 10} more files"
+                        )
+
+            def fingerprint_verification():
+                results["verification"] = self.verify_device_fingerprint()
+
+            steps = [
+                ("stop_processes", self.stop_zoom_processes),
+                # NEW: Remove main Zoom apps from /Applications
+                ("remove_applications", self.remove_zoom_applications),
+                ("auth_tokens", auth_tokens),
+            ]
+            # Per-user steps (multi-user mode runs these per account instead)
+            if self.include_user_steps:
+                steps.append(("fingerprint_stores", self.clean_fingerprint_stores))
+            steps += [
+                ("launch_agents", self.remove_launch_agents),
+                ("system_daemon", self.remove_system_daemon),
+                ("audio_driver", self.remove_audio_driver),
+            ]
+            if self.include_user_steps:
+                steps.append(("user_data", user_data))
+            steps += [
+                ("system_caches", self.clean_system_caches),
+                ("network_caches", self.flush_network_caches),
+                ("deep_system", deep_system),
+                ("advanced_features", advanced_features),
+                ("verify_deep_cleanup", verify_deep_cleanup),
+            ]
+            if self.include_verification:
+                steps += [
+                    ("file_search", file_search),
+                    ("fingerprint_verification", fingerprint_verification),
+                ]
+            self._run_steps(steps)
 
             self.show_hardware_info()
 
-            # Perform comprehensive device fingerprint verification
-            self.logger.info(
-                "🔍 Starting comprehensive device fingerprint verification..."
-            )
-            fingerprint_verifier = DeviceFingerprintVerifier(verbose=self.verbose)
-            verification_report = fingerprint_verifier.verify_complete_cleanup()
+            auth_cleanup_results = results["auth"]
+            deep_cleanup_results = results["deep"]
+            deep_cleanup_verified = results["deep_verified"]
+            verification_report = results["verification"]
 
             # Generate and save report
-            report = self.generate_report()
-            report["advanced_features_results"] = (
-                advanced_results if "advanced_results" in locals() else {}
-            )
-            report["deep_system_cleanup"] = {
-                "results": deep_cleanup_results,
-                "verification_passed": deep_cleanup_verified,
-                "detailed_report": self.deep_system_cleaner.generate_deep_cleanup_report(),
-            }
-            report["device_fingerprint_verification"] = verification_report
-            report["authentication_cleanup"] = auth_cleanup_results
-            self.save_report(report)
+            with self.progress.step("report"):
+                report = self.generate_report()
+                report["advanced_features_results"] = results["advanced"]
+                report["deep_system_cleanup"] = {
+                    "results": deep_cleanup_results,
+                    "verification_passed": deep_cleanup_verified,
+                    "detailed_report": self.deep_system_cleaner.generate_deep_cleanup_report(),
+                }
+                report["device_fingerprint_verification"] = verification_report
+                report["authentication_cleanup"] = auth_cleanup_results
+                self.save_report(report)
 
             # Final summary
             self.logger.info("=" * 80)
@@ -1937,7 +2504,8 @@ class ZoomDeepCleanerEnhanced:
                 self.logger.info("   3. Install Zoom as if on a new device")
 
             # Perform system reboot if requested
-            self.perform_system_reboot()
+            if self.system_reboot:
+                self._run_step("reboot", self.perform_system_reboot)
 
             # Return success only if no errors AND no security violations
             return (
@@ -1945,7 +2513,7 @@ class ZoomDeepCleanerEnhanced:
                 and self.cleanup_stats["security_violations"] == 0
             )
 
-        except KeyboardInterrupt:
+        except (KeyboardInterrupt, CleanupCancelled):
             self.logger.warning("Operation cancelled by user")
             self.user_cancelled = True
             return False
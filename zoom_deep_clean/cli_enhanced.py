@@ -4,23 +4,46 @@ Enhanced CLI for Zoom Deep Clean with comprehensive system cleaning
 """
 
 import argparse
+import importlib
 import sys
 import logging
 import os
 from pathlib import Path
 
 # Handle both direct execution and package import
-try:
-    # Try relative import first (when run as package)
-    from .cleaner_enhanced import ZoomDeepCleanerEnhanced
-    from .comprehensive_cli import ComprehensiveZoomCLI
-    from .auth_fix_cli import main as auth_fix_main
-except ImportError:
-    # Fall back to absolute import (when run directly)
+if not __package__:
+    # Running directly: make the package importable
     sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
-    from zoom_deep_clean.cleaner_enhanced import ZoomDeepCleanerEnhanced
-    from zoom_deep_clean.comprehensive_cli import ComprehensiveZoomCLI
-    from zoom_deep_clean.auth_fix_cli import main as auth_fix_main
+
+# Subsystems are imported on first use (PEP 562) so that --help and --version
+# never load the cleaners, the installer or their dependencies
+_LAZY_IMPORTS = {
+    "ZoomDeepCleanerEnhanced": (
+        "zoom_deep_clean.cleaner_enhanced",
+        "ZoomDeepCleanerEnhanced",
+    ),
+    "MultiUserCleaner": ("zoom_deep_clean.multi_user", "MultiUserCleaner"),
+    "TargetRootBatch": ("zoom_deep_clean.target_root", "TargetRootBatch"),
+    "ComprehensiveZoomCLI": (
+        "zoom_deep_clean.comprehensive_cli",
+        "ComprehensiveZoomCLI",
+    ),
+    "auth_fix_main": ("zoom_deep_clean.auth_fix_cli", "main"),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_IMPORTS[name]
+    value = getattr(importlib.import_module(module_name), attribute)
+    globals()[name] = value
+    return value
+
+
+def _subsystem(name: str):
+    """Resolve a lazily imported subsystem, honouring patched attributes"""
+    return globals()[name] if name in globals() else __getattr__(name)
 
 
 def setup_logging(verbose: bool = False) -> logging.Logger:
@@ -30,6 +53,19 @@ def setup_logging(verbose: bool = False) -> logging.Logger:
     return logging.getLogger(__name__)
 
 
+def progress_logger(logger: logging.Logger):
+    """Progress observer logging each step as it starts and the run's end"""
+    from zoom_deep_clean.progress_events import RUN_FINISHED, STEP_STARTED
+
+    def observe(event):
+        if event.kind == STEP_STARTED:
+            logger.info(f"⏳ {event.describe()}")
+        elif event.kind == RUN_FINISHED:
+            logger.info(f"⏱️  Cleanup steps took {event.elapsed:.1f}s")
+
+    return observe
+
+
 def main():
     """Main CLI entry point"""
     parser = argparse.ArgumentParser(
@@ -54,6 +90,12 @@ Examples:
   
   # Deep system clean with reboot
   %(prog)s --comprehensive --system-reboot
+
+  # Clean every account on a shared Mac in one run
+  %(prog)s --force --all-users
+
+  # Clean mounted volumes or golden image directories offline
+  %(prog)s --force --target-root /Volumes/Lab01 /Volumes/Lab02
         """,
     )
 
@@ -178,6 +220,38 @@ Examples:
         help="Set a new hostname (requires --reset-hostname)",
     )
 
+    # Multi-user options
+    parser.add_argument(
+        "--all-users",
+        action="store_true",
+        help="Clean every account under /Users (system steps run once)",
+    )
+    parser.add_argument(
+        "--users-root",
+        type=str,
+        default="/Users",
+        help="Directory containing user home directories (default: /Users)",
+    )
+    parser.add_argument(
+        "--user-workers",
+        type=int,
+        help="Parallel worker processes for --all-users (default: CPU count)",
+    )
+
+    # Target root options
+    parser.add_argument(
+        "--target-root",
+        type=str,
+        nargs="+",
+        metavar="ROOT",
+        help="Clean mounted volumes or image directories instead of this system",
+    )
+    parser.add_argument(
+        "--target-workers",
+        type=int,
+        help="Parallel worker processes for --target-root (default: CPU count)",
+    )
+
     # Logging options
     parser.add_argument(
         "--log-file",
@@ -192,6 +266,31 @@ Examples:
         help="Export dry run results to a file",
     )
 
+    parser.add_argument(
+        "--progress",
+        action="store_true",
+        help="Log each cleanup step with overall progress and ETA",
+    )
+    parser.add_argument(
+        "--full-verification",
+        action="store_true",
+        help="Verify by searching the whole disk instead of re-checking "
+        "only the paths the clean touched",
+    )
+    parser.add_argument(
+        "--time-budget",
+        type=float,
+        metavar="SECONDS",
+        help="Finish within SECONDS: highest-value artifacts first, "
+        "skipped steps listed in the report",
+    )
+    parser.add_argument(
+        "--watch",
+        action="store_true",
+        help="After cleaning, keep removing Zoom artifacts that reappear "
+        "until Ctrl+C",
+    )
+
     try:
         args = parser.parse_args()
     except SystemExit as e:
@@ -206,6 +305,22 @@ Examples:
     if (args.install_fresh or args.system_reboot) and not args.comprehensive:
         parser.error("--install-fresh and --system-reboot require --comprehensive")
 
+    # Target roots are cleaned offline, one account set per root
+    if args.target_root and (args.all_users or args.comprehensive):
+        parser.error(
+            "--target-root cannot be combined with --all-users or --comprehensive"
+        )
+
+    # Watch mode follows one clean of this system
+    if args.watch and (args.target_root or args.all_users or args.comprehensive):
+        parser.error(
+            "--watch cannot be combined with --target-root, --all-users "
+            "or --comprehensive"
+        )
+
+    if args.time_budget is not None and args.time_budget <= 0:
+        parser.error("--time-budget must be a positive number of seconds")
+
     # Validate export dry run
     if args.export_dry_run and not args.dry_run:
         print("⚠️  Warning: --export-dry-run is most useful with --dry-run mode")
@@ -217,7 +332,7 @@ Examples:
         if args.comprehensive:
             # Run comprehensive cleaning
             logger.info("🚀 Starting Comprehensive Zoom Deep Clean")
-            cli = ComprehensiveZoomCLI()
+            cli = _subsystem("ComprehensiveZoomCLI")()
             success = cli.run_comprehensive_clean(args)
         else:
             # Run standard cleaning
@@ -256,11 +371,53 @@ Examples:
             if args.new_hostname:
                 cleaner_kwargs["new_hostname"] = args.new_hostname
 
-            cleaner = ZoomDeepCleanerEnhanced(**cleaner_kwargs)
-            success = cleaner.run_deep_clean()
+            if args.time_budget:
+                cleaner_kwargs["time_budget"] = args.time_budget
+            if args.full_verification:
+                cleaner_kwargs["full_verification"] = True
+
+            if args.target_root:
+                logger.info(
+                    f"💿 Target-root mode: cleaning {len(args.target_root)} root(s)"
+                )
+                cleaner = _subsystem("TargetRootBatch")(
+                    args.target_root,
+                    max_workers=args.target_workers,
+                    **cleaner_kwargs,
+                )
+                success = cleaner.run()
+                for result in cleaner.results:
+                    status = "✅" if result["success"] else "❌"
+                    logger.info(
+                        f"{status} {result['target_root']}: "
+                        f"{result.get('report_file') or result.get('error', '')}"
+                    )
+            elif args.all_users:
+                logger.info("👥 Multi-user mode: cleaning every account")
+                cleaner = _subsystem("MultiUserCleaner")(
+                    users_root=args.users_root,
+                    max_workers=args.user_workers,
+                    **cleaner_kwargs,
+                )
+                success = cleaner.run()
+            else:
+                cleaner = _subsystem("ZoomDeepCleanerEnhanced")(**cleaner_kwargs)
+                if args.progress:
+                    cleaner.progress.subscribe(progress_logger(logger))
+                success = cleaner.run_deep_clean()
+                if args.watch and success and not cleaner.was_cancelled_by_user():
+                    logger.info("👀 Watch mode: press Ctrl+C to stop")
+                    try:
+                        cleaner.watch()
+                    except KeyboardInterrupt:
+                        pass  # Ctrl+C ends a watch, not the clean before it
 
             # Handle export dry run
-            if args.export_dry_run and args.dry_run:
+            if (
+                args.export_dry_run
+                and args.dry_run
+                and not (args.all_users or args.target_root)
+            ):
                 try:
                     export_path = cleaner.export_dry_run_operations(args.export_dry_run)
                     logger.info(f"📄 Dry run results exported to: {export_path}")
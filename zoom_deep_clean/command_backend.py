@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Command Backend Module
+Pluggable execution layer for external macOS tools
+
+Every cleaner module runs system tools (security, ioreg, launchctl, tccutil,
+pkgutil, system_profiler, networksetup, ...) through a CommandBackend instead
+of calling subprocess directly. Three backends are provided:
+
+- SubprocessBackend: real execution (default)
+- RecordingBackend: real execution, recorded to a JSON cassette file
+- ReplayBackend: answers from a cassette, optionally with synthetic latency,
+  so the full pipeline can be profiled deterministically on any machine
+
+Inside ``backend.cancellation(token)`` every command checks the token first,
+and a running command is cut short when it is cancelled: real processes are
+killed with their whole process group, synthetic latency is interrupted.
+
+Created by: PHLthy215
+Version: 2.4.2 - Command Backends
+"""
+
+import abc
+import atexit
+import json
+import os
+import subprocess
+import threading
+import time
+from collections import defaultdict, deque
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional, Sequence, Tuple, Union
+
+from .cancellation import CancellationToken, check_all, run_cancellable, wait_any
+
+CASSETTE_VERSION = 1
+
+# Environment variable selecting the default backend, e.g.
+#   ZDCE_COMMAND_BACKEND=record:/tmp/run.json
+#   ZDCE_COMMAND_BACKEND=replay:/tmp/run.json
+#   ZDCE_COMMAND_BACKEND=replay:/tmp/run.json:recorded   (replay recorded latency)
+#   ZDCE_COMMAND_BACKEND=replay:/tmp/run.json:0.05       (fixed 50 ms per call)
+BACKEND_ENV_VAR = "ZDCE_COMMAND_BACKEND"
+
+_cancellation_lock = threading.Lock()
+
+
+class CommandNotRecorded(LookupError):
+    """Raised by a strict ReplayBackend for commands missing from the cassette"""
+
+    pass
+
+
+class CommandBackend(abc.ABC):
+    """Interface for executing external commands
+
+    ``run`` mirrors ``subprocess.run(..., capture_output=True, shell=False)``:
+    it returns a ``subprocess.CompletedProcess`` and raises
+    ``subprocess.TimeoutExpired`` / ``subprocess.CalledProcessError`` /
+    ``OSError`` exactly like subprocess does, so callers keep their existing
+    error handling.
+    """
+
+    # False for backends that never touch the live system
+    live = True
+    # Tokens of the runs currently using this backend
+    cancel_tokens: Tuple[CancellationToken, ...] = ()
+
+    @property
+    def spec(self) -> Optional[str]:
+        """``backend_from_spec`` string rebuilding this backend elsewhere
+
+        Used to hand the backend to process pool workers; ``None`` when it
+        cannot be rebuilt from a spec.
+        """
+        return None
+
+    @contextmanager
+    def cancellation(self, token: CancellationToken) -> Iterator[None]:
+        """Make every command run inside the block cancellable through ``token``"""
+        with _cancellation_lock:
+            self.cancel_tokens = self.cancel_tokens + (token,)
+        try:
+            yield
+        finally:
+            with _cancellation_lock:
+                # Drop the innermost registration; nested blocks may share a token
+                tokens = self.cancel_tokens
+                index = len(tokens) - 1 - tokens[::-1].index(token)
+                self.cancel_tokens = tokens[:index] + tokens[index + 1 :]
+
+    @abc.abstractmethod
+    def run(
+        self,
+        cmd_args: Sequence[str],
+        timeout: Optional[float] = None,
+        check: bool = False,
+        text: bool = True,
+        errors: Optional[str] = None,
+    ) -> subprocess.CompletedProcess:
+        """Run ``cmd_args`` and capture its output"""
+
+
+class SubprocessBackend(CommandBackend):
+    """Execute commands for real with subprocess"""
+
+    spec = "subprocess"
+
+    def run(
+        self,
+        cmd_args: Sequence[str],
+        timeout: Optional[float] = None,
+        check: bool = False,
+        text: bool = True,
+        errors: Optional[str] = None,
+    ) -> subprocess.CompletedProcess:
+        if self.cancel_tokens:
+            return run_cancellable(
+                cmd_args,
+                self.cancel_tokens,
+                timeout=timeout,
+                check=check,
+                text=text,
+                errors=errors,
+            )
+        return subprocess.run(
+            list(cmd_args),
+            capture_output=True,
+            text=text,
+            errors=errors,
+            timeout=timeout,
+            check=check,
+            shell=False,  # Critical: Never use shell=True
+        )
+
+
+def _to_text(value: Union[str, bytes, None]) -> str:
+    """Normalise captured output for storage in a cassette"""
+    if value is None:
+        return ""
+    if isinstance(value, bytes):
+        return value.decode("utf-8", errors="replace")
+    return value
+
+
+class RecordingBackend(CommandBackend):
+    """Execute commands through another backend and record every interaction"""
+
+    def __init__(self, cassette_path: str, inner: Optional[CommandBackend] = None):
+        self.cassette_path = cassette_path
+        self.inner = inner or SubprocessBackend()
+        self.interactions: List[Dict[str, Any]] = []
+        self._lock = threading.Lock()
+
+    @contextmanager
+    def cancellation(self, token: CancellationToken) -> Iterator[None]:
+        with super().cancellation(token), self.inner.cancellation(token):
+            yield
+
+    def run(
+        self,
+        cmd_args: Sequence[str],
+        timeout: Optional[float] = None,
+        check: bool = False,
+        text: bool = True,
+        errors: Optional[str] = None,
+    ) -> subprocess.CompletedProcess:
+        interaction: Dict[str, Any] = {"args": list(cmd_args)}
+        start_time = time.perf_counter()
+        try:
+            # check is applied here so the real exit status is recorded
+            result = self.inner.run(
+                cmd_args, timeout=timeout, check=False, text=text, errors=errors
+            )
+        except subprocess.TimeoutExpired:
+            interaction.update(
+                {"timeout": True, "duration": time.perf_counter() - start_time}
+            )
+            self._record(interaction)
+            raise
+        except OSError as e:
+            interaction.update(
+                {
+                    "error": type(e).__name__,
+                    "errno": e.errno,
+                    "message": str(e),
+                    "duration": time.perf_counter() - start_time,
+                }
+            )
+            self._record(interaction)
+            raise
+
+        interaction.update(
+            {
+                "returncode": result.returncode,
+                "stdout": _to_text(result.stdout),
+                "stderr": _to_text(result.stderr),
+                "duration": time.perf_counter() - start_time,
+            }
+        )
+        self._record(interaction)
+
+        if check and result.returncode != 0:
+            raise subprocess.CalledProcessError(
+                result.returncode, result.args, result.stdout, result.stderr
+            )
+        return result
+
+    def _record(self, interaction: Dict[str, Any]) -> None:
+        with self._lock:
+            self.interactions.append(interaction)
+
+    def save(self) -> str:
+        """Write the cassette to disk and return its path"""
+        directory = os.path.dirname(self.cassette_path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        with self._lock:
+            data = {"version": CASSETTE_VERSION, "interactions": self.interactions}
+        with open(self.cassette_path, "w", encoding="utf-8") as f:
+            json.dump(data, f, indent=2)
+        return self.cassette_path
+
+    def __enter__(self) -> "RecordingBackend":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.save()
+
+
+class ReplayBackend(CommandBackend):
+    """Answer commands from a recorded cassette without executing anything
+
+    Interactions for the same argument list are replayed in recording order;
+    once exhausted the last one keeps being returned. ``latency`` adds a
+    synthetic delay per call: ``None`` for none, a number of seconds, or
+    ``"recorded"`` to reproduce the recorded durations (scaled by
+    ``latency_scale``).
+    """
+
+    live = False
+
+    def __init__(
+        self,
+        cassette_path: Optional[str] = None,
+        latency: Union[None, float, str] = None,
+        latency_scale: float = 1.0,
+        strict: bool = False,
+        interactions: Optional[List[Dict[str, Any]]] = None,
+    ):
+        if interactions is None:
+            if cassette_path is None:
+                raise ValueError("ReplayBackend needs a cassette or interactions")
+            with open(cassette_path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") != CASSETTE_VERSION:
+                raise ValueError(f"Unsupported cassette version: {data.get('version')}")
+            interactions = data.get("interactions", [])
+
+        if isinstance(latency, str) and latency != "recorded":
+            raise ValueError("latency must be None, seconds or 'recorded'")
+
+        self.cassette_path = cassette_path
+        self.latency = latency
+        self.latency_scale = latency_scale
+        self.strict = strict
+        self.calls = 0
+        self.misses: List[List[str]] = []
+        self._lock = threading.Lock()
+        self._queues: Dict[tuple, deque] = defaultdict(deque)
+        self._last: Dict[tuple, Dict[str, Any]] = {}
+        for interaction in interactions:
+            self._queues[tuple(interaction["args"])].append(interaction)
+
+    @property
+    def spec(self) -> Optional[str]:
+        # In-memory interactions, scaled latency and strictness have no spec
+        if self.cassette_path is None or ":" in self.cassette_path:
+            return None
+        if self.strict or self.latency_scale != 1.0:
+            return None
+        if self.latency is None:
+            return f"replay:{self.cassette_path}"
+        return f"replay:{self.cassette_path}:{self.latency}"
+
+    def _next_interaction(self, key: tuple) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            self.calls += 1
+            queue = self._queues.get(key)
+            if queue:
+                self._last[key] = queue.popleft()
+            interaction = self._last.get(key)
+            if interaction is None:
+                self.misses.append(list(key))
+            return interaction
+
+    def _delay_for(self, interaction: Optional[Dict[str, Any]]) -> float:
+        if self.latency is None:
+            return 0.0
+        if self.latency == "recorded":
+            recorded = interaction.get("duration", 0.0) if interaction else 0.0
+            return recorded * self.latency_scale
+        return float(self.latency)
+
+    def run(
+        self,
+        cmd_args: Sequence[str],
+        timeout: Optional[float] = None,
+        check: bool = False,
+        text: bool = True,
+        errors: Optional[str] = None,
+    ) -> subprocess.CompletedProcess:
+        args = list(cmd_args)
+        check_all(self.cancel_tokens)
+        interaction = self._next_interaction(tuple(args))
+
+        delay = self._delay_for(interaction)
+        if timeout is not None and delay > timeout:
+            wait_any(self.cancel_tokens, timeout)
+            check_all(self.cancel_tokens)
+            raise subprocess.TimeoutExpired(args, timeout)
+        if delay > 0:
+            wait_any(self.cancel_tokens, delay)
+            check_all(self.cancel_tokens)
+
+        if interaction is None:
+            if self.strict:
+                raise CommandNotRecorded(f"No recorded interaction for: {args}")
+            stdout, stderr = "", f"No recorded interaction for: {' '.join(args)}"
+            returncode = 127
+        elif interaction.get("timeout"):
+            raise subprocess.TimeoutExpired(args, timeout or 0)
+        elif "error" in interaction:
+            error_cls = FileNotFoundError
+            if interaction["error"] == "PermissionError":
+                error_cls = PermissionError
+            raise error_cls(interaction.get("errno"), interaction.get("message"))
+        else:
+            stdout = interaction.get("stdout", "")
+            stderr = interaction.get("stderr", "")
+            returncode = interaction.get("returncode", 0)
+
+        if not text:
+            stdout, stderr = stdout.encode("utf-8"), stderr.encode("utf-8")
+
+        if check and returncode != 0:
+            raise subprocess.CalledProcessError(returncode, args, stdout, stderr)
+        return subprocess.CompletedProcess(args, returncode, stdout, stderr)
+
+
+def backend_from_spec(spec: str) -> CommandBackend:
+    """Build a backend from a spec such as ``replay:/path/run.json:recorded``"""
+    if not spec or spec == "subprocess":
+        return SubprocessBackend()
+
+    mode, _, rest = spec.partition(":")
+    if mode == "record" and rest:
+        backend = RecordingBackend(rest)
+        atexit.register(backend.save)
+        return backend
+    if mode == "replay" and rest:
+        path, _, latency = rest.partition(":")
+        if latency and latency != "recorded":
+            latency = float(latency)
+        return ReplayBackend(path, latency=latency or None)
+    raise ValueError(f"Invalid command backend spec: {spec}")
+
+
+_default_backend: Optional[CommandBackend] = None
+_default_lock = threading.Lock()
+
+
+def get_default_backend() -> CommandBackend:
+    """Process-wide backend used when none is injected explicitly"""
+    global _default_backend
+    with _default_lock:
+        if _default_backend is None:
+            _default_backend = backend_from_spec(os.environ.get(BACKEND_ENV_VAR, ""))
+        return _default_backend
+
+
+def set_default_backend(backend: Optional[CommandBackend]) -> None:
+    """Replace the process-wide backend (``None`` resets to the env default)"""
+    global _default_backend
+    with _default_lock:
+        _default_backend = backend
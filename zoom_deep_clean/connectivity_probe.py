@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Connectivity Probe Module
+Concurrent DNS and TCP probing of Zoom endpoints for Error 1132 diagnostics
+
+Resolving every Zoom domain and connecting to every (domain, port) pair one
+after another takes tens of seconds when the network is broken, which is
+exactly when the diagnostic runs. This module does all of it at once on an
+asyncio loop:
+
+- every host is resolved concurrently (``getaddrinfo`` on a private thread
+  pool, so a hung resolver never blocks the loop or the caller)
+- every resolved (host, port) pair is connected to concurrently, over IPv4
+  and IPv6, and each probe's latency is measured
+- the whole run shares one deadline; probes still pending when it passes
+  are reported as timed out rather than waited for
+
+Results are cached for a short time, so the connectivity and port checks
+of one diagnostic, and repeated diagnostics from the CLIs, do not probe the
+same endpoints again.
+
+Created by: PHLthy215
+Version: 2.4.2 - Connectivity Probe
+"""
+
+import asyncio
+import os
+import socket
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional, Sequence, Tuple
+
+DEFAULT_DEADLINE = 10.0
+DEFAULT_CONNECT_TIMEOUT = 5.0
+PROBE_CACHE_TTL = 60.0
+MAX_CONCURRENT_PROBES = 64
+
+_FAMILIES = {socket.AF_INET: "ipv4", socket.AF_INET6: "ipv6"}
+
+
+@dataclass
+class ResolveResult:
+    """Addresses of one host, by family"""
+
+    host: str
+    addresses: Dict[str, List[str]] = field(default_factory=dict)
+    latency: float = 0.0
+    error: Optional[str] = None
+    timed_out: bool = False
+
+    @property
+    def resolved(self) -> bool:
+        return any(self.addresses.values())
+
+
+@dataclass
+class ProbeResult:
+    """One TCP connection attempt to a (host, port) over one address family"""
+
+    host: str
+    port: int
+    family: str
+    address: Optional[str] = None
+    open: bool = False
+    latency: float = 0.0
+    error: Optional[str] = None
+    timed_out: bool = False
+
+
+@dataclass
+class ConnectivityReport:
+    """Everything one probe run found out"""
+
+    resolutions: Dict[str, ResolveResult] = field(default_factory=dict)
+    probes: List[ProbeResult] = field(default_factory=list)
+    elapsed: float = 0.0
+    # True when the global deadline cut at least one lookup or probe short
+    deadline_hit: bool = False
+    cached: int = 0
+
+    def port_open(self, host: str, port: int) -> bool:
+        """Whether the port accepted a connection over any family"""
+        return any(
+            probe.open
+            for probe in self.probes
+            if (probe.host, probe.port) == (host, port)
+        )
+
+    def probes_for(self, host: str, port: int) -> List[ProbeResult]:
+        return [
+            probe for probe in self.probes if (probe.host, probe.port) == (host, port)
+        ]
+
+
+# key -> (expiry, result); runs cut off by the deadline are never cached
+_probe_cache: Dict[Tuple, Tuple[float, object]] = {}
+_probe_cache_lock = threading.Lock()
+
+
+def clear_probe_cache() -> None:
+    """Forget every cached resolution and probe"""
+    with _probe_cache_lock:
+        _probe_cache.clear()
+
+
+def _cache_get(key: Tuple):
+    with _probe_cache_lock:
+        entry = _probe_cache.get(key)
+        if entry is None:
+            return None
+        if entry[0] <= time.monotonic():
+            del _probe_cache[key]
+            return None
+        return entry[1]
+
+
+def _cache_put(key: Tuple, value, ttl: float) -> None:
+    if ttl <= 0:
+        return
+    with _probe_cache_lock:
+        _probe_cache[key] = (time.monotonic() + ttl, value)
+
+
+class ConnectivityProber:
+    """Resolve hosts and probe their ports concurrently under one deadline"""
+
+    def __init__(
+        self,
+        deadline: float = DEFAULT_DEADLINE,
+        connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+        cache_ttl: float = PROBE_CACHE_TTL,
+        families: Sequence[str] = ("ipv4", "ipv6"),
+    ):
+        self.deadline = deadline
+        self.connect_timeout = connect_timeout
+        self.cache_ttl = cache_ttl
+        self.families = tuple(families)
+
+    def run(
+        self, hosts: Sequence[str], ports: Sequence[int] = ()
+    ) -> ConnectivityReport:
+        """Resolve ``hosts`` and, if given, connect to each of ``ports`` on them"""
+        started = time.monotonic()
+        report = ConnectivityReport()
+        executor = ThreadPoolExecutor(
+            max_workers=max(1, min(16, len(hosts))),
+            thread_name_prefix="zoom-probe-dns",
+        )
+        try:
+            asyncio.run(self._run(hosts, ports, report, executor))
+        finally:
+            # A resolver stuck past the deadline must not hold up the caller
+            executor.shutdown(wait=False)
+        report.elapsed = time.monotonic() - started
+        return report
+
+    async def _run(
+        self,
+        hosts: Sequence[str],
+        ports: Sequence[int],
+        report: ConnectivityReport,
+        executor: ThreadPoolExecutor,
+    ) -> None:
+        loop = asyncio.get_running_loop()
+        deadline_at = loop.time() + self.deadline
+        semaphore = asyncio.Semaphore(MAX_CONCURRENT_PROBES)
+
+        async def host_task(host: str) -> None:
+            resolution = await self._resolve(host, loop, executor, deadline_at, report)
+            report.resolutions[host] = resolution
+            probes = [
+                self._probe(
+                    host, port, family, addresses[0], deadline_at, semaphore, report
+                )
+                for port in ports
+                for family, addresses in resolution.addresses.items()
+                if addresses and family in self.families
+            ]
+            report.probes.extend(await asyncio.gather(*probes))
+
+        await asyncio.gather(*(host_task(host) for host in dict.fromkeys(hosts)))
+        report.probes.sort(key=lambda probe: (probe.host, probe.port, probe.family))
+
+    async def _resolve(
+        self,
+        host: str,
+        loop: asyncio.AbstractEventLoop,
+        executor: ThreadPoolExecutor,
+        deadline_at: float,
+        report: ConnectivityReport,
+    ) -> ResolveResult:
+        cached = _cache_get(("resolve", host))
+        if cached is not None:
+            report.cached += 1
+            return cached
+
+        result = ResolveResult(host)
+        started = loop.time()
+        try:
+            infos = await asyncio.wait_for(
+                loop.run_in_executor(
+                    executor,
+                    socket.getaddrinfo,
+                    host,
+                    None,
+                    socket.AF_UNSPEC,
+                    socket.SOCK_STREAM,
+                ),
+                timeout=max(0.0, deadline_at - loop.time()),
+            )
+        except asyncio.TimeoutError:
+            result.timed_out = True
+            result.error = "Deadline reached"
+            report.deadline_hit = True
+        except (socket.gaierror, OSError, UnicodeError) as e:
+            result.error = str(e)
+        else:
+            for family, _, _, _, sockaddr in infos:
+                name = _FAMILIES.get(family)
+                if name is None:
+                    continue
+                addresses = result.addresses.setdefault(name, [])
+                if sockaddr[0] not in addresses:
+                    addresses.append(sockaddr[0])
+            if not result.resolved:
+                result.error = "No IPv4 or IPv6 addresses"
+        result.latency = loop.time() - started
+
+        if not result.timed_out:
+            _cache_put(("resolve", host), result, self.cache_ttl)
+        return result
+
+    async def _probe(
+        self,
+        host: str,
+        port: int,
+        family: str,
+        address: str,
+        deadline_at: float,
+        semaphore: asyncio.Semaphore,
+        report: ConnectivityReport,
+    ) -> ProbeResult:
+        key = ("probe", host, port, family, address)
+        cached = _cache_get(key)
+        if cached is not None:
+            report.cached += 1
+            return cached
+
+        loop = asyncio.get_running_loop()
+        result = ProbeResult(host, port, family, address)
+        async with semaphore:
+            started = loop.time()
+            remaining = deadline_at - started
+            timeout = min(self.connect_timeout, remaining)
+            try:
+                if timeout <= 0:
+                    raise asyncio.TimeoutError
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(address, port), timeout=timeout
+                )
+                result.open = True
+                writer.close()
+            except asyncio.TimeoutError:
+                result.timed_out = True
+                if remaining <= self.connect_timeout:
+                    result.error = "Deadline reached"
+                    report.deadline_hit = True
+                else:
+                    result.error = f"No answer within {self.connect_timeout:g}s"
+            except OSError as e:
+                result.error = os.strerror(e.errno) if e.errno else str(e)
+            result.latency = loop.time() - started
+
+        # Only a global-deadline cut-off is inconclusive; a connect timeout
+        # is a real answer (the port is filtered)
+        if not (result.timed_out and remaining <= self.connect_timeout):
+            _cache_put(key, result, self.cache_ttl)
+        return result
+
+
+def probe_connectivity(
+    hosts: Sequence[str],
+    ports: Sequence[int] = (),
+    deadline: float = DEFAULT_DEADLINE,
+    connect_timeout: float = DEFAULT_CONNECT_TIMEOUT,
+) -> ConnectivityReport:
+    """Resolve ``hosts`` and probe ``ports`` on them with default settings"""
+    return ConnectivityProber(deadline, connect_timeout).run(hosts, ports)
@@ -12,10 +12,21 @@ import sys
 import platform
 import subprocess
 import shutil
-from typing import List, Dict, Tuple, Optional, Any
+from typing import List, Dict, Set, Tuple, Optional, Any
 from pathlib import Path
 import logging
 
+from .artifact_rules import catalog_paths
+from .cancellation import CancellationToken
+from .package_inventory import PackageInventory
+from .search_backends import (
+    IndexedSearch,
+    LocateBackend,
+    build_find_command,
+    split_candidates,
+)
+from .watch_mode import ArtifactWatcher, EventSource
+
 # Conditional Windows import
 try:
     import winreg
@@ -104,18 +115,11 @@ class PlatformDetector:
     def _get_macos_paths(self) -> Dict[str, List[str]]:
         """macOS-specific paths"""
         return {
-            "applications": ["/Applications/zoom.us.app"],
-            "user_data": [
-                "~/Library/Application Support/zoom.us",
-                "~/Library/Preferences/us.zoom.xos.plist",
-                "~/Library/Caches/us.zoom.xos",
-                "~/Library/Logs/zoom.us",
-            ],
-            "system_data": [
-                "/Library/Application Support/zoom.us",
-                "/Library/LaunchAgents/us.zoom.*",
-                "/Library/LaunchDaemons/us.zoom.*",
-            ],
+            "applications": catalog_paths("applications"),
+            "user_data": catalog_paths("application_data", "preferences"),
+            "system_data": catalog_paths(
+                "system_application_data", "launch_agents", "system_daemons"
+            ),
         }
 
     def _get_windows_paths(self) -> Dict[str, List[str]]:
@@ -348,12 +352,55 @@ class WindowsZoomCleaner:
                 self.logger.warning(f"Could not clean prefetch: {e}")
 
 
+# Searched for Zoom files the known Linux paths miss
+LINUX_SEARCH_LOCATIONS = ["~/.config", "~/.cache", "~/.local/share", "/opt"]
+
+
+class _LinuxWatchTarget:
+    """Watch target of the known Linux Zoom locations"""
+
+    category = "linux_zoom_files"
+
+    def __init__(self, cleaner: "LinuxZoomCleaner"):
+        self.cleaner = cleaner
+        self.paths = set(cleaner._zoom_paths())
+
+    def scan(self) -> Tuple[List[Tuple[str, str]], List[str]]:
+        matches = [
+            (path, self.category)
+            for path in sorted(self.paths)
+            if os.path.lexists(path) and self.cleaner.packages.owner(path) is None
+        ]
+        return matches, sorted({os.path.dirname(path) for path in self.paths})
+
+    def classify(self, path: str) -> Tuple[Optional[str], bool]:
+        # Files of installed packages are left to their package manager
+        if path in self.paths and self.cleaner.packages.owner(path) is None:
+            return self.category, False
+        return None, False
+
+    def remove(self, path: str, category: str) -> bool:
+        return self.cleaner._remove_zoom_path(path)
+
+
 class LinuxZoomCleaner:
     """Linux-specific Zoom cleanup implementation"""
 
-    def __init__(self, logger: logging.Logger, dry_run: bool = False):
+    def __init__(
+        self,
+        logger: logging.Logger,
+        dry_run: bool = False,
+        search: Optional[IndexedSearch] = None,
+        packages: Optional[PackageInventory] = None,
+    ):
         self.logger = logger
         self.dry_run = dry_run
+        # The locate database answers the remnant search; walked without it
+        self.search = search or IndexedSearch([LocateBackend()])
+        # Zoom packages by exact name, queried on first use
+        self.packages = packages or PackageInventory()
+        # (manager, name) of packages whose removal failed this run
+        self._failed_packages: Set[Tuple[str, str]] = set()
 
         if platform.system() != "Linux":
             raise RuntimeError("LinuxZoomCleaner can only run on Linux")
@@ -374,15 +421,21 @@ class LinuxZoomCleaner:
             # Stop Zoom processes
             results["processes_terminated"] = self._terminate_zoom_processes()
 
+            # Remove packages first, so their files are left to them only
+            # when the package manager actually removed the package
+            results["packages_removed"] = self._remove_zoom_packages()
+            results["packages"] = self.packages.summary()
+
             # Remove files
             results["files_removed"] = self._remove_zoom_files()
 
-            # Remove packages
-            results["packages_removed"] = self._remove_zoom_packages()
-
             # Clean Linux-specific locations
             self._clean_linux_specific()
 
+            # Report Zoom files left outside the known locations
+            results["remaining_files"] = self._find_remaining_zoom_files()
+            results["file_search"] = self.search.stats()
+
         except Exception as e:
             error_msg = f"Linux cleanup error: {e}"
             self.logger.error(error_msg)
@@ -408,9 +461,9 @@ class LinuxZoomCleaner:
 
         return 0
 
-    def _remove_zoom_files(self) -> int:
-        """Remove Zoom files on Linux"""
-        zoom_paths = [
+    def _zoom_paths(self) -> List[str]:
+        """Known Zoom file locations on Linux"""
+        return [
             "/opt/zoom",
             "/usr/bin/zoom",
             "/usr/local/bin/zoom",
@@ -420,69 +473,150 @@ class LinuxZoomCleaner:
             os.path.expanduser("~/.local/share/zoom"),
             "/usr/share/applications/Zoom.desktop",
             os.path.expanduser("~/.local/share/applications/Zoom.desktop"),
+            os.path.expanduser("~/snap/zoom-client"),
+            os.path.expanduser("~/.var/app/us.zoom.Zoom"),
         ]
 
+    def _remove_zoom_files(self) -> int:
+        """Remove Zoom files on Linux
+
+        Paths owned by an installed Zoom package are left to its package
+        manager, which removes them with the package. Paths of a package
+        whose removal failed are deleted like any other.
+        """
         removed = 0
-        for path in zoom_paths:
-            if os.path.exists(path):
-                try:
-                    if self.dry_run:
-                        self.logger.info(f"DRY RUN: Would remove {path}")
-                        removed += 1
-                    else:
-                        if os.path.isdir(path):
-                            shutil.rmtree(path)
-                        else:
-                            os.remove(path)
-                        self.logger.info(f"Removed: {path}")
-                        removed += 1
-                except Exception as e:
-                    self.logger.warning(f"Could not remove {path}: {e}")
+        for path in self._zoom_paths():
+            if not os.path.exists(path):
+                continue
+            package = self.packages.owner(path)
+            if (
+                package is not None
+                and (package.manager, package.name) not in self._failed_packages
+            ):
+                self.logger.info(
+                    f"Leaving {path} to {package.manager} package {package.name}"
+                )
+            elif self._remove_zoom_path(path):
+                removed += 1
 
         return removed
 
+    def _remove_zoom_path(self, path: str) -> bool:
+        try:
+            if self.dry_run:
+                self.logger.info(f"DRY RUN: Would remove {path}")
+            else:
+                if os.path.isdir(path) and not os.path.islink(path):
+                    shutil.rmtree(path)
+                else:
+                    os.remove(path)
+                self.logger.info(f"Removed: {path}")
+            return True
+        except Exception as e:
+            self.logger.warning(f"Could not remove {path}: {e}")
+            return False
+
+    def watch(
+        self,
+        cancel_token: Optional[CancellationToken] = None,
+        source: Optional[EventSource] = None,
+        **options,
+    ) -> Dict[str, int]:
+        """Remove Zoom files that reappear in the known locations until cancelled
+
+        The parent directories of the known locations are watched with
+        inotify. Returns the watch counters.
+        """
+        watcher = ArtifactWatcher(
+            _LinuxWatchTarget(self),
+            source=source,
+            logger=self.logger,
+            cancel_token=cancel_token,
+            **options,
+        )
+        return watcher.run()
+
     def _remove_zoom_packages(self) -> int:
-        """Remove Zoom packages on Linux"""
-        package_managers = [
-            (["dpkg", "-l"], ["apt-get", "remove", "--purge", "-y"]),  # Debian/Ubuntu
-            (["rpm", "-qa"], ["yum", "remove", "-y"]),  # RHEL/CentOS
-            (["rpm", "-qa"], ["dnf", "remove", "-y"]),  # Fedora
-            (["pacman", "-Q"], ["pacman", "-R", "--noconfirm"]),  # Arch
-        ]
+        """Remove the installed Zoom packages by their exact names
 
+        Packages that could not be removed are remembered, so that
+        ``_remove_zoom_files`` deletes their files instead.
+        """
         removed = 0
-        for list_cmd, remove_cmd in package_managers:
-            try:
-                # Check if package manager exists
-                if not shutil.which(list_cmd[0]):
-                    continue
+        self._failed_packages.clear()
+        packages = self.packages.packages()
+        for package in packages:
+            command = " ".join(self.packages.remove_command(package))
+            if self.dry_run:
+                self.logger.info(
+                    f"DRY RUN: Would remove {package.manager} package "
+                    f"{package.name} {package.version}: {command}"
+                )
+                removed += 1
+                continue
 
-                # List packages
-                result = subprocess.run(list_cmd, capture_output=True, text=True)
-                if result.returncode == 0:
-                    packages = result.stdout.lower()
-                    if "zoom" in packages:
-                        if self.dry_run:
-                            self.logger.info(
-                                f"DRY RUN: Would remove Zoom package with {remove_cmd[0]}"
-                            )
-                            removed += 1
-                        else:
-                            # Remove zoom package
-                            remove_result = subprocess.run(
-                                remove_cmd + ["zoom"], capture_output=True, text=True
-                            )
-                            if remove_result.returncode == 0:
-                                self.logger.info(
-                                    f"Removed Zoom package with {remove_cmd[0]}"
-                                )
-                                removed += 1
-                        break  # Only use one package manager
-            except Exception as e:
-                self.logger.warning(f"Package removal error with {list_cmd[0]}: {e}")
+            try:
+                result = self.packages.remove(package)
+            except (subprocess.SubprocessError, OSError) as e:
+                self.logger.warning(f"Package removal error with {command}: {e}")
+                self._failed_packages.add((package.manager, package.name))
+                continue
+            if result.returncode == 0:
+                self.logger.info(
+                    f"Removed {package.manager} package {package.name} "
+                    f"({len(package.files)} files)"
+                )
+                removed += 1
+            else:
+                self.logger.warning(
+                    f"Could not remove {package.manager} package {package.name}: "
+                    f"{result.stderr.strip()}"
+                )
+                self._failed_packages.add((package.manager, package.name))
 
+        for error in self.packages.errors:
+            self.logger.warning(f"Package query error with {error}")
+        if packages and not self.dry_run:
+            self.packages.reset()  # what is installed may have changed
         return removed
 
+    def _find_remaining_zoom_files(self) -> List[str]:
+        """Zoom files under ``LINUX_SEARCH_LOCATIONS``, from the locate database"""
+        found = []
+        for location in LINUX_SEARCH_LOCATIONS:
+            location = os.path.expanduser(location)
+            if not os.path.isdir(location):
+                continue
+
+            candidates, walk = self.search.lookup(location)
+            if candidates is not None:
+                files, directories = split_candidates(candidates)
+                found.extend(files)
+                walk = walk + directories
+            for subtree in walk:
+                try:
+                    result = subprocess.run(
+                        build_find_command(subtree),
+                        capture_output=True,
+                        text=True,
+                        timeout=60,
+                    )
+                    found.extend(
+                        line for line in result.stdout.split("\n") if line.strip()
+                    )
+                except (subprocess.SubprocessError, OSError) as e:
+                    self.logger.warning(f"Could not search {subtree}: {e}")
+
+        stats = self.search.stats()
+        if stats["backend"]:
+            self.logger.info(
+                f"📇 {stats['backend']} index answered {stats['locations_indexed']} "
+                f"of {stats['locations_indexed'] + stats['locations_walked']} locations"
+            )
+        if found:
+            self.logger.warning(f"Found {len(found)} remaining Zoom files")
+        return sorted(set(found))
+
     def _clean_linux_specific(self):
         """Clean Linux-specific Zoom artifacts"""
         # Clean systemd user services
@@ -9,25 +9,51 @@ but fails when trying to join meetings due to deeper system-level artifacts.
 
 import os
 import sys
-import subprocess
 import logging
 import re
 import time
-import sqlite3
-import shutil
 from typing import List, Dict, Optional, Tuple
 from pathlib import Path
 
+from .cancellation import CancellationToken
+from .command_backend import CommandBackend, get_default_backend
+from .sqlite_cleaner import clean_databases, tcc_target
+from .target_root import discover_user_homes, rebase_path
+
 
 class DeepSystemCleaner:
     """Enhanced cleaner for deep system-level Zoom artifacts"""
 
-    def __init__(self, logger: logging.Logger, dry_run: bool = False):
+    def __init__(
+        self,
+        logger: logging.Logger,
+        dry_run: bool = False,
+        command_backend: Optional[CommandBackend] = None,
+        target_root: Optional[str] = None,
+        cancel_token: Optional[CancellationToken] = None,
+        backup_dir: Optional[str] = None,
+    ):
         self.logger = logger
         self.dry_run = dry_run
+        self.command_backend = command_backend or get_default_backend()
+        self.cancel_token = cancel_token or CancellationToken()
+        self.target_root = target_root
+        self.live_system = target_root is None
+        # Private directory for removed TCC rows; None disables backups
+        self.backup_dir = backup_dir
         self.deep_artifacts_found = []
         self.ioreg_zoom_entries = []
 
+    def _rebase(self, path: str) -> str:
+        """Map a live-system path onto the target root (identity when live)"""
+        return rebase_path(path, self.target_root)
+
+    def _user_homes(self) -> List[str]:
+        """Home directories whose per-user artifacts are cleaned"""
+        if self.live_system:
+            return [os.path.expanduser("~")]
+        return discover_user_homes(self._rebase("/Users"))
+
     def clean_deep_system_artifacts(self) -> Dict[str, int]:
         """Clean deeper system artifacts that cause meeting join failures"""
         results = {
@@ -44,12 +70,18 @@ class DeepSystemCleaner:
         }
 
         self.logger.info("🔍 Starting deep system artifact cleanup...")
+        with self.command_backend.cancellation(self.cancel_token):
+            self._clean_deep_system_artifacts(results)
+        return results
 
+    def _clean_deep_system_artifacts(self, results: Dict[str, int]) -> None:
+        """Run every deep cleanup step; items check the cancellation token"""
         # 1. Clear TCC database entries (CRITICAL - primary cause of meeting join failures)
         results["tcc_entries_cleared"] = self._clear_tcc_zoom_entries()
 
         # 2. Clear IORegistry Zoom entries (critical for meeting join issues)
-        results["ioreg_entries_cleared"] = self._clear_ioreg_zoom_entries()
+        if self.live_system:
+            results["ioreg_entries_cleared"] = self._clear_ioreg_zoom_entries()
 
         # 3. Clean system temporary files with Zoom signatures
         results["system_temp_cleaned"] = self._clean_system_temp_zoom_files()
@@ -67,92 +99,73 @@ class DeepSystemCleaner:
         results["receipt_files_removed"] = self._remove_package_receipts()
 
         # 8. Clear keychain entries
-        results["keychain_entries_cleared"] = self._clear_keychain_entries()
+        if self.live_system:
+            results["keychain_entries_cleared"] = self._clear_keychain_entries()
 
         # 9. Clear deep system caches
-        results["deep_cache_cleared"] = self._clear_deep_system_caches()
+        if self.live_system:
+            results["deep_cache_cleared"] = self._clear_deep_system_caches()
 
         # 10. Clear any kernel extensions or system extensions
         results["kernel_extensions_cleared"] = self._clear_kernel_extensions()
 
-        return results
-
     def _clear_tcc_zoom_entries(self) -> int:
         """Clear TCC database entries - CRITICAL fix for meeting join failures"""
         cleared = 0
 
         # TCC database locations
-        tcc_paths = [
-            "/Library/Application Support/com.apple.TCC/TCC.db",
-            os.path.expanduser("~/Library/Application Support/com.apple.TCC/TCC.db"),
-        ]
-
-        for tcc_path in tcc_paths:
-            if not os.path.exists(tcc_path):
+        tcc_paths = [self._rebase("/Library/Application Support/com.apple.TCC/TCC.db")]
+        tcc_paths.extend(
+            os.path.join(home, "Library/Application Support/com.apple.TCC/TCC.db")
+            for home in self._user_homes()
+        )
+
+        targets = [tcc_target(path) for path in tcc_paths if os.path.exists(path)]
+        results = clean_databases(
+            targets,
+            dry_run=self.dry_run,
+            immutable=not self.live_system,
+            backup_dir=self.backup_dir,
+        )
+
+        removed = False
+        for result in results:
+            tcc_path = result.target.path
+            if result.error:
+                self.logger.error(
+                    f"Error processing TCC database {tcc_path}: {result.error}"
+                )
+                continue
+            if not result.rows:
                 continue
 
-            try:
-                self.logger.info(f"Processing TCC database: {tcc_path}")
-
-                # Create backup first
-                if not self.dry_run:
-                    backup_path = f"{tcc_path}.backup.{int(time.time())}"
-                    shutil.copy2(tcc_path, backup_path)
-                    self.logger.info(f"Created TCC backup: {backup_path}")
-
-                # Connect to database
-                conn = sqlite3.connect(tcc_path)
-                cursor = conn.cursor()
-
-                # Find Zoom entries
-                cursor.execute(
-                    "SELECT service, client, auth_value FROM access WHERE client LIKE '%zoom%' OR client LIKE '%Zoom%'"
+            self.logger.warning(f"Found {result.matched} TCC entries in {tcc_path}:")
+            for row in result.rows:
+                self.logger.warning(
+                    f"  {row['service']}: {row['client']} (auth: {row['auth_value']})"
                 )
-                entries = cursor.fetchall()
-
-                if entries:
-                    self.logger.warning(
-                        f"Found {len(entries)} TCC entries in {tcc_path}:"
+            if self.dry_run:
+                self.logger.info(f"[DRY RUN] Would remove {result.matched} TCC entries")
+            else:
+                self.logger.info(f"✅ Removed {result.matched} TCC entries")
+                if result.backup_path:
+                    self.logger.info(
+                        f"Backed up removed TCC rows: {result.backup_path}"
                     )
-                    for service, client, auth_value in entries:
-                        self.logger.warning(
-                            f"  {service}: {client} (auth: {auth_value})"
-                        )
-
-                    if not self.dry_run:
-                        # Remove all Zoom-related TCC entries
-                        cursor.execute(
-                            "DELETE FROM access WHERE client LIKE '%zoom%' OR client LIKE '%Zoom%'"
-                        )
-                        conn.commit()
-                        self.logger.info(f"✅ Removed {len(entries)} TCC entries")
-                        cleared += len(entries)
-
-                        # Also reset using tccutil if available
-                        zoom_clients = [
-                            "us.zoom.xos",
-                            "sh.1132.ZoomFixer",
-                            "us.zoom.ZoomClips",
-                        ]
-                        for client in zoom_clients:
-                            try:
-                                subprocess.run(
-                                    ["sudo", "tccutil", "reset", "All", client],
-                                    capture_output=True,
-                                    check=False,
-                                )
-                            except Exception:
-                                pass  # tccutil might not be available or might fail
-                    else:
-                        self.logger.info(
-                            f"[DRY RUN] Would remove {len(entries)} TCC entries"
-                        )
-                        cleared += len(entries)
-
-                conn.close()
+                removed = True
+            cleared += result.matched
 
-            except Exception as e:
-                self.logger.error(f"Error processing TCC database {tcc_path}: {e}")
+        # Also reset using tccutil if available (live system only)
+        if removed and self.live_system:
+            for client in ["us.zoom.xos", "sh.1132.ZoomFixer", "us.zoom.ZoomClips"]:
+                try:
+                    self.command_backend.run(
+                        ["sudo", "tccutil", "reset", "All", client],
+                        text=False,
+                        check=False,
+                    )
+                except Exception:
+                    pass  # tccutil might not be available or might fail
 
         if cleared > 0:
             self.logger.warning(
@@ -167,8 +180,8 @@ class DeepSystemCleaner:
 
         try:
             # First, identify active Zoom processes in IORegistry
-            result = subprocess.run(
-                ["ioreg", "-l"], capture_output=True, text=True, errors="ignore"
+            result = self.command_backend.run(
+                ["ioreg", "-l"], text=True, errors="ignore"
             )
             if result.returncode == 0:
                 zoom_lines = [
@@ -190,9 +203,9 @@ class DeepSystemCleaner:
                         if pid:
                             if not self.dry_run:
                                 try:
-                                    subprocess.run(
+                                    self.command_backend.run(
                                         ["sudo", "kill", "-9", pid],
-                                        capture_output=True,
+                                        text=False,
                                         check=False,
                                     )
                                     self.logger.info(
@@ -218,6 +231,7 @@ class DeepSystemCleaner:
 
         # System temp directories to check
         temp_dirs = ["/private/var/folders", "/private/tmp", "/tmp", "/var/tmp"]
+        temp_dirs = [self._rebase(temp_dir) for temp_dir in temp_dirs]
 
         zoom_patterns = [
             "*zoom*",
@@ -243,21 +257,19 @@ class DeepSystemCleaner:
                         pattern,
                         "-type",
                         "f",
-                        "2>/dev/null",
                     ]
-                    result = subprocess.run(
-                        cmd, capture_output=True, text=True, shell=False
-                    )
+                    result = self.command_backend.run(cmd, text=True)
 
                     if result.returncode == 0 and result.stdout.strip():
                         files = result.stdout.strip().split("\n")
                         for file_path in files:
+                            self.cancel_token.check()
                             if file_path and os.path.exists(file_path):
                                 if not self.dry_run:
                                     try:
-                                        subprocess.run(
+                                        self.command_backend.run(
                                             ["sudo", "rm", "-rf", file_path],
-                                            capture_output=True,
+                                            text=False,
                                             check=True,
                                         )
                                         self.logger.info(
@@ -287,18 +299,21 @@ class DeepSystemCleaner:
             "/Library/Preferences/SystemConfiguration/NetworkInterfaces.plist",
             "/Library/Preferences/SystemConfiguration/preferences.plist",
         ]
+        network_configs = [self._rebase(config) for config in network_configs]
 
         # Clear DNS cache (critical for Zoom meeting connections)
-        if not self.dry_run:
+        if not self.live_system:
+            self.logger.debug("Skipping DNS cache flush for offline target")
+        elif not self.dry_run:
             try:
-                subprocess.run(
+                self.command_backend.run(
                     ["sudo", "dscacheutil", "-flushcache"],
-                    capture_output=True,
+                    text=False,
                     check=True,
                 )
-                subprocess.run(
+                self.command_backend.run(
                     ["sudo", "killall", "-HUP", "mDNSResponder"],
-                    capture_output=True,
+                    text=False,
                     check=False,
                 )
                 self.logger.info("Flushed DNS cache")
@@ -320,9 +335,9 @@ class DeepSystemCleaner:
                             if not self.dry_run:
                                 # Backup and reset the configuration
                                 backup_file = f"{config_file}.backup.{int(time.time())}"
-                                subprocess.run(
+                                self.command_backend.run(
                                     ["sudo", "cp", config_file, backup_file],
-                                    capture_output=True,
+                                    text=False,
                                     check=True,
                                 )
                                 self.logger.info(f"Reset network config: {config_file}")
@@ -348,6 +363,7 @@ class DeepSystemCleaner:
             "/Library/CoreMediaIO/Plug-Ins/DAL",
             "/private/var/db/CoreAudio",
         ]
+        av_config_paths = [self._rebase(path) for path in av_config_paths]
 
         for config_path in av_config_paths:
             if not os.path.exists(config_path):
@@ -355,7 +371,7 @@ class DeepSystemCleaner:
 
             try:
                 # Look for Zoom-related audio/video plugins or configurations
-                result = subprocess.run(
+                result = self.command_backend.run(
                     [
                         "sudo",
                         "find",
@@ -366,19 +382,19 @@ class DeepSystemCleaner:
                         "-name",
                         "*Zoom*",
                     ],
-                    capture_output=True,
                     text=True,
                 )
 
                 if result.returncode == 0 and result.stdout.strip():
                     files = result.stdout.strip().split("\n")
                     for file_path in files:
+                        self.cancel_token.check()
                         if file_path and os.path.exists(file_path):
                             if not self.dry_run:
                                 try:
-                                    subprocess.run(
+                                    self.command_backend.run(
                                         ["sudo", "rm", "-rf", file_path],
-                                        capture_output=True,
+                                        text=False,
                                         check=True,
                                     )
                                     self.logger.info(f"Removed AV config: {file_path}")
@@ -408,6 +424,7 @@ class DeepSystemCleaner:
             "/Library/Application Support/com.apple.TCC",
             "/private/var/db/receipts",
         ]
+        identifier_paths = [self._rebase(path) for path in identifier_paths]
 
         for id_path in identifier_paths:
             if not os.path.exists(id_path):
@@ -415,7 +432,7 @@ class DeepSystemCleaner:
 
             try:
                 # Look for Zoom-related system identifiers
-                result = subprocess.run(
+                result = self.command_backend.run(
                     [
                         "sudo",
                         "find",
@@ -426,19 +443,19 @@ class DeepSystemCleaner:
                         "-name",
                         "*us.zoom*",
                     ],
-                    capture_output=True,
                     text=True,
                 )
 
                 if result.returncode == 0 and result.stdout.strip():
                     files = result.stdout.strip().split("\n")
                     for file_path in files:
+                        self.cancel_token.check()
                         if file_path and os.path.exists(file_path):
                             if not self.dry_run:
                                 try:
-                                    subprocess.run(
+                                    self.command_backend.run(
                                         ["sudo", "rm", "-rf", file_path],
-                                        capture_output=True,
+                                        text=False,
                                         check=True,
                                     )
                                     self.logger.info(
@@ -466,26 +483,26 @@ class DeepSystemCleaner:
 
         receipt_patterns = ["us.zoom.pkg.videomeeting.*", "us.zoom.*", "*zoom*"]
 
-        receipt_dir = "/private/var/db/receipts"
+        receipt_dir = self._rebase("/private/var/db/receipts")
 
         if os.path.exists(receipt_dir):
             try:
                 for pattern in receipt_patterns:
-                    result = subprocess.run(
+                    result = self.command_backend.run(
                         ["sudo", "find", receipt_dir, "-name", pattern],
-                        capture_output=True,
                         text=True,
                     )
 
                     if result.returncode == 0 and result.stdout.strip():
                         files = result.stdout.strip().split("\n")
                         for file_path in files:
+                            self.cancel_token.check()
                             if file_path and os.path.exists(file_path):
                                 if not self.dry_run:
                                     try:
-                                        subprocess.run(
+                                        self.command_backend.run(
                                             ["sudo", "rm", "-f", file_path],
-                                            capture_output=True,
+                                            text=False,
                                             check=True,
                                         )
                                         self.logger.info(
@@ -513,9 +530,8 @@ class DeepSystemCleaner:
 
         try:
             # Search for Zoom-related keychain entries
-            result = subprocess.run(
+            result = self.command_backend.run(
                 ["security", "dump-keychain"],
-                capture_output=True,
                 text=True,
                 timeout=30,
             )
@@ -549,6 +565,7 @@ class DeepSystemCleaner:
                     )
 
                     for entry in zoom_entries:
+                        self.cancel_token.check()
                         service = entry.get('"svce"<blob>', "unknown")
                         account = entry.get('"acct"<blob>', "unknown")
                         self.logger.warning(f"  Service: {service}, Account: {account}")
@@ -566,8 +583,8 @@ class DeepSystemCleaner:
                                         "-D",
                                         "application password",
                                     ]
-                                    subprocess.run(
-                                        delete_cmd, capture_output=True, check=False
+                                    self.command_backend.run(
+                                        delete_cmd, text=False, check=False
                                     )
                                     cleared += 1
                             except Exception as e:
@@ -599,35 +616,35 @@ class DeepSystemCleaner:
     def verify_deep_cleanup(self) -> bool:
         """Verify that deep system cleanup was successful"""
         try:
-            # Check IORegistry for remaining Zoom entries
-            try:
-                result = subprocess.run(
-                    ["ioreg", "-l"],
-                    capture_output=True,
-                    text=True,
-                    errors="ignore",
-                    timeout=30,
-                )
-                if result.returncode == 0:
-                    zoom_lines = [
-                        line
-                        for line in result.stdout.split("\n")
-                        if "zoom" in line.lower() and "IOUserClientCreator" in line
-                    ]
-                    if zoom_lines:
-                        self.logger.warning(
-                            f"Found {len(zoom_lines)} remaining IORegistry entries"
-                        )
-                        return False
-            except Exception as e:
-                self.logger.debug(f"IORegistry verification skipped: {e}")
+            # Check IORegistry for remaining Zoom entries (live system only)
+            if self.live_system:
+                try:
+                    result = self.command_backend.run(
+                        ["ioreg", "-l"],
+                        text=True,
+                        errors="ignore",
+                        timeout=30,
+                    )
+                    if result.returncode == 0:
+                        zoom_lines = [
+                            line
+                            for line in result.stdout.split("\n")
+                            if "zoom" in line.lower() and "IOUserClientCreator" in line
+                        ]
+                        if zoom_lines:
+                            self.logger.warning(
+                                f"Found {len(zoom_lines)} remaining IORegistry entries"
+                            )
+                            return False
+                except Exception as e:
+                    self.logger.debug(f"IORegistry verification skipped: {e}")
 
             # Check system temp directories
             temp_dirs = ["/private/var/folders", "/tmp", "/private/tmp"]
-            for temp_dir in temp_dirs:
+            for temp_dir in map(self._rebase, temp_dirs):
                 if os.path.exists(temp_dir):
                     try:
-                        result = subprocess.run(
+                        result = self.command_backend.run(
                             [
                                 "find",
                                 temp_dir,
@@ -637,7 +654,6 @@ class DeepSystemCleaner:
                                 "-name",
                                 "*Zoom*",
                             ],
-                            capture_output=True,
                             text=True,
                             timeout=30,
                         )
@@ -677,7 +693,7 @@ class DeepSystemCleaner:
         for cmd in cache_commands:
             if not self.dry_run:
                 try:
-                    subprocess.run(cmd, capture_output=True, check=True, timeout=30)
+                    self.command_backend.run(cmd, text=False, check=True, timeout=30)
                     self.logger.info(f"Executed cache clear command: {' '.join(cmd)}")
                     cleared += 1
                 except Exception as e:
@@ -697,13 +713,14 @@ class DeepSystemCleaner:
             "/Library/Extensions",
             "/Library/SystemExtensions",
         ]
+        extension_paths = [self._rebase(path) for path in extension_paths]
 
         for ext_path in extension_paths:
             if not os.path.exists(ext_path):
                 continue
 
             try:
-                result = subprocess.run(
+                result = self.command_backend.run(
                     [
                         "sudo",
                         "find",
@@ -714,28 +731,29 @@ class DeepSystemCleaner:
                         "-name",
                         "*Zoom*",
                     ],
-                    capture_output=True,
                     text=True,
                 )
 
                 if result.returncode == 0 and result.stdout.strip():
                     extensions = result.stdout.strip().split("\n")
                     for ext_path in extensions:
+                        self.cancel_token.check()
                         if ext_path and os.path.exists(ext_path):
                             if not self.dry_run:
                                 try:
                                     # Unload extension first if it's loaded
                                     ext_name = os.path.basename(ext_path)
-                                    subprocess.run(
-                                        ["sudo", "kextunload", ext_path],
-                                        capture_output=True,
-                                        check=False,
-                                    )
+                                    if self.live_system:
+                                        self.command_backend.run(
+                                            ["sudo", "kextunload", ext_path],
+                                            text=False,
+                                            check=False,
+                                        )
 
                                     # Remove the extension
-                                    subprocess.run(
+                                    self.command_backend.run(
                                         ["sudo", "rm", "-rf", ext_path],
-                                        capture_output=True,
+                                        text=False,
                                         check=True,
                                     )
                                     self.logger.info(
@@ -9,18 +9,62 @@ import subprocess
 import json
 import logging
 from pathlib import Path
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, Iterable, List, Tuple, Optional
 import re
 import plistlib
 from datetime import datetime
+from functools import partial
+
+from .binary_cookies import cookie_jar_paths, scan_cookie_jar
+from .clean_journal import PLACEHOLDER, CleanJournal
+from .command_backend import CommandBackend, get_default_backend
+from .diagnostic_runner import STATUS_OK, CheckOutcome, DiagnosticRunner
+from .target_root import discover_user_homes, rebase_path
+
+# Wall-clock limit per verification check, in seconds. Each limit covers the
+# check's own command timeouts for a typical number of search locations.
+CHECK_DEADLINES = {
+    "user_library": 120.0,
+    "system_level": 180.0,  # sudo find over /Library, /System/Library, /usr/local
+    "running_processes": 15.0,
+    "network_data": 25.0,
+    "keychain": 35.0,
+    "launch_agents": 40.0,
+    "device_containers": 60.0,
+    "metadata_indexes": 45.0,
+    "browser_data": 60.0,
+    "log_files": 45.0,
+    "journal_paths": 60.0,
+    "cookie_jars": 30.0,
+}
+MAX_CHECK_WORKERS = 8
 
 
 class DeviceFingerprintVerifier:
     """Comprehensive device fingerprint verification for Zoom cleanup"""
 
-    def __init__(self, verbose: bool = False):
+    def __init__(
+        self,
+        verbose: bool = False,
+        command_backend: Optional[CommandBackend] = None,
+        dry_run: bool = False,
+        target_root: Optional[str] = None,
+        user_home: Optional[str] = None,
+    ):
         self.verbose = verbose
+        self.command_backend = command_backend or get_default_backend()
+        self.dry_run = dry_run
+        self.target_root = target_root
+        self.live_system = target_root is None
+        self.user_home = user_home
         self.logger = self._setup_logging()
+        self.mode = "full"
+        self.delta_stats: Dict[str, int] = {}
+        self._delta_remaining: List[str] = []
+        self.check_deadlines = dict(CHECK_DEADLINES)
+        self.max_check_workers = MAX_CHECK_WORKERS
+        self.check_timings: Dict[str, float] = {}
+        self.incomplete_checks: List[str] = []
         self.verification_results = {
             "timestamp": datetime.now().isoformat(),
             "status": "unknown",
@@ -44,36 +88,207 @@ class DeviceFingerprintVerifier:
         logger.setLevel(logging.DEBUG if self.verbose else logging.INFO)
         return logger
 
-    def verify_complete_cleanup(self) -> Dict:
+    def _user_homes(self) -> List[str]:
+        """Home directories whose ~/ paths are verified"""
+        if self.user_home:
+            return [self.user_home]
+        if self.live_system:
+            return [os.path.expanduser("~")]
+        return discover_user_homes(rebase_path("/Users", self.target_root))
+
+    def _expand_paths(self, paths: Iterable[str]) -> List[Tuple[str, str]]:
+        """Pair each path rule with its expansion(s) on the verified system
+
+        ``~`` paths expand once per verified home; absolute paths are
+        re-based onto the target root, if any.
+        """
+        expanded = []
+        for path in paths:
+            if path == "~" or path.startswith("~/"):
+                for home in self._user_homes():
+                    expanded.append((path, home + path[1:]))
+            else:
+                expanded.append((path, rebase_path(path, self.target_root)))
+        return expanded
+
+    def verify_complete_cleanup(self, journal: Optional[CleanJournal] = None) -> Dict:
         """
         Perform comprehensive verification of Zoom cleanup
         Returns detailed report of verification status
+
+        With the ``journal`` of a cleanup run only the paths it recorded and
+        their directories are re-checked; without one the disk is searched.
         """
+        if journal is not None:
+            return self.verify_delta(journal)
+
         self.logger.info("🔍 Starting comprehensive device fingerprint verification...")
 
         # Check all potential Zoom remnants
-        self._check_user_library_files()
-        self._check_system_level_files()
-        self._check_running_processes()
-        self._check_network_data()
-        self._check_keychain_entries()
-        self._check_launch_agents()
-        self._check_device_containers()
-        self._check_metadata_indexes()
-        self._check_browser_data()
-        self._check_log_files()
+        checks = [
+            ("user_library", self._check_user_library_files),
+            ("system_level", self._check_system_level_files),
+        ]
+        if self.live_system:
+            checks += [
+                ("running_processes", self._check_running_processes),
+                ("network_data", self._check_network_data),
+                ("keychain", self._check_keychain_entries),
+            ]
+        checks += [
+            ("launch_agents", self._check_launch_agents),
+            ("device_containers", self._check_device_containers),
+            ("metadata_indexes", self._check_metadata_indexes),
+            ("browser_data", self._check_browser_data),
+            ("log_files", self._check_log_files),
+        ]
+        self._run_checks(checks)
 
         # Clean any remaining items found
         self._clean_remaining_items()
 
         # Final verification
         self._perform_final_verification()
+        self._mark_incomplete_checks()
 
         # Generate comprehensive report
         return self._generate_verification_report()
 
-    def _check_user_library_files(self):
+    def verify_delta(self, journal: CleanJournal) -> Dict:
+        """Verify only what a cleanup run touched, indexed or found
+
+        Every journal path and every directory containing one is re-stat'ed
+        once; live-system checks (processes, DNS, keychain) and cookie jars
+        run as in a full verification.
+        """
+        self.logger.info("🔍 Starting delta device fingerprint verification...")
+        self.mode = "delta"
+
+        checks = [("journal_paths", partial(self._check_journal_paths, journal))]
+        if self.live_system:
+            checks += [
+                ("running_processes", self._check_running_processes),
+                ("network_data", self._check_network_data),
+                ("keychain", self._check_keychain_entries),
+            ]
+        checks.append(("cookie_jars", self._check_cookie_jar_items))
+        self._run_checks(checks)
+
+        self._clean_remaining_items()
+        self._perform_delta_final_verification()
+        self._mark_incomplete_checks()
+        return self._generate_verification_report()
+
+    def _run_checks(self, checks: List[Tuple[str, Callable]]) -> None:
+        """Run independent checks concurrently, each under its own deadline
+
+        Every check records into a buffer of its own; the buffers are merged
+        into ``verification_results`` in the order the checks are listed, so
+        the results do not depend on which check finishes first. A check that
+        times out or fails leaves the verification incomplete.
+        """
+        self.check_timings = {}
+        self.incomplete_checks = []
+        runner = DiagnosticRunner(
+            [(name, partial(self._collect, check)) for name, check in checks],
+            deadlines=self.check_deadlines,
+            max_workers=min(len(checks), self.max_check_workers),
+        )
+        run = runner.run(self._log_check_outcome)
+
+        for name, outcome in run.outcomes.items():
+            if outcome.status == STATUS_OK:
+                for key, items in outcome.result.items():
+                    self.verification_results[key].extend(items)
+            else:
+                self.incomplete_checks.append(name)
+                self.verification_results["findings"].append(
+                    f"Verification check {name} did not complete: {outcome.error}"
+                )
+        self.check_timings = run.timings()
+        self.logger.info(f"⏱️  Verification checks finished in {run.elapsed:.2f}s")
+
+    @staticmethod
+    def _collect(check: Callable) -> Dict[str, List[str]]:
+        results = {"findings": [], "cleaned_items": [], "remaining_items": []}
+        check(results)
+        return results
+
+    def _check_results(
+        self, results: Optional[Dict[str, List[str]]]
+    ) -> Dict[str, List[str]]:
+        """Where a check records its items: its own buffer when run concurrently"""
+        return self.verification_results if results is None else results
+
+    def _log_check_outcome(self, outcome: CheckOutcome) -> None:
+        if outcome.timed_out:
+            self.logger.warning(
+                f"⏰ Check {outcome.name} timed out after {outcome.deadline:g}s"
+            )
+        elif outcome.error:
+            self.logger.error(f"❌ Check {outcome.name} failed: {outcome.error}")
+        else:
+            self.logger.debug(
+                f"⏱️  Check {outcome.name} finished in {outcome.elapsed:.2f}s"
+            )
+
+    def _mark_incomplete_checks(self) -> None:
+        """A device is only ready when every check could look"""
+        if self.incomplete_checks:
+            self.verification_results["status"] = "verification_incomplete"
+            self.verification_results["device_ready"] = False
+
+    def _check_journal_paths(
+        self, journal: CleanJournal, results: Optional[Dict[str, List[str]]] = None
+    ) -> None:
+        """Re-stat journal paths and look for Zoom entries next to them"""
+        results = self._check_results(results)
+        placeholders = set(journal.paths(PLACEHOLDER))
+        paths = [path for path in journal.paths() if path not in placeholders]
+        directories = journal.directories()
+
+        remaining = {path for path in paths if os.path.lexists(path)}
+        for directory in directories:
+            try:
+                with os.scandir(directory) as entries:
+                    siblings = [entry.path for entry in entries]
+            except OSError:
+                continue  # removed along with its contents
+            remaining.update(
+                path
+                for path in self._filter_zoom_files(siblings)
+                if path not in placeholders
+            )
+
+        self.delta_stats = {
+            "paths_checked": len(paths),
+            "directories_checked": len(directories),
+        }
+        self._delta_remaining = sorted(remaining)
+        if remaining:
+            results["remaining_items"].extend(self._delta_remaining)
+            self.logger.warning(f"Found {len(remaining)} remaining journal paths")
+        else:
+            self.logger.info(
+                f"✅ {len(paths)} cleaned paths and {len(directories)} "
+                "directories verified clean"
+            )
+
+    def _perform_delta_final_verification(self):
+        """Re-stat the remaining journal paths after the final clean"""
+        actual_remaining = [
+            path for path in self._delta_remaining if os.path.lexists(path)
+        ]
+        if actual_remaining:
+            self.verification_results["status"] = "partial_cleanup"
+            self.verification_results["device_ready"] = False
+        else:
+            self.verification_results["status"] = "complete_cleanup"
+            self.verification_results["device_ready"] = True
+
+    def _check_user_library_files(self, results: Optional[Dict[str, List[str]]] = None):
         """Check user Library for Zoom-related files"""
+        results = self._check_results(results)
         self.logger.info("Checking user Library directories...")
 
         search_patterns = ["*zoom*", "*Zoom*", "*ZM*", "*us.zoom*"]
@@ -89,14 +304,12 @@ class DeviceFingerprintVerifier:
         ]
 
         found_files = []
-        for lib_path in library_paths:
-            expanded_path = os.path.expanduser(lib_path)
+        for path, expanded_path in self._expand_paths(library_paths):
             if os.path.exists(expanded_path):
                 for pattern in search_patterns:
                     try:
-                        result = subprocess.run(
+                        result = self.command_backend.run(
                             ["find", expanded_path, "-name", pattern],
-                            capture_output=True,
                             text=True,
                             timeout=30,
                         )
@@ -109,22 +322,23 @@ class DeviceFingerprintVerifier:
                         continue
 
         if found_files:
-            self.verification_results["remaining_items"].extend(found_files)
+            results["remaining_items"].extend(found_files)
             self.logger.warning(f"Found {len(found_files)} user library files")
         else:
             self.logger.info("✅ User library directories clean")
 
-    def _check_system_level_files(self):
+    def _check_system_level_files(self, results: Optional[Dict[str, List[str]]] = None):
         """Check system-level directories for Zoom files"""
+        results = self._check_results(results)
         self.logger.info("Checking system-level directories...")
 
         system_paths = ["/Library", "/System/Library", "/usr/local"]
         found_files = []
 
-        for sys_path in system_paths:
+        for _, sys_path in self._expand_paths(system_paths):
             if os.path.exists(sys_path):
                 try:
-                    result = subprocess.run(
+                    result = self.command_backend.run(
                         [
                             "sudo",
                             "find",
@@ -138,7 +352,6 @@ class DeviceFingerprintVerifier:
                             "-name",
                             "*us.zoom*",
                         ],
-                        capture_output=True,
                         text=True,
                         timeout=60,
                     )
@@ -152,19 +365,18 @@ class DeviceFingerprintVerifier:
                     continue
 
         if found_files:
-            self.verification_results["remaining_items"].extend(found_files)
+            results["remaining_items"].extend(found_files)
             self.logger.warning(f"Found {len(found_files)} system-level files")
         else:
             self.logger.info("✅ System-level directories clean")
 
-    def _check_running_processes(self):
+    def _check_running_processes(self, results: Optional[Dict[str, List[str]]] = None):
         """Check for any running Zoom processes"""
+        results = self._check_results(results)
         self.logger.info("Checking for running Zoom processes...")
 
         try:
-            result = subprocess.run(
-                ["ps", "aux"], capture_output=True, text=True, timeout=10
-            )
+            result = self.command_backend.run(["ps", "aux"], text=True, timeout=10)
             zoom_processes = []
             for line in result.stdout.split("\n"):
                 if any(term in line.lower() for term in ["zoom", "us.zoom"]):
@@ -173,7 +385,7 @@ class DeviceFingerprintVerifier:
                         zoom_processes.append(line.strip())
 
             if zoom_processes:
-                self.verification_results["remaining_items"].extend(zoom_processes)
+                results["remaining_items"].extend(zoom_processes)
                 self.logger.warning(f"Found {len(zoom_processes)} running processes")
             else:
                 self.logger.info("✅ No Zoom processes running")
@@ -181,48 +393,48 @@ class DeviceFingerprintVerifier:
         except subprocess.SubprocessError:
             self.logger.warning("Could not check running processes")
 
-    def _check_network_data(self):
+    def _check_network_data(self, results: Optional[Dict[str, List[str]]] = None):
         """Check and clear network-related Zoom data"""
+        results = self._check_results(results)
         self.logger.info("Checking network data...")
 
         # Clear DNS cache
         try:
-            subprocess.run(
-                ["sudo", "dscacheutil", "-flushcache"], capture_output=True, timeout=10
+            self.command_backend.run(
+                ["sudo", "dscacheutil", "-flushcache"], text=False, timeout=10
             )
-            subprocess.run(
+            self.command_backend.run(
                 ["sudo", "killall", "-HUP", "mDNSResponder"],
-                capture_output=True,
+                text=False,
                 timeout=10,
             )
-            self.verification_results["cleaned_items"].append("DNS cache cleared")
+            results["cleaned_items"].append("DNS cache cleared")
             self.logger.info("✅ DNS cache cleared")
         except subprocess.SubprocessError:
             self.logger.warning("Could not clear DNS cache")
 
-    def _check_keychain_entries(self):
+    def _check_keychain_entries(self, results: Optional[Dict[str, List[str]]] = None):
         """Check for Zoom-related keychain entries"""
+        results = self._check_results(results)
         self.logger.info("Checking keychain entries...")
 
         try:
-            result = subprocess.run(
+            result = self.command_backend.run(
                 ["security", "dump-keychain"],
-                capture_output=True,
                 text=True,
                 timeout=30,
             )
             if "zoom" in result.stdout.lower():
-                self.verification_results["findings"].append(
-                    "Potential Zoom keychain entries found"
-                )
+                results["findings"].append("Potential Zoom keychain entries found")
                 self.logger.warning("⚠️ Potential keychain entries found")
             else:
                 self.logger.info("✅ No Zoom keychain entries found")
         except subprocess.SubprocessError:
             self.logger.info("✅ Keychain check completed (no entries found)")
 
-    def _check_launch_agents(self):
+    def _check_launch_agents(self, results: Optional[Dict[str, List[str]]] = None):
         """Check for Zoom launch agents and daemons"""
+        results = self._check_results(results)
         self.logger.info("Checking launch agents and daemons...")
 
         launch_paths = [
@@ -232,11 +444,10 @@ class DeviceFingerprintVerifier:
         ]
 
         found_agents = []
-        for path in launch_paths:
-            expanded_path = os.path.expanduser(path)
+        for path, expanded_path in self._expand_paths(launch_paths):
             if os.path.exists(expanded_path):
                 try:
-                    result = subprocess.run(
+                    result = self.command_backend.run(
                         [
                             "find",
                             expanded_path,
@@ -249,7 +460,6 @@ class DeviceFingerprintVerifier:
                             "-name",
                             "*us.zoom*",
                         ],
-                        capture_output=True,
                         text=True,
                         timeout=10,
                     )
@@ -260,13 +470,14 @@ class DeviceFingerprintVerifier:
                     continue
 
         if found_agents:
-            self.verification_results["remaining_items"].extend(found_agents)
+            results["remaining_items"].extend(found_agents)
             self.logger.warning(f"Found {len(found_agents)} launch agents/daemons")
         else:
             self.logger.info("✅ No Zoom launch agents/daemons found")
 
-    def _check_device_containers(self):
+    def _check_device_containers(self, results: Optional[Dict[str, List[str]]] = None):
         """Check for device-specific containers and data"""
+        results = self._check_results(results)
         self.logger.info("Checking device containers...")
 
         container_paths = [
@@ -276,11 +487,10 @@ class DeviceFingerprintVerifier:
         ]
 
         found_containers = []
-        for path in container_paths:
-            expanded_path = os.path.expanduser(path)
+        for path, expanded_path in self._expand_paths(container_paths):
             if os.path.exists(expanded_path):
                 try:
-                    result = subprocess.run(
+                    result = self.command_backend.run(
                         [
                             "find",
                             expanded_path,
@@ -290,7 +500,6 @@ class DeviceFingerprintVerifier:
                             "-name",
                             "*us.zoom*",
                         ],
-                        capture_output=True,
                         text=True,
                         timeout=20,
                     )
@@ -302,13 +511,14 @@ class DeviceFingerprintVerifier:
                     continue
 
         if found_containers:
-            self.verification_results["remaining_items"].extend(found_containers)
+            results["remaining_items"].extend(found_containers)
             self.logger.warning(f"Found {len(found_containers)} device containers")
         else:
             self.logger.info("✅ No Zoom device containers found")
 
-    def _check_metadata_indexes(self):
+    def _check_metadata_indexes(self, results: Optional[Dict[str, List[str]]] = None):
         """Check Spotlight and other metadata indexes"""
+        results = self._check_results(results)
         self.logger.info("Checking metadata indexes...")
 
         metadata_paths = [
@@ -317,11 +527,10 @@ class DeviceFingerprintVerifier:
         ]
 
         found_metadata = []
-        for path in metadata_paths:
-            expanded_path = os.path.expanduser(path)
+        for path, expanded_path in self._expand_paths(metadata_paths):
             if os.path.exists(expanded_path):
                 try:
-                    result = subprocess.run(
+                    result = self.command_backend.run(
                         [
                             "find",
                             expanded_path,
@@ -334,7 +543,6 @@ class DeviceFingerprintVerifier:
                             "-name",
                             "*us.zoom*",
                         ],
-                        capture_output=True,
                         text=True,
                         timeout=20,
                     )
@@ -346,13 +554,14 @@ class DeviceFingerprintVerifier:
                     continue
 
         if found_metadata:
-            self.verification_results["remaining_items"].extend(found_metadata)
+            results["remaining_items"].extend(found_metadata)
             self.logger.warning(f"Found {len(found_metadata)} metadata entries")
         else:
             self.logger.info("✅ No Zoom metadata entries found")
 
-    def _check_browser_data(self):
+    def _check_browser_data(self, results: Optional[Dict[str, List[str]]] = None):
         """Check browser data for Zoom-related entries"""
+        results = self._check_results(results)
         self.logger.info("Checking browser data...")
 
         browser_paths = [
@@ -362,13 +571,11 @@ class DeviceFingerprintVerifier:
         ]
 
         found_browser_data = []
-        for path in browser_paths:
-            expanded_path = os.path.expanduser(path)
+        for path, expanded_path in self._expand_paths(browser_paths):
             if os.path.exists(expanded_path):
                 try:
-                    result = subprocess.run(
+                    result = self.command_backend.run(
                         ["find", expanded_path, "-name", "*zoom*"],
-                        capture_output=True,
                         text=True,
                         timeout=15,
                     )
@@ -385,25 +592,48 @@ class DeviceFingerprintVerifier:
                 except subprocess.SubprocessError:
                     continue
 
+        found_browser_data.extend(self._check_cookie_jars())
+
         if found_browser_data:
-            self.verification_results["remaining_items"].extend(found_browser_data)
+            results["remaining_items"].extend(found_browser_data)
             self.logger.warning(f"Found {len(found_browser_data)} browser data items")
         else:
             self.logger.info("✅ No Zoom browser data found")
 
-    def _check_log_files(self):
+    def _check_cookie_jars(self) -> List[str]:
+        """Cookie jars still holding Zoom cookies"""
+        # Zoom cookies hide inside shared cookie jars whose names are generic
+        found = []
+        for home in self._user_homes():
+            for jar in cookie_jar_paths(home):
+                result = scan_cookie_jar(jar)
+                if result.matched:
+                    found.append(f"{jar} ({result.matched} Zoom cookies)")
+        return found
+
+    def _check_cookie_jar_items(self, results: Optional[Dict[str, List[str]]] = None):
+        """Report cookie jars still holding Zoom cookies as remaining items"""
+        results = self._check_results(results)
+        cookie_items = self._check_cookie_jars()
+        if cookie_items:
+            results["remaining_items"].extend(cookie_items)
+            self.logger.warning(
+                f"Found {len(cookie_items)} cookie jars with Zoom cookies"
+            )
+
+    def _check_log_files(self, results: Optional[Dict[str, List[str]]] = None):
         """Check system and application logs"""
+        results = self._check_results(results)
         self.logger.info("Checking log files...")
 
         log_paths = ["/var/log", "~/Library/Logs"]
         found_logs = []
 
-        for path in log_paths:
-            expanded_path = os.path.expanduser(path)
+        for path, expanded_path in self._expand_paths(log_paths):
             if os.path.exists(expanded_path):
                 try:
                     if path.startswith("/var"):
-                        result = subprocess.run(
+                        result = self.command_backend.run(
                             [
                                 "sudo",
                                 "find",
@@ -414,12 +644,11 @@ class DeviceFingerprintVerifier:
                                 "-name",
                                 "*Zoom*",
                             ],
-                            capture_output=True,
                             text=True,
                             timeout=20,
                         )
                     else:
-                        result = subprocess.run(
+                        result = self.command_backend.run(
                             [
                                 "find",
                                 expanded_path,
@@ -429,7 +658,6 @@ class DeviceFingerprintVerifier:
                                 "-name",
                                 "*Zoom*",
                             ],
-                            capture_output=True,
                             text=True,
                             timeout=20,
                         )
@@ -441,7 +669,7 @@ class DeviceFingerprintVerifier:
                     continue
 
         if found_logs:
-            self.verification_results["findings"].extend(found_logs)
+            results["findings"].extend(found_logs)
             self.logger.info(f"Found {len(found_logs)} log files (informational)")
         else:
             self.logger.info("✅ No Zoom log files found")
@@ -498,6 +726,13 @@ class DeviceFingerprintVerifier:
         if not self.verification_results["remaining_items"]:
             return
 
+        if self.dry_run:
+            self.logger.info(
+                f"DRY RUN: Would clean "
+                f"{len(self.verification_results['remaining_items'])} remaining items"
+            )
+            return
+
         self.logger.info("🧹 Cleaning remaining items...")
         cleaned_count = 0
 
@@ -505,12 +740,12 @@ class DeviceFingerprintVerifier:
             try:
                 if os.path.exists(item):
                     if os.path.isdir(item):
-                        subprocess.run(
-                            ["rm", "-rf", item], capture_output=True, timeout=10
+                        self.command_backend.run(
+                            ["rm", "-rf", item], text=False, timeout=10
                         )
                     else:
-                        subprocess.run(
-                            ["rm", "-f", item], capture_output=True, timeout=10
+                        self.command_backend.run(
+                            ["rm", "-f", item], text=False, timeout=10
                         )
 
                     if not os.path.exists(item):
@@ -530,35 +765,33 @@ class DeviceFingerprintVerifier:
 
         # Quick scan for any remaining Zoom files
         try:
-            result = subprocess.run(
-                [
-                    "find",
-                    os.path.expanduser("~/Library"),
-                    "-name",
-                    "*zoom*",
-                    "-o",
-                    "-name",
-                    "*Zoom*",
-                    "-o",
-                    "-name",
-                    "*us.zoom*",
-                ],
-                capture_output=True,
-                text=True,
-                timeout=30,
-            )
+            actual_remaining = []
+            for _, library_path in self._expand_paths(["~/Library"]):
+                result = self.command_backend.run(
+                    [
+                        "find",
+                        library_path,
+                        "-name",
+                        "*zoom*",
+                        "-o",
+                        "-name",
+                        "*Zoom*",
+                        "-o",
+                        "-name",
+                        "*us.zoom*",
+                    ],
+                    text=True,
+                    timeout=30,
+                )
+
+                if result.stdout.strip():
+                    remaining = result.stdout.strip().split("\n")
+                    # Filter out known safe files
+                    actual_remaining.extend(self._filter_zoom_files(remaining))
 
-            if result.stdout.strip():
-                remaining = result.stdout.strip().split("\n")
-                # Filter out known safe files
-                actual_remaining = self._filter_zoom_files(remaining)
-
-                if actual_remaining:
-                    self.verification_results["status"] = "partial_cleanup"
-                    self.verification_results["device_ready"] = False
-                else:
-                    self.verification_results["status"] = "complete_cleanup"
-                    self.verification_results["device_ready"] = True
+            if actual_remaining:
+                self.verification_results["status"] = "partial_cleanup"
+                self.verification_results["device_ready"] = False
             else:
                 self.verification_results["status"] = "complete_cleanup"
                 self.verification_results["device_ready"] = True
@@ -584,7 +817,11 @@ class DeviceFingerprintVerifier:
                     self.verification_results["remaining_items"]
                 ),
                 "findings_count": len(self.verification_results["findings"]),
+                "verification_mode": self.mode,
+                **self.delta_stats,
+                "incomplete_checks": self.incomplete_checks,
             },
+            "check_timings": self.check_timings,
             "system_information": system_info,
             "cleanup_results": {
                 "cleaned_items": self.verification_results["cleaned_items"],
@@ -620,11 +857,14 @@ class DeviceFingerprintVerifier:
         """Get system information for the report"""
         system_info = {}
 
+        if not self.live_system:
+            # Hardware identifiers belong to this machine, not the target
+            return {"target_root": self.target_root}
+
         try:
             # Get hardware info
-            result = subprocess.run(
+            result = self.command_backend.run(
                 ["system_profiler", "SPHardwareDataType"],
-                capture_output=True,
                 text=True,
                 timeout=15,
             )
@@ -637,9 +877,7 @@ class DeviceFingerprintVerifier:
                         system_info["hardware_uuid"] = line.split(":")[-1].strip()
 
             # Get network interfaces
-            result = subprocess.run(
-                ["ifconfig"], capture_output=True, text=True, timeout=10
-            )
+            result = self.command_backend.run(["ifconfig"], text=True, timeout=10)
             if result.stdout:
                 mac_addresses = re.findall(r"ether ([a-f0-9:]{17})", result.stdout)
                 system_info["mac_addresses"] = mac_addresses
@@ -670,6 +908,12 @@ class DeviceFingerprintVerifier:
                 ]
             )
 
+        if self.incomplete_checks:
+            recommendations.append(
+                f"⏰ {len(self.incomplete_checks)} verification checks did not "
+                "complete; run verification again"
+            )
+
         if self.verification_results["remaining_items"]:
             recommendations.append(
                 f"🧹 {len(self.verification_results['remaining_items'])} items require attention"
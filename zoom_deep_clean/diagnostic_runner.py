@@ -0,0 +1,202 @@
+#!/usr/bin/env python3
+"""
+Diagnostic Runner Module
+Run independent diagnostic checks concurrently, each under its own deadline
+
+Diagnostics such as the Error 1132 checks are independent of each other but
+each may block on a slow command or an unreachable server. Running them one
+after another makes the total latency the sum of their worst cases. The
+runner starts every check on its own thread and hands each outcome to the
+caller as soon as it is known:
+
+- a check that returns is reported with its wall time
+- a check that raises is reported as failed, with the error
+- a check still running at its deadline is reported as timed out right
+  away; its late result is discarded
+
+Checks run on daemon threads, so a check that never returns does not keep
+the interpreter from exiting. Checks share the terminal, so none of them
+may prompt on it; callers validate sudo credentials once before fanning out
+(``validate_sudo``) and run ``sudo -n`` inside the checks.
+
+Created by: PHLthy215
+Version: 2.4.2 - Diagnostic Runner
+"""
+
+import queue
+import subprocess
+import sys
+import threading
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_CHECK_DEADLINE = 30.0
+SUDO_PROMPT_TIMEOUT = 120.0
+
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+
+
+@dataclass
+class CheckOutcome:
+    """How one check ended"""
+
+    name: str
+    status: str
+    result: Any = None
+    elapsed: float = 0.0
+    deadline: Optional[float] = None
+    error: Optional[str] = None
+
+    @property
+    def timed_out(self) -> bool:
+        return self.status == STATUS_TIMEOUT
+
+
+@dataclass
+class DiagnosticRun:
+    """Every check's outcome, in the order the checks were given"""
+
+    outcomes: Dict[str, CheckOutcome] = field(default_factory=dict)
+    elapsed: float = 0.0
+
+    @property
+    def timed_out(self) -> List[str]:
+        return [name for name, outcome in self.outcomes.items() if outcome.timed_out]
+
+    def timings(self) -> Dict[str, float]:
+        """Wall time per check and overall, in seconds"""
+        timings = {
+            name: round(outcome.elapsed, 3) for name, outcome in self.outcomes.items()
+        }
+        timings["total"] = round(self.elapsed, 3)
+        return timings
+
+
+class DiagnosticRunner:
+    """Run named checks concurrently with per-check deadlines"""
+
+    def __init__(
+        self,
+        checks: Sequence[Tuple[str, Callable[[], Any]]],
+        deadlines: Optional[Dict[str, float]] = None,
+        default_deadline: float = DEFAULT_CHECK_DEADLINE,
+        max_workers: Optional[int] = None,
+    ):
+        self.checks = list(checks)
+        self.deadlines = dict(deadlines or {})
+        self.default_deadline = default_deadline
+        self.max_workers = max_workers or max(1, len(self.checks))
+
+    def deadline_for(self, name: str) -> float:
+        return self.deadlines.get(name, self.default_deadline)
+
+    def iter_outcomes(self) -> Iterator[CheckOutcome]:
+        """Yield each check's outcome as soon as it finishes or times out"""
+        if not self.checks:
+            return
+
+        todo: "queue.SimpleQueue[Tuple[str, Callable[[], Any]]]" = queue.SimpleQueue()
+        finished: "queue.SimpleQueue[Tuple[str, Any, Optional[str], float]]" = (
+            queue.SimpleQueue()
+        )
+        for name, check in self.checks:
+            todo.put((name, check))
+        # Start times are recorded by the worker, so a check queued behind
+        # others is not charged for the wait
+        started: Dict[str, float] = {}
+
+        def worker() -> None:
+            while True:
+                try:
+                    name, check = todo.get_nowait()
+                except queue.Empty:
+                    return
+                started[name] = time.monotonic()
+                try:
+                    result, error = check(), None
+                except Exception as e:
+                    result, error = None, str(e)
+                finished.put((name, result, error, time.monotonic() - started[name]))
+
+        # Daemon threads: a timed-out check is abandoned, not joined at exit
+        for index in range(min(self.max_workers, len(self.checks))):
+            threading.Thread(
+                target=worker, name=f"zoom-diagnostic-{index}", daemon=True
+            ).start()
+
+        pending = {name for name, _ in self.checks}
+        while pending:
+            now = time.monotonic()
+            expiries = {
+                name: started.get(name, now) + self.deadline_for(name)
+                for name in pending
+            }
+            for name, expiry in expiries.items():
+                if expiry <= now:
+                    pending.discard(name)
+                    yield CheckOutcome(
+                        name,
+                        STATUS_TIMEOUT,
+                        elapsed=now - started.get(name, now),
+                        deadline=self.deadline_for(name),
+                        error=f"Timed out after {self.deadline_for(name):g}s",
+                    )
+            if not pending:
+                break
+
+            timeout = max(0.0, min(expiries[name] for name in pending) - now)
+            try:
+                name, result, error, elapsed = finished.get(timeout=timeout)
+            except queue.Empty:
+                continue
+            if name not in pending:
+                continue  # finished after its deadline
+            pending.discard(name)
+            yield CheckOutcome(
+                name,
+                STATUS_OK if error is None else STATUS_ERROR,
+                result=result,
+                elapsed=elapsed,
+                deadline=self.deadline_for(name),
+                error=error,
+            )
+
+    def run(
+        self, on_outcome: Optional[Callable[[CheckOutcome], None]] = None
+    ) -> DiagnosticRun:
+        """Run every check; ``on_outcome`` sees each outcome as it arrives"""
+        started = time.monotonic()
+        arrived = {}
+        for outcome in self.iter_outcomes():
+            arrived[outcome.name] = outcome
+            if on_outcome is not None:
+                on_outcome(outcome)
+
+        run = DiagnosticRun(elapsed=time.monotonic() - started)
+        for name, _ in self.checks:
+            run.outcomes[name] = arrived[name]
+        return run
+
+
+def validate_sudo(timeout: float = SUDO_PROMPT_TIMEOUT) -> bool:
+    """Make sure sudo credentials are cached before checks fan out
+
+    Concurrent checks that each prompt for a password would race for the
+    terminal, so the prompt happens here, once, on the calling thread. It is
+    only shown when the credentials are not cached already and stdin is a
+    terminal; checks then run ``sudo -n``, which never prompts.
+    """
+    try:
+        cached = subprocess.run(
+            ["sudo", "-n", "-v"], capture_output=True, timeout=timeout
+        )
+        if cached.returncode == 0:
+            return True
+        if sys.stdin is None or not sys.stdin.isatty():
+            return False
+        return subprocess.run(["sudo", "-v"], timeout=timeout).returncode == 0
+    except (OSError, subprocess.SubprocessError):
+        return False
@@ -0,0 +1,431 @@
+#!/usr/bin/env python3
+"""
+Download Engine Module
+Resumable, range-parallel HTTP downloads with streaming SHA-256
+
+Zoom installers are a few hundred megabytes. Downloading them in 8 KB reads
+over one connection, and starting again from zero whenever the connection
+drops, makes the fresh-install phase slow and fragile. This engine uses only
+the standard library:
+
+- the file is split into segments fetched concurrently with HTTP ``Range``
+  requests, each written in place into a pre-sized ``<name>.part`` file
+- progress is recorded in ``<name>.part.json``; an interrupted download
+  continues where every segment stopped, as long as the server still
+  reports the same size, ETag and Last-Modified
+- SHA-256 is computed while the data arrives: bytes at the hash frontier
+  are hashed straight from memory, bytes that arrive ahead of it are
+  hashed from the page cache once the frontier reaches them, so the
+  finished file never has to be read again
+- servers without range support get a single streamed connection
+
+Created by: PHLthy215
+Version: 2.4.2 - Download Engine
+"""
+
+import hashlib
+import http.client
+import json
+import os
+import ssl
+import threading
+import time
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+
+DEFAULT_CONNECTIONS = 4
+DEFAULT_CHUNK_SIZE = 1024 * 1024
+MIN_SEGMENT_SIZE = 8 * 1024 * 1024
+DEFAULT_RETRIES = 3
+STATE_SAVE_INTERVAL = 8  # chunks between progress saves
+
+PART_SUFFIX = ".part"
+STATE_SUFFIX = ".part.json"
+
+
+class DownloadError(Exception):
+    """A download could not be completed"""
+
+
+@dataclass
+class DownloadResult:
+    """Outcome of one download"""
+
+    url: str
+    path: str
+    size: int = 0
+    sha256: Optional[str] = None
+    elapsed: float = 0.0
+    bytes_transferred: int = 0
+    resumed_bytes: int = 0
+    connections: int = 1
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second actually received during this run"""
+        return self.bytes_transferred / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass
+class _Segment:
+    start: int
+    end: int  # exclusive
+    done: int  # next offset to fetch
+
+    @property
+    def complete(self) -> bool:
+        return self.done >= self.end
+
+
+@dataclass
+class _Remote:
+    """What the server said about the resource"""
+
+    size: Optional[int]
+    ranges: bool
+    etag: Optional[str] = None
+    last_modified: Optional[str] = None
+    response: object = None  # open full-body response when ranges are off
+
+
+class _StreamingHasher:
+    """SHA-256 over a file that is written out of order
+
+    Workers report every chunk they write. Chunks landing exactly at the
+    frontier are hashed from memory; once a segment ahead of the frontier is
+    joined to it, the bytes in between are read back with ``pread`` while
+    they are still in the page cache.
+    """
+
+    def __init__(self, fd: int, segments: List[_Segment]):
+        self.fd = fd
+        self.segments = segments
+        self.digest = hashlib.sha256()
+        self.hashed = 0
+        self.lock = threading.Lock()
+
+    def _frontier(self) -> int:
+        for segment in self.segments:
+            if not segment.complete:
+                return segment.done
+        return self.segments[-1].end if self.segments else 0
+
+    def _catch_up(self, frontier: int) -> None:
+        while self.hashed < frontier:
+            length = min(DEFAULT_CHUNK_SIZE, frontier - self.hashed)
+            data = os.pread(self.fd, length, self.hashed)
+            if not data:
+                raise DownloadError("Partial file is shorter than its progress")
+            self.digest.update(data)
+            self.hashed += len(data)
+
+    def wrote(self, offset: int, data: bytes) -> None:
+        """Called after ``data`` was written at ``offset``"""
+        with self.lock:
+            if offset == self.hashed:
+                self.digest.update(data)
+                self.hashed += len(data)
+            self._catch_up(self._frontier())
+
+    def finish(self) -> str:
+        with self.lock:
+            self._catch_up(self._frontier())
+            return self.digest.hexdigest()
+
+
+def _plan_segments(size: int, connections: int) -> List[_Segment]:
+    if size <= 0:
+        return [_Segment(0, 0, 0)]
+    count = max(1, min(connections, -(-size // MIN_SEGMENT_SIZE)))
+    step = -(-size // count)
+    return [
+        _Segment(start, min(start + step, size), start)
+        for start in range(0, size, step)
+    ]
+
+
+class DownloadEngine:
+    """Fetch a URL to a file over several resumable range connections"""
+
+    def __init__(
+        self,
+        connections: int = DEFAULT_CONNECTIONS,
+        chunk_size: int = DEFAULT_CHUNK_SIZE,
+        timeout: float = 30,
+        retries: int = DEFAULT_RETRIES,
+        headers: Optional[Dict[str, str]] = None,
+        ssl_context: Optional[ssl.SSLContext] = None,
+    ):
+        self.connections = max(1, connections)
+        self.chunk_size = chunk_size
+        self.timeout = timeout
+        self.retries = retries
+        self.headers = dict(headers or {})
+        self.ssl_context = ssl_context
+
+    def open_url(self, url: str, headers: Optional[Dict[str, str]] = None):
+        request = urllib.request.Request(
+            url, headers={**self.headers, **(headers or {})}
+        )
+        return urllib.request.urlopen(
+            request, context=self.ssl_context, timeout=self.timeout
+        )
+
+    def _probe(self, url: str) -> _Remote:
+        """Ask for the first byte to learn the size and range support"""
+        response = self.open_url(url, {"Range": "bytes=0-0"})
+        etag = response.headers.get("ETag")
+        last_modified = response.headers.get("Last-Modified")
+        if response.status == 206:
+            content_range = response.headers.get("Content-Range", "")
+            response.read()
+            response.close()
+            total = content_range.rpartition("/")[2]
+            if total.isdigit():
+                return _Remote(int(total), True, etag, last_modified)
+            raise DownloadError(f"Unusable Content-Range: {content_range!r}")
+        length = response.headers.get("Content-Length")
+        return _Remote(
+            int(length) if length and length.isdigit() else None,
+            False,
+            etag,
+            last_modified,
+            response,
+        )
+
+    def _load_state(
+        self, state_path: str, url: str, remote: _Remote
+    ) -> Optional[List[_Segment]]:
+        try:
+            with open(state_path, "r", encoding="utf-8") as f:
+                state = json.load(f)
+        except (OSError, ValueError):
+            return None
+        same = (
+            state.get("url") == url
+            and state.get("size") == remote.size
+            and state.get("etag") == remote.etag
+            and state.get("last_modified") == remote.last_modified
+        )
+        if not same:
+            return None
+        try:
+            return [_Segment(*segment) for segment in state["segments"]]
+        except (KeyError, TypeError):
+            return None
+
+    def _save_state(
+        self,
+        state_path: str,
+        url: str,
+        remote: _Remote,
+        segments: List[_Segment],
+    ) -> None:
+        state = {
+            "url": url,
+            "size": remote.size,
+            "etag": remote.etag,
+            "last_modified": remote.last_modified,
+            "segments": [[s.start, s.end, s.done] for s in segments],
+        }
+        temp_path = f"{state_path}.tmp"
+        with open(temp_path, "w", encoding="utf-8") as f:
+            json.dump(state, f)
+        os.replace(temp_path, state_path)
+
+    def _fetch_segment(
+        self,
+        url: str,
+        remote: _Remote,
+        segment: _Segment,
+        fd: int,
+        hasher: _StreamingHasher,
+        on_chunk: Callable[[int], None],
+    ) -> None:
+        headers = {"Range": f"bytes={segment.done}-{segment.end - 1}"}
+        # Only ever splice bytes of the same version of the file
+        if remote.etag and not remote.etag.startswith("W/"):
+            headers["If-Range"] = remote.etag
+        elif remote.last_modified:
+            headers["If-Range"] = remote.last_modified
+        with self.open_url(url, headers) as response:
+            if response.status != 206:
+                raise DownloadError(
+                    "Server ignored the range request; the file may have changed"
+                )
+            while not segment.complete:
+                data = response.read(min(self.chunk_size, segment.end - segment.done))
+                if not data:
+                    raise DownloadError(
+                        f"Connection closed at byte {segment.done} of {remote.size}"
+                    )
+                os.pwrite(fd, data, segment.done)
+                offset = segment.done
+                segment.done += len(data)
+                hasher.wrote(offset, data)
+                on_chunk(len(data))
+
+    def _download_ranges(
+        self,
+        url: str,
+        remote: _Remote,
+        part_path: str,
+        state_path: str,
+        result: DownloadResult,
+        progress_callback: Optional[Callable[[int, int], None]],
+    ) -> str:
+        segments = self._load_state(state_path, url, remote)
+        if segments is None or not os.path.exists(part_path):
+            segments = _plan_segments(remote.size, self.connections)
+            with open(part_path, "wb") as f:
+                f.truncate(remote.size)
+        result.resumed_bytes = sum(s.done - s.start for s in segments)
+        result.connections = sum(1 for s in segments if not s.complete) or 1
+        self._save_state(state_path, url, remote, segments)
+
+        lock = threading.Lock()
+        counters = {"received": 0, "chunks": 0}
+
+        def on_chunk(length: int) -> None:
+            with lock:
+                counters["received"] += length
+                counters["chunks"] += 1
+                if counters["chunks"] % STATE_SAVE_INTERVAL == 0:
+                    self._save_state(state_path, url, remote, segments)
+                received = counters["received"]
+            if progress_callback is not None:
+                progress_callback(result.resumed_bytes + received, remote.size)
+
+        fd = os.open(part_path, os.O_RDWR)
+        try:
+            hasher = _StreamingHasher(fd, segments)
+            errors: List[str] = []
+            for _ in range(self.retries + 1):
+                pending = [segment for segment in segments if not segment.complete]
+                if not pending:
+                    break
+                errors = []
+
+                def fetch(segment: _Segment) -> None:
+                    try:
+                        self._fetch_segment(url, remote, segment, fd, hasher, on_chunk)
+                    except (
+                        OSError,
+                        DownloadError,
+                        ValueError,
+                        http.client.HTTPException,
+                    ) as e:
+                        errors.append(str(e))
+
+                with ThreadPoolExecutor(max_workers=len(pending)) as executor:
+                    list(executor.map(fetch, pending))
+                with lock:
+                    self._save_state(state_path, url, remote, segments)
+
+            result.bytes_transferred = counters["received"]
+            if any(not segment.complete for segment in segments):
+                raise DownloadError(
+                    f"Download incomplete after {self.retries + 1} attempts: "
+                    f"{errors[-1] if errors else 'unknown error'}"
+                )
+            digest = hasher.finish()
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+        return digest
+
+    def _download_stream(
+        self,
+        remote: _Remote,
+        part_path: str,
+        result: DownloadResult,
+        progress_callback: Optional[Callable[[int, int], None]],
+    ) -> str:
+        digest = hashlib.sha256()
+        received = 0
+        with remote.response as response, open(part_path, "wb") as f:
+            while True:
+                data = response.read(self.chunk_size)
+                if not data:
+                    break
+                f.write(data)
+                digest.update(data)
+                received += len(data)
+                if progress_callback is not None:
+                    progress_callback(received, remote.size or 0)
+            f.flush()
+            os.fsync(f.fileno())
+        result.bytes_transferred = received
+        if remote.size is not None and received != remote.size:
+            raise DownloadError(f"Received {received} of {remote.size} bytes")
+        return digest.hexdigest()
+
+    def download(
+        self,
+        url: str,
+        dest_path: str,
+        expected_sha256: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> DownloadResult:
+        """Download ``url`` to ``dest_path``, resuming a previous attempt
+
+        ``progress_callback(done, total)`` is called after every chunk.
+        Failures are reported in ``DownloadResult.error``; the ``.part`` file
+        and its progress are kept so the next call can resume.
+        """
+        result = DownloadResult(url=url, path=dest_path)
+        part_path = dest_path + PART_SUFFIX
+        state_path = dest_path + STATE_SUFFIX
+        started = time.monotonic()
+        try:
+            remote = self._probe(url)
+            result.etag, result.last_modified = remote.etag, remote.last_modified
+            if remote.ranges:
+                digest = self._download_ranges(
+                    url, remote, part_path, state_path, result, progress_callback
+                )
+            else:
+                result.connections = 1
+                digest = self._download_stream(
+                    remote, part_path, result, progress_callback
+                )
+
+            if expected_sha256 and digest != expected_sha256.lower():
+                for path in (part_path, state_path):
+                    if os.path.exists(path):
+                        os.remove(path)
+                raise DownloadError(
+                    f"SHA-256 mismatch: expected {expected_sha256}, got {digest}"
+                )
+            os.replace(part_path, dest_path)
+            if os.path.exists(state_path):
+                os.remove(state_path)
+            result.sha256 = digest
+            result.size = os.path.getsize(dest_path)
+        except (
+            DownloadError,
+            OSError,
+            ValueError,
+            http.client.HTTPException,
+        ) as e:
+            result.error = str(e)
+        result.elapsed = time.monotonic() - started
+        return result
+
+
+def download_file(
+    url: str,
+    dest_path: str,
+    connections: int = DEFAULT_CONNECTIONS,
+    expected_sha256: Optional[str] = None,
+    progress_callback: Optional[Callable[[int, int], None]] = None,
+    **engine_options,
+) -> DownloadResult:
+    """Download ``url`` to ``dest_path`` with a default engine"""
+    engine = DownloadEngine(connections=connections, **engine_options)
+    return engine.download(url, dest_path, expected_sha256, progress_callback)
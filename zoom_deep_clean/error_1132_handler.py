@@ -9,13 +9,31 @@ network or firewall issues preventing connection to Zoom servers.
 import subprocess
 import os
 import sys
-import socket
 import logging
 import time
 import json
-from typing import Dict, List, Tuple, Optional
+from typing import Callable, Dict, List, Tuple, Optional
 from pathlib import Path
 
+from .connectivity_probe import ConnectivityProber, clear_probe_cache
+from .diagnostic_runner import (
+    STATUS_OK,
+    CheckOutcome,
+    DiagnosticRunner,
+    validate_sudo,
+)
+
+# Seconds each diagnostic check may take; every check runs concurrently
+CHECK_DEADLINES = {
+    "connectivity": 15.0,
+    "port_connectivity": 15.0,
+    "firewall": 35.0,
+    "proxy": 60.0,
+    "logs": 30.0,
+    "network_config": 45.0,
+    "advanced_network": 35.0,
+}
+
 
 class Error1132Handler:
     """Handler for Zoom error 1132 - Network/Firewall Connection Issues"""
@@ -32,21 +50,72 @@ class Error1132Handler:
             "zoomgovcloud.com",
         ]
         self.zoom_ports = [80, 443, 8801, 8802, 8443, 3478, 3479]
-
-    def diagnose_error_1132(self) -> Dict[str, any]:
-        """Run comprehensive diagnostic for error 1132"""
+        self.prober = ConnectivityProber()
+        self.check_deadlines = dict(CHECK_DEADLINES)
+
+    def diagnose_error_1132(
+        self, on_result: Optional[Callable[[CheckOutcome], None]] = None
+    ) -> Dict[str, any]:
+        """Run comprehensive diagnostic for error 1132
+
+        The checks are independent, so they run concurrently, each under its
+        own deadline (see ``CHECK_DEADLINES``). ``on_result`` receives every
+        check's outcome as soon as it finishes or times out. A timed-out
+        check's result is ``{"timed_out": True, "error": ...}``; wall times
+        per check and overall are returned under ``check_timings``.
+
+        sudo is validated once before the checks start, so at most one
+        password prompt is shown; the checks themselves never prompt.
+        """
         self.logger.info("🔍 Starting Error 1132 Diagnostic")
         self.logger.info("=" * 50)
 
-        results = {
-            "connectivity": self._check_zoom_connectivity(),
-            "firewall": self._check_firewall_rules(),
-            "proxy": self._check_proxy_settings(),
-            "logs": self._check_zoom_logs(),
-            "network_config": self._check_network_configuration(),
-            "port_connectivity": self._check_port_connectivity(),
-            "advanced_network": self._check_advanced_network_diagnostics(),
-        }
+        if not validate_sudo():
+            self.logger.warning(
+                "⚠️  No sudo credentials; firewall rules will not be readable"
+            )
+
+        runner = DiagnosticRunner(
+            [
+                ("connectivity", self._check_zoom_connectivity),
+                ("firewall", self._check_firewall_rules),
+                ("proxy", self._check_proxy_settings),
+                ("logs", self._check_zoom_logs),
+                ("network_config", self._check_network_configuration),
+                ("port_connectivity", self._check_port_connectivity),
+                ("advanced_network", self._check_advanced_network_diagnostics),
+            ],
+            deadlines=self.check_deadlines,
+        )
+
+        def report_outcome(outcome: CheckOutcome):
+            if outcome.timed_out:
+                self.logger.warning(
+                    f"⏰ Check {outcome.name} timed out after {outcome.deadline:g}s"
+                )
+            elif outcome.error:
+                self.logger.error(f"❌ Check {outcome.name} failed: {outcome.error}")
+            else:
+                self.logger.info(
+                    f"⏱️  Check {outcome.name} finished in {outcome.elapsed:.2f}s"
+                )
+            if on_result is not None:
+                on_result(outcome)
+
+        run = runner.run(report_outcome)
+
+        results = {}
+        for name, outcome in run.outcomes.items():
+            if outcome.status == STATUS_OK:
+                results[name] = outcome.result
+            else:
+                results[name] = {
+                    "timed_out": outcome.timed_out,
+                    "error": outcome.error,
+                }
+        results["check_timings"] = run.timings()
+        results["timed_out_checks"] = run.timed_out
+        self.logger.info(f"⏱️  Error 1132 diagnostic finished in {run.elapsed:.2f}s")
 
         return results
 
@@ -81,6 +150,10 @@ class Error1132Handler:
         if not self._apply_advanced_network_fixes():
             success = False
 
+        # Cached probe results predate the fixes
+        if not self.dry_run:
+            clear_probe_cache()
+
         return success
 
     def _check_zoom_connectivity(self) -> Dict[str, any]:
@@ -91,20 +164,28 @@ class Error1132Handler:
             "domains_tested": [],
             "domains_resolved": [],
             "domains_failed": [],
+            "addresses": {},
+            "latency_ms": {},
             "all_passed": True,
         }
 
+        # All domains are resolved concurrently under one deadline
+        report = self.prober.run(self.zoom_domains)
+
         for domain in self.zoom_domains:
-            try:
-                socket.gethostbyname(domain)
-                self.logger.info(f"✅ DNS resolution for {domain}: Success")
+            resolution = report.resolutions[domain]
+            latency_ms = round(resolution.latency * 1000, 1)
+            if resolution.resolved:
+                self.logger.info(
+                    f"✅ DNS resolution for {domain}: Success ({latency_ms} ms)"
+                )
                 results["domains_resolved"].append(domain)
-            except socket.gaierror as e:
-                self.logger.warning(f"❌ DNS resolution for {domain}: Failed - {e}")
-                results["domains_failed"].append(domain)
-                results["all_passed"] = False
-            except Exception as e:
-                self.logger.error(f"❌ Unexpected error resolving {domain}: {e}")
+                results["addresses"][domain] = resolution.addresses
+                results["latency_ms"][domain] = latency_ms
+            else:
+                self.logger.warning(
+                    f"❌ DNS resolution for {domain}: Failed - {resolution.error}"
+                )
                 results["domains_failed"].append(domain)
                 results["all_passed"] = False
 
@@ -120,49 +201,60 @@ class Error1132Handler:
             "ports_tested": [],
             "ports_open": [],
             "ports_blocked": [],
+            "ports_timed_out": [],
+            "latency_ms": {},
             "all_passed": True,
         }
 
         # Test a few key Zoom domains on critical ports
         test_domains = ["zoom.us", "zoom.com"]
+        critical_ports = [443, 8443, 3478]
 
-        for domain in test_domains:
-            try:
-                ip = socket.gethostbyname(domain)
-                self.logger.info(f"✅ Resolved {domain} to {ip}")
-
-                # Test critical ports
-                critical_ports = [443, 8443, 3478]
-                for port in critical_ports:
-                    try:
-                        sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
-                        sock.settimeout(5)  # 5 second timeout
-                        result = sock.connect_ex((ip, port))
-                        sock.close()
-
-                        port_key = f"{domain}:{port}"
-                        results["ports_tested"].append(port_key)
-
-                        if result == 0:
-                            self.logger.info(f"✅ Port {port} open on {domain}")
-                            results["ports_open"].append(port_key)
-                        else:
-                            self.logger.warning(f"❌ Port {port} blocked on {domain}")
-                            results["ports_blocked"].append(port_key)
-                            results["all_passed"] = False
-
-                    except Exception as e:
-                        self.logger.error(
-                            f"❌ Error testing port {port} on {domain}: {e}"
-                        )
-                        results["all_passed"] = False
+        # Every (domain, port) pair is probed at once, over IPv4 and IPv6
+        report = self.prober.run(test_domains, critical_ports)
+        if report.deadline_hit:
+            self.logger.warning(
+                f"⚠️  Connectivity probe deadline of {self.prober.deadline:g}s "
+                "reached; unfinished probes count as blocked"
+            )
 
-            except socket.gaierror as e:
-                self.logger.error(f"❌ Could not resolve {domain}: {e}")
-                results["all_passed"] = False
-            except Exception as e:
-                self.logger.error(f"❌ Unexpected error testing {domain}: {e}")
+        for domain in test_domains:
+            resolution = report.resolutions[domain]
+            if not resolution.resolved:
+                self.logger.error(f"❌ Could not resolve {domain}: {resolution.error}")
                 results["all_passed"] = False
+                continue
+
+            addresses = ", ".join(
+                address for found in resolution.addresses.values() for address in found
+            )
+            self.logger.info(f"✅ Resolved {domain} to {addresses}")
+
+            for port in critical_ports:
+                port_key = f"{domain}:{port}"
+                results["ports_tested"].append(port_key)
+                probes = report.probes_for(domain, port)
+
+                if report.port_open(domain, port):
+                    latency_ms = round(
+                        min(probe.latency for probe in probes if probe.open) * 1000, 1
+                    )
+                    self.logger.info(
+                        f"✅ Port {port} open on {domain} ({latency_ms} ms)"
+                    )
+                    results["ports_open"].append(port_key)
+                    results["latency_ms"][port_key] = latency_ms
+                else:
+                    errors = "; ".join(
+                        f"{probe.family}: {probe.error}" for probe in probes
+                    )
+                    self.logger.warning(
+                        f"❌ Port {port} blocked on {domain} ({errors})"
+                    )
+                    results["ports_blocked"].append(port_key)
+                    if any(probe.timed_out for probe in probes):
+                        results["ports_timed_out"].append(port_key)
+                    results["all_passed"] = False
 
         return results
 
@@ -181,7 +273,10 @@ class Error1132Handler:
         try:
             # Check if pfctl is available and active
             result = subprocess.run(
-                ["sudo", "pfctl", "-sr"], capture_output=True, text=True, timeout=10
+                ["sudo", "-n", "pfctl", "-sr"],
+                capture_output=True,
+                text=True,
+                timeout=10,
             )
             results["pfctl_available"] = True
 
@@ -207,6 +302,7 @@ class Error1132Handler:
             result = subprocess.run(
                 [
                     "sudo",
+                    "-n",
                     "defaults",
                     "read",
                     "/Library/Preferences/com.apple.alf",
@@ -683,6 +779,12 @@ class Error1132Handler:
             self.logger.error(f"❌ Failed to apply advanced network fixes: {e}")
             return False
 
+    def _incomplete_check_line(self, check_result: Dict[str, any]) -> str:
+        """Report line for a check the diagnostic runner could not complete"""
+        if check_result.get("timed_out"):
+            return f"⏰ Check did not finish in time - {check_result.get('error')}"
+        return f"❌ Check failed - {check_result.get('error')}"
+
     def generate_error_1132_report(self, diagnostic_results: Dict[str, any]) -> str:
         """Generate a detailed report for error 1132"""
         report = []
@@ -693,7 +795,9 @@ class Error1132Handler:
         # Connectivity Results
         connectivity = diagnostic_results.get("connectivity", {})
         report.append("🌐 CONNECTIVITY CHECK:")
-        if connectivity.get("all_passed", False):
+        if "timed_out" in connectivity:
+            report.append(self._incomplete_check_line(connectivity))
+        elif connectivity.get("all_passed", False):
             report.append("✅ All Zoom domains resolved successfully")
         else:
             report.append("❌ Some Zoom domains failed to resolve:")
@@ -704,18 +808,24 @@ class Error1132Handler:
         # Port Connectivity Results
         port_connectivity = diagnostic_results.get("port_connectivity", {})
         report.append("🔌 PORT CONNECTIVITY CHECK:")
-        if port_connectivity.get("all_passed", False):
+        if "timed_out" in port_connectivity:
+            report.append(self._incomplete_check_line(port_connectivity))
+        elif port_connectivity.get("all_passed", False):
             report.append("✅ All critical Zoom ports are accessible")
         else:
             report.append("❌ Some Zoom ports are blocked:")
+            timed_out = port_connectivity.get("ports_timed_out", [])
             for port in port_connectivity.get("ports_blocked", []):
-                report.append(f"   • {port}")
+                suffix = " (no answer, timed out)" if port in timed_out else ""
+                report.append(f"   • {port}{suffix}")
         report.append("")
 
         # Firewall Results
         firewall = diagnostic_results.get("firewall", {})
         report.append("🛡️  FIREWALL CHECK:")
-        if firewall.get("zoom_rules_found", False):
+        if "timed_out" in firewall:
+            report.append(self._incomplete_check_line(firewall))
+        elif firewall.get("zoom_rules_found", False):
             report.append("⚠️  Zoom-related firewall rules detected")
             for rule in firewall.get("rules", []):
                 report.append(f"   • {rule}")
@@ -726,7 +836,9 @@ class Error1132Handler:
         # Proxy Results
         proxy = diagnostic_results.get("proxy", {})
         report.append("🌐 PROXY CHECK:")
-        if proxy.get("has_proxies", False) or proxy.get("system_proxies", {}):
+        if "timed_out" in proxy:
+            report.append(self._incomplete_check_line(proxy))
+        elif proxy.get("has_proxies", False) or proxy.get("system_proxies", {}):
             report.append("⚠️  Proxy settings detected:")
             if proxy.get("found_proxies", {}):
                 for var, value in proxy.get("found_proxies", {}).items():
@@ -741,7 +853,9 @@ class Error1132Handler:
         # Log Results
         logs = diagnostic_results.get("logs", {})
         report.append("📝 LOG ANALYSIS:")
-        if logs.get("error_1132_found", False):
+        if "timed_out" in logs:
+            report.append(self._incomplete_check_line(logs))
+        elif logs.get("error_1132_found", False):
             report.append("❌ Error 1132 references found in logs")
         else:
             report.append("✅ No error 1132 references found in logs")
@@ -752,12 +866,28 @@ class Error1132Handler:
         if advanced:
             report.append("🔬 ADVANCED NETWORK DIAGNOSTICS:")
             ping_results = advanced.get("ping_results", {})
-            if ping_results.get("zoom.us") == "success":
+            if "timed_out" in advanced:
+                report.append(self._incomplete_check_line(advanced))
+            elif ping_results.get("zoom.us") == "success":
                 report.append("✅ Ping to zoom.us successful")
             else:
                 report.append("❌ Ping to zoom.us failed")
             report.append("")
 
+        # Check Timings
+        timings = diagnostic_results.get("check_timings", {})
+        if timings:
+            report.append("⏱️  CHECK TIMINGS:")
+            timed_out_checks = diagnostic_results.get("timed_out_checks", [])
+            for name, seconds in timings.items():
+                if name == "total":
+                    continue
+                suffix = " (timed out)" if name in timed_out_checks else ""
+                report.append(f"   • {name}: {seconds:.2f}s{suffix}")
+            if "total" in timings:
+                report.append(f"   • Overall: {timings['total']:.2f}s")
+            report.append("")
+
         # Recommendations
         report.append("💡 RECOMMENDATIONS:")
         if not connectivity.get("all_passed", True):
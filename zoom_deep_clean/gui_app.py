@@ -10,9 +10,9 @@ Enhanced Version: 2.2.0 - GUI Application
 import sys
 import os
 import threading
+import importlib
 import json
 import webbrowser
-from datetime import datetime
 from pathlib import Path
 
 try:
@@ -26,8 +26,29 @@ except ImportError:
 # Add the package to path
 sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
-from .cleaner_enhanced import ZoomDeepCleanerEnhanced
-from .advanced_features import AdvancedFeatures
+from .log_sink import LogSink, TextLogView
+from .progress_events import RUN_FINISHED
+
+# The cleaner is imported on first use (PEP 562) so the window opens without
+# loading the cleaning subsystems
+_LAZY_IMPORTS = {
+    "ZoomDeepCleanerEnhanced": (".cleaner_enhanced", "ZoomDeepCleanerEnhanced"),
+    "AdvancedFeatures": (".advanced_features", "AdvancedFeatures"),
+}
+
+
+def __getattr__(name):
+    if name not in _LAZY_IMPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    module_name, attribute = _LAZY_IMPORTS[name]
+    value = getattr(importlib.import_module(module_name, __package__), attribute)
+    globals()[name] = value
+    return value
+
+
+def _subsystem(name: str):
+    """Resolve a lazily imported subsystem, honouring patched attributes"""
+    return globals()[name] if name in globals() else __getattr__(name)
 
 
 class ZoomCleanerGUI:
@@ -486,6 +507,17 @@ class ZoomCleanerGUI:
         # Auto-scroll to bottom when new content is added
         self.auto_scroll = True
 
+        # Log lines are queued from any thread and flushed in batches
+        self.log_sink = LogSink()
+        self.log_handler = self.log_sink.handler()
+        self.log_view = TextLogView(
+            self.root,
+            self.output_text,
+            self.log_sink,
+            follow=lambda: self.auto_scroll,
+        )
+        self.log_view.start()
+
         # Add context menu for copy/select all
         self.create_context_menu()
 
@@ -605,34 +637,8 @@ class ZoomCleanerGUI:
         return "break"
 
     def log_message(self, message, level="info"):
-        """Add message to output text area with improved performance"""
-        if self.update_pending:
-            return
-
-        timestamp = datetime.now().strftime("%H:%M:%S")
-
-        # Insert timestamp with special formatting
-        self.output_text.insert(tk.END, f"[{timestamp}] ", "timestamp")
-
-        # Insert message with appropriate color
-        self.output_text.insert(tk.END, f"{message}\n", level)
-
-        # Auto-scroll to bottom if enabled
-        if self.auto_scroll:
-            self.output_text.see(tk.END)
-
-        # Limit text buffer to prevent memory issues
-        self._limit_text_buffer()
-
-        # Schedule GUI update to prevent screen tearing
-        self._schedule_update()
-
-    def _limit_text_buffer(self):
-        """Limit text buffer to prevent memory issues"""
-        lines = self.output_text.get("1.0", tk.END).count("\n")
-        if lines > 1000:  # Keep last 1000 lines
-            # Delete first 200 lines
-            self.output_text.delete("1.0", "200.0")
+        """Queue a message for the output text area (safe from any thread)"""
+        self.log_sink.append(message, level)
 
     def _schedule_update(self):
         """Schedule GUI update to prevent screen tearing"""
@@ -663,7 +669,7 @@ class ZoomCleanerGUI:
 
     def clear_output(self):
         """Clear output text area"""
-        self.output_text.delete(1.0, tk.END)
+        self.log_view.clear()
         self.auto_scroll = True  # Re-enable auto-scroll when clearing
 
     def preview_cleanup(self):
@@ -733,7 +739,7 @@ class ZoomCleanerGUI:
                 return
 
             # Create cleaner instance
-            self.cleaner = ZoomDeepCleanerEnhanced(
+            self.cleaner = _subsystem("ZoomDeepCleanerEnhanced")(
                 log_file=self.log_file_var.get(),
                 verbose=self.verbose_var.get(),
                 dry_run=self.dry_run_var.get(),
@@ -764,39 +770,26 @@ class ZoomCleanerGUI:
 
     def setup_gui_logging(self):
         """Setup logging to capture cleaner output"""
-        import logging
-
-        class GUILogHandler(logging.Handler):
-            def __init__(self, gui):
-                super().__init__()
-                self.gui = gui
-
-            def emit(self, record):
-                try:
-                    msg = self.format(record)
-                    level = "info"
-                    if record.levelno >= logging.ERROR:
-                        level = "error"
-                    elif record.levelno >= logging.WARNING:
-                        level = "warning"
-                    elif "✅" in msg or "SUCCESS" in msg:
-                        level = "success"
-
-                    # Schedule GUI update in main thread
-                    self.gui.root.after(0, lambda: self.gui.log_message(msg, level))
-                except:
-                    pass
-
-        # Add GUI handler to cleaner's logger
-        gui_handler = GUILogHandler(self)
-        gui_handler.setFormatter(logging.Formatter("%(message)s"))
-        self.cleaner.logger.addHandler(gui_handler)
+        # Add GUI handler to cleaner's logger; the logger is shared between
+        # runs and addHandler ignores a handler it already has
+        self.cleaner.logger.addHandler(self.log_handler)
+
+    def _on_progress(self, event):
+        """Progress observer of the cleaner (runs on the cleanup thread)"""
+        if event.kind != RUN_FINISHED:
+            self.root.after(
+                0, self._show_progress, 20 + 80 * event.fraction, event.describe()
+            )
+
+    def _show_progress(self, value, status):
+        self.update_progress(value)
+        self.update_status(status)
 
     def run_cleanup_with_progress(self):
         """Run cleanup with progress updates"""
         try:
-            self.update_status("Stopping processes...")
-            self.update_progress(30)
+            # Progress follows the cleanup steps as the cleaner reports them
+            self.cleaner.progress.subscribe(self._on_progress)
 
             # Run the actual cleanup
             success = self.cleaner.run_deep_clean()
@@ -837,9 +830,9 @@ class ZoomCleanerGUI:
         """Stop the cleanup process"""
         if self.is_running and self.cleaner:
             self.log_message("🛑 Stopping cleanup...", "warning")
+            self.cleaner.cancel()
             self.is_running = False
             self.update_status("Stopping...")
-            # Note: Actual process stopping would need to be implemented in the cleaner
 
     def update_buttons_state(self):
         """Update button states based on running status"""
@@ -1048,6 +1041,7 @@ Right-click in the output area for copy/paste options.
             if not result:
                 return
 
+        self.log_view.stop()
         self.root.destroy()
 
     def run(self):
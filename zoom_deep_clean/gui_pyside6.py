@@ -29,6 +29,7 @@ try:
         QLabel,
         QPushButton,
         QTextEdit,
+        QPlainTextEdit,
         QProgressBar,
         QCheckBox,
         QGroupBox,
@@ -81,6 +82,13 @@ sys.path.insert(0, os.path.join(os.path.dirname(__file__), ".."))
 
 from .cleaner_enhanced import ZoomDeepCleanerEnhanced
 from .advanced_features import AdvancedFeatures
+from .log_sink import (
+    DEFAULT_FLUSH_INTERVAL_MS,
+    DEFAULT_MAX_LINES,
+    LogSink,
+    format_record,
+)
+from .progress_events import RUN_FINISHED, ProgressEvent
 
 
 class LogHighlighter(QSyntaxHighlighter):
@@ -145,14 +153,25 @@ class CleanupWorker(QObject):
     log_message = Signal(str)
     cleanup_finished = Signal(bool, dict)  # success, results
 
-    def __init__(self, cleaner_config: Dict[str, Any]):
+    def __init__(
+        self, cleaner_config: Dict[str, Any], log_sink: Optional[LogSink] = None
+    ):
         super().__init__()
         self.cleaner_config = cleaner_config
         self.cleaner = None
         self.is_cancelled = False
+        self.log_sink = log_sink
+
+    def _log(self, message: str):
+        """Write to the GUI's log sink, or emit a signal without one"""
+        if self.log_sink is not None:
+            self.log_sink.append(message)
+        else:
+            self.log_message.emit(message)
 
     def run_cleanup(self):
         """Execute cleanup operation with progress reporting"""
+        log_handler = None
         try:
             # Extract force flag and performance monitoring flag
             force_cleanup = self.cleaner_config.pop("_force_cleanup", False)
@@ -160,21 +179,28 @@ class CleanupWorker(QObject):
                 "_enable_performance_monitoring", True
             )
 
-            self.log_message.emit(
-                f"DEBUG: Cleaner config after processing: {self.cleaner_config}"
-            )
-            self.log_message.emit(f"DEBUG: Force cleanup: {force_cleanup}")
-            self.log_message.emit(
-                f"DEBUG: Performance monitoring: {enable_performance_monitoring}"
-            )
+            self._log(f"DEBUG: Cleaner config after processing: {self.cleaner_config}")
+            self._log(f"DEBUG: Force cleanup: {force_cleanup}")
+            self._log(f"DEBUG: Performance monitoring: {enable_performance_monitoring}")
 
             # Initialize cleaner with valid config
             self.progress_updated.emit(5, "Creating cleaner instance...")
             self.cleaner = ZoomDeepCleanerEnhanced(**self.cleaner_config)
+            if self.log_sink is not None:
+                log_handler = self.log_sink.handler()
+                self.cleaner.logger.addHandler(log_handler)
 
-            # Connect to cleaner's progress signals if available
+            # Progress follows the cleanup steps as the cleaner reports them
             self.progress_updated.emit(10, "Initializing cleanup...")
-            self.log_message.emit("✅ Cleaner initialized successfully")
+            self.cleaner.progress.subscribe(self._on_progress)
+            if enable_performance_monitoring:
+                from .performance_monitoring import PerformanceMonitor
+
+                monitor = PerformanceMonitor(
+                    self.cleaner.logger, enable_detailed_monitoring=False
+                )
+                self.cleaner.progress.subscribe(monitor.record_progress_event)
+            self._log("✅ Cleaner initialized successfully")
 
             # Handle force cleanup logic
             if not self.cleaner.dry_run and not force_cleanup:
@@ -183,19 +209,17 @@ class CleanupWorker(QObject):
                 pass
 
             # Run the cleanup
-            self.progress_updated.emit(20, "Starting cleanup process...")
-            self.log_message.emit("🔄 Running cleanup process...")
+            self._log("🔄 Running cleanup process...")
 
             success = self.cleaner.run_deep_clean()
 
-            self.progress_updated.emit(90, "Generating report...")
-            self.log_message.emit("📊 Generating cleanup report...")
+            self._log("📊 Generating cleanup report...")
 
             # Generate report
             report = self.cleaner.generate_report()
 
             self.progress_updated.emit(100, "Cleanup completed!")
-            self.log_message.emit(f"✅ Cleanup completed with success: {success}")
+            self._log(f"✅ Cleanup completed with success: {success}")
 
             self.cleanup_finished.emit(success, report)
 
@@ -203,15 +227,24 @@ class CleanupWorker(QObject):
             import traceback
 
             error_details = traceback.format_exc()
-            self.log_message.emit(f"ERROR: Cleanup failed: {str(e)}")
-            self.log_message.emit(f"ERROR: Full traceback:\n{error_details}")
+            self._log(f"ERROR: Cleanup failed: {str(e)}")
+            self._log(f"ERROR: Full traceback:\n{error_details}")
             self.cleanup_finished.emit(False, {})
+        finally:
+            # The cleaner's logger outlives this run
+            if log_handler is not None:
+                self.cleaner.logger.removeHandler(log_handler)
+
+    def _on_progress(self, event: ProgressEvent):
+        """Forward cleaner progress events to the GUI thread"""
+        if event.kind != RUN_FINISHED:
+            self.progress_updated.emit(10 + int(85 * event.fraction), event.describe())
 
     def cancel_cleanup(self):
         """Cancel the cleanup operation"""
         self.is_cancelled = True
         if self.cleaner:
-            self.cleaner.user_cancelled = True
+            self.cleaner.cancel()
 
 
 class ModernZoomCleanerGUI(QMainWindow):
@@ -229,6 +262,9 @@ class ModernZoomCleanerGUI(QMainWindow):
         self.is_cleanup_running = False
         self.executor = ThreadPoolExecutor(max_workers=4)
 
+        # Log lines are queued from any thread and flushed in batches
+        self.log_sink = LogSink()
+
         # Setup UI
         self.setup_ui()
         self.setup_menu_bar()
@@ -470,12 +506,13 @@ class ModernZoomCleanerGUI(QMainWindow):
         output_group.setFont(QFont("SF Pro Text", 14, QFont.Bold))
         output_layout = QVBoxLayout(output_group)
 
-        self.output_text = QTextEdit()
+        self.output_text = QPlainTextEdit()
         self.output_text.setFont(QFont("SF Mono", 11))
         self.output_text.setReadOnly(True)
-        self.output_text.setStyleSheet(
-            """
-            QTextEdit {
+        # Oldest lines are dropped by the document itself, in O(1)
+        self.output_text.setMaximumBlockCount(DEFAULT_MAX_LINES)
+        self.output_text.setStyleSheet("""
+            QPlainTextEdit {
                 background-color: #2b2b2b;
                 color: #f8f8f2;
                 border: 1px solid #555;
@@ -651,6 +688,11 @@ class ModernZoomCleanerGUI(QMainWindow):
         self.stats_timer.timeout.connect(self.update_system_stats)
         self.stats_timer.start(2000)  # Update every 2 seconds
 
+        # Timer for flushing queued log lines
+        self.log_timer = QTimer(self)
+        self.log_timer.timeout.connect(self.flush_log)
+        self.log_timer.start(DEFAULT_FLUSH_INTERVAL_MS)
+
     def apply_modern_styling(self):
         """Apply modern macOS-style theming"""
         self.setStyleSheet(
@@ -770,19 +812,21 @@ class ModernZoomCleanerGUI(QMainWindow):
             pass
 
     def append_log(self, message):
-        """Append message to log output with timestamp"""
-        timestamp = datetime.now().strftime("%H:%M:%S")
-        formatted_message = f"[{timestamp}] {message}"
-
-        self.output_text.append(formatted_message)
-
-        # Auto-scroll to bottom
-        cursor = self.output_text.textCursor()
-        cursor.movePosition(QTextCursor.End)
-        self.output_text.setTextCursor(cursor)
+        """Queue a message for the log output (safe from any thread)"""
+        self.log_sink.append(message)
+
+    def flush_log(self):
+        """Write queued log lines to the output in one batch"""
+        records = self.log_sink.drain(DEFAULT_MAX_LINES)
+        if records:
+            # appendPlainText keeps following the end when scrolled there
+            self.output_text.appendPlainText(
+                "\n".join(format_record(record) for record in records)
+            )
 
     def clear_output(self):
         """Clear the output text area"""
+        self.log_sink.clear()
         self.output_text.clear()
         self.append_log("Output cleared")
 
@@ -833,13 +877,14 @@ class ModernZoomCleanerGUI(QMainWindow):
         self.progress_label.setText("Starting cleanup...")
 
         # Clear previous output
+        self.log_sink.clear()
         self.output_text.clear()
         self.append_log("🚀 Starting Zoom Deep Clean Enhanced...")
         self.append_log(f"Configuration: {config}")
 
         # Create and start worker thread
         self.cleanup_thread = QThread()
-        self.cleanup_worker = CleanupWorker(config)
+        self.cleanup_worker = CleanupWorker(config, log_sink=self.log_sink)
         self.cleanup_worker.moveToThread(self.cleanup_thread)
 
         # Connect signals
@@ -353,6 +353,8 @@ class SimpleZoomCleanerGUI:
         """Stop the cleanup process"""
         if self.is_running:
             self.log_message("🛑 Stopping cleanup...")
+            if self.cleaner:
+                self.cleaner.cancel()
             self.is_running = False
             self.update_status("Stopping...")
 
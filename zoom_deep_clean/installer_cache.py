@@ -0,0 +1,295 @@
+#!/usr/bin/env python3
+"""
+Installer Cache Module
+Content-addressed cache of downloaded installers with memoised verification
+
+Every fresh-install phase used to download a new installer and then run
+``pkgutil --check-signature`` and ``file`` on it. Reinstall loops across a
+fleet, or repeated test runs, fetched and verified the same package again
+and again. This cache keeps:
+
+- installer blobs named by their SHA-256 (``blobs/<sha256>.pkg``)
+- an index mapping each URL to its blob, ETag and Last-Modified; a cached
+  URL is revalidated with a conditional GET and only downloaded again when
+  the server reports a change (or, offline, used as is)
+- verification verdicts per SHA-256, so an identical package is never
+  verified twice. A blob is only trusted to still hold that content while
+  its size, mtime and inode match the ones recorded when it was stored;
+  otherwise it is rehashed, and evicted if the hash no longer matches
+
+The index is a JSON file updated under an exclusive ``flock``, so several
+processes can share one cache directory. Where ``fcntl`` is unavailable
+(Windows) the index is updated without a lock, so the cache directory must
+not be shared between processes there.
+
+Created by: PHLthy215
+Version: 2.4.2 - Installer Cache
+"""
+
+import hashlib
+import json
+import os
+import time
+import urllib.error
+import urllib.request
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Iterator, Optional
+
+from .download_engine import DownloadEngine, DownloadResult
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Not available on Windows
+
+DEFAULT_INSTALLER_CACHE_DIR = os.path.expanduser(
+    "~/Library/Caches/zoom_deep_clean/installers"
+)
+INDEX_VERSION = 1
+
+# Revalidation outcomes
+NOT_MODIFIED = "not_modified"
+MODIFIED = "modified"
+OFFLINE = "offline"
+
+HASH_CHUNK_SIZE = 1024 * 1024
+
+
+def _file_identity(path: str) -> Dict[str, int]:
+    """Size, mtime and inode: what changes when a file is rewritten or replaced"""
+    st = os.stat(path)
+    return {"size": st.st_size, "mtime_ns": st.st_mtime_ns, "inode": st.st_ino}
+
+
+def _sha256_file(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, "rb") as f:
+        for chunk in iter(lambda: f.read(HASH_CHUNK_SIZE), b""):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+@dataclass
+class CachedInstaller:
+    """An installer served by the cache"""
+
+    url: str
+    path: Optional[str] = None
+    sha256: Optional[str] = None
+    from_cache: bool = False
+    revalidation: Optional[str] = None
+    download: Optional[DownloadResult] = None
+    error: Optional[str] = None
+
+
+class InstallerCache:
+    """Installer blobs by content hash, URL validators and verdicts"""
+
+    def __init__(self, cache_dir: str = DEFAULT_INSTALLER_CACHE_DIR):
+        self.cache_dir = cache_dir
+        self.blob_dir = os.path.join(cache_dir, "blobs")
+        self.download_dir = os.path.join(cache_dir, "downloads")
+        self.index_path = os.path.join(cache_dir, "index.json")
+
+    @contextmanager
+    def _locked_index(self) -> Iterator[Dict[str, Any]]:
+        """The index, read and written back under an exclusive lock"""
+        os.makedirs(self.cache_dir, exist_ok=True)
+        with open(self.index_path + ".lock", "a") as lock:
+            if fcntl is not None:
+                fcntl.flock(lock.fileno(), fcntl.LOCK_EX)
+            try:
+                index = self._read_index()
+                before = json.dumps(index, sort_keys=True)
+                yield index
+                if json.dumps(index, sort_keys=True) != before:
+                    temp_path = f"{self.index_path}.{os.getpid()}.tmp"
+                    with open(temp_path, "w", encoding="utf-8") as f:
+                        json.dump(index, f, indent=2)
+                    os.replace(temp_path, self.index_path)
+            finally:
+                if fcntl is not None:
+                    fcntl.flock(lock.fileno(), fcntl.LOCK_UN)
+
+    def _read_index(self) -> Dict[str, Any]:
+        try:
+            with open(self.index_path, "r", encoding="utf-8") as f:
+                index = json.load(f)
+            if index.get("version") == INDEX_VERSION:
+                index.setdefault("urls", {})
+                index.setdefault("verdicts", {})
+                return index
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {"version": INDEX_VERSION, "urls": {}, "verdicts": {}}
+
+    def blob_path(self, sha256: str) -> str:
+        return os.path.join(self.blob_dir, f"{sha256}.pkg")
+
+    def owns(self, path: str) -> bool:
+        """Whether ``path`` lives inside the cache"""
+        cache_dir = os.path.realpath(self.cache_dir)
+        return os.path.realpath(path).startswith(cache_dir + os.sep)
+
+    def lookup(self, url: str) -> Optional[Dict[str, Any]]:
+        """The index entry of ``url`` if its blob is still present"""
+        with self._locked_index() as index:
+            entry = index["urls"].get(url)
+            if entry and os.path.isfile(self.blob_path(entry["sha256"])):
+                return dict(entry)
+            index["urls"].pop(url, None)
+        return None
+
+    def store(self, url: str, result: DownloadResult) -> str:
+        """Move a finished download into the cache and index it by URL
+
+        The blob is moved and indexed under one lock, so a concurrent
+        ``prune`` never sees it unreferenced.
+        """
+        blob = self.blob_path(result.sha256)
+        with self._locked_index() as index:
+            os.makedirs(self.blob_dir, exist_ok=True)
+            if os.path.exists(blob):
+                os.remove(result.path)
+            else:
+                os.replace(result.path, blob)
+            now = time.time()
+            identity = _file_identity(blob)
+            index["urls"][url] = {
+                "sha256": result.sha256,
+                "blob": identity,
+                "size": result.size,
+                "etag": result.etag,
+                "last_modified": result.last_modified,
+                "stored_at": now,
+                "validated_at": now,
+            }
+        return blob
+
+    def blob_intact(self, entry: Dict[str, Any]) -> bool:
+        """Whether the blob of an index entry still holds its SHA-256 content
+
+        Blobs whose size, mtime or inode changed since they were recorded are
+        rehashed; a blob that no longer matches is evicted.
+        """
+        sha256 = entry["sha256"]
+        blob = self.blob_path(sha256)
+        try:
+            identity = _file_identity(blob)
+            if identity == entry.get("blob"):
+                return True
+            intact = _sha256_file(blob) == sha256
+        except OSError:
+            intact = False
+        if not intact:
+            self.evict(sha256)
+            return False
+        with self._locked_index() as index:
+            for other in index["urls"].values():
+                if other["sha256"] == sha256:
+                    other["blob"] = identity
+        return True
+
+    def evict(self, sha256: str) -> None:
+        """Drop a blob and every URL pointing at it"""
+        with self._locked_index() as index:
+            for url in [u for u, e in index["urls"].items() if e["sha256"] == sha256]:
+                del index["urls"][url]
+            blob = self.blob_path(sha256)
+            if os.path.exists(blob):
+                os.remove(blob)
+
+    def verdict(self, sha256: str) -> Optional[Dict[str, Any]]:
+        """The memoised verification verdict of a package, if any"""
+        with self._locked_index() as index:
+            verdict = index["verdicts"].get(sha256)
+        return dict(verdict) if verdict else None
+
+    def record_verdict(self, sha256: str, verified: bool, detail: str = "") -> None:
+        with self._locked_index() as index:
+            index["verdicts"][sha256] = {
+                "verified": verified,
+                "detail": detail,
+                "checked_at": time.time(),
+            }
+
+    def revalidate(
+        self, url: str, entry: Dict[str, Any], engine: DownloadEngine
+    ) -> str:
+        """Ask the server whether the cached copy of ``url`` is current"""
+        headers = {}
+        if entry.get("etag"):
+            headers["If-None-Match"] = entry["etag"]
+        if entry.get("last_modified"):
+            headers["If-Modified-Since"] = entry["last_modified"]
+        if not headers:
+            return MODIFIED
+        try:
+            response = engine.open_url(url, headers)
+        except urllib.error.HTTPError as e:
+            if e.code == 304:
+                with self._locked_index() as index:
+                    if url in index["urls"]:
+                        index["urls"][url]["validated_at"] = time.time()
+                return NOT_MODIFIED
+            return OFFLINE if e.code >= 500 else MODIFIED
+        except OSError:
+            return OFFLINE
+        response.close()
+        return MODIFIED
+
+    def fetch(
+        self,
+        url: str,
+        engine: DownloadEngine,
+        expected_sha256: Optional[str] = None,
+        progress_callback: Optional[Callable[[int, int], None]] = None,
+    ) -> CachedInstaller:
+        """The installer at ``url``, from the cache when it is still current"""
+        cached = CachedInstaller(url)
+        entry = self.lookup(url)
+        if (
+            entry
+            and (not expected_sha256 or entry["sha256"] == expected_sha256.lower())
+            and self.blob_intact(entry)
+        ):
+            cached.revalidation = self.revalidate(url, entry, engine)
+            if cached.revalidation in (NOT_MODIFIED, OFFLINE):
+                cached.path = self.blob_path(entry["sha256"])
+                cached.sha256 = entry["sha256"]
+                cached.from_cache = True
+                return cached
+
+        # One resumable download per URL, beside the blobs (same filesystem)
+        os.makedirs(self.download_dir, exist_ok=True)
+        name = hashlib.sha256(url.encode("utf-8")).hexdigest()[:16]
+        result = engine.download(
+            url,
+            os.path.join(self.download_dir, f"{name}.pkg"),
+            expected_sha256=expected_sha256,
+            progress_callback=progress_callback,
+        )
+        cached.download = result
+        if result.error:
+            cached.error = result.error
+            return cached
+        cached.path = self.store(url, result)
+        cached.sha256 = result.sha256
+        # A replaced installer's old blob is no longer reachable
+        self.prune()
+        return cached
+
+    def prune(self) -> int:
+        """Remove blobs no URL points at; returns how many were removed"""
+        removed = 0
+        with self._locked_index() as index:
+            referenced = {entry["sha256"] for entry in index["urls"].values()}
+            if not os.path.isdir(self.blob_dir):
+                return 0
+            for name in os.listdir(self.blob_dir):
+                sha256, _, extension = name.partition(".")
+                if extension == "pkg" and sha256 not in referenced:
+                    os.remove(os.path.join(self.blob_dir, name))
+                    removed += 1
+        return removed
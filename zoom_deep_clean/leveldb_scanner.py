@@ -0,0 +1,639 @@
+#!/usr/bin/env python3
+"""
+LevelDB Scanner Module
+Read-only Chromium LevelDB scanner for Zoom origins in browser storage
+
+Chromium keeps Local Storage and Session Storage in LevelDB databases, where
+origins only appear inside the keys stored in ``.ldb`` table and ``.log``
+files. This module reads those files directly, in pure Python, without a
+LevelDB binding:
+
+- table and log files are memory-mapped, so multi-GB profiles are never
+  loaded; only the blocks that are actually decoded are materialised
+- keys are sorted, so every data block covers the key range between two
+  index entries; blocks whose range can only hold other origins are skipped
+  without being read or decompressed
+- only files referenced by the current MANIFEST are scanned, and the newest
+  entry of every key decides whether it is still live
+
+Matching keys can optionally be tombstoned: one write batch of deletions is
+appended to the database's write-ahead log, which LevelDB replays on the
+next open. This is only done while holding the database LOCK, i.e. when the
+browser is closed; without POSIX locks (Windows) tombstoning is refused and
+scanning stays read-only.
+
+Created by: PHLthy215
+Version: 2.4.2 - LevelDB Scanner
+"""
+
+import mmap
+import os
+import re
+import struct
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+try:
+    import fcntl
+except ImportError:
+    fcntl = None  # Not available on Windows
+
+ZOOM_ORIGIN_DOMAINS = ("zoom.us", "zoom.com")
+
+TABLE_MAGIC = 0xDB4775248B80FB57
+FOOTER_SIZE = 48
+BLOCK_TRAILER_SIZE = 5
+NO_COMPRESSION = 0
+SNAPPY_COMPRESSION = 1
+
+LOG_BLOCK_SIZE = 32768
+LOG_HEADER_SIZE = 7
+FULL_RECORD, FIRST_RECORD, MIDDLE_RECORD, LAST_RECORD = 1, 2, 3, 4
+
+TYPE_DELETION = 0
+TYPE_VALUE = 1
+WRITE_BATCH_HEADER_SIZE = 12
+
+# Chromium storage key schemas
+LOCAL_STORAGE_PREFIX = b"_"  # _<origin>\x00<script key>
+META_PREFIXES = (b"META:", b"METAACCESS:")  # META:<origin>
+NAMESPACE_PREFIX = b"namespace-"  # namespace-<guid>-<origin> -> map id
+MAP_PREFIX = b"map-"  # map-<map id>-<script key>
+NAMESPACE_GUID_LENGTH = 36
+SCHEMA_PREFIXES = (LOCAL_STORAGE_PREFIX, NAMESPACE_PREFIX, MAP_PREFIX) + META_PREFIXES
+
+_MAP_KEY = re.compile(rb"map-(\d+)-")
+_TABLE_FILE = re.compile(r"^(\d+)\.(ldb|sst)$")
+_LOG_FILE = re.compile(r"^(\d+)\.log$")
+
+
+class LevelDBError(Exception):
+    """Malformed or unusable LevelDB database"""
+
+
+def decode_varint(data, pos: int) -> Tuple[int, int]:
+    """Decode a little-endian base-128 varint; returns (value, next position)"""
+    result = shift = 0
+    while True:
+        byte = data[pos]
+        pos += 1
+        result |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return result, pos
+        shift += 7
+        if shift > 63:
+            raise LevelDBError("Malformed varint")
+
+
+def encode_varint(value: int) -> bytes:
+    out = bytearray()
+    while value >= 0x80:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def _crc32c_table() -> List[int]:
+    table = []
+    for i in range(256):
+        crc = i
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x82F63B78 if crc & 1 else crc >> 1
+        table.append(crc)
+    return table
+
+
+_CRC32C_TABLE = _crc32c_table()
+
+
+def masked_crc32c(data: bytes) -> int:
+    """CRC32C as stored in LevelDB log records and block trailers"""
+    crc = 0xFFFFFFFF
+    for byte in data:
+        crc = _CRC32C_TABLE[(crc ^ byte) & 0xFF] ^ (crc >> 8)
+    crc ^= 0xFFFFFFFF
+    return (((crc >> 15) | (crc << 17)) + 0xA282EAD8) & 0xFFFFFFFF
+
+
+def snappy_decompress(data) -> bytes:
+    """Decompress a raw snappy block"""
+    length, pos = decode_varint(data, 0)
+    out = bytearray()
+    end = len(data)
+    while pos < end:
+        tag = data[pos]
+        pos += 1
+        kind = tag & 3
+        if kind == 0:
+            size = tag >> 2
+            if size >= 60:
+                extra = size - 59
+                size = int.from_bytes(data[pos : pos + extra], "little")
+                pos += extra
+            size += 1
+            out += data[pos : pos + size]
+            pos += size
+            continue
+        if kind == 1:
+            size = ((tag >> 2) & 7) + 4
+            offset = ((tag >> 5) << 8) | data[pos]
+            pos += 1
+        elif kind == 2:
+            size = (tag >> 2) + 1
+            offset = int.from_bytes(data[pos : pos + 2], "little")
+            pos += 2
+        else:
+            size = (tag >> 2) + 1
+            offset = int.from_bytes(data[pos : pos + 4], "little")
+            pos += 4
+        if offset == 0 or offset > len(out):
+            raise LevelDBError("Malformed snappy copy")
+        start = len(out) - offset
+        if offset >= size:
+            out += out[start : start + size]
+        else:
+            for i in range(size):
+                out.append(out[start + i])
+    if len(out) != length:
+        raise LevelDBError("Snappy length mismatch")
+    return bytes(out)
+
+
+def encode_write_batch(
+    sequence: int, entries: Sequence[Tuple[int, bytes, bytes]]
+) -> bytes:
+    """Serialise (type, key, value) entries as a LevelDB write batch"""
+    out = bytearray(struct.pack("<QI", sequence, len(entries)))
+    for value_type, key, value in entries:
+        out.append(value_type)
+        out += encode_varint(len(key)) + key
+        if value_type == TYPE_VALUE:
+            out += encode_varint(len(value)) + value
+    return bytes(out)
+
+
+def encode_log_records(payload: bytes, offset: int = 0) -> bytes:
+    """Frame ``payload`` as log records for a log file currently ``offset`` long"""
+    out = bytearray()
+    pos = 0
+    first = True
+    while True:
+        left = LOG_BLOCK_SIZE - offset % LOG_BLOCK_SIZE
+        if left < LOG_HEADER_SIZE:
+            out += b"\x00" * left
+            offset += left
+            left = LOG_BLOCK_SIZE
+        fragment = payload[pos : pos + left - LOG_HEADER_SIZE]
+        pos += len(fragment)
+        last = pos >= len(payload)
+        if first:
+            record_type = FULL_RECORD if last else FIRST_RECORD
+        else:
+            record_type = LAST_RECORD if last else MIDDLE_RECORD
+        crc = masked_crc32c(bytes([record_type]) + fragment)
+        out += struct.pack("<IHB", crc, len(fragment), record_type) + fragment
+        offset += LOG_HEADER_SIZE + len(fragment)
+        first = False
+        if last:
+            return bytes(out)
+
+
+def origin_host(origin: bytes) -> str:
+    """Lower-case host of a serialised origin such as ``https://zoom.us``"""
+    text = origin.decode("utf-8", "replace")
+    if "://" in text:
+        text = text.split("://", 1)[1]
+    return text.split("/", 1)[0].split(":", 1)[0].lower()
+
+
+def is_zoom_host(host: str) -> bool:
+    """Whether a lower-case host is a Zoom domain or one of its subdomains"""
+    host = host.lstrip(".")
+    return any(
+        host == domain or host.endswith("." + domain) for domain in ZOOM_ORIGIN_DOMAINS
+    )
+
+
+def is_zoom_origin(origin: bytes) -> bool:
+    return is_zoom_host(origin_host(origin))
+
+
+def key_origin(user_key: bytes) -> Optional[bytes]:
+    """The origin a Local/Session Storage key belongs to, if it names one"""
+    if user_key.startswith(LOCAL_STORAGE_PREFIX):
+        end = user_key.find(b"\x00")
+        return user_key[1:end] if end > 0 else None
+    for prefix in META_PREFIXES:
+        if user_key.startswith(prefix):
+            return user_key[len(prefix) :]
+    if user_key.startswith(NAMESPACE_PREFIX):
+        origin = user_key[len(NAMESPACE_PREFIX) + NAMESPACE_GUID_LENGTH + 1 :]
+        return origin or None
+    return None
+
+
+class _KeyMatcher:
+    """Decides which keys belong to Zoom and which key ranges may hold some
+
+    The first pass matches origin keys; Session Storage map entries are
+    matched in a second pass once the map ids of Zoom namespaces are known.
+    """
+
+    def __init__(self, map_ids: Optional[Dict[bytes, str]] = None):
+        self.map_ids = map_ids or {}
+        self.origins = not self.map_ids
+
+    def origin(self, user_key: bytes) -> Optional[str]:
+        if self.origins:
+            origin = key_origin(user_key)
+            if origin is not None and is_zoom_origin(origin):
+                return origin.decode("utf-8", "replace")
+            return None
+        match = _MAP_KEY.match(user_key)
+        return self.map_ids.get(match.group(1)) if match else None
+
+    def may_contain(self, prefix: bytes) -> bool:
+        """Whether a key starting with ``prefix`` may match"""
+        if self.origins and prefix.startswith(LOCAL_STORAGE_PREFIX):
+            end = prefix.find(b"\x00")
+            return end < 0 or is_zoom_origin(prefix[1:end])
+        if self.origins and prefix.startswith(META_PREFIXES + (NAMESPACE_PREFIX,)):
+            return True
+        if not self.origins and prefix.startswith(MAP_PREFIX):
+            match = _MAP_KEY.match(prefix)
+            return match is None or match.group(1) in self.map_ids
+        # Ranges that have not yet diverged from a schema prefix
+        return any(tag.startswith(prefix) for tag in SCHEMA_PREFIXES)
+
+
+@dataclass
+class LevelDBEntry:
+    """A live key belonging to a Zoom origin"""
+
+    key: bytes
+    origin: str
+    file: str
+    sequence: int
+    value_size: int
+
+
+@dataclass
+class LevelDBScanResult:
+    """Outcome of scanning (and optionally tombstoning) one database"""
+
+    path: str
+    entries: List[LevelDBEntry] = field(default_factory=list)
+    tables_scanned: int = 0
+    logs_scanned: int = 0
+    blocks_read: int = 0
+    blocks_skipped: int = 0
+    last_sequence: int = 0
+    tombstoned: int = 0
+    error: Optional[str] = None
+
+    @property
+    def origins(self) -> List[str]:
+        return sorted({entry.origin for entry in self.entries})
+
+
+@dataclass
+class _Manifest:
+    log_number: int = 0
+    prev_log_number: int = 0
+    last_sequence: int = 0
+    live_tables: Set[int] = field(default_factory=set)
+
+
+def _map_file(path: str):
+    """Memory-map a file read-only; None for empty files"""
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return None
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+def _close(data) -> None:
+    try:
+        data.close()
+    except BufferError:
+        # A view is still referenced (e.g. by a traceback); GC unmaps it
+        pass
+
+
+def _iter_log_records(data) -> Iterator[memoryview]:
+    """Reassembled records of a log file; unfragmented records are not copied"""
+    view = memoryview(data)
+    size = len(view)
+    pos = 0
+    fragments: List[bytes] = []
+    while pos + LOG_HEADER_SIZE <= size:
+        left = LOG_BLOCK_SIZE - pos % LOG_BLOCK_SIZE
+        if left < LOG_HEADER_SIZE:
+            pos += left
+            continue
+        length = int.from_bytes(view[pos + 4 : pos + 6], "little")
+        record_type = view[pos + 6]
+        if record_type == 0 and length == 0:
+            # Preallocated zero padding: skip the rest of the block
+            pos += left
+            continue
+        payload = view[pos + LOG_HEADER_SIZE : pos + LOG_HEADER_SIZE + length]
+        pos += LOG_HEADER_SIZE + length
+        if record_type == FULL_RECORD:
+            yield payload
+        elif record_type == FIRST_RECORD:
+            fragments = [bytes(payload)]
+        elif record_type == MIDDLE_RECORD and fragments:
+            fragments.append(bytes(payload))
+        elif record_type == LAST_RECORD and fragments:
+            fragments.append(bytes(payload))
+            yield memoryview(b"".join(fragments))
+            fragments = []
+
+
+def _read_manifest(directory: str) -> Optional[_Manifest]:
+    """Current version from the MANIFEST named in CURRENT, if readable"""
+    try:
+        with open(os.path.join(directory, "CURRENT"), "r") as f:
+            name = f.read().strip()
+        data = _map_file(os.path.join(directory, name))
+    except OSError:
+        return None
+    if data is None:
+        return None
+    try:
+        return _parse_manifest(data)
+    except (LevelDBError, IndexError):
+        return None
+    finally:
+        _close(data)
+
+
+def _parse_manifest(data) -> _Manifest:
+    """Replay the version edits of a MANIFEST"""
+    manifest = _Manifest()
+    for record in _iter_log_records(data):
+        pos = 0
+        while pos < len(record):
+            tag, pos = decode_varint(record, pos)
+            if tag == 1:  # comparator
+                length, pos = decode_varint(record, pos)
+                pos += length
+            elif tag in (2, 3, 4, 9):
+                value, pos = decode_varint(record, pos)
+                if tag == 2:
+                    manifest.log_number = value
+                elif tag == 4:
+                    manifest.last_sequence = value
+                elif tag == 9:
+                    manifest.prev_log_number = value
+            elif tag == 5:  # compact pointer
+                _, pos = decode_varint(record, pos)
+                length, pos = decode_varint(record, pos)
+                pos += length
+            elif tag == 6:  # deleted file
+                _, pos = decode_varint(record, pos)
+                number, pos = decode_varint(record, pos)
+                manifest.live_tables.discard(number)
+            elif tag == 7:  # new file
+                _, pos = decode_varint(record, pos)
+                number, pos = decode_varint(record, pos)
+                _, pos = decode_varint(record, pos)
+                for _ in range(2):
+                    length, pos = decode_varint(record, pos)
+                    pos += length
+                manifest.live_tables.add(number)
+            else:
+                raise LevelDBError(f"Unknown MANIFEST tag {tag}")
+    return manifest
+
+
+class LevelDBScanner:
+    """Scan one LevelDB directory for keys of Zoom origins"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self.result = LevelDBScanResult(path)
+        # user key -> (sequence, type, origin, file, value)
+        self._latest: Dict[bytes, Tuple[int, int, str, str, bytes]] = {}
+        self._logs: List[str] = []
+
+    def _files(self) -> Tuple[List[str], List[str], Optional[_Manifest]]:
+        """Live table files and log files, oldest first"""
+        manifest = _read_manifest(self.path)
+        tables, logs = [], []
+        for name in os.listdir(self.path):
+            table = _TABLE_FILE.match(name)
+            log = _LOG_FILE.match(name)
+            if table:
+                number = int(table.group(1))
+                if manifest is None or number in manifest.live_tables:
+                    tables.append((number, name))
+            elif log:
+                number = int(log.group(1))
+                if (
+                    manifest is None
+                    or number >= manifest.log_number
+                    or number == manifest.prev_log_number
+                ):
+                    logs.append((number, name))
+        return (
+            [os.path.join(self.path, name) for _, name in sorted(tables)],
+            [os.path.join(self.path, name) for _, name in sorted(logs)],
+            manifest,
+        )
+
+    def _record(self, user_key, sequence, value_type, origin, file, value) -> None:
+        current = self._latest.get(user_key)
+        if current is None or sequence > current[0]:
+            self._latest[user_key] = (sequence, value_type, origin, file, bytes(value))
+
+    def _scan_table(self, path: str, matcher: _KeyMatcher) -> None:
+        data = _map_file(path)
+        if data is not None:
+            try:
+                self._scan_table_data(data, path, matcher)
+            finally:
+                _close(data)
+
+    def _scan_table_data(self, data, path: str, matcher: _KeyMatcher) -> None:
+        if len(data) < FOOTER_SIZE:
+            raise LevelDBError(f"Truncated table {path}")
+        footer = data[-FOOTER_SIZE:]
+        if int.from_bytes(footer[-8:], "little") != TABLE_MAGIC:
+            raise LevelDBError(f"Not a LevelDB table: {path}")
+        _, pos = decode_varint(footer, 0)  # metaindex offset
+        _, pos = decode_varint(footer, pos)  # metaindex size
+        index_offset, pos = decode_varint(footer, pos)
+        index_size, _ = decode_varint(footer, pos)
+
+        index = self._read_block(data, index_offset, index_size)
+        lower = b""
+        for separator, handle in self._iter_block(index):
+            upper = separator[:-8]
+            prefix = os.path.commonprefix([lower, upper])
+            lower = upper
+            if not matcher.may_contain(prefix):
+                self.result.blocks_skipped += 1
+                continue
+
+            offset, pos = decode_varint(handle, 0)
+            size, _ = decode_varint(handle, pos)
+            self.result.blocks_read += 1
+            block = self._read_block(data, offset, size)
+            for internal_key, value in self._iter_block(block):
+                user_key = internal_key[:-8]
+                origin = matcher.origin(user_key)
+                if origin is None:
+                    continue
+                trailer = int.from_bytes(internal_key[-8:], "little")
+                self._record(
+                    user_key, trailer >> 8, trailer & 0xFF, origin, path, value
+                )
+
+    @staticmethod
+    def _read_block(data, offset: int, size: int):
+        compression = data[offset + size]
+        block = memoryview(data)[offset : offset + size]
+        if compression == NO_COMPRESSION:
+            return block
+        if compression == SNAPPY_COMPRESSION:
+            return memoryview(snappy_decompress(block))
+        raise LevelDBError(f"Unsupported block compression {compression}")
+
+    @staticmethod
+    def _iter_block(block) -> Iterator[Tuple[bytes, memoryview]]:
+        """(key, value) entries of a table block, undoing prefix compression"""
+        restarts = int.from_bytes(block[-4:], "little")
+        end = len(block) - 4 * (restarts + 1)
+        pos = 0
+        key = b""
+        while pos < end:
+            shared, pos = decode_varint(block, pos)
+            non_shared, pos = decode_varint(block, pos)
+            value_length, pos = decode_varint(block, pos)
+            key = key[:shared] + bytes(block[pos : pos + non_shared])
+            pos += non_shared
+            yield key, block[pos : pos + value_length]
+            pos += value_length
+
+    def _scan_log(self, path: str, matcher: _KeyMatcher) -> None:
+        data = _map_file(path)
+        if data is not None:
+            try:
+                self._scan_log_data(data, path, matcher)
+            finally:
+                _close(data)
+
+    def _scan_log_data(self, data, path: str, matcher: _KeyMatcher) -> None:
+        for batch in _iter_log_records(data):
+            if len(batch) < WRITE_BATCH_HEADER_SIZE:
+                continue
+            sequence, count = struct.unpack_from("<QI", batch)
+            self.result.last_sequence = max(
+                self.result.last_sequence, sequence + count - 1
+            )
+            pos = WRITE_BATCH_HEADER_SIZE
+            for index in range(count):
+                value_type = batch[pos]
+                length, pos = decode_varint(batch, pos + 1)
+                user_key = bytes(batch[pos : pos + length])
+                pos += length
+                value = b""
+                if value_type == TYPE_VALUE:
+                    length, pos = decode_varint(batch, pos)
+                    value = batch[pos : pos + length]
+                    pos += length
+                origin = matcher.origin(user_key)
+                if origin is not None:
+                    self._record(
+                        user_key, sequence + index, value_type, origin, path, value
+                    )
+
+    def scan(self) -> LevelDBScanResult:
+        """Collect the live keys of Zoom origins"""
+        tables, logs, manifest = self._files()
+        if manifest is not None:
+            self.result.last_sequence = manifest.last_sequence
+        self._logs = logs
+        self.result.tables_scanned = len(tables)
+        self.result.logs_scanned = len(logs)
+
+        matcher = _KeyMatcher()
+        for path in tables:
+            self._scan_table(path, matcher)
+        for path in logs:
+            self._scan_log(path, matcher)
+
+        # Session Storage values of Zoom namespaces name their maps
+        map_ids = {
+            value: origin
+            for key, (_, value_type, origin, _, value) in self._latest.items()
+            if key.startswith(NAMESPACE_PREFIX)
+            and value_type == TYPE_VALUE
+            and value.isdigit()
+        }
+        if map_ids:
+            matcher = _KeyMatcher(map_ids)
+            for path in tables:
+                self._scan_table(path, matcher)
+            for path in logs:
+                self._scan_log(path, matcher)
+
+        self.result.entries = [
+            LevelDBEntry(key, origin, file, sequence, len(value))
+            for key, (sequence, value_type, origin, file, value) in sorted(
+                self._latest.items()
+            )
+            if value_type == TYPE_VALUE
+        ]
+        return self.result
+
+    def tombstone(self) -> int:
+        """Append deletions of every matched key to the write-ahead log
+
+        Requires the database LOCK, so it fails while the browser is open.
+        """
+        if not self.result.entries:
+            return 0
+        if not self._logs:
+            raise LevelDBError(f"No write-ahead log in {self.path}")
+        if fcntl is None:
+            raise LevelDBError(f"Cannot lock database on this platform: {self.path}")
+
+        fd = os.open(os.path.join(self.path, "LOCK"), os.O_RDWR | os.O_CREAT, 0o644)
+        try:
+            try:
+                fcntl.lockf(fd, fcntl.LOCK_EX | fcntl.LOCK_NB)
+            except OSError:
+                raise LevelDBError(f"Database is in use: {self.path}")
+
+            batch = encode_write_batch(
+                self.result.last_sequence + 1,
+                [(TYPE_DELETION, entry.key, b"") for entry in self.result.entries],
+            )
+            log_path = self._logs[-1]
+            with open(log_path, "ab") as f:
+                f.write(encode_log_records(batch, os.fstat(f.fileno()).st_size))
+                f.flush()
+                os.fsync(f.fileno())
+            fcntl.lockf(fd, fcntl.LOCK_UN)
+        finally:
+            os.close(fd)
+
+        self.result.last_sequence += len(self.result.entries)
+        self.result.tombstoned = len(self.result.entries)
+        return self.result.tombstoned
+
+
+def scan_leveldb(path: str, tombstone: bool = False) -> LevelDBScanResult:
+    """Scan a LevelDB directory for Zoom origins, optionally tombstoning them"""
+    scanner = LevelDBScanner(path)
+    try:
+        scanner.scan()
+        if tombstone:
+            scanner.tombstone()
+    except (LevelDBError, OSError, IndexError, struct.error) as e:
+        scanner.result.error = str(e)
+    return scanner.result
@@ -0,0 +1,227 @@
+#!/usr/bin/env python3
+"""
+Log Sink Module
+Coalescing, ring-buffered log output for the GUIs
+
+Both GUIs used to write every log line straight into their text widget. The
+tkinter GUI counted the lines of the whole widget after each insert, which
+is O(total text) per line and made long verbose runs quadratic, and it
+silently dropped lines while an idle update was pending. The PySide6 GUI
+moved the cursor and received one cross-thread signal per line.
+
+A ``LogSink`` takes lines from any thread into a bounded deque. The GUI
+drains it on a timer (every ~50 ms) and writes each batch to the widget in
+one call, so the cost per flush is bounded by the number of lines that can
+be shown rather than by how fast the cleaner logs. Lines that overflow the
+deque are counted and reported in the output instead of vanishing.
+
+Created by: PHLthy215
+Version: 2.4.2 - Log Sink
+"""
+
+import logging
+import threading
+import time
+from collections import deque
+from datetime import datetime
+from typing import Any, Callable, List, Optional, Tuple
+
+DEFAULT_FLUSH_INTERVAL_MS = 50
+DEFAULT_MAX_LINES = 1000
+DEFAULT_MAX_PENDING = 10000
+
+# (timestamp, message, level)
+LogRecord = Tuple[str, str, str]
+
+
+def level_for_record(record: logging.LogRecord, message: str) -> str:
+    """The output tag of a logging record"""
+    if record.levelno >= logging.ERROR:
+        return "error"
+    if record.levelno >= logging.WARNING:
+        return "warning"
+    if "✅" in message or "SUCCESS" in message:
+        return "success"
+    return "info"
+
+
+def format_record(record: LogRecord) -> str:
+    """A record as a plain ``[HH:MM:SS] message`` line"""
+    timestamp, message, _ = record
+    return f"[{timestamp}] {message}"
+
+
+def _line_count(message: str) -> int:
+    return message.count("\n") + 1
+
+
+class SinkHandler(logging.Handler):
+    """Logging handler feeding a ``LogSink``"""
+
+    def __init__(self, sink: "LogSink"):
+        super().__init__()
+        self.sink = sink
+
+    def emit(self, record):
+        try:
+            message = self.format(record)
+            self.sink.append(message, level_for_record(record, message))
+        except Exception:
+            self.handleError(record)
+
+
+class LogSink:
+    """Thread-safe bounded buffer of log lines waiting to be displayed"""
+
+    def __init__(self, max_pending: int = DEFAULT_MAX_PENDING):
+        self.max_pending = max_pending
+        self._pending = deque(maxlen=max_pending)
+        self._lock = threading.Lock()
+        self._unreported_drops = 0
+
+        # Statistics
+        self.lines_in = 0
+        self.lines_out = 0
+        self.dropped = 0
+        self.skipped = 0
+
+    def __len__(self) -> int:
+        return len(self._pending)
+
+    def append(self, message: str, level: str = "info") -> None:
+        """Queue a line; safe to call from any thread"""
+        timestamp = datetime.now().strftime("%H:%M:%S")
+        with self._lock:
+            if len(self._pending) == self.max_pending:
+                self.dropped += 1
+                self._unreported_drops += 1
+            self._pending.append((timestamp, message, level))
+            self.lines_in += 1
+
+    def drain(self, max_lines: Optional[int] = None) -> List[LogRecord]:
+        """Take all queued lines
+
+        With ``max_lines``, only the newest records that fit in that many
+        lines are returned; older ones would be scrolled out of the widget
+        by the same flush and are counted as skipped.
+        """
+        with self._lock:
+            records = list(self._pending)
+            self._pending.clear()
+            dropped, self._unreported_drops = self._unreported_drops, 0
+
+        if max_lines is not None:
+            lines = 0
+            for index in range(len(records) - 1, -1, -1):
+                lines += _line_count(records[index][1])
+                if lines >= max_lines:
+                    self.skipped += index
+                    records = records[index:]
+                    break
+
+        if dropped:
+            records.insert(
+                0,
+                (
+                    datetime.now().strftime("%H:%M:%S"),
+                    f"⚠️ {dropped} log lines dropped (output faster than display)",
+                    "warning",
+                ),
+            )
+        self.lines_out += len(records)
+        return records
+
+    def clear(self) -> None:
+        """Discard queued lines"""
+        with self._lock:
+            self._pending.clear()
+            self._unreported_drops = 0
+
+    def handler(self) -> SinkHandler:
+        """A logging handler writing ``%(message)s`` into this sink"""
+        handler = SinkHandler(self)
+        handler.setFormatter(logging.Formatter("%(message)s"))
+        return handler
+
+
+class TextLogView:
+    """Flushes a ``LogSink`` into a tkinter ``Text`` widget on a timer
+
+    The widget is only touched from ``root.after`` callbacks, i.e. on the
+    GUI thread. Each flush is one ``insert`` of the whole batch with its
+    tags, one ``delete`` of the lines over ``max_lines`` (the view counts
+    lines itself instead of reading the widget back) and one ``see``.
+    """
+
+    def __init__(
+        self,
+        root: Any,
+        text: Any,
+        sink: LogSink,
+        max_lines: int = DEFAULT_MAX_LINES,
+        interval_ms: int = DEFAULT_FLUSH_INTERVAL_MS,
+        follow: Optional[Callable[[], bool]] = None,
+        timestamp_tag: str = "timestamp",
+    ):
+        self.root = root
+        self.text = text
+        self.sink = sink
+        self.max_lines = max_lines
+        self.interval_ms = interval_ms
+        self.follow = follow
+        self.timestamp_tag = timestamp_tag
+        self.line_count = 0
+        self._after_id = None
+
+        # Statistics
+        self.flushes = 0
+        self.max_flush_time = 0.0
+
+    def start(self) -> None:
+        if self._after_id is None:
+            self._after_id = self.root.after(self.interval_ms, self._tick)
+
+    def stop(self) -> None:
+        if self._after_id is not None:
+            self.root.after_cancel(self._after_id)
+            self._after_id = None
+
+    def _tick(self) -> None:
+        self._after_id = None
+        try:
+            self.flush()
+        finally:
+            self.start()
+
+    def flush(self) -> int:
+        """Write queued lines to the widget; returns how many were written"""
+        records = self.sink.drain(self.max_lines)
+        if not records:
+            return 0
+
+        started = time.perf_counter()
+        chunks = []
+        lines = 0
+        for timestamp, message, level in records:
+            chunks += (f"[{timestamp}] ", self.timestamp_tag, f"{message}\n", level)
+            lines += _line_count(message)
+        self.text.insert("end", *chunks)
+
+        self.line_count += lines
+        excess = self.line_count - self.max_lines
+        if excess > 0:
+            self.text.delete("1.0", f"{excess + 1}.0")
+            self.line_count -= excess
+
+        if self.follow is None or self.follow():
+            self.text.see("end")
+
+        self.flushes += 1
+        self.max_flush_time = max(self.max_flush_time, time.perf_counter() - started)
+        return len(records)
+
+    def clear(self) -> None:
+        """Empty the widget and discard queued lines"""
+        self.sink.clear()
+        self.text.delete("1.0", "end")
+        self.line_count = 0
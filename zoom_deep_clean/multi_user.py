@@ -0,0 +1,290 @@
+#!/usr/bin/env python3
+"""
+Multi-User Cleaning Module
+Clean every account on shared lab and kiosk Macs in a single run
+
+System-level steps (processes, applications, launch agents, daemons, system
+caches, deep system artifacts) run exactly once. The per-user steps listed
+in cleaner_enhanced.USER_CLEANUP_STEPS run for every account under /Users
+concurrently in a process pool. The search for remaining files and the
+device fingerprint verification run last, once, over the journals of the
+system pass and every worker, and the results are aggregated into one
+report.
+
+Created by: PHLthy215
+Version: 2.4.2 - Multi-User Cleaning
+"""
+
+import json
+import logging
+import os
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .artifact_rules import get_compiled_rules
+from .cancellation import CleanupCancelled
+from .clean_journal import CleanJournal
+from .cleaner_enhanced import ZoomDeepCleanerEnhanced
+from .command_backend import backend_from_spec
+from .target_root import USERS_ROOT, discover_user_homes
+
+DEFAULT_MULTI_USER_REPORT = os.path.expanduser(
+    "~/Documents/zoom_cleanup_multi_user_report.json"
+)
+
+# Per-user statistics summed into the aggregated report
+AGGREGATED_STATS = (
+    "files_removed",
+    "directories_removed",
+    "keychain_entries_removed",
+    "files_backed_up",
+    "encrypted_databases_shredded",
+    "errors",
+    "warnings",
+    "security_violations",
+)
+
+
+def clean_user_home(user_home: str, cleaner_options: Dict[str, Any]) -> Dict[str, Any]:
+    """Run the per-user cleanup steps for one account (process pool worker)
+
+    The paths the worker touched come back under ``journal``, for the final
+    verification of the whole machine.
+    """
+    result: Dict[str, Any] = {"user_home": user_home, "success": False}
+    try:
+        cleaner_options = dict(cleaner_options)
+        spec = cleaner_options.pop("command_backend_spec", None)
+        if spec is not None:
+            cleaner_options["command_backend"] = backend_from_spec(spec)
+        cleaner = ZoomDeepCleanerEnhanced(
+            user_home=user_home,
+            enable_advanced_features=False,
+            **cleaner_options,
+        )
+        auth_results = cleaner.clean_user_data()
+        stats = cleaner.cleanup_stats
+        result.update(
+            {
+                "success": stats["errors"] == 0
+                and stats["security_violations"] == 0
+                and auth_results.get("success", False),
+                "statistics": {key: stats[key] for key in AGGREGATED_STATS},
+                "authentication_cleanup": auth_results,
+                "journal": cleaner.journal.to_dict(),
+            }
+        )
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+class MultiUserCleaner:
+    """Clean system-level artifacts once and every user account in parallel"""
+
+    def __init__(
+        self,
+        user_homes: Optional[List[str]] = None,
+        users_root: str = USERS_ROOT,
+        max_workers: Optional[int] = None,
+        report_file: str = DEFAULT_MULTI_USER_REPORT,
+        **cleaner_options: Any,
+    ):
+        self.user_homes = (
+            list(user_homes)
+            if user_homes is not None
+            else discover_user_homes(users_root)
+        )
+        self.max_workers = max_workers or min(len(self.user_homes), os.cpu_count() or 1)
+        self.report_file = report_file
+        # Compiled once here and shipped to every worker
+        cleaner_options.setdefault("artifact_rules", get_compiled_rules())
+        self.cleaner_options = cleaner_options
+        self.logger = logging.getLogger(__name__)
+        self.system_cleaner: Optional[ZoomDeepCleanerEnhanced] = None
+        self.user_results: List[Dict[str, Any]] = []
+        # Paths the per-user workers touched
+        self.user_journal = CleanJournal()
+        self.verification: Dict[str, Any] = {}
+
+    def _worker_options(self) -> Dict[str, Any]:
+        """Cleaner options forwarded to per-user workers
+
+        Machine-wide options (reboot, hostname, MAC spoofing) and the
+        cancellation token stay with the system pass. A command backend is
+        forwarded by its spec; backends without one (recording, in-memory
+        replays) stay too, and workers use the ``ZDCE_COMMAND_BACKEND``
+        default instead.
+        """
+        excluded = {
+            "system_reboot",
+            "reset_hostname",
+            "new_hostname",
+            "enable_mac_spoofing",
+            "enable_advanced_features",
+            "command_backend",
+            "cancel_token",
+        }
+        options = {
+            key: value
+            for key, value in self.cleaner_options.items()
+            if key not in excluded
+        }
+        backend = self.cleaner_options.get("command_backend")
+        if backend is not None:
+            if backend.spec is not None:
+                options["command_backend_spec"] = backend.spec
+            else:
+                self.logger.warning(
+                    f"⚠️ {type(backend).__name__} cannot be shared with the "
+                    f"per-user workers; they use the default command backend"
+                )
+        return options
+
+    def run_system_steps(self) -> bool:
+        """Run all machine-wide steps exactly once
+
+        The file search and fingerprint verification are left to
+        ``run_verification``, after the user accounts are clean.
+        """
+        self.system_cleaner = ZoomDeepCleanerEnhanced(
+            include_user_steps=False,
+            include_verification=False,
+            **self.cleaner_options,
+        )
+        return self.system_cleaner.run_deep_clean()
+
+    def run_user_steps(self) -> List[Dict[str, Any]]:
+        """Run the per-user steps for every account concurrently"""
+        if not self.user_homes:
+            self.logger.warning("⚠️ No user home directories found")
+            return []
+
+        self.logger.info(
+            f"👥 Cleaning {len(self.user_homes)} user account(s) with "
+            f"{self.max_workers} worker(s)"
+        )
+        options = self._worker_options()
+        results = []
+        with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+            futures = {
+                executor.submit(clean_user_home, home, options): home
+                for home in self.user_homes
+            }
+            for future in as_completed(futures):
+                home = futures[future]
+                try:
+                    result = future.result()
+                except Exception as e:
+                    result = {"user_home": home, "success": False, "error": str(e)}
+                self.user_journal.merge(result.pop("journal", {}))
+
+                if result["success"]:
+                    self.logger.info(f"✅ User data cleaned: {home}")
+                else:
+                    self.logger.warning(
+                        f"⚠️ User cleanup incomplete for {home}: "
+                        f"{result.get('error', 'see log for details')}"
+                    )
+                results.append(result)
+
+        self.user_results = sorted(results, key=lambda result: result["user_home"])
+        return self.user_results
+
+    def run_verification(self) -> Dict[str, Any]:
+        """Search for remaining files and verify the fingerprint, once
+
+        Runs after every account is clean, over the journal of the system
+        pass merged with those of the workers.
+        """
+        cleaner = self.system_cleaner
+        if cleaner is None:
+            return {}
+        cleaner.journal.merge(self.user_journal.to_dict())
+        try:
+            with cleaner.command_backend.cancellation(cleaner.cancel_token):
+                remaining_files = cleaner.comprehensive_file_search()
+                if remaining_files:
+                    self.logger.warning(
+                        f"⚠️ Found {len(remaining_files)} remaining Zoom files"
+                    )
+                self.verification = {
+                    "remaining_files": remaining_files,
+                    "device_fingerprint_verification": (
+                        cleaner.verify_device_fingerprint()
+                    ),
+                }
+        except (KeyboardInterrupt, CleanupCancelled):
+            self.logger.warning("Verification cancelled by user")
+            cleaner.user_cancelled = True
+            self.verification = {}
+        return self.verification
+
+    def generate_report(self, system_success: bool) -> Dict[str, Any]:
+        """Aggregate the system pass and all per-user results"""
+        totals = {key: 0 for key in AGGREGATED_STATS}
+        for result in self.user_results:
+            for key, value in result.get("statistics", {}).items():
+                totals[key] += value
+
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "mode": "multi-user",
+            "dry_run": bool(self.cleaner_options.get("dry_run", False)),
+            "system": {
+                "success": system_success,
+                "statistics": (
+                    self.system_cleaner.cleanup_stats if self.system_cleaner else {}
+                ),
+            },
+            "users": self.user_results,
+            "user_totals": totals,
+            "users_cleaned": sum(
+                1 for result in self.user_results if result["success"]
+            ),
+            "users_failed": [
+                result["user_home"]
+                for result in self.user_results
+                if not result["success"]
+            ],
+            "remaining_files": self.verification.get("remaining_files", []),
+            "device_fingerprint_verification": self.verification.get(
+                "device_fingerprint_verification", {}
+            ),
+        }
+
+    def save_report(self, report: Dict[str, Any]) -> None:
+        """Save the aggregated report as JSON"""
+        try:
+            os.makedirs(os.path.dirname(self.report_file), exist_ok=True)
+            with open(self.report_file, "w") as f:
+                json.dump(report, f, indent=2, default=str)
+            self.logger.info(f"📄 Multi-user report saved: {self.report_file}")
+        except Exception as e:
+            self.logger.error(f"Failed to save multi-user report: {e}")
+
+    def was_cancelled_by_user(self) -> bool:
+        """Check if the system pass was cancelled by user (Ctrl+C)"""
+        return bool(self.system_cleaner and self.system_cleaner.was_cancelled_by_user())
+
+    def run(self) -> bool:
+        """Run the system pass, all user accounts, then one verification
+
+        One report covering all of them is saved.
+        """
+        system_success = self.run_system_steps()
+        if self.was_cancelled_by_user():
+            return False
+
+        self.run_user_steps()
+        self.run_verification()
+        if self.was_cancelled_by_user():
+            return False
+        report = self.generate_report(system_success)
+        self.save_report(report)
+
+        self.logger.info(
+            f"👥 Users cleaned: {report['users_cleaned']}/{len(self.user_results)}"
+        )
+        return system_success and not report["users_failed"]
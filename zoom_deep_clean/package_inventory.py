@@ -0,0 +1,423 @@
+#!/usr/bin/env python3
+"""
+Package Inventory Module
+Installed Zoom packages by exact name, with the files they own
+
+The Linux cleaner used to run ``dpkg -l``, ``rpm -qa`` or ``pacman -Q``,
+lowercase the whole package list and look for "zoom" anywhere in it, then
+remove a package called ``zoom`` whether or not that was its name. Each
+package source now asks its package database for the known Zoom package
+names only: the dpkg status file is streamed directly, ``rpm``, ``pacman``,
+``snap`` and ``flatpak`` are queried by exact name. Sources return the
+package's real name, version and files, so removal uses the right name and
+the file cleanup can leave paths the package manager owns to it.
+
+Created by: PHLthy215
+Version: 2.4.2 - Package Inventory
+"""
+
+import abc
+import glob
+import os
+import shutil
+import subprocess
+import threading
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+from .command_backend import CommandBackend, CommandNotRecorded, get_default_backend
+
+PACKAGE_QUERY_TIMEOUT = 30
+PACKAGE_REMOVE_TIMEOUT = 300
+
+# Names Zoom is distributed under, per packaging format
+NATIVE_PACKAGE_NAMES = ("zoom",)  # zoom_amd64.deb, zoom_x86_64.rpm
+PACMAN_PACKAGE_NAMES = ("zoom", "zoom-system-qt")  # AUR
+SNAP_PACKAGE_NAMES = ("zoom-client",)
+FLATPAK_APP_IDS = ("us.zoom.Zoom",)
+
+DPKG_STATUS_FILE = "/var/lib/dpkg/status"
+DPKG_INFO_DIR = "/var/lib/dpkg/info"
+RPM_REMOVE_COMMANDS = ("dnf", "yum", "zypper")
+
+
+@dataclass(frozen=True)
+class ZoomPackage:
+    """An installed Zoom package"""
+
+    manager: str
+    name: str
+    version: str = ""
+    # Paths installed by the package
+    files: Tuple[str, ...] = ()
+    # Directories the package owns entirely (snap and flatpak installs)
+    roots: Tuple[str, ...] = ()
+
+    def owns(self, path: str) -> bool:
+        return path in self.files or any(
+            path == root or path.startswith(root + os.sep) for root in self.roots
+        )
+
+    def summary(self) -> Dict[str, Any]:
+        return {
+            "manager": self.manager,
+            "name": self.name,
+            "version": self.version,
+            "files": len(self.files),
+        }
+
+
+def _lines(output: str) -> List[str]:
+    return [line.strip() for line in output.split("\n") if line.strip()]
+
+
+def parse_dpkg_status(
+    lines: Iterable[str], names: Sequence[str]
+) -> Iterator[Tuple[str, str]]:
+    """``(package, version)`` of installed ``names`` in a dpkg status file"""
+    fields: Dict[str, str] = {}
+    for line in lines:
+        line = line.rstrip("\n")
+        if not line:
+            yield from _installed_dpkg_entry(fields, names)
+            fields = {}
+        elif not line[0].isspace():  # continuation lines are never needed
+            key, _, value = line.partition(":")
+            if key in ("Package", "Status", "Version"):
+                fields[key] = value.strip()
+    yield from _installed_dpkg_entry(fields, names)
+
+
+def _installed_dpkg_entry(
+    fields: Dict[str, str], names: Sequence[str]
+) -> Iterator[Tuple[str, str]]:
+    # Status is "want flag state", e.g. "install ok installed"
+    status = fields.get("Status", "").split()
+    if fields.get("Package") in names and status[-1:] == ["installed"]:
+        yield fields["Package"], fields.get("Version", "")
+
+
+class PackageSource(abc.ABC):
+    """Base class of package databases"""
+
+    manager = "base"
+    command = ""
+
+    def __init__(self, command_backend: Optional[CommandBackend] = None):
+        self.command_backend = command_backend or get_default_backend()
+
+    def available(self) -> bool:
+        if not self.command_backend.live:
+            return True  # replayed commands are not on this machine's PATH
+        return shutil.which(self.command) is not None
+
+    @abc.abstractmethod
+    def installed(self) -> List[ZoomPackage]:
+        """The installed Zoom packages of this source"""
+
+    @abc.abstractmethod
+    def remove_command(self, package: ZoomPackage) -> List[str]:
+        """The command uninstalling ``package``"""
+
+    def _run(self, args: List[str]) -> subprocess.CompletedProcess:
+        return self.command_backend.run(args, timeout=PACKAGE_QUERY_TIMEOUT)
+
+
+class DpkgSource(PackageSource):
+    """Debian/Ubuntu packages, read from the dpkg database files"""
+
+    manager = "dpkg"
+    command = "dpkg-query"
+
+    def __init__(
+        self,
+        command_backend: Optional[CommandBackend] = None,
+        status_file: str = DPKG_STATUS_FILE,
+        info_dir: str = DPKG_INFO_DIR,
+        names: Sequence[str] = NATIVE_PACKAGE_NAMES,
+    ):
+        super().__init__(command_backend)
+        self.status_file = status_file
+        self.info_dir = info_dir
+        self.names = tuple(names)
+
+    def available(self) -> bool:
+        return os.path.exists(self.status_file)
+
+    def installed(self) -> List[ZoomPackage]:
+        try:
+            with open(self.status_file, "r", encoding="utf-8", errors="replace") as f:
+                found = list(parse_dpkg_status(f, self.names))
+        except OSError:
+            # Unreadable database: ask dpkg-query for the exact names instead
+            found = self._query_installed()
+        return [
+            ZoomPackage(self.manager, name, version, self._files(name))
+            for name, version in found
+        ]
+
+    def _query_installed(self) -> List[Tuple[str, str]]:
+        result = self._run(
+            [
+                "dpkg-query",
+                "-W",
+                "-f=${Package}\t${Version}\t${db:Status-Status}\n",
+                *self.names,
+            ]
+        )
+        found = []
+        for line in _lines(result.stdout):
+            fields = line.split("\t")
+            if len(fields) == 3 and fields[2] == "installed":
+                found.append((fields[0], fields[1]))
+        return found
+
+    def _files(self, name: str) -> Tuple[str, ...]:
+        lists = [os.path.join(self.info_dir, f"{name}.list")]
+        lists += sorted(glob.glob(os.path.join(self.info_dir, f"{name}:*.list")))
+        for list_file in lists:
+            try:
+                with open(list_file, "r", encoding="utf-8", errors="replace") as f:
+                    return tuple(
+                        line.strip() for line in f if line.strip() not in ("", "/.")
+                    )
+            except OSError:
+                continue
+        result = self._run(["dpkg-query", "-L", name])
+        return tuple(path for path in _lines(result.stdout) if path != "/.")
+
+    def remove_command(self, package: ZoomPackage) -> List[str]:
+        return ["apt-get", "remove", "--purge", "-y", package.name]
+
+
+class RpmSource(PackageSource):
+    """RHEL/Fedora/openSUSE packages"""
+
+    manager = "rpm"
+    command = "rpm"
+
+    def __init__(
+        self,
+        command_backend: Optional[CommandBackend] = None,
+        names: Sequence[str] = NATIVE_PACKAGE_NAMES,
+    ):
+        super().__init__(command_backend)
+        self.names = tuple(names)
+
+    def installed(self) -> List[ZoomPackage]:
+        result = self._run(
+            [
+                "rpm",
+                "-q",
+                "--whatprovides",
+                *self.names,
+                "--queryformat",
+                "%{NAME}\t%{VERSION}-%{RELEASE}\n",
+            ]
+        )
+        packages = {}
+        # Names nobody provides are reported as "no package provides ..."
+        for line in _lines(result.stdout):
+            name, tab, version = line.partition("\t")
+            if tab and name not in packages:
+                files = _lines(self._run(["rpm", "-ql", name]).stdout)
+                packages[name] = ZoomPackage(self.manager, name, version, tuple(files))
+        return list(packages.values())
+
+    def remove_command(self, package: ZoomPackage) -> List[str]:
+        command = RPM_REMOVE_COMMANDS[0]
+        if self.command_backend.live:
+            command = next(
+                (cmd for cmd in RPM_REMOVE_COMMANDS if shutil.which(cmd)), "rpm"
+            )
+        if command == "rpm":
+            return ["rpm", "-e", package.name]
+        return [command, "remove", "-y", package.name]
+
+
+class PacmanSource(PackageSource):
+    """Arch packages (Zoom comes from the AUR)"""
+
+    manager = "pacman"
+    command = "pacman"
+
+    def __init__(
+        self,
+        command_backend: Optional[CommandBackend] = None,
+        names: Sequence[str] = PACMAN_PACKAGE_NAMES,
+    ):
+        super().__init__(command_backend)
+        self.names = tuple(names)
+
+    def installed(self) -> List[ZoomPackage]:
+        packages = []
+        for name in self.names:
+            result = self._run(["pacman", "-Q", name])
+            if result.returncode != 0:
+                continue  # "error: package 'zoom' was not found"
+            fields = result.stdout.split()
+            version = fields[1] if len(fields) > 1 else ""
+            files = _lines(self._run(["pacman", "-Qlq", name]).stdout)
+            packages.append(ZoomPackage(self.manager, name, version, tuple(files)))
+        return packages
+
+    def remove_command(self, package: ZoomPackage) -> List[str]:
+        return ["pacman", "-R", "--noconfirm", package.name]
+
+
+class SnapSource(PackageSource):
+    """Snap installs, owning ``/snap/<name>`` and ``~/snap/<name>``"""
+
+    manager = "snap"
+    command = "snap"
+
+    def __init__(
+        self,
+        command_backend: Optional[CommandBackend] = None,
+        names: Sequence[str] = SNAP_PACKAGE_NAMES,
+    ):
+        super().__init__(command_backend)
+        self.names = tuple(names)
+
+    def installed(self) -> List[ZoomPackage]:
+        result = self._run(["snap", "list", *self.names])
+        packages = []
+        # Header "Name Version Rev Tracking Publisher Notes", then one row per snap
+        for line in _lines(result.stdout)[1:]:
+            fields = line.split()
+            if fields[0] in self.names:
+                roots = (
+                    os.path.join("/snap", fields[0]),
+                    os.path.join(os.path.expanduser("~/snap"), fields[0]),
+                )
+                version = fields[1] if len(fields) > 1 else ""
+                packages.append(
+                    ZoomPackage(self.manager, fields[0], version, roots=roots)
+                )
+        return packages
+
+    def remove_command(self, package: ZoomPackage) -> List[str]:
+        return ["snap", "remove", "--purge", package.name]
+
+
+class FlatpakSource(PackageSource):
+    """Flatpak apps, owning their deployment directory"""
+
+    manager = "flatpak"
+    command = "flatpak"
+
+    def __init__(
+        self,
+        command_backend: Optional[CommandBackend] = None,
+        app_ids: Sequence[str] = FLATPAK_APP_IDS,
+    ):
+        super().__init__(command_backend)
+        self.app_ids = tuple(app_ids)
+
+    def installed(self) -> List[ZoomPackage]:
+        packages = []
+        for app_id in self.app_ids:
+            result = self._run(["flatpak", "info", app_id])
+            if result.returncode != 0:
+                continue  # "error: us.zoom.Zoom/*unspecified*/* not installed"
+            fields = {}
+            for line in _lines(result.stdout):
+                key, colon, value = line.partition(":")
+                if colon:
+                    fields[key.strip()] = value.strip()
+            location = fields.get("Location")
+            packages.append(
+                ZoomPackage(
+                    self.manager,
+                    app_id,
+                    fields.get("Version", ""),
+                    roots=(location,) if location else (),
+                )
+            )
+        return packages
+
+    def remove_command(self, package: ZoomPackage) -> List[str]:
+        return ["flatpak", "uninstall", "-y", "--noninteractive", package.name]
+
+
+def default_package_sources(
+    command_backend: Optional[CommandBackend] = None,
+) -> List[PackageSource]:
+    return [
+        DpkgSource(command_backend),
+        RpmSource(command_backend),
+        PacmanSource(command_backend),
+        SnapSource(command_backend),
+        FlatpakSource(command_backend),
+    ]
+
+
+class PackageInventory:
+    """Zoom packages installed through any available package source"""
+
+    def __init__(
+        self,
+        sources: Optional[Sequence[PackageSource]] = None,
+        command_backend: Optional[CommandBackend] = None,
+    ):
+        self.sources = (
+            list(sources)
+            if sources is not None
+            else default_package_sources(command_backend)
+        )
+        self._lock = threading.Lock()
+        self._packages: Optional[List[Tuple[PackageSource, ZoomPackage]]] = None
+        self.errors: List[str] = []
+
+    def _inventory(self) -> List[Tuple[PackageSource, ZoomPackage]]:
+        with self._lock:
+            if self._packages is None:
+                packages = []
+                for source in self.sources:
+                    try:
+                        if not source.available():
+                            continue
+                        packages.extend(
+                            (source, package) for package in source.installed()
+                        )
+                    except (
+                        OSError,
+                        subprocess.SubprocessError,
+                        CommandNotRecorded,
+                    ) as e:
+                        self.errors.append(f"{source.manager}: {e}")
+                self._packages = packages
+            return self._packages
+
+    def packages(self) -> List[ZoomPackage]:
+        return [package for _, package in self._inventory()]
+
+    def owner(self, path: str) -> Optional[ZoomPackage]:
+        """The installed Zoom package that owns ``path``, if any"""
+        return next(
+            (package for package in self.packages() if package.owns(path)), None
+        )
+
+    def _source_of(self, package: ZoomPackage) -> PackageSource:
+        for source, known in self._inventory():
+            if known == package:
+                return source
+        raise ValueError(f"Unknown package: {package.manager} {package.name}")
+
+    def remove_command(self, package: ZoomPackage) -> List[str]:
+        return self._source_of(package).remove_command(package)
+
+    def remove(self, package: ZoomPackage) -> subprocess.CompletedProcess:
+        """Uninstall ``package`` with its package manager"""
+        source = self._source_of(package)
+        return source.command_backend.run(
+            source.remove_command(package), timeout=PACKAGE_REMOVE_TIMEOUT
+        )
+
+    def summary(self) -> List[Dict[str, Any]]:
+        return [package.summary() for package in self.packages()]
+
+    def reset(self) -> None:
+        with self._lock:
+            self._packages = None
+            self.errors = []
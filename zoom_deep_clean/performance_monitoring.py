@@ -17,6 +17,8 @@ from dataclasses import dataclass, asdict
 from contextlib import contextmanager
 import logging
 
+from .progress_events import STEP_FINISHED, STEP_STARTED, ProgressEvent
+
 # Optional psutil import for performance monitoring
 try:
     import psutil
@@ -123,6 +125,41 @@ class PerformanceMonitor:
             self.metrics.append(metrics)
             self._log_operation_performance(metrics)
 
+    def record_progress_event(self, event: ProgressEvent) -> None:
+        """Progress observer recording each cleanup step as an operation
+
+        Subscribe it to ``ZoomDeepCleanerEnhanced.progress`` to get the same
+        metrics as ``monitor_operation`` for every step of a run.
+        """
+        if event.kind == STEP_STARTED:
+            self.active_operations[event.step] = {
+                "start_time": time.time(),
+                "metrics": self._capture_metrics(),
+            }
+        elif event.kind == STEP_FINISHED:
+            started = self.active_operations.pop(event.step, None)
+            if started is None:
+                return
+            end_time = time.time()
+            start_metrics = started["metrics"]
+            end_metrics = self._capture_metrics()
+            metrics = PerformanceMetrics(
+                operation_name=event.label or event.step,
+                start_time=started["start_time"],
+                end_time=end_time,
+                duration=end_time - started["start_time"],
+                cpu_usage_start=start_metrics.get("cpu_percent", 0),
+                cpu_usage_end=end_metrics.get("cpu_percent", 0),
+                memory_usage_start=start_metrics.get("memory_percent", 0),
+                memory_usage_end=end_metrics.get("memory_percent", 0),
+                disk_io_start=start_metrics.get("disk_io", {}),
+                disk_io_end=end_metrics.get("disk_io", {}),
+                success=event.success,
+                error_message=event.error,
+            )
+            self.metrics.append(metrics)
+            self._log_operation_performance(metrics)
+
     def _capture_metrics(self) -> Dict[str, Any]:
         """Capture current system metrics"""
         try:
@@ -20,6 +20,8 @@ from concurrent.futures import ThreadPoolExecutor, as_completed
 import subprocess
 import fnmatch
 
+from .search_backends import IndexedSearch, default_search_backends
+
 
 @dataclass
 class ScanResult:
@@ -35,11 +37,18 @@ class ScanResult:
 class AsyncFileScanner:
     """High-performance async file scanner with parallel processing"""
 
-    def __init__(self, logger: logging.Logger, max_workers: int = 8):
+    def __init__(
+        self,
+        logger: logging.Logger,
+        max_workers: int = 8,
+        search: Optional[IndexedSearch] = None,
+    ):
         self.logger = logger
         self.max_workers = max_workers
         self.executor = ThreadPoolExecutor(max_workers=max_workers)
         self.cancelled = False
+        # OS search index asked before walking; None walks every directory
+        self.search = search
 
         # Zoom-related patterns for faster matching
         self.zoom_patterns = [
@@ -168,6 +177,71 @@ class AsyncFileScanner:
 
         return results
 
+    def scan_directory(self, directory: str) -> List[ScanResult]:
+        """Scan a directory, from the search index where it covers it"""
+        if self.search is None:
+            return self.scan_directory_sync(directory)
+
+        candidates, walk = self.search.lookup(directory)
+        if candidates is None:
+            return self.scan_directory_sync(directory)
+
+        results = self._scan_candidates(directory, candidates)
+        for subtree in walk:
+            results.extend(self.scan_directory_sync(subtree))
+        return results
+
+    def _scan_candidates(
+        self, directory: str, candidates: List[str]
+    ) -> List[ScanResult]:
+        """Turn index candidates into the results a walk of ``directory`` gives"""
+        results = []
+        walked: List[str] = []
+        start_time = time.time()
+
+        # Parents sort before their children, so each Zoom directory is
+        # walked once and the candidates inside it are skipped
+        for path in sorted(candidates):
+            if self.cancelled:
+                break
+            if any(path.startswith(parent + os.sep) for parent in walked):
+                continue
+            if self._skipped_by_walk(directory, path):
+                continue
+
+            try:
+                if os.path.isdir(path) and not os.path.islink(path):
+                    if not self.should_skip_directory(path):
+                        walked.append(path)
+                        results.extend(self.scan_directory_sync(path))
+                elif os.path.isfile(path):
+                    if any(path.endswith(ext) for ext in self.skip_extensions):
+                        continue
+                    if self.is_zoom_related(path):
+                        stat_info = os.stat(path)
+                        results.append(
+                            ScanResult(
+                                path=path,
+                                size=stat_info.st_size,
+                                modified_time=stat_info.st_mtime,
+                                is_zoom_related=True,
+                                scan_time=time.time() - start_time,
+                            )
+                        )
+            except (OSError, PermissionError) as e:
+                self.logger.debug(f"Skipping {path}: {e}")
+
+        return results
+
+    def _skipped_by_walk(self, directory: str, path: str) -> bool:
+        """Whether a walk of ``directory`` would skip a folder holding ``path``"""
+        parent = os.path.dirname(path)
+        while len(parent) > len(directory):
+            if self.should_skip_directory(parent):
+                return True
+            parent = os.path.dirname(parent)
+        return False
+
     async def scan_directories_parallel(
         self, directories: List[str], progress_callback: Optional[Callable] = None
     ) -> List[ScanResult]:
@@ -184,7 +258,7 @@ class AsyncFileScanner:
         with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
             for directory in directories:
                 if os.path.exists(directory):
-                    future = executor.submit(self.scan_directory_sync, directory)
+                    future = executor.submit(self.scan_directory, directory)
                     future_to_dir[future] = directory
 
             # Collect results as they complete
@@ -347,7 +421,9 @@ class PerformanceOptimizer:
             max_workers = min(multiprocessing.cpu_count(), 8)
 
         self.max_workers = max_workers
-        self.file_scanner = AsyncFileScanner(logger, max_workers)
+        self.file_scanner = AsyncFileScanner(
+            logger, max_workers, search=IndexedSearch(default_search_backends())
+        )
         self.process_manager = OptimizedProcessManager(logger)
 
         self.logger.info(
@@ -372,6 +448,7 @@ class PerformanceOptimizer:
         )
 
         # Perform parallel scan
+        self.file_scanner.search.reset()
         scan_results = await self.file_scanner.scan_directories_parallel(
             existing_locations, progress_callback
         )
@@ -382,6 +459,13 @@ class PerformanceOptimizer:
         elapsed_time = time.time() - start_time
         self.logger.info(f"⚡ Optimized search completed in {elapsed_time:.2f}s")
         self.logger.info(f"📊 Found {len(zoom_files)} Zoom-related files")
+        search_stats = self.file_scanner.search.stats()
+        if search_stats["backend"]:
+            self.logger.info(
+                f"📇 {search_stats['backend']} index answered "
+                f"{search_stats['locations_indexed']} of {len(existing_locations)} "
+                f"locations (index age: {search_stats['index_age_seconds']}s)"
+            )
 
         return zoom_files
 
@@ -0,0 +1,335 @@
+#!/usr/bin/env python3
+"""
+Plist Scanner Module
+Lazy binary-plist reader for Zoom markers, with a per-file result cache
+
+Deciding whether a property list mentions Zoom does not need the decoded
+object graph. For ``bplist00`` files this module reads the trailer and the
+offset table and only looks at string and data objects; containers,
+numbers and dates are never decoded, and a file in which no marker appears
+at all is rejected with a single search. Top-level container sizes (for
+example ``KnownNetworks`` in the airport preferences) are read from object
+headers without decoding the elements. XML and other plists fall back to
+``plistlib``.
+
+Verdicts are cached by (path, mtime, size), so repeat scans of unchanged
+plists are free.
+
+Created by: PHLthy215
+Version: 2.4.2 - Plist Scanner
+"""
+
+import mmap
+import os
+import plistlib
+import re
+import struct
+import threading
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, Dict, Optional, Sequence, Tuple
+
+BPLIST_MAGIC = b"bplist00"
+TRAILER_SIZE = 32
+
+ZOOM_PLIST_MARKERS = ("zoom",)
+
+PLIST_CACHE_SIZE = 512
+
+# Object types (high nibble of the marker byte)
+_DATA, _ASCII, _UTF16, _UTF8 = 0x4, 0x5, 0x6, 0x7
+_ARRAY, _SET, _DICT = 0xA, 0xC, 0xD
+_TEXT_TYPES = (_DATA, _ASCII, _UTF16, _UTF8)
+
+_OFFSET_FORMATS = {1: "B", 2: "H", 4: "I", 8: "Q"}
+
+
+class PlistScanError(ValueError):
+    """Malformed property list"""
+
+
+@dataclass
+class PlistSummary:
+    """What a plist says about Zoom, plus requested container sizes"""
+
+    path: str
+    mentions_zoom: bool = False
+    counts: Dict[str, int] = field(default_factory=dict)
+    zoom_in: Dict[str, bool] = field(default_factory=dict)
+    binary: bool = False
+
+
+_plist_cache: "OrderedDict[Tuple, PlistSummary]" = OrderedDict()
+_plist_cache_lock = threading.Lock()
+
+
+def clear_plist_cache() -> None:
+    """Forget every cached verdict"""
+    with _plist_cache_lock:
+        _plist_cache.clear()
+
+
+def _marker_pattern(markers: Sequence[str]):
+    """Case-insensitive search for the markers as ASCII or UTF-16 text"""
+    return re.compile(
+        b"|".join(
+            re.escape(marker.encode(encoding))
+            for marker in markers
+            for encoding in ("ascii", "utf-16-be")
+        ),
+        re.IGNORECASE,
+    )
+
+
+class BinaryPlist:
+    """Random access to the objects of a ``bplist00`` buffer"""
+
+    def __init__(self, data):
+        if len(data) < len(BPLIST_MAGIC) + TRAILER_SIZE:
+            raise PlistScanError("Truncated binary plist")
+        if data[: len(BPLIST_MAGIC)] != BPLIST_MAGIC:
+            raise PlistScanError("Not a binary plist")
+        self.data = data
+        (
+            offset_size,
+            self.ref_size,
+            object_count,
+            self.top_object,
+            table_offset,
+        ) = struct.unpack_from(">6xBBQQQ", data, len(data) - TRAILER_SIZE)
+        table_end = table_offset + offset_size * object_count
+        if table_end > len(data) - TRAILER_SIZE or self.top_object >= object_count:
+            raise PlistScanError("Corrupt binary plist trailer")
+
+        code = _OFFSET_FORMATS.get(offset_size)
+        if code is not None:
+            self.offsets = struct.unpack_from(
+                f">{object_count}{code}", data, table_offset
+            )
+        else:
+            self.offsets = tuple(
+                int.from_bytes(data[pos : pos + offset_size], "big")
+                for pos in range(table_offset, table_end, offset_size)
+            )
+
+    def _header(self, ref: int) -> Tuple[int, int, int]:
+        """(object type, element count or length, payload offset) of an object"""
+        offset = self.offsets[ref]
+        marker = self.data[offset]
+        kind, length = marker >> 4, marker & 0xF
+        offset += 1
+        if kind in _TEXT_TYPES + (_ARRAY, _SET, _DICT) and length == 0xF:
+            int_marker = self.data[offset]
+            if int_marker >> 4 != 0x1:
+                raise PlistScanError(f"Bad length of object {ref}")
+            size = 1 << (int_marker & 0xF)
+            length = int.from_bytes(self.data[offset + 1 : offset + 1 + size], "big")
+            offset += 1 + size
+        return kind, length, offset
+
+    def _text_span(self, ref: int) -> Optional[Tuple[int, int, int]]:
+        """(type, start, end) of a string or data object; None otherwise"""
+        kind, length, offset = self._header(ref)
+        if kind not in _TEXT_TYPES:
+            return None
+        if kind == _UTF16:
+            length *= 2
+        return kind, offset, offset + length
+
+    def _refs(self, offset: int, count: int) -> Sequence[int]:
+        code = _OFFSET_FORMATS.get(self.ref_size)
+        if code is not None:
+            return struct.unpack_from(f">{count}{code}", self.data, offset)
+        size = self.ref_size
+        return [
+            int.from_bytes(self.data[pos : pos + size], "big")
+            for pos in range(offset, offset + count * size, size)
+        ]
+
+    def _text_matches(self, ref: int, pattern, lowered: Sequence[str]) -> bool:
+        span = self._text_span(ref)
+        if span is None:
+            return False
+        kind, start, end = span
+        if kind == _UTF16:
+            text = self.data[start:end].decode("utf-16-be", "replace").lower()
+            return any(marker in text for marker in lowered)
+        return pattern.search(self.data, start, end) is not None
+
+    def string(self, ref: int) -> Optional[str]:
+        """Decode one string object; None for other objects"""
+        span = self._text_span(ref)
+        if span is None or span[0] == _DATA:
+            return None
+        kind, start, end = span
+        encoding = {_ASCII: "ascii", _UTF16: "utf-16-be", _UTF8: "utf-8"}[kind]
+        return self.data[start:end].decode(encoding, "replace")
+
+    def top_level(self) -> Dict[str, int]:
+        """Keys of the top-level dictionary mapped to their value refs"""
+        kind, count, offset = self._header(self.top_object)
+        if kind != _DICT:
+            return {}
+        refs = self._refs(offset, 2 * count)
+        top = {}
+        for key_ref, value_ref in zip(refs[:count], refs[count:]):
+            key = self.string(key_ref)
+            if key is not None:
+                top[key] = value_ref
+        return top
+
+    def length(self, ref: int) -> int:
+        """Element count of a container, without decoding the elements"""
+        kind, count, _ = self._header(ref)
+        return count if kind in (_ARRAY, _SET, _DICT) else 0
+
+    def mentions(self, markers: Sequence[str], root: Optional[int] = None) -> bool:
+        """Whether any string or data object (below ``root``) holds a marker
+
+        Without ``root`` the offset table is walked linearly; with one, only
+        objects reachable from it are visited.
+        """
+        pattern = _marker_pattern(markers)
+        lowered = [marker.lower() for marker in markers]
+        if root is None:
+            return any(
+                self._text_matches(ref, pattern, lowered)
+                for ref in range(len(self.offsets))
+            )
+
+        seen = set()
+        stack = [root]
+        while stack:
+            ref = stack.pop()
+            if ref in seen:
+                continue
+            seen.add(ref)
+            kind, count, offset = self._header(ref)
+            if kind in _TEXT_TYPES:
+                if self._text_matches(ref, pattern, lowered):
+                    return True
+            elif kind in (_ARRAY, _SET):
+                stack.extend(self._refs(offset, count))
+            elif kind == _DICT:
+                stack.extend(self._refs(offset, 2 * count))
+        return False
+
+
+def _object_mentions(value: Any, lowered: Sequence[str]) -> bool:
+    """Whether a decoded plist object holds a marker in a key, string or data"""
+    if isinstance(value, dict):
+        return any(
+            _object_mentions(key, lowered) or _object_mentions(item, lowered)
+            for key, item in value.items()
+        )
+    if isinstance(value, (list, tuple)):
+        return any(_object_mentions(item, lowered) for item in value)
+    if isinstance(value, str):
+        text = value.lower()
+        return any(marker in text for marker in lowered)
+    if isinstance(value, bytes):
+        data = value.lower()
+        return any(marker.encode("ascii") in data for marker in lowered)
+    return False
+
+
+def _summarize_binary(
+    path: str,
+    data,
+    markers: Sequence[str],
+    count_keys: Sequence[str],
+    zoom_keys: Sequence[str],
+) -> PlistSummary:
+    summary = PlistSummary(path, binary=True)
+    candidate = _marker_pattern(markers).search(data) is not None
+    if not candidate and not (count_keys or zoom_keys):
+        return summary
+
+    plist = BinaryPlist(data)
+    if candidate:
+        summary.mentions_zoom = plist.mentions(markers)
+    if count_keys or zoom_keys:
+        top = plist.top_level()
+        for key in count_keys:
+            summary.counts[key] = plist.length(top[key]) if key in top else 0
+        for key in zoom_keys:
+            summary.zoom_in[key] = (
+                candidate and key in top and plist.mentions(markers, top[key])
+            )
+    return summary
+
+
+def _summarize_decoded(
+    path: str,
+    data,
+    markers: Sequence[str],
+    count_keys: Sequence[str],
+    zoom_keys: Sequence[str],
+) -> PlistSummary:
+    try:
+        value = plistlib.loads(bytes(data))
+    except (plistlib.InvalidFileException, ValueError, TypeError) as e:
+        raise PlistScanError(str(e))
+    lowered = [marker.lower() for marker in markers]
+    top = value if isinstance(value, dict) else {}
+    summary = PlistSummary(path, mentions_zoom=_object_mentions(value, lowered))
+    for key in count_keys:
+        item = top.get(key)
+        summary.counts[key] = len(item) if isinstance(item, (dict, list)) else 0
+    for key in zoom_keys:
+        summary.zoom_in[key] = key in top and _object_mentions(top[key], lowered)
+    return summary
+
+
+def scan_plist(
+    path: str,
+    count_keys: Sequence[str] = (),
+    zoom_keys: Sequence[str] = (),
+    markers: Sequence[str] = ZOOM_PLIST_MARKERS,
+) -> PlistSummary:
+    """Summarize a plist: Zoom markers anywhere, sizes of top-level containers
+
+    ``count_keys`` name top-level containers whose element count is wanted;
+    ``zoom_keys`` name top-level values to search for markers on their own.
+    Raises OSError or PlistScanError for unreadable or malformed files.
+    """
+    stat = os.stat(path)
+    key = (
+        os.path.abspath(path),
+        stat.st_mtime_ns,
+        stat.st_size,
+        tuple(count_keys),
+        tuple(zoom_keys),
+        tuple(markers),
+    )
+    with _plist_cache_lock:
+        summary = _plist_cache.get(key)
+        if summary is not None:
+            _plist_cache.move_to_end(key)
+            return summary
+
+    with open(path, "rb") as f:
+        data = (
+            mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) if stat.st_size else b""
+        )
+    try:
+        if data[: len(BPLIST_MAGIC)] == BPLIST_MAGIC:
+            summary = _summarize_binary(path, data, markers, count_keys, zoom_keys)
+        else:
+            summary = _summarize_decoded(path, data, markers, count_keys, zoom_keys)
+    except (IndexError, struct.error) as e:
+        raise PlistScanError(f"Corrupt binary plist {path}: {e}")
+    finally:
+        if isinstance(data, mmap.mmap):
+            data.close()
+
+    with _plist_cache_lock:
+        _plist_cache[key] = summary
+        while len(_plist_cache) > PLIST_CACHE_SIZE:
+            _plist_cache.popitem(last=False)
+    return summary
+
+
+def plist_mentions_zoom(path: str) -> bool:
+    """Whether any key, string or data value of a plist mentions Zoom"""
+    return scan_plist(path).mentions_zoom
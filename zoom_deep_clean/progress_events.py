@@ -0,0 +1,328 @@
+#!/usr/bin/env python3
+"""
+Progress Events Module
+Step-weighted progress events with ETA learned from past runs
+
+``run_deep_clean`` used to be one blocking call, so the GUIs showed made-up
+progress around it. The cleaner now publishes structured events through a
+``ProgressTracker``: run start/end, step start/end and item counts inside a
+step. Any number of observers (the CLI, both GUIs, the performance monitor)
+subscribe to the same stream.
+
+Each step is weighted by how long it took on previous successful runs.
+Durations are kept per profile (live, dry run, target root) in a small JSON
+history next to the other caches, so the fraction done and the ETA reflect
+where the time actually goes on this machine. Steps with no history yet fall
+back to a default weight.
+
+Created by: PHLthy215
+Version: 2.4.2 - Progress Events
+"""
+
+import json
+import logging
+import os
+import threading
+import time
+from contextlib import contextmanager
+from dataclasses import dataclass
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+DEFAULT_HISTORY_DIR = os.path.expanduser("~/Library/Caches/zoom_deep_clean")
+HISTORY_FILE = "step_history.json"
+HISTORY_VERSION = 1
+HISTORY_SAMPLES = 5  # durations kept per step
+DEFAULT_STEP_WEIGHT = 1.0  # seconds assumed for a step never timed before
+ITEM_EVENT_INTERVAL = 0.1  # minimum seconds between item events of a step
+
+# Event kinds
+RUN_STARTED = "run_started"
+STEP_STARTED = "step_started"
+STEP_ITEMS = "step_items"
+STEP_FINISHED = "step_finished"
+RUN_FINISHED = "run_finished"
+
+
+@dataclass
+class ProgressEvent:
+    """One progress update of a cleanup run"""
+
+    kind: str
+    step: Optional[str] = None
+    label: str = ""
+    step_index: int = 0  # 1-based; 0 outside a step
+    step_count: int = 0
+    items_done: int = 0
+    items_total: Optional[int] = None
+    fraction: float = 0.0  # of the whole run, 0..1
+    elapsed: float = 0.0  # seconds since the run started
+    step_elapsed: float = 0.0
+    eta: Optional[float] = None  # seconds remaining
+    success: bool = True
+    error: Optional[str] = None
+
+    @property
+    def percent(self) -> int:
+        return int(round(self.fraction * 100))
+
+    def describe(self) -> str:
+        """A one-line summary such as ``[3/14] Removing launch agents 35%``"""
+        text = f"[{self.step_index}/{self.step_count}] {self.label} {self.percent}%"
+        if self.items_total:
+            text += f" ({self.items_done}/{self.items_total})"
+        if self.eta is not None:
+            minutes, seconds = divmod(int(round(self.eta)), 60)
+            text += f", ETA {minutes}:{seconds:02d}"
+        return text
+
+
+ProgressObserver = Callable[[ProgressEvent], None]
+
+
+class StepHistory:
+    """Recent per-step durations, persisted per profile
+
+    ``cache_dir=None`` keeps the history in memory only.
+    """
+
+    def __init__(
+        self, cache_dir: Optional[str] = DEFAULT_HISTORY_DIR, profile: str = "live"
+    ):
+        self.path = os.path.join(cache_dir, HISTORY_FILE) if cache_dir else None
+        self.profile = profile
+        self._lock = threading.Lock()
+        self._samples: Dict[str, List[float]] = self._load().get(profile, {})
+
+    def _load(self) -> Dict[str, Dict[str, List[float]]]:
+        if not self.path:
+            return {}
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                data = json.load(f)
+            if data.get("version") == HISTORY_VERSION:
+                return data.get("profiles", {})
+        except (OSError, ValueError, AttributeError):
+            pass
+        return {}
+
+    def expected(self, step: str) -> Optional[float]:
+        """Median duration of ``step`` over recent runs, if it was timed"""
+        with self._lock:
+            samples = sorted(self._samples.get(step, ()))
+        if not samples:
+            return None
+        middle = len(samples) // 2
+        if len(samples) % 2:
+            return samples[middle]
+        return (samples[middle - 1] + samples[middle]) / 2
+
+    def record(self, durations: Dict[str, float]) -> None:
+        """Add one run's step durations and save the history"""
+        if not durations:
+            return
+        with self._lock:
+            for step, duration in durations.items():
+                samples = self._samples.setdefault(step, [])
+                samples.append(round(duration, 3))
+                del samples[:-HISTORY_SAMPLES]
+            if not self.path:
+                return
+            profiles = self._load()
+            profiles[self.profile] = self._samples
+            try:
+                os.makedirs(os.path.dirname(self.path), exist_ok=True)
+                temp_path = f"{self.path}.{os.getpid()}.tmp"
+                with open(temp_path, "w", encoding="utf-8") as f:
+                    json.dump(
+                        {"version": HISTORY_VERSION, "profiles": profiles}, f, indent=2
+                    )
+                os.replace(temp_path, self.path)
+            except OSError:
+                pass  # history is an optimisation; never fail a run over it
+
+
+class ProgressTracker:
+    """Publishes progress events of a run to its observers"""
+
+    def __init__(
+        self,
+        history: Optional[StepHistory] = None,
+        logger: Optional[logging.Logger] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        self.history = history or StepHistory(cache_dir=None)
+        self.logger = logger or logging.getLogger(__name__)
+        self.clock = clock
+        self._observers: List[ProgressObserver] = []
+        self._lock = threading.RLock()
+        self._reset([])
+
+    def _reset(self, steps: Sequence[Tuple[str, str]]) -> None:
+        self.steps = list(steps)
+        self.labels = dict(self.steps)
+        self.weights = {
+            name: self.history.expected(name) or DEFAULT_STEP_WEIGHT
+            for name, _ in self.steps
+        }
+        self.durations: Dict[str, float] = {}
+        self.run_started: Optional[float] = None
+        self._current: Optional[str] = None
+        self._step_started = 0.0
+        self._items_done = 0
+        self._items_total: Optional[int] = None
+        self._last_item_event = 0.0
+        self._last_fraction = 0.0
+
+    # Observers
+
+    def subscribe(self, observer: ProgressObserver) -> ProgressObserver:
+        with self._lock:
+            if observer not in self._observers:
+                self._observers.append(observer)
+        return observer
+
+    def unsubscribe(self, observer: ProgressObserver) -> None:
+        with self._lock:
+            if observer in self._observers:
+                self._observers.remove(observer)
+
+    def _publish(self, kind: str, **fields) -> ProgressEvent:
+        event = self._event(kind, **fields)
+        with self._lock:
+            observers = list(self._observers)
+        for observer in observers:
+            try:
+                observer(event)
+            except Exception as e:
+                # A broken progress display must not break the cleanup
+                self.logger.debug(f"Progress observer failed: {e}")
+        return event
+
+    # Progress arithmetic
+
+    def _done_weight(self) -> float:
+        return sum(self.weights.get(step, 0.0) for step in self.durations)
+
+    def _current_fraction(self, now: float) -> float:
+        """How far the current step is, from items or else from its history"""
+        if self._current is None:
+            return 0.0
+        if self._items_total:
+            return min(self._items_done / self._items_total, 1.0)
+        expected = self.weights[self._current]
+        return min((now - self._step_started) / expected, 0.95)
+
+    def _event(self, kind: str, **fields) -> ProgressEvent:
+        now = self.clock()
+        total_weight = sum(self.weights.values()) or 1.0
+        current_weight = self.weights.get(self._current, 0.0)
+        if kind == STEP_FINISHED:
+            step_fraction = 1.0
+        else:
+            step_fraction = self._current_fraction(now)
+        done = self._done_weight() + current_weight * step_fraction
+        # Item counts and elapsed time may disagree; never move backwards
+        fraction = max(min(done / total_weight, 1.0), self._last_fraction)
+        self._last_fraction = fraction
+        if kind == RUN_FINISHED and fields.get("success", True):
+            fraction = 1.0
+
+        elapsed = now - self.run_started if self.run_started is not None else 0.0
+        eta = None
+        if kind != RUN_FINISHED:
+            if all(self.history.expected(name) for name, _ in self.steps):
+                eta = max(total_weight - done, 0.0)
+            elif fraction > 0:
+                eta = elapsed * (1 - fraction) / fraction
+
+        names = [name for name, _ in self.steps]
+        event = ProgressEvent(
+            kind=kind,
+            step=self._current,
+            label=self.labels.get(self._current, ""),
+            step_index=(
+                names.index(self._current) + 1 if self._current in names else 0
+            ),
+            step_count=len(self.steps),
+            items_done=self._items_done,
+            items_total=self._items_total,
+            fraction=fraction,
+            elapsed=elapsed,
+            step_elapsed=now - self._step_started if self._current else 0.0,
+            eta=eta,
+        )
+        for key, value in fields.items():
+            setattr(event, key, value)
+        return event
+
+    # Run lifecycle
+
+    def start_run(self, steps: Sequence[Tuple[str, str]]) -> None:
+        """Begin a run of ``steps`` given as ``(name, label)`` pairs"""
+        with self._lock:
+            self._reset(steps)
+            self.run_started = self.clock()
+        self._publish(RUN_STARTED)
+
+    @contextmanager
+    def step(self, name: str) -> Iterator[None]:
+        """Time one step and publish its start and end"""
+        with self._lock:
+            if name not in self.weights:
+                self.steps.append((name, name))
+                self.labels[name] = name
+                self.weights[name] = self.history.expected(name) or DEFAULT_STEP_WEIGHT
+            self._current = name
+            self._step_started = self.clock()
+            self._items_done = 0
+            self._items_total = None
+        self._publish(STEP_STARTED)
+        try:
+            yield
+        except BaseException as e:
+            self._finish_step(name, success=False, error=str(e) or type(e).__name__)
+            raise
+        else:
+            self._finish_step(name)
+
+    def _finish_step(
+        self, name: str, success: bool = True, error: Optional[str] = None
+    ) -> None:
+        duration = self.clock() - self._step_started
+        self._publish(STEP_FINISHED, success=success, error=error)
+        with self._lock:
+            self.durations[name] = duration
+            self._current = None
+
+    def items(self, done: int, total: Optional[int] = None) -> None:
+        """Report item progress inside the current step (rate limited)"""
+        if self._current is None:
+            return
+        self._items_done = done
+        if total is not None:
+            self._items_total = total
+        now = self.clock()
+        finished = self._items_total is not None and done >= self._items_total
+        if finished or now - self._last_item_event >= ITEM_EVENT_INTERVAL:
+            self._last_item_event = now
+            self._publish(STEP_ITEMS)
+
+    def iter_items(self, items: Iterable) -> Iterator:
+        """Yield ``items`` while reporting how many have been handled"""
+        items = list(items)
+        for index, item in enumerate(items):
+            self.items(index, len(items))
+            yield item
+        self.items(len(items), len(items))
+
+    def finish_run(self, success: bool = True, error: Optional[str] = None) -> None:
+        """Publish the end of the run and remember its step durations
+
+        Only successful runs are remembered: a failed or cancelled run stops
+        early, and its truncated steps would skew the weights of later runs.
+        """
+        self._publish(RUN_FINISHED, success=success, error=error)
+        if success and error is None:
+            self.history.record(self.durations)
+        with self._lock:
+            self.run_started = None
@@ -0,0 +1,495 @@
+#!/usr/bin/env python3
+"""
+Search Backends Module
+Find Zoom files through an OS search index, walking only what it cannot see
+
+The comprehensive file search used to run ``find`` over every search
+location, so its cost grew with disk size. macOS (Spotlight) and most Linux
+distributions (``plocate``/``locate``) already keep an index of file names
+that answers a name query in milliseconds. A ``SearchBackend`` queries such
+an index; ``IndexedSearch`` decides per location whether the index can be
+trusted:
+
+- a location the index covers is answered from it; candidates that no
+  longer exist are dropped as stale entries, and directory candidates
+  (``zoom.us.app``) are walked, since an index may list a directory
+  without its contents
+- entries created after a database index was built are found in the
+  directories modified since then (``SearchBackend.changed_candidates``)
+- subtrees the index excludes (Spotlight skips system and Library folders
+  and hidden directories, updatedb prunes the paths in ``updatedb.conf``)
+  are walked
+- a location is walked entirely when no index is available, the index is
+  older than ``INDEX_MAX_AGE``, or the query fails
+
+Index freshness and hit rates are reported with ``IndexedSearch.stats``.
+
+Created by: PHLthy215
+Version: 2.4.2 - Search Backends
+"""
+
+import abc
+import fnmatch
+import os
+import shlex
+import shutil
+import subprocess
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+
+from .command_backend import CommandBackend, CommandNotRecorded, get_default_backend
+
+SEARCH_TERM = "zoom"
+
+# Paths skipped by the comprehensive file search
+SEARCH_EXCLUDED_PATHS = [
+    "*/.Trash/*",
+    "*/Library/Caches/*",
+    "*/Application Support/MobileSync/*",
+    "*/Time Machine Backups/*",
+]
+
+INDEX_MAX_AGE = 24 * 3600  # seconds; older indexes miss too many new files
+INDEX_QUERY_TIMEOUT = 30
+
+# Spotlight does not index these trees (or only parts of them)
+SPOTLIGHT_UNINDEXED_PATHS = [
+    "/System",
+    "/Library",
+    "/private",
+    "/usr",
+    "/opt",
+    "/var",
+    "/Users/*/Library",
+]
+
+LOCATE_COMMANDS = ("plocate", "locate")
+LOCATE_DATABASES = (
+    "/var/lib/plocate/plocate.db",
+    "/var/lib/mlocate/mlocate.db",
+    "/var/lib/locate/locatedb",
+    "/var/cache/locate/locatedb",
+)
+UPDATEDB_CONF = "/etc/updatedb.conf"
+# updatedb's usual PRUNEPATHS when updatedb.conf does not set them
+DEFAULT_PRUNE_PATHS = ["/tmp", "/var/spool", "/media", "/mnt", "/proc", "/sys"]
+# Directory levels below a location checked for changes since updatedb ran;
+# deeper directories are only checked below a changed one
+CHANGE_SCAN_DEPTH = 2
+
+
+def build_find_command(location: str) -> List[str]:
+    """Build the ``find`` invocation used to search a location for Zoom files"""
+    find_command = ["find", location, "-iname", f"*{SEARCH_TERM}*"]
+
+    # Add exclusions
+    for excluded in SEARCH_EXCLUDED_PATHS:
+        find_command.extend(["-not", "-path", excluded])
+
+    find_command.extend(["-type", "f"])
+    return find_command
+
+
+def is_excluded(path: str) -> bool:
+    """Whether ``path`` lies in a tree the file search skips"""
+    return any(fnmatch.fnmatch(path, pattern) for pattern in SEARCH_EXCLUDED_PATHS)
+
+
+def matching_files(paths: Sequence[str]) -> List[str]:
+    """The regular files in ``paths`` that ``build_find_command`` would match"""
+    return [
+        path
+        for path in paths
+        if SEARCH_TERM in os.path.basename(path).lower()
+        and not is_excluded(path)
+        and os.path.isfile(path)
+        and not os.path.islink(path)
+    ]
+
+
+def matching_directories(paths: Sequence[str]) -> List[str]:
+    """The outermost real directories in ``paths`` named like Zoom
+
+    An index may list a directory but not what is inside it (Spotlight does
+    not look into app bundles such as ``zoom.us.app``), so these are walked
+    like the excluded subtrees.
+    """
+    directories: List[str] = []
+    for path in sorted(paths):
+        if any(_under(path, directory) for directory in directories):
+            continue
+        if (
+            SEARCH_TERM in os.path.basename(path).lower()
+            and not is_excluded(path)
+            and os.path.isdir(path)
+            and not os.path.islink(path)
+        ):
+            directories.append(path)
+    return directories
+
+
+def split_candidates(paths: Sequence[str]) -> Tuple[List[str], List[str]]:
+    """Index candidates as (matching files, directories to walk for the rest)"""
+    directories = matching_directories(paths)
+    files = [
+        path
+        for path in matching_files(paths)
+        if not any(_under(path, directory) for directory in directories)
+    ]
+    return files, directories
+
+
+def _under(path: str, root: str) -> bool:
+    root = root.rstrip(os.sep)
+    return path == root or path.startswith(root + os.sep)
+
+
+class SearchBackend(abc.ABC):
+    """An OS file-name index queried for Zoom candidates"""
+
+    name = "index"
+
+    def __init__(self, command_backend: Optional[CommandBackend] = None):
+        self.command_backend = command_backend or get_default_backend()
+        self._available: Optional[bool] = None
+        self._lock = threading.Lock()
+
+    def available(self) -> bool:
+        """Whether the index exists and is enabled; checked once"""
+        with self._lock:
+            if self._available is None:
+                try:
+                    self._available = self._probe()
+                except (OSError, subprocess.SubprocessError, CommandNotRecorded):
+                    # Cassettes recorded before the index was used walk as before
+                    self._available = False
+            return self._available
+
+    def index_age(self) -> Optional[float]:
+        """Seconds since the index was last updated; None for live indexes"""
+        return None
+
+    def fresh(self) -> bool:
+        age = self.index_age()
+        return age is None or age <= INDEX_MAX_AGE
+
+    def excluded_subtrees(self, location: str) -> List[str]:
+        """Trees in ``location`` the index does not cover ([location] for all)"""
+        return []
+
+    def changed_candidates(self, location: str, skip: Sequence[str] = ()) -> List[str]:
+        """Paths under ``location`` named like Zoom that the index cannot know
+
+        Live indexes see every change; database indexes miss what was
+        created after they were built. ``skip`` lists trees walked anyway.
+        """
+        return []
+
+    @abc.abstractmethod
+    def query(self, location: str, timeout: float = INDEX_QUERY_TIMEOUT) -> List[str]:
+        """Indexed paths under ``location`` whose name contains the search term
+
+        Raises subprocess.SubprocessError when the index cannot be queried.
+        """
+
+    def reset(self) -> None:
+        """Forget cached query results and availability"""
+        with self._lock:
+            self._available = None
+
+    @abc.abstractmethod
+    def _probe(self) -> bool:
+        """Whether the index exists and is enabled"""
+
+
+class SpotlightBackend(SearchBackend):
+    """macOS Spotlight, queried with ``mdfind -onlyin``"""
+
+    name = "spotlight"
+
+    def _probe(self) -> bool:
+        result = self.command_backend.run(["mdutil", "-s", "/"], timeout=10)
+        return result.returncode == 0 and "Indexing enabled" in result.stdout
+
+    def excluded_subtrees(self, location: str) -> List[str]:
+        if any(
+            fnmatch.fnmatch(location, pattern)
+            or fnmatch.fnmatch(location, pattern + "/*")
+            for pattern in SPOTLIGHT_UNINDEXED_PATHS
+        ):
+            return [location]
+
+        excluded = []
+        for pattern in SPOTLIGHT_UNINDEXED_PATHS:
+            subtree = os.path.join(location, os.path.basename(pattern))
+            if fnmatch.fnmatch(subtree, pattern) and os.path.isdir(subtree):
+                excluded.append(subtree)
+        # Spotlight skips hidden directories (~/.zoom and friends)
+        try:
+            with os.scandir(location) as entries:
+                excluded += [
+                    entry.path
+                    for entry in entries
+                    if entry.name.startswith(".")
+                    and entry.is_dir(follow_symlinks=False)
+                ]
+        except OSError:
+            pass
+        return sorted(excluded)
+
+    def query(self, location: str, timeout: float = INDEX_QUERY_TIMEOUT) -> List[str]:
+        result = self.command_backend.run(
+            ["mdfind", "-onlyin", location, "-name", SEARCH_TERM], timeout=timeout
+        )
+        if result.returncode != 0:
+            raise subprocess.SubprocessError(result.stderr.strip() or "mdfind failed")
+        return [line for line in result.stdout.split("\n") if line.strip()]
+
+
+class LocateBackend(SearchBackend):
+    """The ``plocate``/``locate`` database kept by updatedb"""
+
+    name = "locate"
+
+    def __init__(
+        self,
+        command_backend: Optional[CommandBackend] = None,
+        databases: Sequence[str] = LOCATE_DATABASES,
+        updatedb_conf: str = UPDATEDB_CONF,
+        clock: Callable[[], float] = time.time,
+    ):
+        super().__init__(command_backend)
+        self.databases = list(databases)
+        self.updatedb_conf = updatedb_conf
+        self.clock = clock
+        self.command: Optional[str] = None
+        self.database: Optional[str] = None
+        self._candidates: Optional[List[str]] = None
+        self._prune_paths: Optional[List[str]] = None
+
+    def _probe(self) -> bool:
+        if self.command_backend.live:
+            self.command = next(
+                (cmd for cmd in LOCATE_COMMANDS if shutil.which(cmd)), None
+            )
+        else:
+            # Replayed commands are not on this machine's PATH
+            self.command = LOCATE_COMMANDS[0]
+        self.database = next(
+            (path for path in self.databases if os.path.exists(path)), None
+        )
+        return self.command is not None and self.database is not None
+
+    def index_age(self) -> Optional[float]:
+        if not self.available():
+            return None
+        try:
+            return max(0.0, self.clock() - os.path.getmtime(self.database))
+        except OSError:
+            return None
+
+    def fresh(self) -> bool:
+        age = self.index_age()
+        return age is not None and age <= INDEX_MAX_AGE
+
+    def changed_candidates(self, location: str, skip: Sequence[str] = ()) -> List[str]:
+        # A directory whose mtime is newer than the database gained or lost
+        # entries since updatedb read it
+        try:
+            built = os.path.getmtime(self.database) if self.available() else None
+        except OSError:
+            built = None
+        if built is None:
+            return []
+
+        found = []
+        pending = [(location, 0)]
+        while pending:
+            directory, depth = pending.pop()
+            try:
+                changed = os.stat(directory).st_mtime > built
+                if not changed and depth >= CHANGE_SCAN_DEPTH:
+                    continue
+                with os.scandir(directory) as entries:
+                    for entry in entries:
+                        if changed and SEARCH_TERM in entry.name.lower():
+                            found.append(entry.path)
+                        elif entry.is_dir(follow_symlinks=False) and not any(
+                            _under(entry.path, subtree) for subtree in skip
+                        ):
+                            pending.append((entry.path, depth + 1))
+            except OSError:
+                continue
+        return sorted(found)
+
+    def prune_paths(self) -> List[str]:
+        """PRUNEPATHS from updatedb.conf: trees updatedb does not index"""
+        if self._prune_paths is None:
+            prune_paths = list(DEFAULT_PRUNE_PATHS)
+            try:
+                with open(self.updatedb_conf, "r", encoding="utf-8") as f:
+                    for line in f:
+                        key, _, value = line.strip().partition("=")
+                        if key.strip() == "PRUNEPATHS":
+                            prune_paths = shlex.split(value)[0].split()
+            except (OSError, ValueError, IndexError):
+                pass
+            self._prune_paths = prune_paths
+        return self._prune_paths
+
+    def excluded_subtrees(self, location: str) -> List[str]:
+        prune_paths = self.prune_paths()
+        if any(_under(location, pruned) for pruned in prune_paths):
+            return [location]
+        return sorted(
+            pruned
+            for pruned in prune_paths
+            if _under(pruned, location) and os.path.isdir(pruned)
+        )
+
+    def query(self, location: str, timeout: float = INDEX_QUERY_TIMEOUT) -> List[str]:
+        # One query answers every location; it is bucketed per location
+        with self._lock:
+            if self._candidates is None:
+                result = self.command_backend.run(
+                    [self.command, "-i", "-b", SEARCH_TERM], timeout=timeout
+                )
+                # locate exits 1 when nothing matches
+                if result.returncode not in (0, 1):
+                    raise subprocess.SubprocessError(
+                        result.stderr.strip() or f"{self.command} failed"
+                    )
+                self._candidates = [
+                    line for line in result.stdout.split("\n") if line.strip()
+                ]
+            candidates = self._candidates
+        return [path for path in candidates if _under(path, location)]
+
+    def reset(self) -> None:
+        super().reset()
+        with self._lock:
+            self._candidates = None
+            self._prune_paths = None
+
+
+def default_search_backends(
+    command_backend: Optional[CommandBackend] = None,
+) -> List[SearchBackend]:
+    """The index of the running platform (Spotlight or locate)"""
+    if sys.platform == "darwin":
+        return [SpotlightBackend(command_backend)]
+    if sys.platform.startswith("linux"):
+        return [LocateBackend(command_backend)]
+    return []
+
+
+class IndexedSearch:
+    """Answer file searches from the first usable index, walking the rest"""
+
+    def __init__(self, backends: Sequence[SearchBackend] = ()):
+        self.backends = list(backends)
+        self._lock = threading.Lock()
+        self.reset_stats()
+
+    def reset_stats(self) -> None:
+        with self._lock:
+            self._stats: Dict[str, Any] = defaultdict(int)
+            self._walk_reasons: Dict[str, str] = {}
+
+    def reset(self) -> None:
+        """Start a new run: re-probe indexes and forget cached results"""
+        for backend in self.backends:
+            backend.reset()
+        self.reset_stats()
+
+    def backend(self) -> Optional[SearchBackend]:
+        """The first index that is available"""
+        return next((b for b in self.backends if b.available()), None)
+
+    def lookup(
+        self, location: str, timeout: float = INDEX_QUERY_TIMEOUT
+    ) -> Tuple[Optional[List[str]], List[str]]:
+        """Index candidates under ``location`` and the subtrees left to walk
+
+        Candidates are existing files and directories whose name contains
+        the search term, including those created after a database index was
+        built. ``(None, [location])`` means the index cannot answer for
+        ``location`` and it must be walked entirely.
+        """
+        backend = self.backend()
+        if backend is None:
+            return self._walk_all(location, "no search index available")
+        if not backend.fresh():
+            return self._walk_all(location, f"{backend.name} index is stale")
+
+        subtrees = backend.excluded_subtrees(location)
+        if subtrees == [location]:
+            return self._walk_all(location, f"not covered by {backend.name} index")
+        try:
+            indexed = backend.query(location, timeout=timeout)
+        except (OSError, subprocess.SubprocessError, CommandNotRecorded) as e:
+            return self._walk_all(location, f"{backend.name} query failed: {e}")
+        known = set(indexed)
+        changed = [
+            path
+            for path in backend.changed_candidates(location, subtrees)
+            if path not in known
+        ]
+
+        candidates, stale = [], 0
+        for path in indexed + changed:
+            if any(_under(path, subtree) for subtree in subtrees):
+                continue  # the walk of that subtree reports it
+            if os.path.lexists(path):
+                candidates.append(path)
+            else:
+                stale += 1
+        with self._lock:
+            self._stats["locations_indexed"] += 1
+            self._stats["index_candidates"] += len(candidates)
+            self._stats["stale_entries"] += stale
+            self._stats["unindexed_entries"] += len(changed)
+            self._stats["subtrees_walked"] += len(subtrees)
+        return candidates, subtrees
+
+    def _walk_all(self, location: str, reason: str) -> Tuple[None, List[str]]:
+        with self._lock:
+            self._stats["locations_walked"] += 1
+            self._walk_reasons[location] = reason
+        return None, [location]
+
+    def stats(self) -> Dict[str, Any]:
+        """Index freshness and how many locations it answered"""
+        backend = self.backend()
+        with self._lock:
+            stats = {
+                key: self._stats[key]
+                for key in (
+                    "locations_indexed",
+                    "locations_walked",
+                    "subtrees_walked",
+                    "index_candidates",
+                    "stale_entries",
+                    "unindexed_entries",
+                )
+            }
+            walk_reasons = dict(self._walk_reasons)
+        searched = stats["locations_indexed"] + stats["locations_walked"]
+        age = backend.index_age() if backend else None
+        stats.update(
+            {
+                "backend": backend.name if backend else None,
+                "index_age_seconds": round(age, 1) if age is not None else None,
+                "index_fresh": backend.fresh() if backend else False,
+                "index_hit_rate": (
+                    round(stats["locations_indexed"] / searched, 3)
+                    if searched
+                    else None
+                ),
+                "walk_reasons": walk_reasons,
+            }
+        )
+        return stats
@@ -0,0 +1,332 @@
+#!/usr/bin/env python3
+"""
+SQLite Cleaner Module
+Shared engine for removing Zoom rows from SQLite databases
+
+TCC permission databases and browser cookie stores are cleaned the same way:
+matching rows are found and deleted in a single ``DELETE ... RETURNING``
+statement inside one transaction, with case-insensitive matching. Cookie
+hosts must be a Zoom domain or one of its subdomains (like ``is_zoom_host``),
+so look-alikes such as zoominfo.com are left alone. When a
+backup directory is given, only the deleted rows are backed up (as a JSON
+file readable by the owner alone) instead of copying the whole file; the
+rows hold cookies and tokens, so they are never written next to the
+database. Dry runs open databases read-only (``immutable`` for offline
+images) and never take a lock. Many databases, such as every browser
+profile of a user, are processed concurrently.
+
+Created by: PHLthy215
+Version: 2.4.2 - SQLite Cleaner
+"""
+
+import base64
+import glob
+import hashlib
+import json
+import os
+import sqlite3
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+from urllib.parse import quote
+
+from .leveldb_scanner import ZOOM_ORIGIN_DOMAINS
+
+# DELETE ... RETURNING needs SQLite 3.35; older libraries select the rowids
+# and delete them in the same transaction instead
+SUPPORTS_RETURNING = sqlite3.sqlite_version_info >= (3, 35, 0)
+
+DEFAULT_PATTERN = "zoom"
+
+# Chromium-family browsers: user data directory below ~/Library/Application Support
+CHROMIUM_USER_DATA_DIRS = (
+    "Google/Chrome",
+    "Google/Chrome Beta",
+    "Google/Chrome Canary",
+    "Chromium",
+    "Microsoft Edge",
+    "BraveSoftware/Brave-Browser",
+    "Vivaldi",
+    "Arc/User Data",
+    "Opera Software/com.operasoftware.Opera",
+)
+
+# Profile directories inside a Chromium user data directory
+CHROMIUM_PROFILE_GLOBS = ("Default", "Profile *", "Guest Profile", "")
+
+# Cookie database locations inside a Chromium profile, newest layout first
+CHROMIUM_COOKIE_FILES = ("Network/Cookies", "Cookies")
+
+FIREFOX_PROFILES_DIR = "Firefox/Profiles"
+
+
+@dataclass(frozen=True)
+class SQLiteTarget:
+    """Rows of one table to remove from one database"""
+
+    path: str
+    table: str
+    match_column: str
+    report_columns: Tuple[str, ...]
+    label: str = ""
+    pattern: str = DEFAULT_PATTERN
+    # When set, the match column must be one of these domains or a subdomain
+    # (optionally with a leading dot) instead of containing ``pattern``
+    domains: Tuple[str, ...] = ()
+
+
+@dataclass
+class SQLiteCleanupResult:
+    """Outcome of cleaning one SQLiteTarget"""
+
+    target: SQLiteTarget
+    rows: List[Dict[str, Any]] = field(default_factory=list)
+    deleted: bool = False
+    backup_path: Optional[str] = None
+    error: Optional[str] = None
+
+    @property
+    def matched(self) -> int:
+        return len(self.rows)
+
+
+def connect(path: str, read_only: bool = False, immutable: bool = False):
+    """Open a database; read-only connections can also be immutable"""
+    if not read_only:
+        return sqlite3.connect(path, isolation_level=None)
+    params = "immutable=1" if immutable else "mode=ro"
+    return sqlite3.connect(
+        f"file:{quote(os.path.abspath(path))}?{params}", uri=True, isolation_level=None
+    )
+
+
+def _quote_identifier(name: str) -> str:
+    return '"' + name.replace('"', '""') + '"'
+
+
+def _escape_like(text: str) -> str:
+    return text.replace("\\", "\\\\").replace("%", "\\%").replace("_", "\\_")
+
+
+def _like_pattern(pattern: str) -> str:
+    return f"%{_escape_like(pattern)}%"
+
+
+def _match_clause(target: SQLiteTarget) -> Tuple[str, Tuple[str, ...]]:
+    """SQL condition and parameters selecting the rows of ``target``"""
+    column = _quote_identifier(target.match_column)
+    if not target.domains:
+        return f"{column} LIKE ? ESCAPE '\\'", (_like_pattern(target.pattern),)
+    clauses, params = [], []
+    for domain in target.domains:
+        # "%.zoom.us" also matches ".zoom.us"
+        clauses.append(f"lower({column}) = ? OR {column} LIKE ? ESCAPE '\\'")
+        params += [domain.lower(), f"%.{_escape_like(domain)}"]
+    return "(" + " OR ".join(clauses) + ")", tuple(params)
+
+
+def _json_value(value: Any) -> Any:
+    if isinstance(value, bytes):
+        return {"base64": base64.b64encode(value).decode("ascii")}
+    return value
+
+
+def write_private_backup(backup_dir: str, kind: str, source: str, payload: Any) -> str:
+    """Write ``payload`` as JSON into ``backup_dir``, readable by the owner only
+
+    The file name identifies ``source`` by digest rather than by name, and
+    the directory is created owner-only when missing.
+    """
+    os.makedirs(backup_dir, mode=0o700, exist_ok=True)
+    digest = hashlib.sha256(os.path.abspath(source).encode("utf-8")).hexdigest()
+    backup_path = os.path.join(
+        backup_dir, f"{kind}-{digest[:16]}-{int(time.time())}.json"
+    )
+    temp_path = f"{backup_path}.{os.getpid()}.tmp"
+    fd = os.open(temp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+    try:
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(payload, f)
+        os.replace(temp_path, backup_path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.unlink(temp_path)
+        raise
+    return backup_path
+
+
+def _write_row_backup(
+    backup_dir: str,
+    target: SQLiteTarget,
+    columns: Sequence[str],
+    rows: Sequence[Sequence[Any]],
+) -> str:
+    payload = {
+        "database": target.path,
+        "table": target.table,
+        "columns": list(columns),
+        "rows": [[_json_value(value) for value in row] for row in rows],
+    }
+    return write_private_backup(backup_dir, "sqlite-rows", target.path, payload)
+
+
+def clean_database(
+    target: SQLiteTarget,
+    dry_run: bool = False,
+    immutable: bool = False,
+    backup_dir: Optional[str] = None,
+) -> SQLiteCleanupResult:
+    """Remove the rows of ``target`` whose match column matches it
+
+    The column must contain the pattern, or name one of ``target.domains``.
+    Matching is case-insensitive (SQLite ``LIKE``). In dry runs the database
+    is opened read-only, or ``immutable`` for offline images, and the
+    matching rows are only reported. Deleted rows are backed up only when
+    ``backup_dir`` is given.
+    """
+    result = SQLiteCleanupResult(target)
+    table = _quote_identifier(target.table)
+    where, params = _match_clause(target)
+
+    conn = None
+    try:
+        conn = connect(target.path, read_only=dry_run, immutable=dry_run and immutable)
+        if dry_run:
+            report = ", ".join(_quote_identifier(c) for c in target.report_columns)
+            cursor = conn.execute(f"SELECT {report} FROM {table} WHERE {where}", params)
+            result.rows = [dict(zip(target.report_columns, row)) for row in cursor]
+            return result
+
+        conn.execute("BEGIN IMMEDIATE")
+        try:
+            if SUPPORTS_RETURNING:
+                cursor = conn.execute(
+                    f"DELETE FROM {table} WHERE {where} RETURNING *", params
+                )
+                deleted_rows = cursor.fetchall()
+            else:
+                cursor = conn.execute(
+                    f"SELECT rowid, * FROM {table} WHERE {where}", params
+                )
+                selected = cursor.fetchall()
+                conn.executemany(
+                    f"DELETE FROM {table} WHERE rowid = ?",
+                    [(row[0],) for row in selected],
+                )
+                deleted_rows = [row[1:] for row in selected]
+                cursor = conn.execute(f"SELECT * FROM {table} LIMIT 0")
+            columns = [description[0] for description in cursor.description]
+
+            if deleted_rows and backup_dir:
+                result.backup_path = _write_row_backup(
+                    backup_dir, target, columns, deleted_rows
+                )
+            conn.execute("COMMIT")
+        except BaseException:
+            conn.execute("ROLLBACK")
+            raise
+
+        indexes = [columns.index(column) for column in target.report_columns]
+        result.rows = [
+            {
+                column: row[index]
+                for column, index in zip(target.report_columns, indexes)
+            }
+            for row in deleted_rows
+        ]
+        result.deleted = bool(deleted_rows)
+    except (sqlite3.Error, OSError, ValueError) as e:
+        result.error = str(e)
+    finally:
+        if conn is not None:
+            conn.close()
+    return result
+
+
+def clean_databases(
+    targets: Sequence[SQLiteTarget],
+    dry_run: bool = False,
+    immutable: bool = False,
+    backup_dir: Optional[str] = None,
+    max_workers: Optional[int] = None,
+) -> List[SQLiteCleanupResult]:
+    """Clean several databases concurrently; results keep the target order"""
+    if not targets:
+        return []
+    workers = max_workers or min(len(targets), 8)
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        return list(
+            executor.map(
+                lambda target: clean_database(target, dry_run, immutable, backup_dir),
+                targets,
+            )
+        )
+
+
+def tcc_target(path: str) -> SQLiteTarget:
+    """Zoom clients in a TCC permission database"""
+    return SQLiteTarget(
+        path=path,
+        table="access",
+        match_column="client",
+        report_columns=("service", "client", "auth_value"),
+        label="TCC",
+    )
+
+
+def chromium_profile_dirs(user_home: str) -> List[Tuple[str, str]]:
+    """(browser label, profile directory) of every Chromium-family profile"""
+    support_dir = os.path.join(user_home, "Library", "Application Support")
+    profiles = []
+    for user_data in CHROMIUM_USER_DATA_DIRS:
+        user_data_dir = os.path.join(support_dir, user_data)
+        if not os.path.isdir(user_data_dir):
+            continue
+        for profile_glob in CHROMIUM_PROFILE_GLOBS:
+            if not profile_glob:
+                matches = [user_data_dir]
+            else:
+                pattern = os.path.join(glob.escape(user_data_dir), profile_glob)
+                matches = sorted(glob.glob(pattern))
+            profiles.extend((user_data.split("/")[-1], path) for path in matches)
+    return profiles
+
+
+def browser_cookie_targets(user_home: str) -> List[SQLiteTarget]:
+    """Cookie databases of every Chromium-family and Firefox profile"""
+    support_dir = os.path.join(user_home, "Library", "Application Support")
+    targets = []
+
+    for browser, profile_dir in chromium_profile_dirs(user_home):
+        for cookie_file in CHROMIUM_COOKIE_FILES:
+            path = os.path.join(profile_dir, cookie_file)
+            if os.path.isfile(path):
+                targets.append(
+                    SQLiteTarget(
+                        path=path,
+                        table="cookies",
+                        match_column="host_key",
+                        report_columns=("name", "host_key"),
+                        label=browser,
+                        domains=ZOOM_ORIGIN_DOMAINS,
+                    )
+                )
+                break
+
+    firefox_profiles = os.path.join(support_dir, FIREFOX_PROFILES_DIR)
+    for path in sorted(
+        glob.glob(os.path.join(glob.escape(firefox_profiles), "*", "cookies.sqlite"))
+    ):
+        targets.append(
+            SQLiteTarget(
+                path=path,
+                table="moz_cookies",
+                match_column="host",
+                report_columns=("name", "host"),
+                label="Firefox",
+                domains=ZOOM_ORIGIN_DOMAINS,
+            )
+        )
+
+    return targets
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Stat Cache Module
+Per-run lstat cache for the removal pipeline
+
+Path validation, Zoom verification, backup and removal all need to know
+whether a path exists and what kind of entry it is. StatCache answers those
+questions from a single ``lstat`` per path and forgets the answer (and every
+cached path below it) as soon as the cleaner mutates the path. Counters for
+every filesystem syscall issued through the cache make the savings visible.
+
+Created by: PHLthy215
+Version: 2.4.2 - Stat Cache
+"""
+
+import os
+import stat
+import threading
+from collections import Counter
+from typing import Dict, Optional, Set
+
+
+class StatCache:
+    """lstat results per path, invalidated on mutation"""
+
+    def __init__(self):
+        self._entries: Dict[str, Optional[os.stat_result]] = {}
+        # directory -> cached paths (or directories leading to them) directly
+        # below it, so invalidation visits only the affected subtree
+        self._children: Dict[str, Set[str]] = {}
+        self._lock = threading.Lock()
+        # syscall name -> count, plus "cache_hits" for answered queries
+        self.counters: Counter = Counter()
+
+    def lstat(self, path: str) -> Optional[os.stat_result]:
+        """Cached ``os.lstat``; ``None`` when the path does not exist"""
+        with self._lock:
+            if path in self._entries:
+                self.counters["cache_hits"] += 1
+                return self._entries[path]
+
+        try:
+            result: Optional[os.stat_result] = os.lstat(path)
+        except OSError:
+            result = None
+
+        with self._lock:
+            self.counters["lstat"] += 1
+            self._entries[path] = result
+            self._link(path)
+        return result
+
+    def _link(self, path: str) -> None:
+        """Index ``path`` below its parent, and unindexed parents below theirs"""
+        child, parent = path, os.path.dirname(path)
+        while parent != child:
+            siblings = self._children.get(parent)
+            if siblings is not None:
+                siblings.add(child)
+                return
+            self._children[parent] = {child}
+            child, parent = parent, os.path.dirname(parent)
+
+    def exists(self, path: str) -> bool:
+        """True for any entry, including dangling symlinks"""
+        return self.lstat(path) is not None
+
+    def is_dir(self, path: str) -> bool:
+        """A real directory (symlinks to directories are not followed)"""
+        result = self.lstat(path)
+        return result is not None and stat.S_ISDIR(result.st_mode)
+
+    def is_file(self, path: str) -> bool:
+        """A regular file"""
+        result = self.lstat(path)
+        return result is not None and stat.S_ISREG(result.st_mode)
+
+    def is_symlink(self, path: str) -> bool:
+        result = self.lstat(path)
+        return result is not None and stat.S_ISLNK(result.st_mode)
+
+    def size(self, path: str) -> int:
+        """Size in bytes, 0 for missing paths"""
+        result = self.lstat(path)
+        return result.st_size if result is not None else 0
+
+    def count(self, syscall: str, amount: int = 1) -> None:
+        """Record a syscall issued outside the cache (open, unlink, ...)"""
+        with self._lock:
+            self.counters[syscall] += amount
+
+    def invalidate(self, path: str) -> None:
+        """Forget ``path`` and everything cached below it"""
+        top = path.rstrip("/") or path
+        with self._lock:
+            self._entries.pop(path, None)
+            pending = [top]
+            while pending:
+                cached = pending.pop()
+                self._entries.pop(cached, None)
+                pending.extend(self._children.pop(cached, ()))
+            siblings = self._children.get(os.path.dirname(top))
+            if siblings is not None:
+                siblings.discard(top)
+            self.counters["invalidations"] += 1
+
+    def clear(self) -> None:
+        """Start a new run with an empty cache and zeroed counters"""
+        with self._lock:
+            self._entries.clear()
+            self._children.clear()
+            self.counters.clear()
+
+    def stats(self) -> Dict[str, int]:
+        """Counters plus the total number of syscalls issued"""
+        with self._lock:
+            stats = dict(self.counters)
+        stats["syscalls"] = sum(
+            count
+            for name, count in stats.items()
+            if name not in ("cache_hits", "invalidations")
+        )
+        return stats
@@ -0,0 +1,692 @@
+#!/usr/bin/env python3
+"""
+Synthetic macOS Fixture Generator
+Deterministic fake macOS filesystem layouts for benchmarks and tests
+
+Builds a reproducible tree that mirrors the locations the cleaner scans
+(Library/Application Support, Containers, Group Containers,
+/private/var/folders, package receipts, ...) under an arbitrary root so
+scanner performance can be measured on any machine, including Linux CI.
+Chromium LevelDB storage databases with Zoom and unrelated origins, and
+Safari binarycookies jars with Zoom and unrelated cookies, can be generated
+the same way.
+
+Created by: PHLthy215
+Version: 2.4.2 - Synthetic Fixtures
+"""
+
+import os
+import plistlib
+import random
+import string
+import struct
+from dataclasses import dataclass, field, fields, replace
+from typing import Dict, List, Optional, Sequence, Tuple
+
+from .binary_cookies import (
+    BINARYCOOKIES_MAGIC,
+    COOKIE_HEADER_SIZE,
+    MAC_EPOCH_OFFSET,
+    PAGE_MAGIC,
+    PAGE_TERMINATOR,
+)
+from .leveldb_scanner import (
+    TABLE_MAGIC,
+    TYPE_DELETION,
+    TYPE_VALUE,
+    encode_log_records,
+    encode_varint,
+    encode_write_batch,
+    masked_crc32c,
+)
+
+# Top-level system locations created under the fixture root
+SYSTEM_BASE_DIRS = [
+    "Applications",
+    "Library/Application Support",
+    "Library/Caches",
+    "Library/LaunchAgents",
+    "Library/LaunchDaemons",
+    "Library/Preferences",
+    "Library/PrivilegedHelperTools",
+    "private/tmp",
+    "private/var/db/receipts",
+    "private/var/folders",
+]
+
+# Per-user locations created under <root>/Users/<user>
+USER_BASE_DIRS = [
+    "Documents",
+    "Downloads",
+    "Library/Application Support",
+    "Library/Caches",
+    "Library/Containers",
+    "Library/Cookies",
+    "Library/Group Containers",
+    "Library/HTTPStorages",
+    "Library/LaunchAgents",
+    "Library/Logs",
+    "Library/Preferences",
+    "Library/Saved Application State",
+    "Library/WebKit",
+]
+
+# Well-known Zoom artifacts that are always present, relative to the root.
+# "{user}" is replaced with every generated user name.
+CANONICAL_SYSTEM_ARTIFACTS = [
+    "Applications/zoom.us.app/Contents/Info.plist",
+    "Applications/zoom.us.app/Contents/MacOS/zoom.us",
+    "Library/LaunchAgents/us.zoom.updater.plist",
+    "Library/LaunchAgents/us.zoom.updater.login.check.plist",
+    "Library/LaunchDaemons/us.zoom.ZoomDaemon.plist",
+    "Library/PrivilegedHelperTools/us.zoom.ZoomDaemon",
+    "private/var/db/receipts/us.zoom.pkg.videomeeting.bom",
+    "private/var/db/receipts/us.zoom.pkg.videomeeting.plist",
+]
+
+CANONICAL_USER_ARTIFACTS = [
+    "Users/{user}/Library/Application Support/zoom.us/data/zoomus.enc.db",
+    "Users/{user}/Library/Application Support/zoom.us/data/zoommeeting.enc.db",
+    "Users/{user}/Library/Application Support/zoom.us/data/viper.ini",
+    "Users/{user}/Library/Caches/us.zoom.xos/Cache.db",
+    "Users/{user}/Library/Containers/us.zoom.xos/Data/Library/Preferences/us.zoom.xos.plist",
+    "Users/{user}/Library/Cookies/us.zoom.xos.binarycookies",
+    "Users/{user}/Library/Group Containers/BJ4HAAB9B3.ZoomClient3rd/Library/Preferences/zoom.plist",
+    "Users/{user}/Library/HTTPStorages/us.zoom.xos/httpstorages.sqlite",
+    "Users/{user}/Library/Logs/zoom.us/zoom_stdout_stderr.log",
+    "Users/{user}/Library/Preferences/us.zoom.xos.plist",
+    "Users/{user}/Library/Saved Application State/us.zoom.xos.savedState/data.data",
+    "Users/{user}/Library/WebKit/us.zoom.xos/WebsiteData/LocalStorage/zoom.localstorage",
+]
+
+# Name fragments used to build realistic non-Zoom bundle identifiers
+_VENDORS = ["apple", "google", "microsoft", "mozilla", "adobe", "slack", "docker"]
+_PRODUCTS = ["Safari", "Chrome", "Office", "Firefox", "Reader", "Helper", "Agent"]
+_EXTENSIONS = [".plist", ".db", ".json", ".dat", ".sqlite", ".cache", ".bin"]
+_ZOOM_NAMES = [
+    "zoom_{n}.dat",
+    "us.zoom.xos.{n}.plist",
+    "ZoomPhone-{n}.db",
+    "zoomus.{n}.enc.db",
+    "ZoomClips_{n}.json",
+]
+
+ZOOM_SIGNATURE_CONTENT = b"us.zoom.xos zoom.us fixture\n"
+
+
+@dataclass
+class FixtureSpec:
+    """Parameters describing a synthetic fixture tree"""
+
+    file_count: int = 10000
+    depth: int = 4
+    zoom_density: float = 0.01
+    symlink_ratio: float = 0.0
+    users: Tuple[str, ...] = ("fixtureuser",)
+    files_per_directory: int = 32
+    seed: int = 1132
+    safari_cookies: int = 0
+
+
+@dataclass
+class FixtureManifest:
+    """Summary of a generated fixture tree"""
+
+    root: str
+    spec: FixtureSpec
+    files_created: int = 0
+    zoom_files_created: int = 0
+    directories_created: int = 0
+    symlinks_created: int = 0
+    zoom_paths: List[str] = field(default_factory=list)
+    cookie_jars: List[str] = field(default_factory=list)
+
+    @property
+    def search_locations(self) -> List[str]:
+        """Locations mirroring comprehensive_file_search, rebased on the root"""
+        locations = [
+            os.path.join(self.root, "Library"),
+            os.path.join(self.root, "private", "var"),
+            os.path.join(self.root, "Applications"),
+        ]
+        for user in self.spec.users:
+            locations.append(os.path.join(self.root, "Users", user))
+        return locations
+
+    def to_dict(self) -> Dict:
+        """Serializable representation used by benchmark reports"""
+        return {
+            "root": self.root,
+            "file_count": self.spec.file_count,
+            "depth": self.spec.depth,
+            "zoom_density": self.spec.zoom_density,
+            "symlink_ratio": self.spec.symlink_ratio,
+            "users": list(self.spec.users),
+            "seed": self.spec.seed,
+            "safari_cookies": self.spec.safari_cookies,
+            "files_created": self.files_created,
+            "zoom_files_created": self.zoom_files_created,
+            "directories_created": self.directories_created,
+            "symlinks_created": self.symlinks_created,
+        }
+
+
+class MacOSFixtureGenerator:
+    """Generate a deterministic fake macOS home/system layout under a root"""
+
+    def __init__(self, root: str, spec: Optional[FixtureSpec] = None):
+        self.root = os.path.abspath(root)
+        self.spec = spec or FixtureSpec()
+        self.rng = random.Random(self.spec.seed)
+        self.manifest = FixtureManifest(root=self.root, spec=self.spec)
+
+    def generate(self) -> FixtureManifest:
+        """Create the fixture tree and return its manifest"""
+        spec = self.spec
+        if spec.file_count < 0:
+            raise ValueError("file_count must be non-negative")
+        if not 0.0 <= spec.zoom_density <= 1.0:
+            raise ValueError("zoom_density must be between 0 and 1")
+        if not 0.0 <= spec.symlink_ratio <= 1.0:
+            raise ValueError("symlink_ratio must be between 0 and 1")
+        if spec.depth < 1:
+            # The directory pool could never grow past the base directories
+            raise ValueError("depth must be at least 1")
+
+        base_dirs = self._create_base_dirs()
+        self._create_canonical_artifacts()
+        self._create_cookie_jars()
+        directories = self._create_directory_pool(base_dirs)
+        symlink_targets = self._create_symlink_targets()
+
+        zoom_budget = int(round(spec.file_count * spec.zoom_density))
+        symlink_budget = int(round(spec.file_count * spec.symlink_ratio))
+        regular_budget = max(0, spec.file_count - zoom_budget - symlink_budget)
+
+        # Interleave the three kinds deterministically so every region of the
+        # tree receives its share of Zoom files and symlinks
+        kinds = (
+            ["zoom"] * zoom_budget
+            + ["symlink"] * symlink_budget
+            + ["regular"] * regular_budget
+        )
+        self.rng.shuffle(kinds)
+
+        for index, kind in enumerate(kinds):
+            directory = directories[self.rng.randrange(len(directories))]
+            if kind == "zoom":
+                name = self.rng.choice(_ZOOM_NAMES).format(n=index)
+                self._write_file(os.path.join(directory, name), zoom=True)
+            elif kind == "symlink":
+                self._create_symlink(directory, index, symlink_targets)
+            else:
+                self._write_file(os.path.join(directory, self._regular_name(index)))
+
+        return self.manifest
+
+    def _create_base_dirs(self) -> List[str]:
+        """Create the fixed macOS skeleton"""
+        base_dirs = [os.path.join(self.root, rel) for rel in SYSTEM_BASE_DIRS]
+        for user in self.spec.users:
+            user_root = os.path.join(self.root, "Users", user)
+            base_dirs.extend(os.path.join(user_root, rel) for rel in USER_BASE_DIRS)
+
+        # /private/var/folders uses two-level random per-user temp directories
+        folders = os.path.join(self.root, "private", "var", "folders")
+        for _ in range(max(1, len(self.spec.users))):
+            bucket = self._random_token(2)
+            user_dir = os.path.join(folders, bucket, self._random_token(30))
+            base_dirs.extend(os.path.join(user_dir, leaf) for leaf in ("T", "C", "0"))
+
+        for directory in base_dirs:
+            self._makedirs(directory)
+        return base_dirs
+
+    def _create_canonical_artifacts(self) -> None:
+        """Create the well-known Zoom artifacts the cleaner targets"""
+        for rel in CANONICAL_SYSTEM_ARTIFACTS:
+            self._write_file(os.path.join(self.root, rel), zoom=True)
+        for user in self.spec.users:
+            for rel in CANONICAL_USER_ARTIFACTS:
+                path = os.path.join(self.root, rel.format(user=user))
+                self._write_file(path, zoom=True)
+
+    def _create_cookie_jars(self) -> None:
+        """Create each user's Safari cookie jar, if requested"""
+        count = self.spec.safari_cookies
+        if count <= 0:
+            return
+        zoom_count = max(1, int(round(count * self.spec.zoom_density)))
+        for index, user in enumerate(self.spec.users):
+            path = os.path.join(
+                self.root, "Users", user, "Library", "Cookies", "Cookies.binarycookies"
+            )
+            generate_cookie_jar_fixture(
+                path, count, zoom_count, seed=self.spec.seed + index
+            )
+            self.manifest.cookie_jars.append(path)
+
+    def _create_directory_pool(self, base_dirs: List[str]) -> List[str]:
+        """Create nested directories up to the configured depth"""
+        spec = self.spec
+        target = max(
+            len(base_dirs), spec.file_count // max(1, spec.files_per_directory)
+        )
+        pool = [(directory, 0) for directory in base_dirs]
+
+        while len(pool) < target:
+            parent, level = pool[self.rng.randrange(len(pool))]
+            if level >= spec.depth:
+                continue
+            vendor = self.rng.choice(_VENDORS)
+            product = self.rng.choice(_PRODUCTS)
+            name = f"com.{vendor}.{product}.{len(pool)}"
+            child = os.path.join(parent, name)
+            self._makedirs(child)
+            pool.append((child, level + 1))
+
+        return [directory for directory, _ in pool]
+
+    def _create_symlink_targets(self) -> List[str]:
+        """Create leaf directories that directory symlinks may point at
+
+        Targets never contain symlinks themselves, so following links can
+        not produce cycles.
+        """
+        if self.spec.symlink_ratio <= 0:
+            return []
+
+        targets = []
+        shared = os.path.join(self.root, "Library", "Application Support", "Shared")
+        for n in range(4):
+            target = os.path.join(shared, f"target{n}")
+            self._makedirs(target)
+            for i in range(4):
+                self._write_file(os.path.join(target, f"shared{i}.dat"))
+            targets.append(target)
+        return targets
+
+    def _create_symlink(self, directory: str, index: int, targets: List[str]) -> None:
+        """Create a file or directory symlink inside ``directory``"""
+        link_path = os.path.join(directory, f"link{index}")
+        if targets and self.rng.random() < 0.25:
+            target = self.rng.choice(targets)
+        else:
+            target = os.path.join(directory, f"linked{index}.dat")
+            self._write_file(target)
+        try:
+            os.symlink(os.path.relpath(target, directory), link_path)
+            self.manifest.symlinks_created += 1
+        except FileExistsError:
+            pass
+
+    def _regular_name(self, index: int) -> str:
+        """Build a non-Zoom file name"""
+        vendor = self.rng.choice(_VENDORS)
+        return f"{vendor}_{index}{self.rng.choice(_EXTENSIONS)}"
+
+    def _random_token(self, length: int) -> str:
+        """Deterministic lowercase/digit token like macOS temp folder names"""
+        alphabet = string.ascii_lowercase + string.digits
+        return "".join(self.rng.choice(alphabet) for _ in range(length))
+
+    def _makedirs(self, directory: str) -> None:
+        """Create a directory and count it once"""
+        if not os.path.isdir(directory):
+            os.makedirs(directory, exist_ok=True)
+            self.manifest.directories_created += 1
+
+    def _write_file(self, path: str, zoom: bool = False) -> None:
+        """Create a small file, tracking Zoom files in the manifest"""
+        parent = os.path.dirname(path)
+        if not os.path.isdir(parent):
+            self._makedirs(parent)
+
+        fd = os.open(path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o644)
+        try:
+            if zoom:
+                os.write(fd, ZOOM_SIGNATURE_CONTENT)
+        finally:
+            os.close(fd)
+
+        self.manifest.files_created += 1
+        if zoom:
+            self.manifest.zoom_files_created += 1
+            self.manifest.zoom_paths.append(path)
+
+
+def generate_macos_fixture(
+    root: str, spec: Optional[FixtureSpec] = None, **overrides
+) -> FixtureManifest:
+    """Generate a synthetic macOS layout under ``root``
+
+    Keyword overrides are applied on top of ``spec`` (or the defaults), e.g.
+    ``generate_macos_fixture(tmp, file_count=1_000_000, zoom_density=0.001)``.
+    """
+    spec = spec or FixtureSpec()
+    known = {f.name for f in fields(FixtureSpec)}
+    unknown = set(overrides) - known
+    if unknown:
+        raise TypeError(f"Unknown fixture option(s): {', '.join(sorted(unknown))}")
+    spec = replace(spec, **overrides)
+    return MacOSFixtureGenerator(root, spec).generate()
+
+
+DEFAULT_ZOOM_ORIGINS = (
+    "https://zoom.us",
+    "https://us02web.zoom.us",
+    "https://app.zoom.com",
+)
+
+# Origins that only look like Zoom ones
+DECOY_ORIGINS = ("https://notzoom.us", "https://zoom.us.example.net")
+
+
+@dataclass
+class LevelDBFixture:
+    """Summary of a generated LevelDB storage database"""
+
+    path: str
+    zoom_keys: List[bytes] = field(default_factory=list)
+    other_keys: int = 0
+    table_blocks: int = 0
+    last_sequence: int = 0
+
+
+def _snappy_literal(chunk: bytes) -> bytes:
+    size = len(chunk) - 1
+    if size < 60:
+        return bytes([size << 2]) + chunk
+    if size < 256:
+        return bytes([60 << 2, size]) + chunk
+    return bytes([61 << 2]) + size.to_bytes(2, "little") + chunk
+
+
+def _snappy_compress(data: bytes) -> bytes:
+    """Greedy raw snappy encoder using literals and 2-byte-offset copies"""
+    out = bytearray(encode_varint(len(data)))
+    candidates: Dict[bytes, int] = {}
+    pos = literal_start = 0
+    while pos + 4 <= len(data):
+        candidate = candidates.get(data[pos : pos + 4])
+        candidates[data[pos : pos + 4]] = pos
+        if candidate is None or pos - candidate > 0xFFFF:
+            pos += 1
+            continue
+        length = 4
+        while (
+            pos + length < len(data)
+            and length < 64
+            and data[candidate + length] == data[pos + length]
+        ):
+            length += 1
+        for start in range(literal_start, pos, 65536):
+            out += _snappy_literal(data[start : min(pos, start + 65536)])
+        out.append(((length - 1) << 2) | 2)
+        out += (pos - candidate).to_bytes(2, "little")
+        pos += length
+        literal_start = pos
+    for start in range(literal_start, len(data), 65536):
+        out += _snappy_literal(data[start : start + 65536])
+    return bytes(out)
+
+
+def _leveldb_block(entries: Sequence[Tuple[bytes, bytes]], restart_interval: int):
+    """Prefix-compressed table block with its restart array"""
+    out = bytearray()
+    restarts = []
+    previous = b""
+    for index, (key, value) in enumerate(entries):
+        if index % restart_interval == 0:
+            restarts.append(len(out))
+            shared = 0
+        else:
+            shared = len(os.path.commonprefix([previous, key]))
+        out += encode_varint(shared) + encode_varint(len(key) - shared)
+        out += encode_varint(len(value)) + key[shared:] + value
+        previous = key
+    restarts = restarts or [0]
+    out += struct.pack(f"<{len(restarts)}I", *restarts)
+    out += struct.pack("<I", len(restarts))
+    return bytes(out)
+
+
+def _write_leveldb_table(
+    path: str,
+    entries: Sequence[Tuple[bytes, bytes]],
+    block_size: int,
+    compress: bool,
+) -> int:
+    """Write sorted internal-key entries as a table; returns the data blocks"""
+    out = bytearray()
+
+    def write_block(raw: bytes) -> bytes:
+        offset = len(out)
+        data, compression = raw, 0
+        if compress:
+            compressed = _snappy_compress(raw)
+            if len(compressed) < len(raw) - len(raw) // 8:
+                data, compression = compressed, 1
+        trailer = bytes([compression])
+        out.extend(data + trailer)
+        out.extend(struct.pack("<I", masked_crc32c(data + trailer)))
+        return encode_varint(offset) + encode_varint(len(data))
+
+    index_entries = []
+    pending: List[Tuple[bytes, bytes]] = []
+    pending_size = 0
+    for key, value in entries:
+        pending.append((key, value))
+        pending_size += len(key) + len(value) + 3
+        if pending_size >= block_size:
+            index_entries.append((key, write_block(_leveldb_block(pending, 16))))
+            pending, pending_size = [], 0
+    if pending:
+        index_entries.append((pending[-1][0], write_block(_leveldb_block(pending, 16))))
+
+    footer = write_block(_leveldb_block([], 1))
+    footer += write_block(_leveldb_block(index_entries, 1))
+    out += footer + b"\x00" * (40 - len(footer)) + struct.pack("<Q", TABLE_MAGIC)
+
+    with open(path, "wb") as f:
+        f.write(out)
+    return len(index_entries)
+
+
+def _internal_key(user_key: bytes, sequence: int, value_type: int) -> bytes:
+    return user_key + struct.pack("<Q", (sequence << 8) | value_type)
+
+
+def generate_leveldb_fixture(
+    path: str,
+    zoom_origins: Sequence[str] = DEFAULT_ZOOM_ORIGINS,
+    other_origin_count: int = 50,
+    keys_per_origin: int = 40,
+    value_size: int = 96,
+    block_size: int = 4096,
+    compress: bool = True,
+    session_storage: bool = False,
+    seed: int = 1132,
+) -> LevelDBFixture:
+    """Generate a Chromium Local Storage (or Session Storage) LevelDB
+
+    The database has one live table, a write-ahead log with newer writes
+    (one added and one deleted Zoom key), a MANIFEST and an obsolete table
+    with a stale Zoom key that must not be reported.
+    """
+    rng = random.Random(seed)
+    os.makedirs(path, exist_ok=True)
+    origins = sorted(
+        [(origin, True) for origin in zoom_origins]
+        + [(origin, False) for origin in DECOY_ORIGINS]
+        + [(f"https://site{n}.example.com", False) for n in range(other_origin_count)]
+    )
+
+    def value() -> bytes:
+        return bytes(rng.randrange(32, 127) for _ in range(value_size))
+
+    records: Dict[bytes, Tuple[bytes, bool]] = {}
+    if session_storage:
+        records[b"VERSION"] = (b"1", False)
+        records[b"next-map-id"] = (str(len(origins)).encode(), False)
+    for map_id, (origin, zoom) in enumerate(origins):
+        encoded = origin.encode()
+        if session_storage:
+            guid = "%08x-0000-4000-8000-%012x" % (seed, map_id)
+            namespace_key = b"namespace-" + guid.encode() + b"-" + encoded + b"/"
+            records[namespace_key] = (str(map_id).encode(), zoom)
+            key_prefix = b"map-" + str(map_id).encode() + b"-"
+        else:
+            records[b"META:" + encoded] = (value()[:16], zoom)
+            key_prefix = b"_" + encoded + b"\x00\x01"
+        for n in range(keys_per_origin):
+            records[key_prefix + b"key%05d" % n] = (value(), zoom)
+
+    entries = [
+        (_internal_key(key, sequence, TYPE_VALUE), records[key][0])
+        for sequence, key in enumerate(sorted(records), start=1)
+    ]
+    last_sequence = len(entries)
+    fixture = LevelDBFixture(path=path)
+    fixture.table_blocks = _write_leveldb_table(
+        os.path.join(path, "000004.ldb"), entries, block_size, compress
+    )
+
+    # Newer writes still in the log: a new Zoom key and a deleted one
+    zoom_keys = sorted(key for key, (_, zoom) in records.items() if zoom)
+    deleted_key = [key for key in zoom_keys if key.endswith(b"key00000")][-1]
+    added_key = (
+        b"map-0-zoom-added" if session_storage else b"_https://zoom.us\x00\x01added"
+    )
+    batch = encode_write_batch(
+        last_sequence + 1,
+        [(TYPE_VALUE, added_key, value()), (TYPE_DELETION, deleted_key, b"")],
+    )
+    with open(os.path.join(path, "000005.log"), "wb") as f:
+        f.write(encode_log_records(batch))
+
+    # Obsolete table left behind by a compaction
+    _write_leveldb_table(
+        os.path.join(path, "000002.ldb"),
+        [(_internal_key(b"_https://zoom.us\x00\x01stale", 1, TYPE_VALUE), b"x")],
+        block_size,
+        compress,
+    )
+
+    comparator = b"leveldb.BytewiseComparator"
+    edit = encode_varint(1) + encode_varint(len(comparator)) + comparator
+    edit += encode_varint(2) + encode_varint(5)  # log number
+    edit += encode_varint(3) + encode_varint(6)  # next file number
+    edit += encode_varint(4) + encode_varint(last_sequence)
+    smallest, largest = entries[0][0], entries[-1][0]
+    edit += encode_varint(7) + encode_varint(0) + encode_varint(4)
+    edit += encode_varint(os.path.getsize(os.path.join(path, "000004.ldb")))
+    edit += encode_varint(len(smallest)) + smallest
+    edit += encode_varint(len(largest)) + largest
+    with open(os.path.join(path, "MANIFEST-000003"), "wb") as f:
+        f.write(encode_log_records(edit))
+    with open(os.path.join(path, "CURRENT"), "w") as f:
+        f.write("MANIFEST-000003\n")
+    open(os.path.join(path, "LOCK"), "wb").close()
+
+    live_zoom = set(zoom_keys) - {deleted_key}
+    live_zoom.add(added_key)
+    fixture.zoom_keys = sorted(live_zoom)
+    fixture.other_keys = len(records) - len(zoom_keys)
+    fixture.last_sequence = last_sequence + 2
+    return fixture
+
+
+ZOOM_COOKIE_DOMAINS = (".zoom.us", "us02web.zoom.us", ".zoom.com")
+
+# Cookie domains that only look like Zoom ones
+DECOY_COOKIE_DOMAINS = ("notzoom.us", ".zoom.us.example.net")
+
+
+@dataclass
+class CookieJarFixture:
+    """Summary of a generated binarycookies jar"""
+
+    path: str
+    cookie_count: int = 0
+    pages: int = 0
+    zoom_cookies: List[Tuple[str, str]] = field(default_factory=list)
+
+
+def _cookie_record(
+    domain: str, name: str, path: str, value: str, expires: float, flags: int
+) -> bytes:
+    strings = b""
+    offsets = []
+    for text in (domain, name, path, value):
+        offsets.append(COOKIE_HEADER_SIZE + len(strings))
+        strings += text.encode("utf-8") + b"\x00"
+    size = COOKIE_HEADER_SIZE + len(strings)
+    header = struct.pack("<4I", size, 1, flags, 0)
+    header += struct.pack("<4I", *offsets) + bytes(8)
+    mac_time = expires - MAC_EPOCH_OFFSET
+    header += struct.pack("<2d", mac_time, mac_time - 86400 * 30)
+    return header + strings
+
+
+def _cookie_page(records: Sequence[bytes]) -> bytes:
+    offsets = []
+    position = 8 + 4 * len(records) + 4
+    for record in records:
+        offsets.append(position)
+        position += len(record)
+    header = PAGE_MAGIC + struct.pack(f"<I{len(records)}I", len(records), *offsets)
+    return header + PAGE_TERMINATOR + b"".join(records)
+
+
+def generate_cookie_jar_fixture(
+    path: str,
+    cookie_count: int = 1000,
+    zoom_cookie_count: int = 10,
+    cookies_per_page: int = 64,
+    seed: int = 1132,
+) -> CookieJarFixture:
+    """Generate a Safari ``Cookies.binarycookies`` jar
+
+    Zoom cookies are spread over random pages among cookies of unrelated
+    and look-alike domains.
+    """
+    rng = random.Random(seed)
+    os.makedirs(os.path.dirname(path) or ".", exist_ok=True)
+    fixture = CookieJarFixture(path=path, cookie_count=cookie_count)
+    zoom_indexes = set(
+        rng.sample(range(cookie_count), min(zoom_cookie_count, cookie_count))
+    )
+    expires = 1893456000.0  # 2030-01-01
+
+    records = []
+    for index in range(cookie_count):
+        if index in zoom_indexes:
+            domain = ZOOM_COOKIE_DOMAINS[index % len(ZOOM_COOKIE_DOMAINS)]
+            name = f"_zm_{index}"
+            fixture.zoom_cookies.append((domain, name))
+        elif index % 50 == 0:
+            domain = DECOY_COOKIE_DOMAINS[index % len(DECOY_COOKIE_DOMAINS)]
+            name = f"decoy_{index}"
+        else:
+            domain = f".site{rng.randrange(5000)}.example.com"
+            name = f"sid_{index}"
+        value = "".join(rng.choice(string.ascii_letters) for _ in range(24))
+        records.append(_cookie_record(domain, name, "/", value, expires, 1))
+
+    pages = [
+        _cookie_page(records[start : start + cookies_per_page])
+        for start in range(0, len(records), cookies_per_page)
+    ]
+    checksum = sum(sum(page[::4]) for page in pages) & 0xFFFFFFFF
+    footer = plistlib.dumps({"NSHTTPCookieAcceptPolicy": 2}, fmt=plistlib.FMT_BINARY)
+    with open(path, "wb") as f:
+        f.write(BINARYCOOKIES_MAGIC)
+        f.write(struct.pack(f">I{len(pages)}I", len(pages), *map(len, pages)))
+        for page in pages:
+            f.write(page)
+        f.write(struct.pack(">I", checksum))
+        f.write(b"\x07\x17\x20\x05\x00\x00\x00\x4b")
+        f.write(footer)
+    fixture.pages = len(pages)
+    return fixture
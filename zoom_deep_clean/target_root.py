@@ -0,0 +1,179 @@
+#!/usr/bin/env python3
+"""
+Target Root Module
+Offline cleaning of mounted volumes, disk images and golden image directories
+
+Every path rule in the cleaners is written against the live root
+(``/Library/...``, ``~/Library/...``). In target-root mode those rules are
+re-based onto an arbitrary directory and steps that only make sense on the
+running system (processes, keychain services, network, IORegistry, caches in
+memory) are skipped. Several roots can be processed concurrently.
+
+Created by: PHLthy215
+Version: 2.4.2 - Target Root Mode
+"""
+
+import hashlib
+import logging
+import os
+import re
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .artifact_rules import get_compiled_rules
+
+USERS_ROOT = "/Users"
+
+# Entries under /Users that are never real login accounts
+SKIPPED_USER_DIRS = {"Shared", "Guest", "Deleted Users"}
+
+
+def rebase_path(path: str, target_root: Optional[str]) -> str:
+    """Re-base an absolute live-system path onto ``target_root``
+
+    Relative paths and paths already inside the target root are returned
+    unchanged, as is everything when no target root is set.
+    """
+    if not target_root or not os.path.isabs(path):
+        return path
+    if is_within_root(path, target_root):
+        return path
+    return os.path.join(target_root, path.lstrip("/"))
+
+
+def is_within_root(path: str, target_root: str) -> bool:
+    """Check whether ``path`` lies inside ``target_root``"""
+    root = target_root.rstrip("/") or "/"
+    return path == root or path.startswith(root + "/")
+
+
+def virtual_path(path: str, target_root: Optional[str]) -> str:
+    """The live-system path a target-root path corresponds to"""
+    if not target_root or not is_within_root(path, target_root):
+        return path
+    relative = os.path.relpath(path, target_root)
+    return "/" if relative == "." else "/" + relative
+
+
+def discover_user_homes(users_root: str = USERS_ROOT) -> List[str]:
+    """Return the home directories of all accounts below ``users_root``
+
+    Only directories with a Library folder are considered homes; shared,
+    guest and hidden entries are skipped.
+    """
+    homes = []
+    try:
+        entries = sorted(os.scandir(users_root), key=lambda entry: entry.name)
+    except OSError:
+        return homes
+
+    for entry in entries:
+        if entry.name.startswith(".") or entry.name in SKIPPED_USER_DIRS:
+            continue
+        if not entry.is_dir(follow_symlinks=False):
+            continue
+        if os.path.isdir(os.path.join(entry.path, "Library")):
+            homes.append(entry.path)
+    return homes
+
+
+def report_path_for_root(target_root: str) -> str:
+    """Per-root report file so concurrent roots never overwrite each other"""
+    name = os.path.basename(target_root.rstrip("/")) or "root"
+    slug = re.sub(r"[^A-Za-z0-9._-]", "_", name)
+    digest = hashlib.sha1(target_root.encode("utf-8")).hexdigest()[:8]
+    return os.path.expanduser(
+        f"~/Documents/zoom_cleanup_target_{slug}_{digest}_report.json"
+    )
+
+
+def clean_target_root(target_root: str, cleaner_options: Dict[str, Any]) -> Dict:
+    """Clean one target root (process pool worker)"""
+    from .cleaner_enhanced import ZoomDeepCleanerEnhanced
+
+    result: Dict[str, Any] = {"target_root": target_root, "success": False}
+    try:
+        cleaner = ZoomDeepCleanerEnhanced(target_root=target_root, **cleaner_options)
+        result["success"] = cleaner.run_deep_clean()
+        result["statistics"] = cleaner.cleanup_stats
+        result["report_file"] = cleaner.report_file
+    except Exception as e:
+        result["error"] = str(e)
+    return result
+
+
+class TargetRootBatch:
+    """Clean several target roots concurrently, one worker process per root"""
+
+    def __init__(
+        self,
+        target_roots: List[str],
+        max_workers: Optional[int] = None,
+        **cleaner_options: Any,
+    ):
+        self.target_roots = [os.path.abspath(root) for root in target_roots]
+        self.max_workers = max_workers or min(
+            len(self.target_roots), os.cpu_count() or 1
+        )
+        # Compiled once here and shipped to every worker
+        cleaner_options.setdefault("artifact_rules", get_compiled_rules())
+        self.cleaner_options = cleaner_options
+        self.logger = logging.getLogger(__name__)
+        self.results: List[Dict[str, Any]] = []
+
+    def run(self) -> bool:
+        """Process every root and return True when all succeeded"""
+        missing = [root for root in self.target_roots if not os.path.isdir(root)]
+        for root in missing:
+            self.logger.error(f"❌ Target root does not exist: {root}")
+            self.results.append(
+                {"target_root": root, "success": False, "error": "not a directory"}
+            )
+
+        roots = [root for root in self.target_roots if root not in missing]
+        if roots:
+            self.logger.info(
+                f"💿 Cleaning {len(roots)} target root(s) with "
+                f"{self.max_workers} worker(s)"
+            )
+            with ProcessPoolExecutor(max_workers=self.max_workers) as executor:
+                futures = {
+                    executor.submit(clean_target_root, root, self.cleaner_options): root
+                    for root in roots
+                }
+                for future in as_completed(futures):
+                    root = futures[future]
+                    try:
+                        result = future.result()
+                    except Exception as e:
+                        result = {
+                            "target_root": root,
+                            "success": False,
+                            "error": str(e),
+                        }
+
+                    status = "✅" if result["success"] else "⚠️"
+                    self.logger.info(f"{status} Target root finished: {root}")
+                    self.results.append(result)
+
+        self.results.sort(key=lambda result: result["target_root"])
+        return all(result["success"] for result in self.results)
+
+    def generate_report(self) -> Dict[str, Any]:
+        """Summary of all processed roots"""
+        return {
+            "timestamp": datetime.now().isoformat(),
+            "mode": "target-root",
+            "roots": self.results,
+            "roots_cleaned": sum(1 for result in self.results if result["success"]),
+            "roots_failed": [
+                result["target_root"]
+                for result in self.results
+                if not result["success"]
+            ],
+        }
+
+    def was_cancelled_by_user(self) -> bool:
+        """Batch runs are not interactive"""
+        return False
@@ -0,0 +1,164 @@
+#!/usr/bin/env python3
+"""
+Time Budget Module
+Run-wide deadline split across cleanup steps, highest-value artifacts first
+
+Timeouts used to be fixed per call (30 s, 60 s, 180 s), so a full run on a
+large disk could take arbitrarily long. With a ``TimeBudget`` the run gets
+one deadline. Steps are reordered so the artifacts Zoom fingerprints a
+device by (``zoomus.enc.db`` and keychain entries, TCC rows and receipts,
+launch agents) are handled first and broad scans such as the comprehensive
+file search come last.
+
+Each step is allotted a share of the time left, in proportion to how long it
+took on earlier runs; time a step does not use rolls over to later steps.
+Command timeouts inside a step are capped by its share. Once the budget is
+exhausted the remaining steps are skipped, and the report lists what was
+skipped or cut short, so maintenance windows can hold a hard SLA.
+
+Created by: PHLthy215
+Version: 2.4.2 - Time Budget
+"""
+
+import time
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+# Lower runs first. Steps not listed run between the listed ones.
+STEP_PRIORITIES = {
+    "stop_processes": 0,  # prerequisite: a running Zoom keeps its files open
+    "fingerprint_stores": 10,  # zoomus.enc.db and keychain entries
+    "auth_tokens": 15,  # system authentication caches and services
+    "deep_system": 20,  # TCC rows, package receipts, system identifiers
+    "launch_agents": 30,
+    "system_daemon": 30,
+    "user_data": 40,
+    "remove_applications": 50,
+    "audio_driver": 60,
+    "system_caches": 70,
+    "network_caches": 70,
+    "advanced_features": 80,
+    "verify_deep_cleanup": 90,
+    "fingerprint_verification": 90,
+    "file_search": 100,  # broad scan: last, cut off when time runs out
+}
+DEFAULT_PRIORITY = 75
+# Never skipped or reordered; they close the run
+FINAL_STEPS = ("report", "reboot")
+
+MIN_COMMAND_TIMEOUT = 1.0  # seconds; shorter limits only produce failures
+RESERVE_FRACTION = 0.05  # of the budget, kept for the report
+MAX_RESERVE = 10.0  # seconds
+
+
+def prioritise(names: Sequence[str]) -> List[str]:
+    """Step names in budget order; the final steps keep their place at the end"""
+    budgeted = [name for name in names if name not in FINAL_STEPS]
+    final = [name for name in names if name in FINAL_STEPS]
+    budgeted.sort(key=lambda name: STEP_PRIORITIES.get(name, DEFAULT_PRIORITY))
+    return budgeted + final
+
+
+class TimeBudget:
+    """A deadline for one run, handed out step by step"""
+
+    def __init__(self, seconds: float, clock: Callable[[], float] = time.monotonic):
+        if seconds <= 0:
+            raise ValueError("Time budget must be positive")
+        self.seconds = float(seconds)
+        self.clock = clock
+        self.reserve = min(self.seconds * RESERVE_FRACTION, MAX_RESERVE)
+        self.started: Optional[float] = None
+        self._reset()
+
+    def _reset(self) -> None:
+        self.current: Optional[str] = None
+        self.step_started = 0.0
+        self.step_deadline: Optional[float] = None
+        self.completed: List[Dict[str, Any]] = []
+        self.skipped: List[Dict[str, Any]] = []
+        self.cut_short: List[Dict[str, Any]] = []
+
+    def start(self) -> None:
+        """Start the clock (again) and forget the previous run"""
+        self._reset()
+        self.started = self.clock()
+
+    def elapsed(self) -> float:
+        return self.clock() - self.started if self.started is not None else 0.0
+
+    def remaining(self) -> float:
+        return self.seconds - self.elapsed()
+
+    @property
+    def exhausted(self) -> bool:
+        """No time left for further steps (the reserve is for the report)"""
+        return self.remaining() <= self.reserve
+
+    def begin_step(
+        self, name: str, weight: float, pending_weight: float, label: str = ""
+    ) -> bool:
+        """Allot ``name`` its share of the time left; False if it must be skipped
+
+        ``weight`` is the step's expected duration and ``pending_weight`` the
+        expected duration of this and every later step.
+        """
+        if self.exhausted:
+            self.skipped.append(
+                {
+                    "step": name,
+                    "label": label or name,
+                    "reason": "time budget exhausted",
+                }
+            )
+            return False
+        usable = self.remaining() - self.reserve
+        share = usable * weight / pending_weight if pending_weight > 0 else usable
+        self.current = name
+        self.step_started = self.clock()
+        self.step_deadline = self.step_started + share
+        return True
+
+    def end_step(self) -> None:
+        if self.current is None:
+            return
+        now = self.clock()
+        allotted = self.step_deadline - self.step_started
+        elapsed = now - self.step_started
+        self.completed.append(
+            {
+                "step": self.current,
+                "allotted": round(allotted, 3),
+                "elapsed": round(elapsed, 3),
+                "overran": elapsed > allotted,
+            }
+        )
+        self.current = None
+        self.step_deadline = None
+
+    def step_expired(self) -> bool:
+        """Whether the current step has used up its share"""
+        if self.step_deadline is None:
+            return self.exhausted
+        return self.clock() >= self.step_deadline
+
+    def timeout(self, default: float) -> float:
+        """``default`` capped by what is left of the current step's share"""
+        if self.step_deadline is None:
+            limit = self.remaining() - self.reserve
+        else:
+            limit = self.step_deadline - self.clock()
+        return max(min(default, limit), MIN_COMMAND_TIMEOUT)
+
+    def cut(self, detail: str) -> None:
+        """Record that the current step stopped early for lack of time"""
+        self.cut_short.append({"step": self.current, "detail": detail})
+
+    def report(self) -> Dict[str, Any]:
+        return {
+            "budget_seconds": self.seconds,
+            "elapsed_seconds": round(self.elapsed(), 3),
+            "exhausted": bool(self.skipped or self.cut_short),
+            "steps": self.completed,
+            "skipped": self.skipped,
+            "cut_short": self.cut_short,
+        }
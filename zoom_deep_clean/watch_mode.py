@@ -0,0 +1,602 @@
+#!/usr/bin/env python3
+"""
+Watch Mode Module
+Remove Zoom artifacts that reappear after a cleanup, as they appear
+
+Zoom's auto-updater, a still-enrolled MDM profile or a synced home folder
+can recreate artifacts minutes after a clean, and catching them used to mean
+running the whole cleanup again: resolving the full rule catalog and
+searching the disk for a handful of new files. In watch mode the cleaner
+subscribes to filesystem events on the directories the artifact rules
+resolve through, matches only the changed paths against the compiled rule
+tries and removes the matches within seconds.
+
+Events come from inotify on Linux and kqueue on macOS, both through the
+standard library, with a polling fallback elsewhere. A burst of events
+(an installer unpacking a bundle) is debounced into one batch, and an idle
+watcher blocks in the kernel instead of polling.
+
+Created by: PHLthy215
+Version: 2.4.2 - Watch Mode
+"""
+
+import abc
+import ctypes
+import ctypes.util
+import logging
+import os
+import select
+import struct
+import sys
+import threading
+import time
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from .cancellation import CancellationToken, CleanupCancelled
+from .clean_journal import PLACEHOLDER
+from .target_root import discover_user_homes
+
+DEBOUNCE_SECONDS = 0.5  # quiet time that ends a burst of events
+MAX_BATCH_DELAY = 2.0  # a continuous burst is still processed after this
+POLL_INTERVAL = 2.0  # seconds between snapshots of the polling fallback
+
+# Categories holding device fingerprints, shredded instead of unlinked
+SECURE_SHRED_CATEGORIES = ("auth_databases",)
+
+# inotify(7)
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_Q_OVERFLOW = 0x00004000
+IN_IGNORED = 0x00008000
+IN_ONLYDIR = 0x01000000
+INOTIFY_MASK = IN_CREATE | IN_MOVED_TO | IN_CLOSE_WRITE | IN_ONLYDIR
+_INOTIFY_EVENT = struct.Struct("iIII")  # wd, mask, cookie, name length
+
+WATCH_COUNTERS = (
+    "events",
+    "batches",
+    "paths_evaluated",
+    "matches",
+    "removed",
+    "failed",
+    "rescans",
+)
+
+
+def _snapshot(directory: str) -> Optional[Dict[str, int]]:
+    """Entry names of ``directory`` with their inode numbers"""
+    try:
+        with os.scandir(directory) as iterator:
+            return {entry.name: entry.inode() for entry in iterator}
+    except OSError:
+        return None
+
+
+def _changed_entries(
+    directory: str, before: Dict[str, int], after: Dict[str, int]
+) -> List[str]:
+    """Paths of entries that are new in ``after`` or were replaced"""
+    return [
+        os.path.join(directory, name)
+        for name, inode in after.items()
+        if before.get(name) != inode
+    ]
+
+
+class EventSource(abc.ABC):
+    """Filesystem events of a set of watched directories (not recursive)"""
+
+    name = "events"
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._woken = threading.Event()
+        self.directories: Set[str] = set()
+        # Set when the kernel dropped events; the watcher then rescans
+        self.overflowed = False
+        self.closed = False
+
+    def add(self, directory: str) -> bool:
+        """Watch ``directory``; False if it is already watched or is gone"""
+        directory = os.path.abspath(directory)
+        with self._lock:
+            if self.closed or directory in self.directories:
+                return False
+            if not self._add(directory):
+                return False
+            self.directories.add(directory)
+            return True
+
+    def discard(self, directory: str) -> None:
+        with self._lock:
+            if directory in self.directories:
+                self.directories.discard(directory)
+                self._discard(directory)
+
+    @abc.abstractmethod
+    def wait(self, timeout: Optional[float]) -> List[str]:
+        """Paths changed in the watched directories since the last call
+
+        Blocks up to ``timeout`` seconds (``None``: until something happens)
+        and returns an empty list on timeout or ``wake``.
+        """
+
+    def wake(self) -> None:
+        """Make a blocked ``wait`` return (safe from any thread)"""
+        self._woken.set()
+
+    def close(self) -> None:
+        with self._lock:
+            if self.closed:
+                return
+            self.closed = True
+            for directory in list(self.directories):
+                self._discard(directory)
+            self._close()
+
+    @abc.abstractmethod
+    def _add(self, directory: str) -> bool:
+        """Start watching ``directory``; False if that is not possible"""
+
+    def _discard(self, directory: str) -> None:
+        pass
+
+    def _close(self) -> None:
+        pass
+
+
+class _DescriptorEventSource(EventSource):
+    """Event source read from a kernel descriptor, woken through a pipe"""
+
+    def __init__(self):
+        super().__init__()
+        self._wake_read, self._wake_write = os.pipe()
+        os.set_blocking(self._wake_read, False)
+        os.set_blocking(self._wake_write, False)
+
+    def wake(self) -> None:
+        super().wake()
+        with self._lock:
+            if self.closed:
+                return
+            try:
+                os.write(self._wake_write, b"w")
+            except OSError:
+                pass  # the pipe is full, a wake is pending anyway
+
+    def _drain_wake(self) -> None:
+        try:
+            while os.read(self._wake_read, 512):
+                pass
+        except OSError:
+            pass
+        self._woken.clear()
+
+    def _close(self) -> None:
+        os.close(self._wake_read)
+        os.close(self._wake_write)
+
+
+class InotifySource(_DescriptorEventSource):
+    """Linux inotify watches, one per directory"""
+
+    name = "inotify"
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(
+            ctypes.util.find_library("c") or "libc.so.6", use_errno=True
+        )
+        fd = self._libc.inotify_init1(os.O_NONBLOCK | os.O_CLOEXEC)
+        if fd < 0:
+            error = ctypes.get_errno()
+            raise OSError(error, f"inotify_init1 failed: {os.strerror(error)}")
+        super().__init__()
+        self._fd = fd
+        self._watches: Dict[int, str] = {}
+        self._descriptors: Dict[str, int] = {}
+
+    def _add(self, directory: str) -> bool:
+        wd = self._libc.inotify_add_watch(
+            self._fd, os.fsencode(directory), INOTIFY_MASK
+        )
+        if wd < 0:
+            return False
+        self._watches[wd] = directory
+        self._descriptors[directory] = wd
+        return True
+
+    def _discard(self, directory: str) -> None:
+        wd = self._descriptors.pop(directory, None)
+        if wd is not None:
+            self._watches.pop(wd, None)
+            self._libc.inotify_rm_watch(self._fd, wd)
+
+    def _close(self) -> None:
+        os.close(self._fd)
+        super()._close()
+
+    def wait(self, timeout: Optional[float]) -> List[str]:
+        readable, _, _ = select.select([self._fd, self._wake_read], [], [], timeout)
+        if self._wake_read in readable:
+            self._drain_wake()
+        if self._fd not in readable:
+            return []
+
+        data = b""
+        try:
+            while True:
+                chunk = os.read(self._fd, 65536)
+                if not chunk:
+                    break
+                data += chunk
+        except BlockingIOError:
+            pass
+        return self._parse(data)
+
+    def _parse(self, data: bytes) -> List[str]:
+        changed = []
+        offset = 0
+        while offset + _INOTIFY_EVENT.size <= len(data):
+            wd, mask, _cookie, length = _INOTIFY_EVENT.unpack_from(data, offset)
+            offset += _INOTIFY_EVENT.size
+            name = data[offset : offset + length].rstrip(b"\0")
+            offset += length
+
+            if mask & IN_Q_OVERFLOW:
+                self.overflowed = True
+                continue
+            with self._lock:
+                directory = self._watches.get(wd)
+                if directory is not None and mask & IN_IGNORED:
+                    # The directory was deleted or unmounted
+                    self._watches.pop(wd, None)
+                    self._descriptors.pop(directory, None)
+                    self.directories.discard(directory)
+                    continue
+            if directory is not None and name:
+                changed.append(os.path.join(directory, os.fsdecode(name)))
+        return changed
+
+
+class KqueueSource(_DescriptorEventSource):
+    """macOS/BSD kqueue vnode watches on directory descriptors
+
+    A directory's vnode event does not name the entry that changed, so each
+    watched directory keeps a snapshot of its entries to diff against.
+    """
+
+    name = "kqueue"
+
+    def __init__(self):
+        super().__init__()
+        self._kqueue = select.kqueue()
+        self._kqueue.control(
+            [
+                select.kevent(
+                    self._wake_read,
+                    filter=select.KQ_FILTER_READ,
+                    flags=select.KQ_EV_ADD,
+                )
+            ],
+            0,
+        )
+        self._directories_by_fd: Dict[int, str] = {}
+        self._descriptors: Dict[str, int] = {}
+        self._snapshots: Dict[str, Dict[str, int]] = {}
+
+    def _add(self, directory: str) -> bool:
+        try:
+            fd = os.open(directory, getattr(os, "O_EVTONLY", os.O_RDONLY))
+        except OSError:
+            return False
+        snapshot = _snapshot(directory)
+        if snapshot is None:
+            os.close(fd)
+            return False
+        event = select.kevent(
+            fd,
+            filter=select.KQ_FILTER_VNODE,
+            flags=select.KQ_EV_ADD | select.KQ_EV_CLEAR,
+            fflags=select.KQ_NOTE_WRITE
+            | select.KQ_NOTE_DELETE
+            | select.KQ_NOTE_RENAME
+            | select.KQ_NOTE_EXTEND,
+        )
+        try:
+            self._kqueue.control([event], 0)
+        except OSError:
+            os.close(fd)
+            return False
+        self._directories_by_fd[fd] = directory
+        self._descriptors[directory] = fd
+        self._snapshots[directory] = snapshot
+        return True
+
+    def _discard(self, directory: str) -> None:
+        fd = self._descriptors.pop(directory, None)
+        self._snapshots.pop(directory, None)
+        if fd is not None:
+            self._directories_by_fd.pop(fd, None)
+            os.close(fd)  # closing the descriptor removes its kevent
+
+    def _close(self) -> None:
+        self._kqueue.close()
+        super()._close()
+
+    def wait(self, timeout: Optional[float]) -> List[str]:
+        events = self._kqueue.control(None, len(self._directories_by_fd) + 1, timeout)
+        changed = []
+        for event in events:
+            if event.ident == self._wake_read:
+                self._drain_wake()
+                continue
+            with self._lock:
+                directory = self._directories_by_fd.get(event.ident)
+                if directory is None:
+                    continue
+                if event.fflags & (select.KQ_NOTE_DELETE | select.KQ_NOTE_RENAME):
+                    self.directories.discard(directory)
+                    self._discard(directory)
+                    continue
+                before = self._snapshots[directory]
+                after = _snapshot(directory)
+                if after is None:
+                    continue
+                self._snapshots[directory] = after
+            changed.extend(_changed_entries(directory, before, after))
+        return changed
+
+
+class PollingSource(EventSource):
+    """Snapshot diffing every ``interval`` seconds where no kernel API exists"""
+
+    name = "polling"
+
+    def __init__(self, interval: float = POLL_INTERVAL):
+        super().__init__()
+        self.interval = interval
+        self._snapshots: Dict[str, Dict[str, int]] = {}
+
+    def _add(self, directory: str) -> bool:
+        snapshot = _snapshot(directory)
+        if snapshot is None:
+            return False
+        self._snapshots[directory] = snapshot
+        return True
+
+    def _discard(self, directory: str) -> None:
+        self._snapshots.pop(directory, None)
+
+    def _poll(self) -> List[str]:
+        changed = []
+        with self._lock:
+            for directory, before in list(self._snapshots.items()):
+                after = _snapshot(directory)
+                if after is None:
+                    self.directories.discard(directory)
+                    self._discard(directory)
+                    continue
+                self._snapshots[directory] = after
+                changed.extend(_changed_entries(directory, before, after))
+        return changed
+
+    def wait(self, timeout: Optional[float]) -> List[str]:
+        deadline = None if timeout is None else time.monotonic() + timeout
+        while True:
+            changed = self._poll()
+            if changed:
+                return changed
+            delay = self.interval
+            if deadline is not None:
+                delay = min(delay, deadline - time.monotonic())
+                if delay <= 0:
+                    return []
+            if self._woken.wait(delay):
+                self._woken.clear()
+                return []
+
+
+def default_event_source() -> EventSource:
+    """inotify on Linux, kqueue on macOS, polling anywhere else"""
+    if sys.platform.startswith("linux"):
+        try:
+            return InotifySource()
+        except (OSError, AttributeError):  # no libc or no inotify in it
+            pass
+    elif hasattr(select, "kqueue"):
+        try:
+            return KqueueSource()
+        except OSError:
+            pass
+    return PollingSource()
+
+
+class ArtifactWatcher:
+    """Remove artifacts of a watch target whenever they reappear
+
+    A target provides ``scan()`` returning the current ``(path, category)``
+    matches and the directories to watch, ``classify(path)`` returning the
+    category of a single path (or ``None``) and whether artifacts can appear
+    below it, and ``remove(path, category)``.
+    """
+
+    def __init__(
+        self,
+        target,
+        source: Optional[EventSource] = None,
+        logger: Optional[logging.Logger] = None,
+        debounce: float = DEBOUNCE_SECONDS,
+        max_batch_delay: float = MAX_BATCH_DELAY,
+        cancel_token: Optional[CancellationToken] = None,
+    ):
+        self.target = target
+        self.source = source or default_event_source()
+        self.logger = logger or logging.getLogger(__name__)
+        self.debounce = debounce
+        self.max_batch_delay = max_batch_delay
+        self.cancel_token = cancel_token or CancellationToken()
+        self._lock = threading.Lock()
+        self._counters = {name: 0 for name in WATCH_COUNTERS}
+        # Set once the initial scan is done and changes are being watched
+        self.ready = threading.Event()
+
+    def counters(self) -> Dict[str, int]:
+        """Event and action counters, safe to read while the watcher runs"""
+        with self._lock:
+            counters = dict(self._counters)
+        counters["watched_directories"] = len(self.source.directories)
+        return counters
+
+    def _count(self, name: str, amount: int = 1) -> None:
+        with self._lock:
+            self._counters[name] += amount
+
+    def run(self) -> Dict[str, int]:
+        """Watch until the cancellation token is cancelled; returns the counters"""
+        self.cancel_token.register(self.source.wake)
+        try:
+            self.rescan()
+            self.ready.set()
+            self.logger.info(
+                f"👀 Watching {len(self.source.directories)} directories "
+                f"for reappearing Zoom artifacts ({self.source.name})"
+            )
+            while not self.cancel_token.cancelled:
+                batch = self._collect_batch()
+                if batch or self.source.overflowed:
+                    self.process(batch)
+        except CleanupCancelled:
+            pass  # cancelling is how a watch ends
+        finally:
+            # Also reached through Ctrl+C
+            self.cancel_token.unregister(self.source.wake)
+            counters = self.counters()
+            self.source.close()
+            self.logger.info(
+                f"👀 Watch stopped: {counters['events']} events, "
+                f"{counters['matches']} reappeared artifacts, "
+                f"{counters['removed']} removed, {counters['failed']} failed"
+            )
+        return counters
+
+    def _collect_batch(self) -> List[str]:
+        """Block until changes arrive, then gather the rest of their burst"""
+        changed = self.source.wait(None)
+        if not changed:
+            return []
+        batch = dict.fromkeys(changed)
+        events = len(changed)
+        started = time.monotonic()
+        while not self.cancel_token.cancelled:
+            remaining = self.max_batch_delay - (time.monotonic() - started)
+            if remaining <= 0:
+                break
+            more = self.source.wait(min(self.debounce, remaining))
+            if not more:
+                break
+            batch.update(dict.fromkeys(more))
+            events += len(more)
+        self._count("events", events)
+        return list(batch)
+
+    def process(self, paths: Iterable[str]) -> int:
+        """Match changed ``paths`` against the rules and remove what matches
+
+        A new directory that rules descend into, or events the kernel
+        dropped, trigger a rescan of the rules. Returns how many artifacts
+        were removed.
+        """
+        self._count("batches")
+        rescan = self.source.overflowed
+        self.source.overflowed = False
+        removed = 0
+        for path in paths:
+            self._count("paths_evaluated")
+            category, below = self.target.classify(path)
+            if below and os.path.isdir(path):
+                rescan = True
+            if category is not None and os.path.lexists(path):
+                removed += self._remove(path, category)
+        if rescan:
+            removed += self.rescan()
+        return removed
+
+    def rescan(self) -> int:
+        """Resolve the rules again, remove the matches and watch new directories
+
+        Scans repeat until they add no new directory, so nothing created
+        between a scan and its new watches goes unseen.
+        """
+        self._count("rescans")
+        while True:
+            matches, directories = self.target.scan()
+            added = [
+                directory for directory in directories if self.source.add(directory)
+            ]
+            if not added:
+                break
+        return sum(self._remove(path, category) for path, category in matches)
+
+    def _remove(self, path: str, category: str) -> int:
+        self._count("matches")
+        self.logger.info(f"👀 Reappeared {category} artifact: {path}")
+        if self.target.remove(path, category):
+            self._count("removed")
+            return 1
+        self._count("failed")
+        return 0
+
+
+class RuleWatchTarget:
+    """Watch target of a cleaner's artifact rule catalog"""
+
+    def __init__(self, cleaner):
+        self.cleaner = cleaner
+        if cleaner.target_root:
+            homes = discover_user_homes(cleaner._rebase("/Users"))
+        else:
+            homes = [cleaner.user_home]
+        # User rules first: user homes lie below the system base
+        self.bases: List[Tuple[str, str]] = [("user", home) for home in homes]
+        self.bases.append(("system", cleaner.target_root or "/"))
+
+    def _placeholders(self) -> Set[str]:
+        """Restricted dummy files the cleaner left in place of shredded ones"""
+        return set(self.cleaner.journal.paths(PLACEHOLDER))
+
+    def scan(self) -> Tuple[List[Tuple[str, str]], List[str]]:
+        placeholders = self._placeholders()
+        matches: Dict[str, str] = {}
+        directories: List[str] = []
+        for scope, base in self.bases:
+            resolved = self.cleaner.artifact_rules.resolve(
+                scope, base, visited=directories
+            )
+            for category, paths in resolved.items():
+                for path in paths:
+                    if path not in placeholders:
+                        matches.setdefault(path, category)
+        return sorted(matches.items()), directories
+
+    def classify(self, path: str) -> Tuple[Optional[str], bool]:
+        if path in self._placeholders():
+            return None, False
+        below = False
+        for scope, base in self.bases:
+            categories, descends = self.cleaner.artifact_rules.match(scope, base, path)
+            if categories:
+                return categories[0], descends
+            below = below or descends
+        return None, below
+
+    def remove(self, path: str, category: str) -> bool:
+        # The cleaner's stat cache still remembers the path as removed
+        self.cleaner.stat_cache.invalidate(path)
+        shred = category in SECURE_SHRED_CATEGORIES
+        return self.cleaner._remove_path(
+            path,
+            f"Reappeared {category}: {os.path.basename(path)}",
+            force=shred,
+            secure_shred=shred,
+        )
@@ -9,11 +9,22 @@ import os
 import subprocess
 import tempfile
 import logging
+import threading
 import time
+import urllib.parse
 import urllib.request
 import urllib.error
 import ssl
-from typing import Optional, Dict
+from typing import Optional, Dict, Tuple
+
+from .download_engine import (
+    DEFAULT_CONNECTIONS,
+    PART_SUFFIX,
+    STATE_SUFFIX,
+    DownloadEngine,
+    DownloadResult,
+)
+from .installer_cache import DEFAULT_INSTALLER_CACHE_DIR, InstallerCache
 
 
 class ZoomInstaller:
@@ -29,10 +40,20 @@ class ZoomInstaller:
         "meetings": "https://zoom.us/client/latest/Zoom.pkg",
     }
 
-    def __init__(self, logger: logging.Logger, temp_dir: Optional[str] = None):
+    def __init__(
+        self,
+        logger: logging.Logger,
+        temp_dir: Optional[str] = None,
+        cache_dir: Optional[str] = DEFAULT_INSTALLER_CACHE_DIR,
+    ):
+        """``cache_dir=None`` disables the installer cache"""
         self.logger = logger
         self.temp_dir = temp_dir or tempfile.gettempdir()
+        self.installer_cache = InstallerCache(cache_dir) if cache_dir else None
         self.download_path = None
+        self.download_sha256 = None
+        self.download_connections = DEFAULT_CONNECTIONS
+        self.last_download = None
         self.installation_log = []
 
         # Create SSL context that doesn't verify certificates (for compatibility)
@@ -46,12 +67,19 @@ class ZoomInstaller:
         return {"version": "latest", "url": self.ZOOM_URLS["client"], "size": "unknown"}
 
     def download_zoom(self, force_redownload: bool = False) -> Optional[str]:
-        """Download latest Zoom installer using urllib"""
+        """Download latest Zoom installer over resumable range connections
+
+        With an installer cache, an unchanged installer (per conditional GET)
+        is served from the cache instead of being downloaded again;
+        ``force_redownload`` bypasses the cache.
+        """
         zoom_info = self.get_latest_zoom_info()
 
-        # Create download filename
-        timestamp = int(time.time())
-        filename = f"ZoomInstaller_{timestamp}.pkg"
+        # A stable name lets an interrupted download resume from its .part file
+        filename = (
+            os.path.basename(urllib.parse.urlparse(zoom_info["url"]).path)
+            or "ZoomInstaller.pkg"
+        )
         download_path = os.path.join(self.temp_dir, filename)
 
         # Check if we already have a recent download
@@ -65,70 +93,147 @@ class ZoomInstaller:
                 self.logger.info(f"Using existing download: {self.download_path}")
                 return self.download_path
 
-        self.logger.info(
-            f"Downloading Zoom {zoom_info['version']} from {zoom_info['url']}"
+        if force_redownload:
+            for stale in (download_path + PART_SUFFIX, download_path + STATE_SUFFIX):
+                if os.path.exists(stale):
+                    os.remove(stale)
+
+        engine = DownloadEngine(
+            connections=self.download_connections,
+            headers={
+                "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
+            },
+            ssl_context=self.ssl_context,
         )
+        progress_callback = self._download_progress_logger()
 
-        try:
-            # Create request with headers
-            request = urllib.request.Request(
+        if self.installer_cache is not None and not force_redownload:
+            cached = self.installer_cache.fetch(
                 zoom_info["url"],
-                headers={
-                    "User-Agent": "Mozilla/5.0 (Macintosh; Intel Mac OS X 10_15_7) AppleWebKit/537.36"
-                },
+                engine,
+                expected_sha256=zoom_info.get("sha256"),
+                progress_callback=progress_callback,
             )
-
-            # Download with progress tracking
-            with urllib.request.urlopen(
-                request, context=self.ssl_context, timeout=30
-            ) as response:
-                total_size = int(response.headers.get("Content-Length", 0))
-                downloaded = 0
-
-                with open(download_path, "wb") as f:
-                    while True:
-                        chunk = response.read(8192)
-                        if not chunk:
-                            break
-                        f.write(chunk)
-                        downloaded += len(chunk)
-
-                        if (
-                            total_size > 0 and downloaded % (1024 * 1024) == 0
-                        ):  # Log every MB
-                            progress = (downloaded / total_size) * 100
-                            self.logger.info(f"Download progress: {progress:.1f}%")
-
-            self.logger.info(f"Download completed: {download_path}")
-            self.download_path = download_path
-
-            # Verify download
-            if self._verify_download(download_path):
-                return download_path
-            else:
-                self.logger.error("Download verification failed")
-                os.remove(download_path)
+            self.last_download = cached.download
+            if cached.error:
+                self.logger.error(f"Download failed: {cached.error}")
                 return None
+            if cached.from_cache:
+                self.logger.info(
+                    f"Using cached installer: {cached.path} "
+                    f"({cached.revalidation.replace('_', ' ')})"
+                )
+            else:
+                self.logger.info(
+                    f"Downloading Zoom {zoom_info['version']} from {zoom_info['url']}"
+                )
+                self._log_download(cached.download, cached.path)
+            download_path = cached.path
+            sha256 = cached.sha256
+        else:
+            self.logger.info(
+                f"Downloading Zoom {zoom_info['version']} from {zoom_info['url']}"
+            )
+            result = engine.download(
+                zoom_info["url"],
+                download_path,
+                expected_sha256=zoom_info.get("sha256"),
+                progress_callback=progress_callback,
+            )
+            self.last_download = result
 
-        except urllib.error.URLError as e:
-            self.logger.error(f"Download failed: {e}")
-            if os.path.exists(download_path):
-                os.remove(download_path)
-            return None
-        except Exception as e:
-            self.logger.error(f"Download failed: {e}")
-            if os.path.exists(download_path):
+            if result.error:
+                # The .part file is kept so the next attempt resumes
+                self.logger.error(f"Download failed: {result.error}")
+                return None
+            self._log_download(result, download_path)
+            sha256 = result.sha256
+
+        self.logger.info(f"SHA-256: {sha256}")
+        self.download_path = download_path
+        self.download_sha256 = sha256
+
+        # Verify download
+        if self._verify_download(download_path):
+            return download_path
+        else:
+            self.logger.error("Download verification failed")
+            if self.installer_cache is not None and self.installer_cache.owns(
+                download_path
+            ):
+                self.installer_cache.evict(sha256)
+            else:
                 os.remove(download_path)
             return None
 
+    def _log_download(self, result: DownloadResult, path: str):
+        resumed = (
+            f", resumed after {result.resumed_bytes / (1024 * 1024):.1f} MB"
+            if result.resumed_bytes
+            else ""
+        )
+        self.logger.info(
+            f"Download completed: {path} "
+            f"({result.size / (1024 * 1024):.1f} MB in {result.elapsed:.1f}s, "
+            f"{result.throughput / (1024 * 1024):.1f} MB/s over "
+            f"{result.connections} connection(s){resumed})"
+        )
+
+    def _download_progress_logger(self):
+        """Progress callback logging every 10% of the download"""
+        lock = threading.Lock()
+        next_step = [10]
+
+        def log_progress(done: int, total: int):
+            if total <= 0:
+                return
+            progress = done * 100 / total
+            with lock:
+                if progress < next_step[0]:
+                    return
+                while next_step[0] <= progress:
+                    next_step[0] += 10
+            self.logger.info(f"Download progress: {progress:.1f}%")
+
+        return log_progress
+
     def _verify_download(self, file_path: str) -> bool:
-        """Verify downloaded installer integrity"""
+        """Verify downloaded installer integrity
+
+        Verdicts are memoised per SHA-256 in the installer cache, so an
+        identical package is only checked once.
+        """
+        sha256 = self.download_sha256 if file_path == self.download_path else None
+        if sha256 and self.installer_cache is not None:
+            verdict = self.installer_cache.verdict(sha256)
+            if verdict is not None:
+                if verdict["verified"]:
+                    self.logger.info(
+                        f"✅ Download verified - {verdict['detail']} (cached verdict)"
+                    )
+                else:
+                    self.logger.error(
+                        f"Package failed verification before: {verdict['detail']}"
+                    )
+                return verdict["verified"]
+
+        verified, detail = self._check_package(file_path)
+        if sha256 and detail is not None and self.installer_cache is not None:
+            self.installer_cache.record_verdict(sha256, verified, detail)
+        return verified
+
+    def _check_package(self, file_path: str) -> Tuple[bool, Optional[str]]:
+        """Check size, signature and format of a package: (verified, detail)
+
+        ``detail`` is None when the check itself failed, which says nothing
+        about the package and must not be memoised.
+        """
         try:
             # Check file size (should be > 100MB for Zoom)
             file_size = os.path.getsize(file_path)
             if file_size < 100 * 1024 * 1024:  # Less than 100MB
                 self.logger.error(f"Downloaded file too small: {file_size} bytes")
-                return False
+                return False, f"file too small: {file_size} bytes"
 
             # Verify it's a valid macOS package
             result = subprocess.run(
@@ -141,7 +246,7 @@ class ZoomInstaller:
                 # Check for Zoom's developer signature
                 if "Zoom Video Communications" in result.stdout:
                     self.logger.info("✅ Download verified - valid Zoom package")
-                    return True
+                    return True, "valid Zoom package"
                 else:
                     self.logger.warning("Package signature doesn't match Zoom")
 
@@ -149,14 +254,14 @@ class ZoomInstaller:
             result = subprocess.run(["file", file_path], capture_output=True, text=True)
             if "xar archive" in result.stdout.lower():
                 self.logger.info("✅ Download verified - valid package format")
-                return True
+                return True, "valid package format"
 
             self.logger.error("Downloaded file is not a valid package")
-            return False
+            return False, "not a valid package"
 
         except Exception as e:
             self.logger.error(f"Verification failed: {e}")
-            return False
+            return False, None
 
     def install_zoom(self, package_path: str, silent: bool = True) -> bool:
         """Install Zoom from downloaded package"""
@@ -256,6 +361,11 @@ class ZoomInstaller:
     def cleanup_downloads(self):
         """Clean up downloaded installer files"""
         if self.download_path and os.path.exists(self.download_path):
+            if self.installer_cache is not None and self.installer_cache.owns(
+                self.download_path
+            ):
+                self.logger.info(f"Keeping cached installer: {self.download_path}")
+                return
             try:
                 os.remove(self.download_path)
                 self.logger.info(f"Cleaned up download: {self.download_path}")
@@ -264,8 +374,11 @@ class ZoomInstaller:
 
     def get_installation_report(self) -> Dict:
         """Get detailed installation report"""
+        download = self.last_download
         return {
             "download_path": self.download_path,
+            "download_sha256": self.download_sha256,
+            "download_throughput": download.throughput if download else None,
             "installation_log": self.installation_log,
             "zoom_app_exists": os.path.exists("/Applications/zoom.us.app"),
             "timestamp": time.time(),